@@ -9,18 +9,50 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # Import routers
-from app.routers import sermons, auth, subscriptions
+from app.routers import sermons, auth, subscriptions, bible
+from app.services.bible_service import get_bible_service
+from app.services.cache_service import get_cache_service
+from app.services.openai_service import get_openai_service
+from app.services.supabase_service import get_supabase_service
 
 # Lifespan context manager for startup/shutdown events
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     print("Starting Bible Sermon Assistant API...")
-    # Initialize Redis connection, DB connections, etc.
+    cache_service = None
+    try:
+        cache_service = get_cache_service()
+        await cache_service.connect()
+    except ValueError as e:
+        print(f"⚠️  Cache disabled: {e}")
+
+    supabase_service = None
+    try:
+        supabase_service = get_supabase_service()
+        await supabase_service.connect()
+    except ValueError as e:
+        print(f"⚠️  Database disabled: {e}")
+
+    # Open the Bible database once per process
+    try:
+        get_bible_service()
+    except ValueError as e:
+        print(f"⚠️  Verse lookup disabled: {e}")
+
+    # Create the OpenAI service now, so tokenizers load before the first request
+    try:
+        get_openai_service()
+    except ValueError as e:
+        print(f"⚠️  Sermon generation disabled: {e}")
     yield
     # Shutdown
     print("Shutting down Bible Sermon Assistant API...")
-    # Close connections, cleanup
+    # Cache first: closing flushes queued ai_cache writes through Supabase
+    if cache_service:
+        await cache_service.close()
+    if supabase_service:
+        await supabase_service.close()
 
 # Create FastAPI app
 app = FastAPI(
@@ -64,6 +96,7 @@ async def root():
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["Authentication"])
 app.include_router(sermons.router, prefix="/api/v1/sermons", tags=["Sermons"])
 app.include_router(subscriptions.router, prefix="/api/v1/subscriptions", tags=["Subscriptions"])
+app.include_router(bible.router, prefix="/api/v1/bible", tags=["Bible"])
 
 if __name__ == "__main__":
     import uvicorn
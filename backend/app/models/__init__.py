@@ -4,9 +4,24 @@ from .sermon import (
     SermonPoint,
     SermonContent,
     Sermon,
+    SermonSummary,
+    SermonListPage,
     GenerateSermonRequest,
     GenerateSermonResponse,
 )
+from .bible import (
+    Testament,
+    SearchMode,
+    VerseSearchResult,
+    VerseSearchPage,
+    Translation,
+    ParallelVerse,
+    TranslationPassage,
+    ParallelPassage,
+    SimilarVerse,
+    RelatedVerse,
+    BibleUpdateInfo,
+)
 from .subscription import (
     SubscriptionTier,
     SubscriptionStatus,
@@ -23,8 +38,21 @@ __all__ = [
     "SermonPoint",
     "SermonContent",
     "Sermon",
+    "SermonSummary",
+    "SermonListPage",
     "GenerateSermonRequest",
     "GenerateSermonResponse",
+    "Testament",
+    "SearchMode",
+    "VerseSearchResult",
+    "VerseSearchPage",
+    "Translation",
+    "ParallelVerse",
+    "TranslationPassage",
+    "ParallelPassage",
+    "SimilarVerse",
+    "RelatedVerse",
+    "BibleUpdateInfo",
     "SubscriptionTier",
     "SubscriptionStatus",
     "UserProfile",
@@ -0,0 +1,64 @@
+from pydantic import BaseModel
+from typing import List, Optional, Literal
+
+from .sermon import VerseReference
+
+# Enums as Literal types
+Testament = Literal["OT", "NT"]
+SearchMode = Literal["word", "partial"]
+
+class VerseSearchResult(BaseModel):
+    book_id: int
+    book_name: str
+    chapter: int
+    verse: int
+    text: str
+    snippet: str
+    score: float
+
+class VerseSearchPage(BaseModel):
+    results: List[VerseSearchResult]
+    mode: SearchMode
+    next_cursor: Optional[str] = None
+
+class Translation(BaseModel):
+    code: str
+    name: str
+    language: str
+
+class ParallelVerse(BaseModel):
+    verse: int
+    text: str
+
+class TranslationPassage(BaseModel):
+    translation: str
+    book_name: str
+    verses: List[ParallelVerse]
+
+class ParallelPassage(BaseModel):
+    """One reference in several translations (primary first)"""
+    reference: VerseReference
+    passages: List[TranslationPassage]
+
+class SimilarVerse(BaseModel):
+    book_id: int
+    book_name: str
+    chapter: int
+    verse: int
+    text: str
+    score: float
+
+class RelatedVerse(BaseModel):
+    reference: VerseReference
+    label: str
+    source: Literal["openbible", "similar"]
+    score: float
+
+class BibleUpdateInfo(BaseModel):
+    """How a bundled bible.db reaches the latest release"""
+    latest_version: Optional[str] = None
+    up_to_date: bool
+    full_download_required: bool
+    delta_url: Optional[str] = None
+    delta_size: Optional[int] = None
+    delta_sha256: Optional[str] = None
@@ -19,6 +19,8 @@ class SermonConfig(BaseModel):
     length_minutes: SermonLength
     tone: Optional[Literal["formal", "casual", "passionate", "gentle"]] = "formal"
     include_illustrations: bool = True
+    # Translation code to quote alongside Telugu (bilingual sermons)
+    parallel_translation: Optional[str] = Field(None, max_length=20, pattern=r"^[a-z0-9_]+$")
 
 class SermonPoint(BaseModel):
     point: str
@@ -47,10 +49,29 @@ class Sermon(BaseModel):
     created_at: datetime
     updated_at: datetime
 
+class SermonSummary(BaseModel):
+    """Sermon list item (no content)"""
+    id: str
+    title: str
+    sermon_type: SermonType
+    target_audience: TargetAudience
+    created_at: datetime
+
+class SermonListPage(BaseModel):
+    items: List[SermonSummary]
+    next_cursor: Optional[str] = None
+
 class GenerateSermonRequest(BaseModel):
     verses: List[VerseReference] = Field(..., min_length=1, max_length=10)
     config: SermonConfig
 
+class NearDuplicateMatch(BaseModel):
+    """A cached sermon served for overlapping, not identical, verses"""
+    similarity: float
+    verses: List[VerseReference]
+
 class GenerateSermonResponse(BaseModel):
     sermon: Sermon
     quota_remaining: int
+    # Set when the sermon was written for these overlapping verses
+    near_duplicate: Optional[NearDuplicateMatch] = None
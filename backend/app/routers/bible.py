@@ -0,0 +1,280 @@
+"""
+Bible Router - API endpoints for verse search and parallel translations
+"""
+
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from typing import List, Optional
+
+from app.models.bible import (
+    BibleUpdateInfo,
+    ParallelPassage,
+    ParallelVerse,
+    RelatedVerse,
+    SimilarVerse,
+    Testament,
+    Translation,
+    TranslationPassage,
+    VerseSearchPage,
+    VerseSearchResult,
+)
+from app.models.sermon import VerseReference
+from app.services.bible_service import (
+    SEARCH_TABLES,
+    SearchUnavailableError,
+    TranslationNotFoundError,
+    VerseNotFoundError,
+    get_bible_service,
+)
+from app.services.bible_update_service import get_bible_update_service
+from app.utils.auth import get_current_user
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.ranges import immutable_response
+
+router = APIRouter()
+
+
+def _decode_search_cursor(cursor: str) -> tuple[str, float, int]:
+    """
+    Decode a search cursor into (mode, score, verse id).
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    mode, score, verse_id = decode_cursor(cursor, 3)
+    if mode not in SEARCH_TABLES or not isinstance(score, (int, float)) or not isinstance(verse_id, int):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return mode, float(score), verse_id
+
+
+@router.get("/search", response_model=VerseSearchPage)
+def search_verses(
+    q: str = Query(..., min_length=1, max_length=100),
+    book_id: Optional[int] = Query(None, ge=1, le=66),
+    testament: Optional[Testament] = None,
+    limit: int = Query(20, ge=1, le=50),
+    cursor: Optional[str] = None,
+    translation: Optional[str] = Query(None, max_length=20),
+    user_id: str = Depends(get_current_user),
+):
+    """
+    Search verse text, best matches first.
+
+    Whole words are matched first; if nothing matches, partial words
+    (3+ characters) are matched instead, reported as mode "partial".
+    Snippets mark matches with <mark></mark>. Pass next_cursor to fetch
+    the following page; it is null on the last page.
+    """
+    after = _decode_search_cursor(cursor) if cursor else None
+
+    try:
+        bible_service = get_bible_service()
+        # Fetch one extra row to know whether another page exists
+        page = bible_service.search(
+            q,
+            book_id=book_id,
+            testament=testament,
+            limit=limit + 1,
+            after=after,
+            translation=translation,
+        )
+
+    except TranslationNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except (SearchUnavailableError, ValueError) as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    results = page["results"][:limit]
+    next_cursor = None
+    if len(page["results"]) > limit:
+        last = results[-1]
+        next_cursor = encode_cursor(page["mode"], last["score"], last["id"])
+
+    return VerseSearchPage(
+        results=[VerseSearchResult(**r) for r in results],
+        mode=page["mode"],
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/translations", response_model=list[Translation])
+def list_translations(user_id: str = Depends(get_current_user)):
+    """List the translations in the Bible database, default first"""
+    try:
+        bible_service = get_bible_service()
+    except ValueError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    return [
+        Translation(code=t["code"], name=t["name"], language=t["language"])
+        for t in bible_service.translations.values()
+    ]
+
+
+@router.get("/parallel", response_model=ParallelPassage)
+def get_parallel_passage(
+    book_id: int = Query(..., ge=1, le=66),
+    chapter: int = Query(..., ge=1),
+    verse_start: int = Query(..., ge=1),
+    verse_end: Optional[int] = Query(None, ge=1),
+    translations: List[str] = Query(..., min_length=1, max_length=5),
+    user_id: str = Depends(get_current_user),
+):
+    """
+    Get one passage in several translations, fetched in a single query.
+
+    The first translation must contain the whole passage (404 otherwise);
+    the others are included with whatever verses they have, e.g.
+    ?translations=tel&translations=hin.
+    """
+    reference = VerseReference(
+        book_id=book_id,
+        chapter=chapter,
+        verse_start=verse_start,
+        verse_end=verse_end,
+    )
+
+    try:
+        bible_service = get_bible_service()
+        verses = bible_service.get_parallel_verses([reference], translations)
+
+    except (VerseNotFoundError, TranslationNotFoundError) as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return ParallelPassage(
+        reference=reference,
+        passages=[
+            TranslationPassage(
+                translation=code,
+                book_name=bible_service.get_book_name(book_id, code),
+                verses=[ParallelVerse(verse=verse, text=text) for verse, text in passage[0]],
+            )
+            for code, passage in verses.items()
+        ],
+    )
+
+
+@router.get("/similar", response_model=list[SimilarVerse])
+def find_similar_verses(
+    q: Optional[str] = Query(None, min_length=1, max_length=200),
+    book_id: Optional[int] = Query(None, ge=1, le=66),
+    chapter: Optional[int] = Query(None, ge=1),
+    verse_start: Optional[int] = Query(None, ge=1),
+    verse_end: Optional[int] = Query(None, ge=1),
+    limit: int = Query(10, ge=1, le=50),
+    user_id: str = Depends(get_current_user),
+):
+    """
+    Find verses about a topic (?q=) or close in meaning to a passage
+    (?book_id=&chapter=&verse_start=), most similar first.
+
+    Served from precomputed verse embeddings, for picking verses for
+    topical sermons. 503 if the embeddings are not built.
+    """
+    reference = None
+    if book_id is not None and chapter is not None and verse_start is not None:
+        reference = VerseReference(
+            book_id=book_id,
+            chapter=chapter,
+            verse_start=verse_start,
+            verse_end=verse_end,
+        )
+    elif q is None:
+        raise HTTPException(status_code=400, detail="Pass q or book_id, chapter and verse_start")
+
+    try:
+        results = get_bible_service().find_similar_verses(q, reference, limit)
+
+    except VerseNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except (SearchUnavailableError, ValueError) as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return [SimilarVerse(**r) for r in results]
+
+
+@router.get("/related", response_model=list[RelatedVerse])
+def get_related_verses(
+    book_id: int = Query(..., ge=1, le=66),
+    chapter: int = Query(..., ge=1),
+    verse_start: int = Query(..., ge=1),
+    verse_end: Optional[int] = Query(None, ge=1),
+    limit: int = Query(5, ge=1, le=10),
+    user_id: str = Depends(get_current_user),
+):
+    """
+    Get related verses for a passage, best first.
+
+    Cross-references from OpenBible.info come first, then verses with
+    similar wording. Empty if the database was built without
+    cross-references.
+    """
+    reference = VerseReference(
+        book_id=book_id,
+        chapter=chapter,
+        verse_start=verse_start,
+        verse_end=verse_end,
+    )
+
+    try:
+        related = get_bible_service().get_related_verses([reference], limit)
+    except ValueError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return [RelatedVerse(**r) for r in related]
+
+
+@router.get("/updates", response_model=BibleUpdateInfo)
+def get_bible_update(
+    from_version: str = Query(..., min_length=1, max_length=64),
+    user_id: str = Depends(get_current_user),
+):
+    """
+    Check for a newer bible.db than the client's version.
+
+    When a delta chain exists, delta_url points to one squashed delta;
+    otherwise (unknown or pre-delta version) full_download_required is set.
+    """
+    try:
+        update = get_bible_update_service().get_update(from_version)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    if update["delta_size"] is not None:
+        update["delta_url"] = f"/api/v1/bible/deltas/{from_version}/{update['latest_version']}"
+
+    return BibleUpdateInfo(**update)
+
+
+@router.get("/deltas/{from_version}/{to_version}")
+def download_bible_delta(
+    from_version: str,
+    to_version: str,
+    request: Request,
+    user_id: str = Depends(get_current_user),
+):
+    """
+    Download the gzipped row delta between two bible.db releases.
+
+    Deltas are immutable: the ETag is their sha256, If-None-Match returns
+    304 and Range requests resume interrupted downloads.
+    """
+    try:
+        delta = get_bible_update_service().get_delta(from_version, to_version)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    if delta is None:
+        raise HTTPException(status_code=404, detail=f"No delta from {from_version} to {to_version}")
+
+    payload, sha256 = delta
+    return immutable_response(request, payload, sha256, "application/gzip")
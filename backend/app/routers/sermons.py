@@ -2,25 +2,138 @@
 Sermon Router - API endpoints for sermon generation and management
 """
 
-from fastapi import APIRouter, HTTPException, Depends, Header
+from fastapi import APIRouter, HTTPException, Depends, Header, Query
 from fastapi.responses import StreamingResponse
 from typing import Optional
 import json
+import uuid
 from datetime import datetime
 
 from app.models.sermon import (
     GenerateSermonRequest,
     GenerateSermonResponse,
     Sermon,
+    SermonListPage,
+    SermonSummary,
     VerseReference,
 )
+from app.services.bible_service import TranslationNotFoundError, VerseNotFoundError, get_prompt_verse_texts
 from app.services.openai_service import get_openai_service
 from app.services.cache_service import get_cache_service
 from app.services.supabase_service import get_supabase_service
 from app.utils.auth import get_current_user
+from app.utils.pagination import decode_cursor, encode_cursor
 
 router = APIRouter()
 
+# Sermon fields users may edit via PUT /{sermon_id}
+UPDATABLE_SERMON_FIELDS = ("title", "content", "tags")
+
+
+def _build_sermon(record: dict) -> Sermon:
+    """Parse a sermon database record into a Sermon model"""
+    return Sermon(
+        id=record["id"],
+        user_id=record["user_id"],
+        title=record["title"],
+        content=record["content"],
+        source_verses=[VerseReference(**v) for v in record["source_verses"]],
+        sermon_type=record["sermon_type"],
+        target_audience=record["target_audience"],
+        language=record["language"],
+        ai_model_used=record.get("ai_model_used"),
+        tags=record.get("tags"),
+        created_at=record["created_at"],
+        updated_at=record["updated_at"],
+    )
+
+
+async def _save_generated_sermon(
+    supabase_service,
+    user_id: str,
+    request: GenerateSermonRequest,
+    result: dict,
+) -> Sermon:
+    """
+    Persist a generated sermon and return it as a Sermon model.
+
+    A near-duplicate is saved under the verses it was written for, not
+    the requested ones.
+    """
+    sermon_content = result["sermon_content"]
+    metadata = result["metadata"]
+    near_duplicate = result.get("near_duplicate")
+
+    sermon_data = {
+        "user_id": user_id,
+        "title": sermon_content.get("title", "Untitled Sermon"),
+        "content": sermon_content,
+        "source_verses": near_duplicate["verses"] if near_duplicate else [v.dict() for v in request.verses],
+        "sermon_type": request.config.sermon_type,
+        "target_audience": request.config.target_audience,
+        "language": "telugu",
+        "ai_model_used": metadata.get("model"),
+        "tags": [],
+    }
+
+    sermon_record = await supabase_service.create_sermon(sermon_data)
+
+    if not sermon_record:
+        raise HTTPException(status_code=500, detail="Failed to save sermon")
+
+    return _build_sermon(sermon_record)
+
+
+async def _check_quota(supabase_service, user_id: str) -> tuple[dict, str]:
+    """
+    Check and decrement quota; the same call returns the subscription tier.
+
+    Returns:
+        Tuple of (quota_result, subscription_tier)
+    """
+    quota_result = await supabase_service.check_and_decrement_quota(user_id)
+
+    if not quota_result["success"]:
+        raise HTTPException(
+            status_code=403,
+            detail={
+                "message": quota_result.get("error", "Quota exceeded"),
+                "quota_remaining": quota_result.get("quota_remaining", 0),
+                "quota_reset_at": quota_result.get("quota_reset_at"),
+            }
+        )
+
+    return quota_result, quota_result["subscription_tier"]
+
+
+def _decode_sermon_cursor(cursor: str) -> tuple[str, str]:
+    """
+    Decode a sermon list cursor into (created_at, id).
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    created_at, sermon_id = decode_cursor(cursor, 2)
+    try:
+        # Validate both parts; they are interpolated into the query filter
+        datetime.fromisoformat(created_at)
+        return created_at, str(uuid.UUID(sermon_id))
+    except (ValueError, TypeError, AttributeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _get_verse_texts(verses: list[VerseReference], parallel_translation: Optional[str] = None) -> list[str]:
+    """
+    Get verse texts for the prompt (references only without a Bible database).
+
+    Raises:
+        HTTPException: 400 if a reference or translation does not exist
+    """
+    try:
+        return get_prompt_verse_texts(verses, parallel_translation)
+    except (VerseNotFoundError, TranslationNotFoundError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 
 @router.post("/generate", response_model=GenerateSermonResponse)
 async def generate_sermon(
@@ -40,36 +153,13 @@ async def generate_sermon(
     """
     try:
         openai_service = get_openai_service()
-        cache_service = get_cache_service()
         supabase_service = get_supabase_service()
 
-        # Step 1: Check and decrement quota
-        quota_result = await supabase_service.check_and_decrement_quota(user_id)
-
-        if not quota_result["success"]:
-            raise HTTPException(
-                status_code=403,
-                detail={
-                    "message": quota_result.get("error", "Quota exceeded"),
-                    "quota_remaining": quota_result.get("quota_remaining", 0),
-                    "quota_reset_at": quota_result.get("quota_reset_at"),
-                }
-            )
-
-        # Step 2: Get user profile for subscription tier
-        profile = await supabase_service.get_user_profile(user_id)
-        if not profile:
-            raise HTTPException(status_code=404, detail="User profile not found")
-
-        subscription_tier = profile["subscription_tier"]
+        # Step 1: Fetch verse texts (before quota, so bad references cost nothing)
+        verse_texts = _get_verse_texts(request.verses, request.config.parallel_translation)
 
-        # Step 3: Fetch verse texts (you'll need to implement this)
-        # For now, we'll use placeholder verse texts
-        # TODO: Integrate with Bible database to fetch actual verse texts
-        verse_texts = [
-            f"Verse {v.book_id}:{v.chapter}:{v.verse_start}"
-            for v in request.verses
-        ]
+        # Steps 2-3: Check and decrement quota (also returns subscription tier)
+        quota_result, subscription_tier = await _check_quota(supabase_service, user_id)
 
         # Step 4: Generate sermon using OpenAI
         result = await openai_service.generate_sermon(
@@ -80,47 +170,8 @@ async def generate_sermon(
             use_cache=True,
         )
 
-        # Step 5: Parse sermon content
-        sermon_content = result["sermon_content"]
-        metadata = result["metadata"]
-        from_cache = result.get("from_cache", False)
-
-        # Step 6: Create sermon record
-        sermon_data = {
-            "user_id": user_id,
-            "title": sermon_content.get("title", "Untitled Sermon"),
-            "content": sermon_content,
-            "source_verses": [v.dict() for v in request.verses],
-            "sermon_type": request.config.sermon_type,
-            "target_audience": request.config.target_audience,
-            "language": "telugu",
-            "ai_model_used": metadata.get("model"),
-            "tags": [],
-        }
-
-        sermon_id = await supabase_service.create_sermon(sermon_data)
-
-        if not sermon_id:
-            raise HTTPException(status_code=500, detail="Failed to save sermon")
-
-        # Step 7: Get updated sermon
-        sermon_record = await supabase_service.get_sermon(sermon_id)
-
-        # Step 8: Parse sermon record into Pydantic model
-        sermon = Sermon(
-            id=sermon_record["id"],
-            user_id=sermon_record["user_id"],
-            title=sermon_record["title"],
-            content=sermon_record["content"],
-            source_verses=[VerseReference(**v) for v in sermon_record["source_verses"]],
-            sermon_type=sermon_record["sermon_type"],
-            target_audience=sermon_record["target_audience"],
-            language=sermon_record["language"],
-            ai_model_used=sermon_record.get("ai_model_used"),
-            tags=sermon_record.get("tags"),
-            created_at=sermon_record["created_at"],
-            updated_at=sermon_record["updated_at"],
-        )
+        # Steps 5-8: Save sermon record and parse into Pydantic model
+        sermon = await _save_generated_sermon(supabase_service, user_id, request, result)
 
         # Step 9: Return response with remaining quota
         # Note: Quota was already decremented, so we need to calculate remaining
@@ -131,6 +182,7 @@ async def generate_sermon(
         return GenerateSermonResponse(
             sermon=sermon,
             quota_remaining=quota_remaining,
+            near_duplicate=result.get("near_duplicate"),
         )
 
     except HTTPException:
@@ -140,6 +192,118 @@ async def generate_sermon(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/generate/stream")
+async def generate_sermon_stream(
+    request: GenerateSermonRequest,
+    user_id: str = Depends(get_current_user),
+):
+    """
+    Generate a sermon and stream it as newline-delimited JSON (NDJSON)
+
+    Emits one JSON object per line:
+    - {"event": "start", "model": ..., "from_cache": ...}, plus
+      "near_duplicate": {"similarity": ..., "verses": [...]} when a cached
+      sermon for overlapping verses is served
+    - {"event": "section", "name": "<SermonContent field>", "data": ...}
+      as soon as each section is complete
+    - {"event": "complete", "sermon": {...}, "quota_remaining": ...,
+      "near_duplicate": ...}
+      after the sermon is saved and cached
+    - {"event": "error", "message": ...} if generation fails mid-stream
+
+    Quota and validation errors are returned as regular HTTP errors
+    before streaming starts.
+    """
+    try:
+        openai_service = get_openai_service()
+        supabase_service = get_supabase_service()
+
+        verse_texts = _get_verse_texts(request.verses, request.config.parallel_translation)
+        quota_result, subscription_tier = await _check_quota(supabase_service, user_id)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"❌ Generate sermon stream error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    quota_remaining = quota_result.get("quota_remaining", 0)
+    if quota_result.get("unlimited"):
+        quota_remaining = -1  # Unlimited
+
+    async def event_stream():
+        try:
+            async for event in openai_service.generate_sermon_stream(
+                verses=request.verses,
+                verse_texts=verse_texts,
+                config=request.config,
+                subscription_tier=subscription_tier,
+                use_cache=True,
+            ):
+                if event["event"] != "done":
+                    yield json.dumps(event, ensure_ascii=False) + "\n"
+                    continue
+
+                sermon = await _save_generated_sermon(
+                    supabase_service, user_id, request, event["result"]
+                )
+                yield json.dumps({
+                    "event": "complete",
+                    "sermon": sermon.model_dump(mode="json"),
+                    "quota_remaining": quota_remaining,
+                    "near_duplicate": event["result"].get("near_duplicate"),
+                }, ensure_ascii=False) + "\n"
+
+        except Exception as e:
+            message = e.detail if isinstance(e, HTTPException) else str(e)
+            print(f"❌ Generate sermon stream error: {message}")
+            yield json.dumps({"event": "error", "message": message}, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/summaries", response_model=SermonListPage)
+async def list_sermon_summaries(
+    user_id: str = Depends(get_current_user),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+):
+    """
+    List the current user's sermons without content, newest first.
+
+    Pass the returned next_cursor to fetch the following page; it is null
+    on the last page. Load full content with GET /{sermon_id}.
+    """
+    after = _decode_sermon_cursor(cursor) if cursor else None
+
+    try:
+        supabase_service = get_supabase_service()
+        # Fetch one extra row to know whether another page exists
+        records = await supabase_service.get_user_sermon_summaries(
+            user_id=user_id,
+            limit=limit + 1,
+            after=after,
+        )
+
+        page = records[:limit]
+        next_cursor = None
+        if len(records) > limit:
+            last = page[-1]
+            next_cursor = encode_cursor(last["created_at"], last["id"])
+
+        return SermonListPage(
+            items=[SermonSummary(**r) for r in page],
+            next_cursor=next_cursor,
+        )
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/{sermon_id}", response_model=Sermon)
 async def get_sermon(
     sermon_id: str,
@@ -157,20 +321,7 @@ async def get_sermon(
         if sermon_record["user_id"] != user_id:
             raise HTTPException(status_code=403, detail="Not authorized")
 
-        sermon = Sermon(
-            id=sermon_record["id"],
-            user_id=sermon_record["user_id"],
-            title=sermon_record["title"],
-            content=sermon_record["content"],
-            source_verses=[VerseReference(**v) for v in sermon_record["source_verses"]],
-            sermon_type=sermon_record["sermon_type"],
-            target_audience=sermon_record["target_audience"],
-            language=sermon_record["language"],
-            ai_model_used=sermon_record.get("ai_model_used"),
-            tags=sermon_record.get("tags"),
-            created_at=sermon_record["created_at"],
-            updated_at=sermon_record["updated_at"],
-        )
+        sermon = _build_sermon(sermon_record)
 
         return sermon
 
@@ -186,7 +337,11 @@ async def list_sermons(
     limit: int = 50,
     offset: int = 0,
 ):
-    """List all sermons for the current user"""
+    """
+    List all sermons for the current user, including full content.
+
+    Kept for older clients; list screens should use GET /summaries.
+    """
     try:
         supabase_service = get_supabase_service()
         sermons_records = await supabase_service.get_user_sermons(
@@ -195,23 +350,7 @@ async def list_sermons(
             offset=offset,
         )
 
-        sermons = [
-            Sermon(
-                id=s["id"],
-                user_id=s["user_id"],
-                title=s["title"],
-                content=s["content"],
-                source_verses=[VerseReference(**v) for v in s["source_verses"]],
-                sermon_type=s["sermon_type"],
-                target_audience=s["target_audience"],
-                language=s["language"],
-                ai_model_used=s.get("ai_model_used"),
-                tags=s.get("tags"),
-                created_at=s["created_at"],
-                updated_at=s["updated_at"],
-            )
-            for s in sermons_records
-        ]
+        sermons = [_build_sermon(s) for s in sermons_records]
 
         return sermons
 
@@ -227,35 +366,24 @@ async def update_sermon(
 ):
     """Update a sermon (title, content, tags)"""
     try:
+        allowed_updates = {
+            field: value for field, value in updates.items()
+            if field in UPDATABLE_SERMON_FIELDS
+        }
+        if not allowed_updates:
+            raise HTTPException(
+                status_code=400,
+                detail=f"No updatable fields provided ({', '.join(UPDATABLE_SERMON_FIELDS)})"
+            )
+
         supabase_service = get_supabase_service()
 
-        # Verify ownership
-        sermon_record = await supabase_service.get_sermon(sermon_id)
-        if not sermon_record or sermon_record["user_id"] != user_id:
+        # Update only if the sermon belongs to the user (single statement)
+        updated_record = await supabase_service.update_sermon(sermon_id, user_id, allowed_updates)
+        if not updated_record:
             raise HTTPException(status_code=403, detail="Not authorized")
 
-        # Update sermon
-        success = await supabase_service.update_sermon(sermon_id, updates)
-        if not success:
-            raise HTTPException(status_code=500, detail="Failed to update sermon")
-
-        # Get updated sermon
-        updated_record = await supabase_service.get_sermon(sermon_id)
-
-        sermon = Sermon(
-            id=updated_record["id"],
-            user_id=updated_record["user_id"],
-            title=updated_record["title"],
-            content=updated_record["content"],
-            source_verses=[VerseReference(**v) for v in updated_record["source_verses"]],
-            sermon_type=updated_record["sermon_type"],
-            target_audience=updated_record["target_audience"],
-            language=updated_record["language"],
-            ai_model_used=updated_record.get("ai_model_used"),
-            tags=updated_record.get("tags"),
-            created_at=updated_record["created_at"],
-            updated_at=updated_record["updated_at"],
-        )
+        sermon = _build_sermon(updated_record)
 
         return sermon
 
@@ -274,16 +402,11 @@ async def delete_sermon(
     try:
         supabase_service = get_supabase_service()
 
-        # Verify ownership
-        sermon_record = await supabase_service.get_sermon(sermon_id)
-        if not sermon_record or sermon_record["user_id"] != user_id:
+        # Delete only if the sermon belongs to the user (single statement)
+        deleted = await supabase_service.delete_sermon(sermon_id, user_id)
+        if not deleted:
             raise HTTPException(status_code=403, detail="Not authorized")
 
-        # Delete sermon
-        success = await supabase_service.delete_sermon(sermon_id)
-        if not success:
-            raise HTTPException(status_code=500, detail="Failed to delete sermon")
-
         return {"message": "Sermon deleted successfully"}
 
     except HTTPException:
@@ -297,7 +420,7 @@ async def get_cache_stats(user_id: str = Depends(get_current_user)):
     """Get cache statistics (admin/debug)"""
     try:
         cache_service = get_cache_service()
-        stats = cache_service.get_stats()
+        stats = await cache_service.get_stats()
         return stats
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
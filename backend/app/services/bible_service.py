@@ -0,0 +1,692 @@
+"""
+Bible Service for Verse Lookup
+Serves verse text from the SQLite database built by scripts/create_bible_db.py
+"""
+
+import os
+import sqlite3
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.models.sermon import VerseReference
+from app.services.verse_index import VerseIndex
+from app.services.verse_vectors import VerseVectorIndex
+
+
+# Repository assets/bible.db (same file the mobile app bundles)
+DEFAULT_BIBLE_DB_PATH = Path(__file__).resolve().parents[3] / "assets" / "bible.db"
+
+
+# Search tables built by create_bible_db.py, per search mode. These are the
+# default translation's; other translations add a _<code> suffix.
+SEARCH_TABLES = {
+    "word": "verses_fts",             # whole words, Telugu-aware tokenizer
+    "partial": "verses_fts_trigram",  # substrings of 3+ characters
+}
+
+# Databases built before translations hold only this translation
+DEFAULT_TRANSLATION = {"id": 1, "code": "tel", "name": "Telugu", "language": "te"}
+
+# Snippet length in tokens (trigram tokens are single characters wide)
+SNIPPET_TOKENS = {"word": 12, "partial": 48}
+
+# Related verses listed under each reference in prompts
+DEFAULT_PROMPT_RELATED_VERSES = 3
+
+
+class VerseNotFoundError(ValueError):
+    """Raised when a verse reference does not exist in the Bible database"""
+
+
+class SearchUnavailableError(RuntimeError):
+    """Raised when the database has no search index"""
+
+
+class TranslationNotFoundError(ValueError):
+    """Raised when a translation code is not in the Bible database"""
+
+
+def _fts_phrase(term: str) -> str:
+    """Quote a term as an FTS5 string so query syntax is not interpreted"""
+    return '"' + term.replace('"', '""') + '"'
+
+
+def _format_reference(book_name: str, ref: VerseReference) -> str:
+    """Format a reference label, e.g. "యోహాను సువార్త 3:16-18" """
+    label = f"{book_name} {ref.chapter}:{ref.verse_start}"
+    if ref.verse_end and ref.verse_end != ref.verse_start:
+        label += f"-{ref.verse_end}"
+    return label
+
+
+def verse_key(book_id: int, chapter: int, verse: int) -> int:
+    """Key a verse as in the cross_references table (book_id * 1_000_000 + chapter * 1000 + verse)"""
+    return book_id * 1_000_000 + chapter * 1000 + verse
+
+
+def _key_reference(start_key: int, end_key: int) -> VerseReference:
+    """Turn a cross_references key range (within one chapter) into a reference"""
+    return VerseReference(
+        book_id=start_key // 1_000_000,
+        chapter=start_key // 1000 % 1000,
+        verse_start=start_key % 1000,
+        verse_end=end_key % 1000 if end_key != start_key else None,
+    )
+
+
+def _format_verses(verses: List[tuple[int, str]]) -> str:
+    """Join verse texts, marking verse numbers inside ranges"""
+    if len(verses) == 1:
+        return verses[0][1]
+    return " ".join(f"[{verse}] {text}" for verse, text in verses)
+
+
+class BibleService:
+    """Read-only verse lookup against the bundled SQLite Bible"""
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Open the Bible database read-only.
+
+        Args:
+            db_path: Path to bible.db (default: BIBLE_DB_PATH or assets/bible.db)
+        """
+        self.db_path = Path(db_path or os.getenv("BIBLE_DB_PATH", DEFAULT_BIBLE_DB_PATH))
+
+        if not self.db_path.is_file():
+            raise ValueError(f"Bible database not found at {self.db_path}")
+
+        mmap_size = int(os.getenv("BIBLE_DB_MMAP_SIZE", 256 * 1024 * 1024))
+
+        # Opened once per process; the whole file is memory-mapped so
+        # lookups are served from the page cache without read() calls
+        self.conn = sqlite3.connect(
+            f"{self.db_path.as_uri()}?mode=ro",
+            uri=True,
+            check_same_thread=False,
+        )
+        self.conn.execute(f"PRAGMA mmap_size = {mmap_size}")
+        self.conn.execute("PRAGMA query_only = ON")
+        self._lock = threading.Lock()
+
+        self.book_names: Dict[int, str] = {
+            book_id: name_telugu
+            for book_id, name_telugu in self.conn.execute("SELECT id, name_telugu FROM books")
+        }
+
+        existing_tables = {
+            name for (name,) in self.conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        }
+
+        # Translations, default (id 1, Telugu) first
+        multi_translation = "translations" in existing_tables
+        self.translations: Dict[str, Dict[str, Any]] = {DEFAULT_TRANSLATION["code"]: DEFAULT_TRANSLATION}
+        self.translation_book_names: Dict[int, Dict[int, str]] = {}
+        if multi_translation:
+            self.translations = {
+                code: {"id": translation_id, "code": code, "name": name, "language": language}
+                for translation_id, code, name, language in self.conn.execute(
+                    "SELECT id, code, name, language FROM translations ORDER BY id"
+                )
+            }
+            for translation_id, book_id, name in self.conn.execute(
+                "SELECT translation_id, book_id, name FROM book_names"
+            ):
+                self.translation_book_names.setdefault(translation_id, {})[book_id] = name
+        self.default_translation = next(iter(self.translations))
+
+        # Older databases have no translation_id column (one translation)
+        self._translation_column = "v.translation_id" if multi_translation else str(DEFAULT_TRANSLATION["id"])
+
+        self.searchable_translations = {
+            code for code in self.translations
+            if set(self._search_tables(code).values()) <= existing_tables
+        }
+        self.search_enabled = self.default_translation in self.searchable_translations
+        if not self.search_enabled:
+            print("⚠️  Bible search index missing (run create_bible_db.py --rebuild-search)")
+
+        # Related verses (scripts/build_cross_references.py)
+        self.cross_references_enabled = "cross_references" in existing_tables
+        self.prompt_related_verses = int(os.getenv("BIBLE_PROMPT_RELATED_VERSES", DEFAULT_PROMPT_RELATED_VERSES))
+
+        # Optional: serve default translation lookups from an in-memory
+        # index instead of SQLite
+        self.index: Optional[VerseIndex] = None
+        if os.getenv("BIBLE_IN_MEMORY_INDEX", "false").lower() == "true":
+            self.index = VerseIndex.from_database(
+                self.conn,
+                self.translations[self.default_translation]["id"] if multi_translation else None,
+            )
+            print(f"✅ Verse index loaded ({len(self.index)} verses, {self.index.nbytes / 1024 / 1024:.1f} MB)")
+
+        # Optional: verse embeddings for topic search
+        # (scripts/build_verse_embeddings.py)
+        self.vectors: Optional[VerseVectorIndex] = None
+        self.vector_nprobe = int(os.getenv("BIBLE_VECTOR_NPROBE", 16))
+        try:
+            self.vectors = VerseVectorIndex.load(self.db_path)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Verse embeddings not loaded: {e}")
+        if self.vectors is not None:
+            print(f"✅ Verse embeddings mapped ({len(self.vectors)} verses, {self.vectors.nbytes / 1024 / 1024:.1f} MB)")
+
+        print(f"✅ Bible database opened ({len(self.book_names)} books, {len(self.translations)} translations)")
+
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
+
+    def _get_translation(self, code: Optional[str]) -> Dict[str, Any]:
+        """
+        Look up a translation by code (None for the default).
+
+        Raises:
+            TranslationNotFoundError: If the code is unknown
+        """
+        translation = self.translations.get(code or self.default_translation)
+        if translation is None:
+            raise TranslationNotFoundError(f"Translation not found: {code}")
+        return translation
+
+    def _search_tables(self, code: str) -> Dict[str, str]:
+        """Get a translation's search table per search mode"""
+        if code == self.default_translation:
+            return SEARCH_TABLES
+        return {mode: f"{table}_{code}" for mode, table in SEARCH_TABLES.items()}
+
+    def get_book_name(self, book_id: int, translation: Optional[str] = None) -> str:
+        """Get a book's name in a translation (default: name_telugu)"""
+        if translation and translation != self.default_translation:
+            names = self.translation_book_names.get(self._get_translation(translation)["id"], {})
+            if book_id in names:
+                return names[book_id]
+        return self.book_names.get(book_id, str(book_id))
+
+    def _query_verses(
+        self,
+        refs: List[VerseReference],
+        translation_ids: List[int],
+    ) -> Dict[tuple[int, int], List[tuple[int, str]]]:
+        """
+        Fetch every reference in every translation in one range query.
+
+        Each reference selects book_id/chapter with verse BETWEEN
+        verse_start AND verse_end (verse_start only if verse_end is None),
+        served by idx_verses_translation_book_chapter_verse.
+
+        Returns:
+            (reference index, translation id) -> [(verse number, text)]
+
+        Raises:
+            VerseNotFoundError: If a range ends before it starts
+        """
+        params: List[Any] = []
+        for i, ref in enumerate(refs):
+            verse_end = ref.verse_end or ref.verse_start
+            if verse_end < ref.verse_start:
+                raise VerseNotFoundError(
+                    f"Invalid verse range {ref.book_id}:{ref.chapter}:{ref.verse_start}-{verse_end}"
+                )
+            params.extend((i, ref.book_id, ref.chapter, ref.verse_start, verse_end))
+        params.extend(translation_ids)
+
+        # One statement per reference/translation count; sqlite3 caches the
+        # prepared statement, so repeat lookups skip parsing and planning
+        sql = (
+            "WITH refs(idx, book_id, chapter, verse_start, verse_end) AS (VALUES "
+            + ",".join(["(?, ?, ?, ?, ?)"] * len(refs))
+            + "), wanted(translation_id) AS (VALUES "
+            + ",".join(["(?)"] * len(translation_ids))
+            + ") SELECT refs.idx, wanted.translation_id, v.verse, v.text"
+            " FROM refs CROSS JOIN wanted"
+            " JOIN verses AS v ON v.book_id = refs.book_id"
+            f" AND {self._translation_column} = wanted.translation_id"
+            " AND v.chapter = refs.chapter"
+            " AND v.verse BETWEEN refs.verse_start AND refs.verse_end"
+            " ORDER BY refs.idx, wanted.translation_id, v.verse"
+        )
+
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+
+        results: Dict[tuple[int, int], List[tuple[int, str]]] = {}
+        for idx, translation_id, verse, text in rows:
+            results.setdefault((idx, translation_id), []).append((verse, text))
+
+        return results
+
+    def get_verses(
+        self,
+        refs: List[VerseReference],
+        translation: Optional[str] = None,
+    ) -> List[List[tuple[int, str]]]:
+        """
+        Resolve verse references in one batched range query.
+
+        Args:
+            refs: Verse references
+            translation: Translation code (default translation if None)
+
+        Returns:
+            One list of (verse number, text) per reference, in order
+
+        Raises:
+            VerseNotFoundError: If a reference (or part of a range) is missing
+            TranslationNotFoundError: If the translation is unknown
+        """
+        if not refs:
+            return []
+
+        code = self._get_translation(translation)["code"]
+        if self.index is not None and code == self.default_translation:
+            return self._get_verses_from_index(refs)
+
+        return self.get_parallel_verses(refs, [code])[code]
+
+    def get_parallel_verses(
+        self,
+        refs: List[VerseReference],
+        translations: List[str],
+    ) -> Dict[str, List[List[tuple[int, str]]]]:
+        """
+        Resolve references in several translations with one query.
+
+        The first translation must contain every verse; the others may
+        lack some (e.g. New Testament-only translations), in which case
+        their lists are shorter or empty.
+
+        Args:
+            refs: Verse references
+            translations: Translation codes, primary first
+
+        Returns:
+            Translation code -> one list of (verse number, text) per reference
+
+        Raises:
+            VerseNotFoundError: If the primary translation misses a verse
+            TranslationNotFoundError: If a translation is unknown
+        """
+        selected = [self._get_translation(code) for code in translations]
+        if not refs:
+            return {t["code"]: [] for t in selected}
+
+        rows = self._query_verses(refs, [t["id"] for t in selected])
+
+        results = {
+            t["code"]: [rows.get((i, t["id"]), []) for i in range(len(refs))]
+            for t in selected
+        }
+
+        for ref, verses in zip(refs, results[selected[0]["code"]]):
+            expected = (ref.verse_end or ref.verse_start) - ref.verse_start + 1
+            if len(verses) != expected:
+                raise VerseNotFoundError(
+                    f"Verse not found: {ref.book_id}:{ref.chapter}:{ref.verse_start}"
+                    + (f"-{ref.verse_end}" if ref.verse_end else "")
+                )
+
+        return results
+
+    def _get_verses_from_index(self, refs: List[VerseReference]) -> List[List[tuple[int, str]]]:
+        """Resolve references from the in-memory VerseIndex"""
+        results = []
+        for ref in refs:
+            verse_end = ref.verse_end or ref.verse_start
+            verses = self.index.get_range(ref.book_id, ref.chapter, ref.verse_start, verse_end)
+            if verses is None:
+                raise VerseNotFoundError(
+                    f"Verse not found: {ref.book_id}:{ref.chapter}:{ref.verse_start}"
+                    + (f"-{ref.verse_end}" if ref.verse_end else "")
+                )
+            results.append([(verse, str(text, "utf-8")) for verse, text in verses])
+
+        return results
+
+    def get_related_verses(
+        self,
+        refs: List[VerseReference],
+        limit: int = 5,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the top related verses of one or more references.
+
+        Cross-references (OpenBible) rank before similar wording. Each
+        reference is one primary key range scan of cross_references; verses
+        inside the references themselves are skipped.
+
+        Args:
+            refs: Verse references
+            limit: Maximum related verses
+
+        Returns:
+            List of dicts with reference (VerseReference), label, source
+            ("openbible" or "similar") and score (votes or similarity);
+            empty if the database has no cross_references table
+        """
+        if not refs or limit <= 0 or not self.cross_references_enabled:
+            return []
+
+        ranges = [
+            (verse_key(ref.book_id, ref.chapter, ref.verse_start),
+             verse_key(ref.book_id, ref.chapter, ref.verse_end or ref.verse_start))
+            for ref in refs
+        ]
+        sql = (
+            "SELECT related_key, related_end_key, source, score FROM cross_references WHERE "
+            + " OR ".join(["verse_key BETWEEN ? AND ?"] * len(ranges))
+            + " ORDER BY rank, verse_key"
+        )
+
+        with self._lock:
+            rows = self.conn.execute(sql, [key for pair in ranges for key in pair]).fetchall()
+
+        related = []
+        seen = set()
+        for start_key, end_key, source, score in rows:
+            if start_key in seen or any(first <= start_key <= last for first, last in ranges):
+                continue
+            seen.add(start_key)
+
+            ref = _key_reference(start_key, end_key)
+            related.append({
+                "reference": ref,
+                "label": _format_reference(self.get_book_name(ref.book_id), ref),
+                "source": source,
+                "score": score,
+            })
+            if len(related) == limit:
+                break
+
+        return related
+
+    def find_similar_verses(
+        self,
+        query: Optional[str] = None,
+        ref: Optional[VerseReference] = None,
+        limit: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """
+        Find verses close in meaning to a topic or a passage.
+
+        Scores every verse embedding (or, with IVF lists, the
+        BIBLE_VECTOR_NPROBE closest lists) against the query vector.
+
+        Args:
+            query: Topic text, e.g. "క్షమాపణ" (used if ref is None)
+            ref: Passage whose verses' mean embedding is the query; the
+                passage itself is left out of the results
+            limit: Maximum results
+
+        Returns:
+            List of dicts with book_id, book_name, chapter, verse, text and
+            score (cosine similarity), most similar first
+
+        Raises:
+            SearchUnavailableError: If embeddings are not built, or text
+                queries need a model that is not installed
+            VerseNotFoundError: If the passage is not in the embeddings
+        """
+        if self.vectors is None:
+            raise SearchUnavailableError("Verse embeddings are not built")
+
+        exclude: List[int] = []
+        if ref is not None:
+            exclude = [
+                verse_key(ref.book_id, ref.chapter, verse)
+                for verse in range(ref.verse_start, (ref.verse_end or ref.verse_start) + 1)
+            ]
+            vector = self.vectors.embed_keys(exclude)
+            if vector is None:
+                raise VerseNotFoundError(f"Verse not found: {ref.book_id}:{ref.chapter}:{ref.verse_start}")
+        else:
+            try:
+                vector = self.vectors.embed_text(query or "")
+            except RuntimeError as e:
+                raise SearchUnavailableError(str(e))
+
+        if not vector.any():
+            return []  # Nothing in the query was seen when embedding
+
+        matches = self.vectors.search(vector, limit, exclude=exclude, nprobe=self.vector_nprobe)
+        if not matches:
+            return []
+
+        refs = [_key_reference(key, key) for key, _ in matches]
+        translation_id = self.translations[self.default_translation]["id"]
+        texts = self._query_verses(refs, [translation_id])
+
+        # Verses missing from the database (embeddings older than it) are skipped
+        return [
+            {
+                "book_id": ref.book_id,
+                "book_name": self.get_book_name(ref.book_id),
+                "chapter": ref.chapter,
+                "verse": ref.verse_start,
+                "text": texts[(i, translation_id)][0][1],
+                "score": score,
+            }
+            for i, (ref, (_, score)) in enumerate(zip(refs, matches))
+            if (i, translation_id) in texts
+        ]
+
+    def get_verse_texts(
+        self,
+        refs: List[VerseReference],
+        parallel_translation: Optional[str] = None,
+        related_verses: Optional[int] = None,
+    ) -> List[str]:
+        """
+        Get prompt-ready text for each reference.
+
+        Args:
+            refs: Verse references
+            parallel_translation: Also include this translation's text
+                under each reference (bilingual prompts)
+            related_verses: Related verses to list under each reference
+                (default: BIBLE_PROMPT_RELATED_VERSES, 0 for none)
+
+        Returns:
+            One string per reference: "<book> <chapter>:<verses> - <text>",
+            with verse numbers marked inside ranges, followed by an indented
+            "[<translation>] <book> <chapter>:<verses> - <text>" line if a
+            parallel translation is given and has the passage, and an
+            indented "Related: <label>; <label>" line if the reference has
+            cross-references
+        """
+        if related_verses is None:
+            related_verses = self.prompt_related_verses
+
+        if not parallel_translation or parallel_translation == self.default_translation:
+            primary, parallel = self.get_verses(refs), None
+        else:
+            parallel_code = self._get_translation(parallel_translation)["code"]
+            verses = self.get_parallel_verses(refs, [self.default_translation, parallel_code])
+            primary, parallel = verses[self.default_translation], verses[parallel_code]
+
+        texts = []
+        for i, (ref, verses) in enumerate(zip(refs, primary)):
+            text = f"{_format_reference(self.get_book_name(ref.book_id), ref)} - {_format_verses(verses)}"
+
+            if parallel and parallel[i]:
+                name = self.translations[parallel_code]["name"]
+                label = _format_reference(self.get_book_name(ref.book_id, parallel_code), ref)
+                text += f"\n  [{name}] {label} - {_format_verses(parallel[i])}"
+
+            related = self.get_related_verses([ref], related_verses)
+            if related:
+                text += "\n  Related: " + "; ".join(r["label"] for r in related)
+
+            texts.append(text)
+
+        return texts
+
+    def search(
+        self,
+        query: str,
+        book_id: Optional[int] = None,
+        testament: Optional[str] = None,
+        limit: int = 20,
+        after: Optional[tuple[str, float, int]] = None,
+        translation: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Full-text search over verses, best matches first.
+
+        Whole words are matched first (the last term as a prefix); if that
+        finds nothing, the trigram index is used for partial-word matches.
+        Results are ranked by bm25 and paged by (score, verse id).
+
+        Args:
+            query: Search text
+            book_id: Only search this book
+            testament: Only search "OT" or "NT"
+            limit: Maximum results
+            after: (mode, score, id) of the last result of the previous page
+            translation: Translation code (default translation if None)
+
+        Returns:
+            Dict with mode ("word" or "partial") and result rows
+
+        Raises:
+            SearchUnavailableError: If the search tables are missing
+            TranslationNotFoundError: If the translation is unknown
+        """
+        code = self._get_translation(translation)["code"]
+        if code not in self.searchable_translations:
+            raise SearchUnavailableError("Bible search index is not built")
+
+        terms = unicodedata.normalize("NFC", query).split()
+        if after is not None:
+            return {"mode": after[0], "results": self._search(code, after[0], terms, book_id, testament, limit, after)}
+
+        results = self._search(code, "word", terms, book_id, testament, limit, None)
+        if results:
+            return {"mode": "word", "results": results}
+
+        return {"mode": "partial", "results": self._search(code, "partial", terms, book_id, testament, limit, None)}
+
+    def _search(
+        self,
+        translation: str,
+        mode: str,
+        terms: List[str],
+        book_id: Optional[int],
+        testament: Optional[str],
+        limit: int,
+        after: Optional[tuple[str, float, int]],
+    ) -> List[Dict[str, Any]]:
+        """Run one search mode; see search()"""
+        if mode == "word":
+            match = " ".join(_fts_phrase(t) for t in terms[:-1])
+            match = f"{match} {_fts_phrase(terms[-1])}*".strip() if terms else ""
+        else:
+            # Trigram matching needs at least 3 characters per term
+            match = " ".join(_fts_phrase(t) for t in terms if len(t) >= 3)
+
+        if not match:
+            return []
+
+        table = self._search_tables(translation)[mode]
+        sql = (
+            "SELECT v.id, v.book_id, v.chapter, v.verse, v.text, hits.score"
+            f" FROM (SELECT rowid AS id, bm25({table}) AS score FROM {table} WHERE {table} MATCH ?) AS hits"
+            " JOIN verses AS v ON v.id = hits.id"
+            " JOIN books AS b ON b.id = v.book_id"
+            " WHERE 1 = 1"
+        )
+        params: List[Any] = [match]
+
+        if book_id is not None:
+            sql += " AND v.book_id = ?"
+            params.append(book_id)
+        if testament is not None:
+            sql += " AND b.testament = ?"
+            params.append(testament)
+        if after is not None:
+            _, score, verse_id = after
+            sql += " AND (hits.score > ? OR (hits.score = ? AND hits.id > ?))"
+            params.extend((score, score, verse_id))
+
+        sql += " ORDER BY hits.score, hits.id LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+
+            # Snippets only for the returned page, not every match
+            snippets = {}
+            if rows:
+                ids = [row[0] for row in rows]
+                snippets = dict(self.conn.execute(
+                    f"SELECT rowid, snippet({table}, 0, '<mark>', '</mark>', '…', {SNIPPET_TOKENS[mode]})"
+                    f" FROM {table} WHERE {table} MATCH ? AND rowid IN ({','.join('?' * len(ids))})",
+                    [match, *ids],
+                ))
+
+        return [
+            {
+                "id": verse_id,
+                "book_id": row_book_id,
+                "book_name": self.get_book_name(row_book_id, translation),
+                "chapter": chapter,
+                "verse": verse,
+                "text": text,
+                "score": score,
+                "snippet": snippets.get(verse_id, text),
+            }
+            for verse_id, row_book_id, chapter, verse, text, score in rows
+        ]
+
+
+# Singleton instance
+_bible_service_instance = None
+
+
+def get_bible_service() -> BibleService:
+    """Get or create BibleService singleton instance"""
+    global _bible_service_instance
+
+    if _bible_service_instance is None:
+        _bible_service_instance = BibleService()
+
+    return _bible_service_instance
+
+
+def get_prompt_verse_texts(
+    refs: List[VerseReference],
+    parallel_translation: Optional[str] = None,
+) -> List[str]:
+    """
+    Get prompt text for each reference, from the Bible database if possible.
+
+    Without a database, or for books the database does not hold (a partial
+    build), a reference is sent alone ("Verse <book>:<chapter>:<verses>")
+    and the model supplies the text.
+
+    Raises:
+        VerseNotFoundError: If a verse is missing from a book the database holds
+        TranslationNotFoundError: If the parallel translation does not exist
+    """
+    try:
+        bible_service = get_bible_service()
+    except ValueError as e:
+        print(f"⚠️  Verse lookup unavailable, prompting with references only: {e}")
+        return [_reference_only_text(ref) for ref in refs]
+
+    known = [ref for ref in refs if ref.book_id in bible_service.book_names]
+    texts = iter(bible_service.get_verse_texts(known, parallel_translation) if known else [])
+    return [
+        next(texts) if ref.book_id in bible_service.book_names else _reference_only_text(ref)
+        for ref in refs
+    ]
+
+
+def _reference_only_text(ref: VerseReference) -> str:
+    """Prompt text for a reference the Bible database cannot supply"""
+    text = f"Verse {ref.book_id}:{ref.chapter}:{ref.verse_start}"
+    if ref.verse_end and ref.verse_end != ref.verse_start:
+        text += f"-{ref.verse_end}"
+    return text
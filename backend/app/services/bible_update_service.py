@@ -0,0 +1,229 @@
+"""
+Bible Update Service
+Serves bible.db row deltas published by scripts/bible_release.py
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+# Repository data/releases (written by scripts/bible_release.py)
+DEFAULT_RELEASES_DIR = Path(__file__).resolve().parents[3] / "data" / "releases"
+
+
+class BibleUpdateService:
+    """Resolve and squash delta chains between bible.db releases"""
+
+    def __init__(self, releases_dir: Optional[str] = None):
+        """
+        Args:
+            releases_dir: Release directory (default: BIBLE_RELEASES_DIR
+                or data/releases)
+        """
+        self.releases_dir = Path(releases_dir or os.getenv("BIBLE_RELEASES_DIR") or DEFAULT_RELEASES_DIR)
+        self.cache_size = int(os.getenv("BIBLE_DELTA_CACHE_SIZE", 32))
+
+        # (from, to) -> (gzipped delta, sha256); squashing is the
+        # expensive part, so each pair is built once per process
+        self._deltas: "OrderedDict[tuple[str, str], tuple[bytes, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._manifest: Dict[str, Any] = {"latest": None, "releases": []}
+        self._manifest_mtime: Optional[float] = None
+
+    def get_manifest(self) -> Dict[str, Any]:
+        """Get manifest.json, re-reading it when a new release is published"""
+        path = self.releases_dir / "manifest.json"
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            return {"latest": None, "releases": []}
+
+        with self._lock:
+            if mtime != self._manifest_mtime:
+                self._manifest = json.loads(path.read_text(encoding="utf-8"))
+                self._manifest_mtime = mtime
+            return self._manifest
+
+    def get_chain(self, from_version: str, to_version: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get the releases after from_version, up to to_version.
+
+        Args:
+            from_version: Client's current version
+            to_version: Target version (default: latest)
+
+        Returns:
+            Manifest entries in order (empty if up to date), or None if
+            either version is unknown or a release has no delta
+        """
+        releases = self.get_manifest()["releases"]
+        versions = [r["version"] for r in releases]
+        to_version = to_version or self.get_manifest()["latest"]
+
+        if from_version not in versions or to_version not in versions:
+            return None
+
+        start, end = versions.index(from_version), versions.index(to_version)
+        if end < start:
+            return None
+
+        chain = releases[start + 1:end + 1]
+        if any(r["delta"] is None for r in chain):
+            return None
+
+        return chain
+
+    def get_update(self, from_version: str) -> Dict[str, Any]:
+        """
+        Describe how a client at from_version reaches the latest release.
+
+        Returns:
+            Dict with latest_version, up_to_date, full_download_required and,
+            when a delta applies, delta_size and delta_sha256
+        """
+        latest = self.get_manifest()["latest"]
+        update = {
+            "latest_version": latest,
+            "up_to_date": from_version == latest,
+            "full_download_required": False,
+            "delta_size": None,
+            "delta_sha256": None,
+        }
+        if latest is None or update["up_to_date"]:
+            return update
+
+        delta = self.get_delta(from_version, latest)
+        if delta is None:
+            update["full_download_required"] = True
+            return update
+
+        payload, sha256 = delta
+        update["delta_size"] = len(payload)
+        update["delta_sha256"] = sha256
+        return update
+
+    def get_delta(self, from_version: str, to_version: str) -> Optional[tuple[bytes, str]]:
+        """
+        Get one gzipped delta from from_version to to_version.
+
+        A single release is served as published; longer chains are
+        squashed so each changed row is sent once.
+
+        Returns:
+            Tuple of (gzipped JSON delta, sha256 hex), or None if there is
+            no delta chain between the versions
+        """
+        with self._lock:
+            cached = self._deltas.get((from_version, to_version))
+            if cached is not None:
+                self._deltas.move_to_end((from_version, to_version))
+                return cached
+
+        chain = self.get_chain(from_version, to_version)
+        if not chain:
+            return None
+
+        if len(chain) == 1:
+            payload = self._read_delta_file(chain[0])
+        else:
+            squashed = self._squash([json.loads(gzip.decompress(self._read_delta_file(r))) for r in chain])
+            payload = gzip.compress(
+                json.dumps(squashed, ensure_ascii=False, separators=(",", ":")).encode(),
+                mtime=0,
+            )
+
+        result = (payload, hashlib.sha256(payload).hexdigest())
+
+        with self._lock:
+            self._deltas[(from_version, to_version)] = result
+            while len(self._deltas) > self.cache_size:
+                self._deltas.popitem(last=False)
+
+        print(f"✅ Delta {from_version} -> {to_version} built ({len(chain)} releases, {len(payload)} bytes)")
+        return result
+
+    def _read_delta_file(self, release: Dict[str, Any]) -> bytes:
+        """
+        Read a published delta and check it against its content address.
+
+        Raises:
+            ValueError: If the file does not match its sha256
+        """
+        payload = (self.releases_dir / release["delta"]["file"]).read_bytes()
+        if hashlib.sha256(payload).hexdigest() != release["delta"]["sha256"]:
+            raise ValueError(f"Corrupt delta for release {release['version']}")
+        return payload
+
+    @staticmethod
+    def _squash(deltas: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Merge consecutive deltas; the latest change to each key wins.
+
+        Args:
+            deltas: Parsed deltas in release order
+
+        Returns:
+            One delta from the first delta's version to the last one's
+        """
+        tables: Dict[str, Dict[str, Any]] = {}
+
+        for delta in deltas:
+            for table, changes in delta["tables"].items():
+                width = len(changes["key"])
+                merged = tables.setdefault(table, {
+                    "key": changes["key"],
+                    "columns": changes["columns"],
+                    "rows": {},
+                })
+
+                # Rows of a key are replaced as a group
+                upserts: Dict[tuple, List[list]] = {}
+                for row in changes["upsert"]:
+                    upserts.setdefault(tuple(row[:width]), []).append(row)
+
+                for key in changes["delete"]:
+                    merged["rows"][tuple(key)] = None
+                merged["rows"].update(upserts)
+
+        return {
+            "format": deltas[0]["format"],
+            "from": deltas[0]["from"],
+            "to": deltas[-1]["to"],
+            "tables": {
+                table: {
+                    "key": merged["key"],
+                    "columns": merged["columns"],
+                    "upsert": [
+                        row
+                        for key in sorted(merged["rows"])
+                        for row in merged["rows"][key] or []
+                    ],
+                    "delete": [
+                        list(key)
+                        for key in sorted(merged["rows"])
+                        if merged["rows"][key] is None
+                    ],
+                }
+                for table, merged in tables.items()
+            },
+        }
+
+
+# Singleton instance
+_bible_update_service_instance = None
+
+
+def get_bible_update_service() -> BibleUpdateService:
+    """Get or create BibleUpdateService singleton instance"""
+    global _bible_update_service_instance
+
+    if _bible_update_service_instance is None:
+        _bible_update_service_instance = BibleUpdateService()
+
+    return _bible_update_service_instance
@@ -0,0 +1,133 @@
+"""
+Binary Serialization for Cached AI Responses
+Compact, versioned encoding for Redis cache entries
+
+Entry layout: one format-version byte followed by the encoded body.
+Plain JSON entries written before versioning (first byte "{" or "[")
+are still decoded transparently.
+"""
+
+import json
+import os
+import zlib
+from typing import Any, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+
+# Format-version bytes
+FORMAT_ORJSON_ZSTD = 0x01  # JSON (orjson) compressed with zstd
+FORMAT_JSON_ZLIB = 0x02    # JSON compressed with zlib (no optional deps)
+
+# First bytes of legacy plain-JSON entries
+LEGACY_JSON_PREFIXES = (ord("{"), ord("["))
+
+
+class CacheCodecError(ValueError):
+    """Raised when a cache entry cannot be decoded"""
+
+
+def _dumps(value: Any) -> bytes:
+    """Serialize to UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _loads(data: bytes) -> Any:
+    """Deserialize UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class CacheCodec:
+    """Encode/decode cache entries with a format-version byte"""
+
+    def __init__(self, codec: str = "zstd", level: int = 3):
+        """
+        Initialize codec.
+
+        Args:
+            codec: "zstd" (falls back to zlib if zstandard is missing),
+                "zlib", or "json" (legacy plain JSON, for rollback)
+            level: Compression level
+        """
+        if codec == "zstd" and zstandard is None:
+            print("⚠️  zstandard not installed, using zlib for cache entries")
+            codec = "zlib"
+
+        if codec not in ("zstd", "zlib", "json"):
+            raise ValueError(f"Unknown cache codec: {codec}")
+
+        self.codec = codec
+        self.level = level
+
+        if zstandard is not None:
+            self._zstd_compressor = zstandard.ZstdCompressor(level=level)
+            self._zstd_decompressor = zstandard.ZstdDecompressor()
+
+    def encode(self, value: Any) -> Tuple[bytes, int]:
+        """
+        Encode a value for storage.
+
+        Returns:
+            Tuple of (payload bytes, uncompressed JSON size in bytes)
+        """
+        data = _dumps(value)
+
+        if self.codec == "zstd":
+            return bytes([FORMAT_ORJSON_ZSTD]) + self._zstd_compressor.compress(data), len(data)
+        if self.codec == "zlib":
+            return bytes([FORMAT_JSON_ZLIB]) + zlib.compress(data, self.level), len(data)
+        return data, len(data)
+
+    def decode(self, payload: bytes) -> Tuple[Any, int]:
+        """
+        Decode a stored entry, whatever format it was written in.
+
+        Returns:
+            Tuple of (value, uncompressed JSON size in bytes)
+
+        Raises:
+            CacheCodecError: If the entry is corrupt or uses an unknown format
+        """
+        if not payload:
+            raise CacheCodecError("Empty cache entry")
+
+        version = payload[0]
+
+        try:
+            if version in LEGACY_JSON_PREFIXES:
+                data = payload
+            elif version == FORMAT_ORJSON_ZSTD:
+                if zstandard is None:
+                    raise CacheCodecError("zstandard is required to read this cache entry")
+                data = self._zstd_decompressor.decompress(payload[1:])
+            elif version == FORMAT_JSON_ZLIB:
+                data = zlib.decompress(payload[1:])
+            else:
+                raise CacheCodecError(f"Unknown cache entry format: {version:#04x}")
+
+            return _loads(data), len(data)
+
+        except CacheCodecError:
+            raise
+        except Exception as e:
+            raise CacheCodecError(f"Corrupt cache entry: {e}") from e
+
+
+def get_cache_codec() -> CacheCodec:
+    """Create the codec configured by CACHE_CODEC / CACHE_COMPRESSION_LEVEL"""
+    return CacheCodec(
+        codec=os.getenv("CACHE_CODEC", "zstd"),
+        level=int(os.getenv("CACHE_COMPRESSION_LEVEL", 3)),
+    )
@@ -0,0 +1,309 @@
+"""
+Cache Prewarming
+Generates sermons for upcoming lectionary readings and the most-hit cache
+entries ahead of peak traffic, within a share of DAILY_SPEND_LIMIT
+"""
+
+import asyncio
+import json
+import os
+from collections import Counter
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from pydantic import ValidationError
+
+from app.models.sermon import SermonConfig, VerseReference
+from app.services.bible_service import get_prompt_verse_texts
+from app.services.cache_service import get_cache_service
+from app.services.openai_service import get_openai_service
+
+
+# Configs prewarmed for every lectionary reading, in addition to the most
+# common configs among hot entries (the second is generate_devotional's)
+DEFAULT_PREWARM_CONFIGS = [
+    {
+        "sermon_type": "expository",
+        "target_audience": "general",
+        "length_minutes": 20,
+        "tone": "formal",
+        "include_illustrations": True,
+    },
+    {
+        "sermon_type": "devotional",
+        "target_audience": "general",
+        "length_minutes": 10,
+        "tone": "gentle",
+        "include_illustrations": False,
+    },
+]
+
+
+def load_lectionary(path: str, start: date, days: int) -> List[Dict[str, Any]]:
+    """
+    Load the lectionary readings dated within the next days.
+
+    The file is JSON:
+        {"readings": [{"date": "2026-10-18", "name": "Proper 24",
+                       "verses": [{"book_id": 23, "chapter": 53,
+                                   "verse_start": 4, "verse_end": 12}]}]}
+
+    Args:
+        path: Lectionary file
+        start: First date to include
+        days: Number of days to include
+
+    Returns:
+        Readings with "date" as a date and "verses" as VerseReference
+        lists, in date order
+
+    Raises:
+        ValueError: If the file is not in this format
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    readings = []
+    try:
+        for reading in data["readings"]:
+            reading_date = date.fromisoformat(reading["date"])
+            if 0 <= (reading_date - start).days < days:
+                readings.append({
+                    "date": reading_date,
+                    "name": reading.get("name", reading["date"]),
+                    "verses": [VerseReference(**v) for v in reading["verses"]],
+                })
+    except (KeyError, TypeError, ValidationError) as e:
+        raise ValueError(f"Invalid lectionary file {path}: {e}")
+
+    return sorted(readings, key=lambda r: r["date"])
+
+
+class PrewarmState:
+    """
+    Progress of today's prewarm run, saved after every target.
+
+    A rerun on the same (UTC) day skips finished targets and continues
+    with today's spend; a new day starts over.
+    """
+
+    def __init__(self, path: str, today: Optional[date] = None):
+        self.path = Path(path)
+        self.day = (today or datetime.utcnow().date()).isoformat()
+        self.spent = 0.0
+        # cache_key -> outcome ("generated", "refreshed", "cached")
+        self.done: Dict[str, str] = {}
+
+        if self.path.is_file():
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("day") == self.day:
+                self.spent = float(data.get("spent", 0.0))
+                self.done = data.get("done", {})
+
+    def save(self):
+        """Write the state atomically (a crash never leaves a partial file)"""
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(
+            json.dumps({"day": self.day, "spent": round(self.spent, 6), "done": self.done}, indent=2),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, self.path)
+
+
+class CachePrewarmer:
+    """Pre-generates sermons through OpenAIService so peak requests hit the cache"""
+
+    def __init__(
+        self,
+        state: PrewarmState,
+        budget: Optional[float] = None,
+        concurrency: int = 4,
+        horizon_hours: float = 48,
+        subscription_tier: str = "free",
+    ):
+        """
+        Args:
+            state: Run state (resumability and spend so far)
+            budget: Spend limit for today's runs in USD (default:
+                PREWARM_SPEND_SHARE of DAILY_SPEND_LIMIT)
+            concurrency: Generations running at once
+            horizon_hours: Entries must stay cached this long; entries
+                expiring sooner are refreshed
+            subscription_tier: Tier to generate as (selects the model)
+        """
+        self.cache_service = get_cache_service()
+        self.openai_service = get_openai_service()
+
+        self.state = state
+        self.budget = budget if budget is not None else (
+            self.openai_service.daily_spend_limit * float(os.getenv("PREWARM_SPEND_SHARE", 0.5))
+        )
+        self.concurrency = concurrency
+        self.horizon_seconds = int(horizon_hours * 60 * 60)
+        self.subscription_tier = subscription_tier
+
+        # Worst-case cost of one generation, reserved before it starts so
+        # concurrent generations cannot overshoot the budget together
+        model = self.openai_service._get_model_for_tier(subscription_tier)
+        self.max_cost = self.openai_service.get_cost_estimate(
+            self.openai_service.max_tokens_input, self.openai_service.max_tokens_output, model
+        )
+        self._reserved = 0.0
+
+    def _common_configs(self, hot_entries: List[Dict[str, Any]], count: int) -> List[Dict[str, Any]]:
+        """DEFAULT_PREWARM_CONFIGS plus the count most-hit configs of hot entries"""
+        hits: Counter = Counter()
+        for entry in hot_entries:
+            hits[json.dumps(entry["config"], sort_keys=True)] += entry["hit_count"]
+
+        configs = {json.dumps(c, sort_keys=True): c for c in DEFAULT_PREWARM_CONFIGS}
+        for config, _ in hits.most_common(count):
+            configs.setdefault(config, json.loads(config))
+        return list(configs.values())
+
+    def _target(self, verses: List[VerseReference], config: Dict[str, Any], source: str) -> Optional[Dict[str, Any]]:
+        """A (verses, config) pair to prewarm, or None if the config is invalid"""
+        try:
+            sermon_config = SermonConfig(**config)
+        except ValidationError as e:
+            print(f"⚠️  Skipping invalid config {config}: {e.error_count()} errors")
+            return None
+
+        _, _, cache_key = self.openai_service._prepare_cache_inputs(verses, sermon_config)
+        return {"cache_key": cache_key, "verses": verses, "config": sermon_config, "source": source}
+
+    async def plan(
+        self,
+        readings: List[Dict[str, Any]],
+        hot_limit: int = 100,
+        config_count: int = 3,
+    ) -> List[Dict[str, Any]]:
+        """
+        List the sermons to prewarm.
+
+        Each lectionary reading is combined with the common configs; each
+        hot entry is kept with its own config. Readings come first, then
+        hot entries by hit count.
+
+        Args:
+            readings: From load_lectionary()
+            hot_limit: Most-hit cache entries to include
+            config_count: Most-hit configs to add to DEFAULT_PREWARM_CONFIGS
+
+        Returns:
+            Targets with cache_key, verses, config and source, one per key
+        """
+        hot_entries = await self.cache_service.get_hot_entries(hot_limit) if hot_limit > 0 else []
+        configs = self._common_configs(hot_entries, config_count)
+
+        candidates = [
+            self._target(reading["verses"], config, f"lectionary {reading['date']} {reading['name']}")
+            for reading in readings
+            for config in configs
+        ]
+        for entry in hot_entries:
+            try:
+                verses = [VerseReference(**v) for v in entry["verses"]]
+            except (TypeError, ValidationError):
+                continue
+            candidates.append(self._target(verses, entry["config"], f"hot ({entry['hit_count']} hits)"))
+
+        targets: Dict[str, Dict[str, Any]] = {}
+        for target in candidates:
+            if target:
+                targets.setdefault(target["cache_key"], target)
+        return list(targets.values())
+
+    async def _refresh(self, target: Dict[str, Any]) -> bool:
+        """Restart the TTL of an entry that expires before the horizon (no model call)"""
+        if await self.cache_service.refresh(target["cache_key"]):
+            return True
+
+        # Only in the ai_cache table: get() copies it back into Redis
+        # (uncounted, so prewarming does not make entries look hot)
+        if not await self.cache_service.get(target["cache_key"], count=False):
+            return False
+        return await self.cache_service.refresh(target["cache_key"])
+
+    async def _generate(self, target: Dict[str, Any]) -> Optional[str]:
+        """
+        Generate and cache a sermon if the budget allows.
+
+        Returns:
+            "generated", or None if the budget is used up
+        """
+        if self.state.spent + self._reserved + self.max_cost > self.budget:
+            return None
+
+        self._reserved += self.max_cost
+        try:
+            config = target["config"]
+            verse_texts = get_prompt_verse_texts(target["verses"], config.parallel_translation)
+            result = await self.openai_service.generate_sermon(
+                verses=target["verses"],
+                verse_texts=verse_texts,
+                config=config,
+                subscription_tier=self.subscription_tier,
+                use_cache=True,
+                allow_near_duplicate=False,
+            )
+        finally:
+            self._reserved -= self.max_cost
+
+        metadata = result.get("metadata", {})
+        if not result.get("from_cache") and metadata.get("total_tokens"):
+            self.state.spent += self.openai_service.get_cost_estimate(
+                metadata["input_tokens"], metadata["output_tokens"], metadata["model"]
+            )
+        return "generated"
+
+    async def _prewarm(self, target: Dict[str, Any], semaphore: asyncio.Semaphore) -> str:
+        """
+        Prewarm one target.
+
+        Returns:
+            Outcome: "done" (earlier run), "cached", "refreshed",
+            "generated", "over_budget" or "failed"
+        """
+        cache_key = target["cache_key"]
+        if cache_key in self.state.done:
+            return "done"
+
+        async with semaphore:
+            try:
+                expires_in = await self.cache_service.expires_in(cache_key)
+                if expires_in is not None and expires_in >= self.horizon_seconds:
+                    outcome = "cached"
+                elif expires_in is not None and await self._refresh(target):
+                    outcome = "refreshed"
+                else:
+                    outcome = await self._generate(target)
+                    if outcome is None:
+                        return "over_budget"
+            except Exception as e:
+                print(f"❌ Prewarm failed for {target['source']}: {e}")
+                return "failed"
+
+        self.state.done[cache_key] = outcome
+        self.state.save()
+        print(f"✅ Prewarm {outcome}: {target['source']} ({cache_key[:16]}...)")
+        return outcome
+
+    async def run(self, targets: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Prewarm targets with bounded concurrency.
+
+        Targets are started in order, so when the budget runs out the
+        later (less important) ones are the ones skipped.
+
+        Returns:
+            Count per outcome plus today's spend and budget
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        outcomes = await asyncio.gather(*[self._prewarm(target, semaphore) for target in targets])
+
+        summary: Dict[str, Any] = dict(Counter(outcomes))
+        summary["spent"] = round(self.state.spent, 4)
+        summary["budget"] = round(self.budget, 4)
+        return summary
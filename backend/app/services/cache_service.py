@@ -4,42 +4,437 @@ Target: 80% cache hit rate, 7-day TTL
 """
 
 import json
+import asyncio
 import hashlib
+import uuid
+from collections import Counter
 from typing import Optional, Dict, Any
-from datetime import datetime, timedelta
-import redis
+from datetime import datetime, timedelta, timezone
+import redis.asyncio as redis
 from redis.exceptions import RedisError
 import os
 from dotenv import load_dotenv
 
+from app.services.local_cache import LocalLRUCache
+from app.services.cache_codec import CacheCodecError, get_cache_codec
+from app.services.supabase_service import get_supabase_service
+
 load_dotenv()
 
+# Read an entry, bump its hit counter and the hit/miss stats counters in
+# the same round trip. A missing meta hash is not recreated (it would have
+# no TTL).
+# KEYS: entry, entry meta, stats buckets... (day bucket last)
+# ARGV: day bucket TTL in seconds
+GET_AND_COUNT_SCRIPT = """
+local value = redis.call("GET", KEYS[1])
+local field = "misses"
+if value then
+    if redis.call("EXISTS", KEYS[2]) == 1 then
+        redis.call("HINCRBY", KEYS[2], "hit_count", 1)
+    end
+    field = "hits"
+end
+for i = 3, #KEYS do
+    redis.call("HINCRBY", KEYS[i], field, 1)
+end
+redis.call("EXPIRE", KEYS[#KEYS], ARGV[1])
+return value
+"""
+
+# Unlink an entry and its metadata, counting an eviction if it existed.
+# KEYS: entry, entry meta, stats buckets... (day bucket last)
+# ARGV: day bucket TTL in seconds
+DELETE_AND_COUNT_SCRIPT = """
+local removed = redis.call("UNLINK", KEYS[1])
+redis.call("UNLINK", KEYS[2])
+if removed > 0 then
+    for i = 3, #KEYS do
+        redis.call("HINCRBY", KEYS[i], "evictions", removed)
+    end
+    redis.call("EXPIRE", KEYS[#KEYS], ARGV[1])
+end
+return removed
+"""
+
+# Add hits served from the in-process L1 cache or as near-duplicates to an
+# entry's hit counter, without recreating metadata for entries that have
+# since expired
+# KEYS: entry meta; ARGV: hit count
+COUNT_HITS_SCRIPT = """
+if redis.call("EXISTS", KEYS[1]) == 1 then
+    redis.call("HINCRBY", KEYS[1], "hit_count", ARGV[1])
+end
+return 0
+"""
+
+# Counters kept in every stats bucket
+STATS_FIELDS = ("hits", "misses", "near_hits", "l2_hits", "sets", "evictions", "bytes_written")
+
+# Config fields a near-duplicate entry must share with the request
+NEAR_DUPLICATE_FIELDS = ("sermon_type", "target_audience", "parallel_translation")
+
+# Most cached entries compared per near-duplicate lookup
+NEAR_DUPLICATE_MAX_CANDIDATES = 200
+
+# Delete the lock only if it still holds our token (compare-and-delete)
+RELEASE_LOCK_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
 
 class CacheService:
     """Handles AI response caching with Redis"""
 
-    def __init__(self):
-        """Initialize Redis connection"""
+    def __init__(self, database=None):
+        """
+        Initialize Redis connection pool (connections are opened lazily).
+
+        Args:
+            database: Store for the ai_cache table (L2 tier), e.g.
+                SupabaseService; None disables L2
+        """
         redis_url = os.getenv("REDIS_URL")
         if not redis_url:
             raise ValueError("REDIS_URL environment variable not set")
 
+        # One pool per worker process; callers wait for a free connection
+        # instead of failing when the pool is exhausted
+        self.connection_pool = redis.BlockingConnectionPool.from_url(
+            redis_url,
+            max_connections=int(os.getenv("REDIS_MAX_CONNECTIONS", 20)),
+            timeout=5,
+            # Cache entries are binary (see cache_codec); text replies are
+            # decoded where needed
+            decode_responses=False,
+            socket_timeout=5,
+            socket_connect_timeout=5,
+        )
+        self.redis_client = redis.Redis(connection_pool=self.connection_pool)
+        self._get_and_count = self.redis_client.register_script(GET_AND_COUNT_SCRIPT)
+        self._delete_and_count = self.redis_client.register_script(DELETE_AND_COUNT_SCRIPT)
+        self._release_lock = self.redis_client.register_script(RELEASE_LOCK_SCRIPT)
+        self._count_hits = self.redis_client.register_script(COUNT_HITS_SCRIPT)
+
+        self.codec = get_cache_codec()
+        self.cache_ttl_days = int(os.getenv("CACHE_TTL_DAYS", 7))
+        self.cache_prefix = "ai_sermon:"
+        # Sermon sections share the keyspace so clear_all() removes them too
+        self.section_prefix = f"{self.cache_prefix}section:"
+        # Verse ordinal -> cache keys of entries covering that verse
+        self.verse_index_prefix = f"{self.cache_prefix}verse:"
+        self.lock_prefix = "ai_sermon_lock:"
+
+        # Stats counters live outside the ai_sermon: keyspace so that
+        # clear_all() does not reset them
+        self.stats_prefix = "ai_sermon_stats:"
+        self.stats_retention_days = int(os.getenv("CACHE_STATS_RETENTION_DAYS", 30))
+        self.scan_batch_size = 500
+
+        # In-process L1 tier; kept coherent across workers via pub/sub
+        self.local_cache = LocalLRUCache(
+            max_bytes=int(os.getenv("L1_CACHE_MAX_BYTES", 64 * 1024 * 1024)),
+            ttl_seconds=int(os.getenv("L1_CACHE_TTL_SECONDS", 300)),
+        )
+        self.invalidation_channel = "ai_sermon_invalidate"
+        self.local_hit_flush_seconds = int(os.getenv("L1_HIT_FLUSH_SECONDS", 10))
+        # (cache_key, request_type) -> hits served from L1 not yet in Redis
+        self._pending_local_hits: Counter = Counter()
+        self._background_tasks: list[asyncio.Task] = []
+        # L1 is only used while the invalidation listener is running
+        self.local_cache_active = False
+
+        # Durable L2 tier: the ai_cache table. Redis misses fall through to
+        # it; writes, deletes and hit counts are queued and flushed in batches
+        self.database = database
+        self.l2_flush_seconds = int(os.getenv("CACHE_L2_FLUSH_SECONDS", 5))
+        self.l2_batch_size = int(os.getenv("CACHE_L2_BATCH_SIZE", 100))
+        self.l2_max_pending = int(os.getenv("CACHE_L2_MAX_PENDING", 1000))
+        # cache_key -> ai_cache row not yet written (latest write wins)
+        self._pending_l2_writes: Dict[str, Dict[str, Any]] = {}
+        self._pending_l2_deletes: set[str] = set()
+        # cache_key -> hits (any tier) not yet added to ai_cache.hit_count
+        self._pending_l2_hits: Counter = Counter()
+
+    async def connect(self) -> bool:
+        """
+        Verify the Redis connection (called on application startup).
+
+        Returns:
+            True if Redis is reachable, False if caching is disabled
+        """
+        if not self.redis_client:
+            return False
+
         try:
-            self.redis_client = redis.from_url(
-                redis_url,
-                decode_responses=True,
-                socket_timeout=5,
-                socket_connect_timeout=5,
-            )
-            # Test connection
-            self.redis_client.ping()
+            await self.redis_client.ping()
             print("✅ Redis connection established")
         except RedisError as e:
             print(f"❌ Redis connection failed: {e}")
-            self.redis_client = None
+            await self.close()
+            return False
 
-        self.cache_ttl_days = int(os.getenv("CACHE_TTL_DAYS", 7))
-        self.cache_prefix = "ai_sermon:"
+        self._background_tasks = [
+            asyncio.create_task(self._listen_for_invalidations()),
+            asyncio.create_task(self._flush_local_hits_periodically()),
+        ]
+        if self.database:
+            self._background_tasks.append(asyncio.create_task(self._flush_l2_periodically()))
+        self.local_cache_active = True
+        return True
+
+    async def close(self):
+        """Close the Redis connection pool (called on application shutdown)"""
+        if not self.redis_client:
+            return
+
+        self.local_cache_active = False
+        for task in self._background_tasks:
+            task.cancel()
+        await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        self._background_tasks = []
+
+        await self._flush_local_hits()
+        await self._flush_l2()
+        self.local_cache.clear()
+
+        client = self.redis_client
+        self.redis_client = None
+        await client.aclose()
+        await self.connection_pool.disconnect()
+
+    def _apply_invalidation(self, message: str):
+        """Apply an invalidation message to the local L1 cache"""
+        if message == "*":
+            self.local_cache.clear()
+        else:
+            self.local_cache.delete(message)
+
+    async def _listen_for_invalidations(self):
+        """Evict L1 entries deleted or overwritten by any worker (runs until close())"""
+        while self.redis_client:
+            pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.invalidation_channel)
+                while True:
+                    message = await pubsub.get_message(timeout=1.0)
+                    if message:
+                        self._apply_invalidation(message["data"].decode())
+            except RedisError as e:
+                # Invalidations may have been missed while disconnected
+                print(f"❌ Cache invalidation listener error: {e}")
+                self.local_cache.clear()
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+    async def _publish_invalidation(self, message: str):
+        """Tell every worker to evict a key ("*" for everything) from L1"""
+        self._apply_invalidation(message)
+        await self.redis_client.publish(self.invalidation_channel, message)
+
+    async def _flush_local_hits(self):
+        """Write hits served from L1 to Redis hit counters and stats"""
+        if not self._pending_local_hits or not self.redis_client:
+            return
+
+        pending = self._pending_local_hits
+        self._pending_local_hits = Counter()
+
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for (cache_key, request_type), hits in pending.items():
+                await self._count_hits(keys=[f"{cache_key}:meta"], args=[hits], client=pipe)
+                for stats_key in self._stats_keys(request_type):
+                    pipe.hincrby(stats_key, "hits", hits)
+            pipe.expire(self._stats_keys()[-1], self._stats_day_ttl)
+            await pipe.execute()
+        except RedisError as e:
+            print(f"❌ Cache hit flush error: {e}")
+
+    async def _flush_local_hits_periodically(self):
+        """Flush L1 hit counts every local_hit_flush_seconds"""
+        while True:
+            await asyncio.sleep(self.local_hit_flush_seconds)
+            await self._flush_local_hits()
+
+    @property
+    def _l2_available(self) -> bool:
+        """Whether the ai_cache table can be used (database connected)"""
+        return self.database is not None and self.database.client is not None
+
+    def _uses_l2(self, cache_key: str) -> bool:
+        """
+        Whether an entry is kept in the ai_cache table.
+
+        Sermon sections stay in Redis only: a sermon is looked up section by
+        section, so L2 would add a database round trip per section miss.
+        """
+        return self.database is not None and not cache_key.startswith(self.section_prefix)
+
+    def _count_l2_hit(self, cache_key: str):
+        """Queue a hit for the entry's ai_cache.hit_count"""
+        if self._uses_l2(cache_key):
+            self._pending_l2_hits[cache_key] += 1
+
+    def _queue_l2_write(self, cache_key: str, entry: Dict[str, Any]):
+        """Queue an ai_cache row, dropping the oldest queued if over the limit"""
+        self._pending_l2_deletes.discard(cache_key)
+        self._pending_l2_writes.pop(cache_key, None)
+        self._pending_l2_writes[cache_key] = entry
+
+        while len(self._pending_l2_writes) > self.l2_max_pending:
+            dropped = next(iter(self._pending_l2_writes))
+            del self._pending_l2_writes[dropped]
+            print(f"⚠️  L2 write queue full, dropped {dropped[:16]}...")
+
+    async def _flush_l2(self):
+        """
+        Write queued rows, deletes and hit counts to the ai_cache table.
+
+        Rows are upserted in batches of l2_batch_size. Failed writes and
+        hit counts are queued again for the next flush, unless a newer
+        write for the same key has been queued meanwhile.
+        """
+        if not self._l2_available:
+            return
+
+        writes, self._pending_l2_writes = self._pending_l2_writes, {}
+        deletes, self._pending_l2_deletes = self._pending_l2_deletes, set()
+        hits, self._pending_l2_hits = self._pending_l2_hits, Counter()
+
+        if deletes and not await self.database.delete_ai_cache_entries(sorted(deletes)):
+            self._pending_l2_deletes |= deletes - self._pending_l2_writes.keys()
+
+        rows = list(writes.values())
+        for start in range(0, len(rows), self.l2_batch_size):
+            batch = rows[start:start + self.l2_batch_size]
+            if not await self.database.upsert_ai_cache_entries(batch):
+                for row in batch:
+                    key = row["cache_key"]
+                    if key not in self._pending_l2_writes and key not in self._pending_l2_deletes:
+                        self._queue_l2_write(key, row)
+
+        # After the writes, so hits on new rows are not lost
+        if hits and not await self.database.increment_ai_cache_hits(dict(hits)):
+            self._pending_l2_hits.update(hits)
+
+    async def _flush_l2_periodically(self):
+        """Flush the L2 queues every l2_flush_seconds"""
+        while True:
+            await asyncio.sleep(self.l2_flush_seconds)
+            await self._flush_l2()
+
+    async def _get_from_l2(
+        self,
+        cache_key: str,
+        request_type: str,
+        count: bool = True,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Read an entry from the ai_cache table and promote it into Redis.
+
+        The entry keeps its remaining TTL and hit count. Promoted entries
+        are not re-added to the verse index. With count=False the read is
+        left out of the hit counts and l2_hits stats.
+
+        Returns:
+            Cached response dict, or None if not in the table
+        """
+        if not self._l2_available or not self._uses_l2(cache_key):
+            return None
+
+        row = await self.database.get_ai_cache_entry(cache_key)
+        if not row:
+            return None
+
+        expires_at = datetime.fromisoformat(row["expires_at"])
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        ttl_seconds = int((expires_at - datetime.now(timezone.utc)).total_seconds())
+        if ttl_seconds <= 0:
+            return None
+
+        data = row["response_content"]
+        if count:
+            self._count_l2_hit(cache_key)
+
+        try:
+            payload, data_size = self.codec.encode(data)
+            metadata = {
+                "request_type": row.get("request_type") or request_type,
+                "verse_count": len(row.get("source_verses") or []),
+                "cached_at": row.get("created_at") or datetime.utcnow().isoformat(),
+                "expires_at": expires_at.isoformat(),
+                "hit_count": row.get("hit_count") or 0,
+                "verses": json.dumps(row.get("source_verses") or []),
+                "config": json.dumps(row.get("config") or {}),
+            }
+            stats_keys = self._stats_keys(request_type)
+
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.set(cache_key, payload, ex=ttl_seconds, nx=True)
+            pipe.hset(f"{cache_key}:meta", mapping=metadata)
+            pipe.expire(f"{cache_key}:meta", ttl_seconds)
+            if count:
+                for stats_key in stats_keys:
+                    pipe.hincrby(stats_key, "l2_hits", 1)
+                pipe.expire(stats_keys[-1], self._stats_day_ttl)
+            await pipe.execute()
+
+            if self.local_cache_active:
+                self.local_cache.set(cache_key, data, data_size)
+        except RedisError as e:
+            print(f"❌ Cache promotion error: {e}")
+
+        print(f"✅ Cache HIT (L2): {cache_key[:16]}...")
+        return dict(data)
+
+    def _normalize_verses(self, verses: list) -> list[str]:
+        """Verse references as sorted "book:chapter:start-end" strings"""
+        return sorted([
+            f"{v.get('book_id')}:{v.get('chapter')}:{v.get('verse_start')}-{v.get('verse_end', v.get('verse_start'))}"
+            for v in verses
+        ])
+
+    def _verse_ordinals(self, verses: list) -> set[int]:
+        """Every verse covered by the references, as book_id * 1_000_000 + chapter * 1000 + verse"""
+        return {
+            v.get("book_id") * 1_000_000 + v.get("chapter") * 1000 + verse
+            for v in verses
+            for verse in range(v.get("verse_start"), (v.get("verse_end") or v.get("verse_start")) + 1)
+        }
+
+    def _ordinal_verses(self, ordinals: set[int]) -> list[Dict[str, Any]]:
+        """Verse references for ordinals, one per run of consecutive verses"""
+        verses: list[Dict[str, Any]] = []
+        for ordinal in sorted(ordinals):
+            book_id, chapter, verse = ordinal // 1_000_000, ordinal // 1000 % 1000, ordinal % 1000
+            last = verses[-1] if verses else None
+            if (
+                last
+                and (last["book_id"], last["chapter"]) == (book_id, chapter)
+                and (last["verse_end"] or last["verse_start"]) == verse - 1
+            ):
+                last["verse_end"] = verse
+            else:
+                verses.append({"book_id": book_id, "chapter": chapter, "verse_start": verse, "verse_end": None})
+        return verses
+
+    def _near_duplicate_match(self, request_type: str, config: Dict[str, Any]) -> str:
+        """Fields a near-duplicate must share, as one comparable string"""
+        return json.dumps(
+            [request_type, *(config.get(field) for field in NEAR_DUPLICATE_FIELDS)],
+            ensure_ascii=False,
+        )
+
+    def _hash_cache_input(self, cache_input: Dict[str, Any]) -> str:
+        """SHA-256 of the deterministic JSON form of a cache input"""
+        cache_string = json.dumps(cache_input, sort_keys=True)
+        return hashlib.sha256(cache_string.encode()).hexdigest()
 
     def generate_cache_key(
         self,
@@ -61,10 +456,7 @@ class CacheService:
         # Normalize input for consistent hashing
         cache_input = {
             "type": request_type,
-            "verses": sorted([
-                f"{v.get('book_id')}:{v.get('chapter')}:{v.get('verse_start')}-{v.get('verse_end', v.get('verse_start'))}"
-                for v in verses
-            ]),
+            "verses": self._normalize_verses(verses),
             "config": {
                 "sermon_type": config.get("sermon_type"),
                 "target_audience": config.get("target_audience"),
@@ -73,64 +465,145 @@ class CacheService:
                 "include_illustrations": config.get("include_illustrations", True),
             }
         }
+        # Only when set, so existing Telugu-only keys stay valid
+        if config.get("parallel_translation"):
+            cache_input["config"]["parallel_translation"] = config["parallel_translation"]
 
-        # Create deterministic JSON string
-        cache_string = json.dumps(cache_input, sort_keys=True)
+        return f"{self.cache_prefix}{self._hash_cache_input(cache_input)}"
 
-        # Generate SHA-256 hash
-        cache_hash = hashlib.sha256(cache_string.encode()).hexdigest()
+    def generate_section_key(
+        self,
+        verses: list,
+        key_fields: Dict[str, Any],
+        section: str,
+    ) -> str:
+        """
+        Generate a cache key for a reusable part of a response.
+
+        Unlike generate_cache_key, only key_fields are hashed, so requests
+        that differ in anything else share the entry.
+
+        Args:
+            verses: List of verse references
+            key_fields: Config values the part depends on
+            section: Name of the part (e.g. "exposition")
+
+        Returns:
+            Cache key in the ai_sermon:section: namespace
+        """
+        cache_input = {
+            "type": f"section:{section}",
+            "verses": self._normalize_verses(verses),
+            "config": key_fields,
+        }
+        return f"{self.section_prefix}{self._hash_cache_input(cache_input)}"
+
+    def _stats_keys(self, request_type: Optional[str] = None) -> list[str]:
+        """
+        Get the stats counter hashes updated by a cache operation.
+
+        Returns:
+            [total, (per-request-type), per-day]; the per-day bucket is last
+        """
+        keys = [f"{self.stats_prefix}total"]
+        if request_type:
+            keys.append(f"{self.stats_prefix}type:{request_type}")
+        keys.append(f"{self.stats_prefix}day:{datetime.utcnow().strftime('%Y-%m-%d')}")
+        return keys
 
-        return f"{self.cache_prefix}{cache_hash}"
+    @property
+    def _stats_day_ttl(self) -> int:
+        """TTL for per-day stats buckets in seconds"""
+        return self.stats_retention_days * 24 * 60 * 60
 
-    def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+    async def get(
+        self,
+        cache_key: str,
+        request_type: str = "sermon",
+        count: bool = True,
+    ) -> Optional[Dict[str, Any]]:
         """
         Retrieve cached AI response.
 
+        Looks in L1, then Redis, then the ai_cache table (L2, skipped for
+        section keys); entries found in L2 are promoted back into Redis.
+
         Args:
             cache_key: Cache key from generate_cache_key()
+            request_type: Type of request (for hit/miss stats)
+            count: Count the lookup in hit/miss stats and the entry's
+                hit_count (False for internal re-reads)
 
         Returns:
-            Cached response dict or None if not found/expired
+            Cached response dict or None if not found/expired. Entries
+            served from L1 are shared, so only top-level keys of the
+            returned dict may be modified.
         """
         if not self.redis_client:
             return None
 
+        if self.local_cache_active:
+            local_data = self.local_cache.get(cache_key)
+            if local_data is not None:
+                if count:
+                    self._pending_local_hits[(cache_key, request_type)] += 1
+                    self._count_l2_hit(cache_key)
+                print(f"✅ Cache HIT (L1): {cache_key[:16]}...")
+                return dict(local_data)
+
         try:
-            cached_data = self.redis_client.get(cache_key)
+            if count:
+                # GET + hit count + stats counters in one round trip
+                cached_data = await self._get_and_count(
+                    keys=[cache_key, f"{cache_key}:meta", *self._stats_keys(request_type)],
+                    args=[self._stats_day_ttl],
+                )
+            else:
+                cached_data = await self.redis_client.get(cache_key)
 
             if cached_data:
-                data = json.loads(cached_data)
+                data, data_size = self.codec.decode(cached_data)
 
-                # Increment hit count
-                self.redis_client.hincrby(f"{cache_key}:meta", "hit_count", 1)
+                if self.local_cache_active:
+                    self.local_cache.set(cache_key, data, data_size)
 
+                if count:
+                    self._count_l2_hit(cache_key)
                 print(f"✅ Cache HIT: {cache_key[:16]}...")
-                return data
-            else:
-                print(f"❌ Cache MISS: {cache_key[:16]}...")
-                return None
+                return dict(data)
 
-        except (RedisError, json.JSONDecodeError) as e:
+        except (RedisError, CacheCodecError) as e:
             print(f"❌ Cache read error: {e}")
-            return None
 
-    def set(
+        # Evicted, expired in Redis, or Redis unavailable
+        data = await self._get_from_l2(cache_key, request_type, count)
+        if data is None:
+            print(f"❌ Cache MISS: {cache_key[:16]}...")
+        return data
+
+    async def set(
         self,
         cache_key: str,
         response_data: Dict[str, Any],
         verses: list,
         config: Dict[str, Any],
-        request_type: str = "sermon"
+        request_type: str = "sermon",
+        index_verses: bool = False,
     ) -> bool:
         """
         Store AI response in cache.
 
+        The key is published on the invalidation channel, so workers
+        holding an older value in L1 drop it.
+
         Args:
             cache_key: Cache key from generate_cache_key()
             response_data: AI response to cache
             verses: Verse references (for metadata)
             config: Sermon configuration (for metadata)
             request_type: Type of request
+            index_verses: Add the entry to the verse index so
+                find_near_duplicate() can offer it for overlapping verses
 
         Returns:
             True if successful, False otherwise
@@ -142,13 +615,6 @@ class CacheService:
             # Calculate expiration
             ttl_seconds = self.cache_ttl_days * 24 * 60 * 60
 
-            # Store main cache data with TTL
-            self.redis_client.setex(
-                cache_key,
-                ttl_seconds,
-                json.dumps(response_data)
-            )
-
             # Store metadata (for analytics)
             metadata = {
                 "request_type": request_type,
@@ -156,13 +622,47 @@ class CacheService:
                 "cached_at": datetime.utcnow().isoformat(),
                 "expires_at": (datetime.utcnow() + timedelta(days=self.cache_ttl_days)).isoformat(),
                 "hit_count": 0,
+                # Lets get_hot_entries() regenerate the entry
+                "verses": json.dumps(verses),
+                "config": json.dumps(config),
             }
 
-            self.redis_client.hset(
-                f"{cache_key}:meta",
-                mapping=metadata
-            )
-            self.redis_client.expire(f"{cache_key}:meta", ttl_seconds)
+            payload, data_size = self.codec.encode(response_data)
+            stats_keys = self._stats_keys(request_type)
+
+            # Data, metadata, metadata TTL and stats counters in one round trip
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.setex(cache_key, ttl_seconds, payload)
+            if index_verses:
+                ordinals = sorted(self._verse_ordinals(verses))
+                metadata["verse_ordinals"] = ",".join(map(str, ordinals))
+                metadata["near_duplicate_match"] = self._near_duplicate_match(request_type, config)
+                for ordinal in ordinals:
+                    pipe.sadd(f"{self.verse_index_prefix}{ordinal}", cache_key)
+                    pipe.expire(f"{self.verse_index_prefix}{ordinal}", ttl_seconds)
+            pipe.hset(f"{cache_key}:meta", mapping=metadata)
+            pipe.expire(f"{cache_key}:meta", ttl_seconds)
+            for stats_key in stats_keys:
+                pipe.hincrby(stats_key, "sets", 1)
+                pipe.hincrby(stats_key, "bytes_written", len(payload))
+            pipe.expire(stats_keys[-1], self._stats_day_ttl)
+            pipe.sadd(f"{self.stats_prefix}types", request_type)
+            # Other workers may hold an older value for this key in L1
+            pipe.publish(self.invalidation_channel, cache_key)
+            await pipe.execute()
+
+            # Store decoded copies so later changes by the caller don't leak in
+            if self.local_cache_active:
+                self.local_cache.set(cache_key, self.codec.decode(payload)[0], data_size)
+            if self._uses_l2(cache_key):
+                self._queue_l2_write(cache_key, {
+                    "cache_key": cache_key,
+                    "request_type": request_type,
+                    "source_verses": verses,
+                    "config": config,
+                    "response_content": self.codec.decode(payload)[0],
+                    "expires_at": (datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds)).isoformat(),
+                })
 
             print(f"✅ Cache SET: {cache_key[:16]}... (TTL: {self.cache_ttl_days} days)")
             return True
@@ -171,7 +671,234 @@ class CacheService:
             print(f"❌ Cache write error: {e}")
             return False
 
-    def delete(self, cache_key: str) -> bool:
+    async def find_near_duplicate(
+        self,
+        verses: list,
+        config: Dict[str, Any],
+        threshold: float,
+        request_type: str = "sermon",
+    ) -> Optional[tuple[Dict[str, Any], float, list[Dict[str, Any]]]]:
+        """
+        Find a cached entry for overlapping verses.
+
+        Candidates come from the verse index (entries stored with
+        index_verses=True that cover any requested verse). The entry whose
+        verses have the highest Jaccard similarity to the request's wins,
+        if it reaches the threshold and shares NEAR_DUPLICATE_FIELDS.
+        Index members whose entry has expired are pruned on the way.
+
+        Args:
+            verses: Verse references of the request
+            config: Sermon configuration dict
+            threshold: Minimum Jaccard similarity (0-1)
+            request_type: Type of request
+
+        Returns:
+            Tuple of (cached response, similarity, verse references the
+            cached sermon was written for), or None
+        """
+        if not self.redis_client:
+            return None
+
+        ordinals = self._verse_ordinals(verses)
+        index_keys = [f"{self.verse_index_prefix}{ordinal}" for ordinal in sorted(ordinals)]
+        match = self._near_duplicate_match(request_type, config).encode()
+
+        try:
+            candidates = list(await self.redis_client.sunion(index_keys))[:NEAR_DUPLICATE_MAX_CANDIDATES]
+            if not candidates:
+                return None
+
+            pipe = self.redis_client.pipeline(transaction=False)
+            for candidate in candidates:
+                pipe.hmget(candidate + b":meta", "verse_ordinals", "near_duplicate_match")
+            metas = await pipe.execute()
+
+            best = None
+            stale = []
+            for candidate, (verse_ordinals, candidate_match) in zip(candidates, metas):
+                if verse_ordinals is None:
+                    stale.append(candidate)
+                    continue
+                if candidate_match != match:
+                    continue
+
+                cached_ordinals = {int(o) for o in verse_ordinals.split(b",")}
+                similarity = len(ordinals & cached_ordinals) / len(ordinals | cached_ordinals)
+                if similarity >= threshold and (best is None or similarity > best[1]):
+                    best = (candidate, similarity, cached_ordinals)
+
+            pipe = self.redis_client.pipeline(transaction=False)
+            if stale:
+                for index_key in index_keys:
+                    pipe.srem(index_key, *stale)
+
+            if best is None:
+                if stale:
+                    await pipe.execute()
+                return None
+
+            cache_key, similarity, cached_ordinals = best
+            stats_keys = self._stats_keys(request_type)
+            pipe.get(cache_key)
+            await self._count_hits(keys=[cache_key + b":meta"], args=[1], client=pipe)
+            for stats_key in stats_keys:
+                pipe.hincrby(stats_key, "near_hits", 1)
+            pipe.expire(stats_keys[-1], self._stats_day_ttl)
+            cached_data = (await pipe.execute())[len(index_keys) if stale else 0]
+
+            if not cached_data:
+                return None
+
+            data, _ = self.codec.decode(cached_data)
+            self._count_l2_hit(cache_key.decode())
+            print(f"✅ Cache NEAR HIT: {cache_key.decode()[:16]}... (similarity {similarity:.2f})")
+            return dict(data), round(similarity, 4), self._ordinal_verses(cached_ordinals)
+
+        except (RedisError, CacheCodecError) as e:
+            print(f"❌ Cache near-duplicate lookup error: {e}")
+            return None
+
+    async def expires_in(self, cache_key: str) -> Optional[int]:
+        """
+        Seconds until an entry expires, without counting a hit.
+
+        Returns:
+            Remaining TTL from Redis, or from the ai_cache table if the
+            entry is only there; None if the entry is not cached
+        """
+        if not self.redis_client:
+            return None
+
+        try:
+            ttl = await self.redis_client.ttl(cache_key)
+            if ttl > 0:
+                return ttl
+        except RedisError as e:
+            print(f"❌ Cache TTL error: {e}")
+
+        if not self._l2_available or not self._uses_l2(cache_key):
+            return None
+
+        row = await self.database.get_ai_cache_entry(cache_key)
+        if not row:
+            return None
+
+        expires_at = datetime.fromisoformat(row["expires_at"])
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        return max(0, int((expires_at - datetime.now(timezone.utc)).total_seconds())) or None
+
+    async def refresh(self, cache_key: str) -> bool:
+        """
+        Restart an entry's TTL, keeping its hit count (unlike set()).
+
+        The entry's verse index sets and ai_cache row are extended too.
+
+        Returns:
+            True if refreshed, False if the entry is not in Redis
+        """
+        if not self.redis_client:
+            return False
+
+        try:
+            ttl_seconds = self.cache_ttl_days * 24 * 60 * 60
+            meta_key = f"{cache_key}:meta"
+
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.get(cache_key)
+            pipe.expire(cache_key, ttl_seconds)
+            pipe.expire(meta_key, ttl_seconds)
+            pipe.hmget(meta_key, "request_type", "verses", "config", "verse_ordinals")
+            payload, extended, _, (request_type, verses, config, ordinals) = await pipe.execute()
+            if not extended:
+                return False
+
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.hset(meta_key, "expires_at", (datetime.utcnow() + timedelta(seconds=ttl_seconds)).isoformat())
+            pipe.publish(self.invalidation_channel, cache_key)
+            for ordinal in (ordinals or b"").decode().split(","):
+                if ordinal:
+                    pipe.sadd(f"{self.verse_index_prefix}{ordinal}", cache_key)
+                    pipe.expire(f"{self.verse_index_prefix}{ordinal}", ttl_seconds)
+            await pipe.execute()
+
+            if self._uses_l2(cache_key) and verses and config:
+                self._queue_l2_write(cache_key, {
+                    "cache_key": cache_key,
+                    "request_type": (request_type or b"sermon").decode(),
+                    "source_verses": json.loads(verses),
+                    "config": json.loads(config),
+                    "response_content": self.codec.decode(payload)[0],
+                    "expires_at": (datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds)).isoformat(),
+                })
+
+            print(f"♻️  Cache REFRESH: {cache_key[:16]}... (TTL: {self.cache_ttl_days} days)")
+            return True
+
+        except RedisError as e:
+            print(f"❌ Cache refresh error: {e}")
+            return False
+
+    async def get_hot_entries(self, limit: int, request_type: str = "sermon") -> list[Dict[str, Any]]:
+        """
+        Most-hit cache entries, with the verses and config to regenerate them.
+
+        Reads hit_count from the Redis entry metadata (SCAN, so not for the
+        request path) and from the ai_cache table, which also remembers
+        entries Redis has evicted or lost. Entries cached before metadata
+        recorded verses and config are skipped.
+
+        Args:
+            limit: Maximum entries
+            request_type: Type of request
+
+        Returns:
+            Dicts with cache_key, hit_count, verses and config, most hits first
+        """
+        entries: Dict[str, Dict[str, Any]] = {}
+
+        if self._l2_available:
+            for row in await self.database.get_hot_ai_cache_entries(limit, request_type):
+                entries[row["cache_key"]] = {
+                    "cache_key": row["cache_key"],
+                    "hit_count": row["hit_count"],
+                    "verses": row["source_verses"],
+                    "config": row["config"],
+                }
+
+        if self.redis_client:
+            try:
+                meta_keys = [
+                    key async for key in self.redis_client.scan_iter(
+                        match=f"{self.cache_prefix}*:meta",
+                        count=self.scan_batch_size,
+                    )
+                ]
+                for start in range(0, len(meta_keys), self.scan_batch_size):
+                    batch = meta_keys[start:start + self.scan_batch_size]
+                    pipe = self.redis_client.pipeline(transaction=False)
+                    for meta_key in batch:
+                        pipe.hmget(meta_key, "request_type", "hit_count", "verses", "config")
+                    for meta_key, (entry_type, hit_count, verses, config) in zip(batch, await pipe.execute()):
+                        if entry_type != request_type.encode() or not verses or not config:
+                            continue
+                        cache_key = meta_key[:-len(b":meta")].decode()
+                        hit_count = int(hit_count or 0)
+                        if cache_key in entries and entries[cache_key]["hit_count"] >= hit_count:
+                            continue
+                        entries[cache_key] = {
+                            "cache_key": cache_key,
+                            "hit_count": hit_count,
+                            "verses": json.loads(verses),
+                            "config": json.loads(config),
+                        }
+            except RedisError as e:
+                print(f"❌ Cache hot entries error: {e}")
+
+        return sorted(entries.values(), key=lambda e: (-e["hit_count"], e["cache_key"]))[:limit]
+
+    async def delete(self, cache_key: str) -> bool:
         """
         Delete cached entry.
 
@@ -185,48 +912,138 @@ class CacheService:
             return False
 
         try:
-            self.redis_client.delete(cache_key, f"{cache_key}:meta")
+            await self._delete_and_count(
+                keys=[cache_key, f"{cache_key}:meta", *self._stats_keys()],
+                args=[self._stats_day_ttl],
+            )
+            await self._publish_invalidation(cache_key)
+            if self._uses_l2(cache_key):
+                self._pending_l2_writes.pop(cache_key, None)
+                self._pending_l2_hits.pop(cache_key, None)
+                self._pending_l2_deletes.add(cache_key)
             print(f"✅ Cache DELETE: {cache_key[:16]}...")
             return True
         except RedisError as e:
             print(f"❌ Cache delete error: {e}")
             return False
 
-    def get_stats(self) -> Dict[str, Any]:
+    def _lock_key(self, cache_key: str) -> str:
+        """Get the generation lock key for a cache key"""
+        return f"{self.lock_prefix}{cache_key[len(self.cache_prefix):]}"
+
+    async def acquire_lock(self, cache_key: str, ttl_seconds: int) -> Optional[str]:
+        """
+        Acquire a generation lease for a cache key across workers.
+
+        Args:
+            cache_key: Cache key being generated
+            ttl_seconds: Lease duration (released early by release_lock)
+
+        Returns:
+            Lease token if acquired, None if another worker holds the lease.
+            When Redis is unavailable a token is always returned, since
+            there is nothing to coordinate with.
+        """
+        token = uuid.uuid4().hex
+
+        if not self.redis_client:
+            return token
+
+        try:
+            acquired = await self.redis_client.set(
+                self._lock_key(cache_key),
+                token,
+                nx=True,
+                ex=ttl_seconds,
+            )
+            return token if acquired else None
+        except RedisError as e:
+            print(f"❌ Cache lock error: {e}")
+            return token
+
+    async def release_lock(self, cache_key: str, token: str) -> bool:
+        """
+        Release a generation lease if it is still held by this token.
+
+        Args:
+            cache_key: Cache key being generated
+            token: Token returned by acquire_lock()
+
+        Returns:
+            True if the lease was released, False otherwise
+        """
+        if not self.redis_client:
+            return False
+
+        try:
+            released = await self._release_lock(
+                keys=[self._lock_key(cache_key)],
+                args=[token],
+            )
+            return bool(released)
+        except RedisError as e:
+            print(f"❌ Cache unlock error: {e}")
+            return False
+
+    async def is_locked(self, cache_key: str) -> bool:
+        """Check whether another worker holds the generation lease"""
+        if not self.redis_client:
+            return False
+
+        try:
+            return bool(await self.redis_client.exists(self._lock_key(cache_key)))
+        except RedisError as e:
+            print(f"❌ Cache lock check error: {e}")
+            return False
+
+    def _format_counters(self, counters: Dict[bytes, bytes]) -> Dict[str, Any]:
+        """Convert a raw stats hash into ints plus hit rate percentage"""
+        formatted = {field: int(counters.get(field.encode(), 0)) for field in STATS_FIELDS}
+        lookups = formatted["hits"] + formatted["misses"]
+        formatted["hit_rate"] = round(formatted["hits"] / lookups * 100, 2) if lookups > 0 else 0
+        return formatted
+
+    async def get_stats(self) -> Dict[str, Any]:
         """
         Get cache statistics.
 
+        Reads counters maintained on the get/set/delete paths, so the cost
+        does not grow with the number of cached entries.
+
         Returns:
-            Dict with cache stats (total entries, hit rate, etc.)
+            Dict with cache stats (hits, misses, hit rate, etc.) in total,
+            for today and per request type
         """
         if not self.redis_client:
             return {"error": "Redis not connected"}
 
         try:
-            # Get all cache keys
-            all_keys = self.redis_client.keys(f"{self.cache_prefix}*")
-            cache_keys = [k for k in all_keys if not k.endswith(":meta")]
+            total_key, day_key = self._stats_keys()
 
-            total_entries = len(cache_keys)
-            total_hits = 0
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.hgetall(total_key)
+            pipe.hgetall(day_key)
+            pipe.smembers(f"{self.stats_prefix}types")
+            totals, today, request_types = await pipe.execute()
 
-            # Sum up hit counts
-            for key in cache_keys:
-                hit_count = self.redis_client.hget(f"{key}:meta", "hit_count")
-                if hit_count:
-                    total_hits += int(hit_count)
+            request_types = sorted(t.decode() for t in request_types)
+            pipe = self.redis_client.pipeline(transaction=False)
+            for request_type in request_types:
+                pipe.hgetall(f"{self.stats_prefix}type:{request_type}")
+            by_type = await pipe.execute() if request_types else []
 
-            # Calculate hit rate (hits per entry)
-            avg_hits_per_entry = total_hits / total_entries if total_entries > 0 else 0
-
-            # Estimate hit rate percentage (assuming 1 miss per cache entry)
-            cache_hit_rate = (total_hits / (total_hits + total_entries)) if (total_hits + total_entries) > 0 else 0
+            totals = self._format_counters(totals)
 
             return {
-                "total_entries": total_entries,
-                "total_hits": total_hits,
-                "avg_hits_per_entry": round(avg_hits_per_entry, 2),
-                "estimated_hit_rate": round(cache_hit_rate * 100, 2),
+                "total_hits": totals["hits"],
+                "hit_rate": totals["hit_rate"],
+                "totals": totals,
+                "today": self._format_counters(today),
+                "by_type": {
+                    request_type: self._format_counters(counters)
+                    for request_type, counters in zip(request_types, by_type)
+                },
+                "local": self.local_cache.get_stats(),
                 "ttl_days": self.cache_ttl_days,
                 "status": "connected",
             }
@@ -234,10 +1051,32 @@ class CacheService:
         except RedisError as e:
             return {"error": f"Failed to get stats: {e}"}
 
-    def clear_all(self) -> bool:
+    async def _unlink_batch(self, keys: list[bytes]) -> int:
+        """Unlink a batch of cache keys and count evicted entries"""
+        verse_index_prefix = self.verse_index_prefix.encode()
+        evicted = sum(
+            1 for key in keys
+            if not key.endswith(b":meta") and not key.startswith(verse_index_prefix)
+        )
+
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.unlink(*keys)
+        if evicted:
+            stats_keys = self._stats_keys()
+            for stats_key in stats_keys:
+                pipe.hincrby(stats_key, "evictions", evicted)
+            pipe.expire(stats_keys[-1], self._stats_day_ttl)
+        await pipe.execute()
+
+        return evicted
+
+    async def clear_all(self) -> bool:
         """
         Clear all AI cache entries (use with caution!).
 
+        Keys are found with SCAN and removed with UNLINK in batches, so
+        Redis is never blocked by one large KEYS or DELETE.
+
         Returns:
             True if successful, False otherwise
         """
@@ -245,38 +1084,75 @@ class CacheService:
             return False
 
         try:
-            keys = self.redis_client.keys(f"{self.cache_prefix}*")
-            if keys:
-                self.redis_client.delete(*keys)
-                print(f"✅ Cleared {len(keys)} cache entries")
+            cleared = 0
+            batch = []
+
+            async for key in self.redis_client.scan_iter(
+                match=f"{self.cache_prefix}*",
+                count=self.scan_batch_size,
+            ):
+                batch.append(key)
+                if len(batch) >= self.scan_batch_size:
+                    cleared += await self._unlink_batch(batch)
+                    batch = []
+
+            if batch:
+                cleared += await self._unlink_batch(batch)
+
+            await self._publish_invalidation("*")
+
+            # Otherwise Redis misses would bring the entries back from L2
+            if self.database:
+                self._pending_l2_writes.clear()
+                self._pending_l2_deletes.clear()
+                self._pending_l2_hits.clear()
+                if self._l2_available:
+                    await self.database.clear_ai_cache()
+
+            print(f"✅ Cleared {cleared} cache entries")
             return True
         except RedisError as e:
             print(f"❌ Cache clear error: {e}")
             return False
 
-    def cleanup_expired(self) -> int:
+    async def cleanup_expired(self) -> int:
         """
-        Clean up expired cache entries (Redis handles this automatically,
-        but this can be used for manual cleanup).
+        Clean up expired cache entries in the ai_cache table (Redis
+        handles TTL expiration automatically).
 
         Returns:
             Number of entries cleaned up
         """
-        # Redis handles TTL expiration automatically
-        # This method is mainly for PostgreSQL cache backup
-        print("ℹ️  Redis handles TTL expiration automatically")
-        return 0
+        if not self._l2_available:
+            print("ℹ️  Redis handles TTL expiration automatically")
+            return 0
+
+        deleted = await self.database.cleanup_expired_ai_cache()
+        print(f"✅ Cleaned up {deleted} expired L2 cache entries")
+        return deleted
 
 
 # Singleton instance
 _cache_service_instance = None
 
 
+def _get_l2_database():
+    """SupabaseService for the L2 tier, or None if disabled or not configured"""
+    if os.getenv("CACHE_L2_ENABLED", "true").lower() != "true":
+        return None
+
+    try:
+        return get_supabase_service()
+    except ValueError as e:
+        print(f"⚠️  L2 cache disabled: {e}")
+        return None
+
+
 def get_cache_service() -> CacheService:
     """Get or create CacheService singleton instance"""
     global _cache_service_instance
 
     if _cache_service_instance is None:
-        _cache_service_instance = CacheService()
+        _cache_service_instance = CacheService(database=_get_l2_database())
 
     return _cache_service_instance
@@ -0,0 +1,108 @@
+"""
+In-process LRU cache (L1) in front of Redis
+Bounded by total byte size, with per-entry TTL
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class LocalLRUCache:
+    """Bounded in-memory LRU cache with TTL and byte-size accounting"""
+
+    def __init__(self, max_bytes: int, ttl_seconds: int):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Total size budget; least recently used entries are
+                evicted once the sum of entry sizes exceeds it
+            ttl_seconds: Lifetime of each entry
+        """
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # key -> (expires_at, size_bytes, value)
+        self._entries: "OrderedDict[str, tuple[float, int, Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a value and mark it as recently used.
+
+        Returns:
+            Cached value or None if missing/expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, _, value = entry
+        if expires_at <= time.monotonic():
+            self.delete(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, size_bytes: int) -> bool:
+        """
+        Store a value, evicting least recently used entries to fit.
+
+        Args:
+            key: Cache key
+            value: Value to store (treated as read-only by callers)
+            size_bytes: Size charged against max_bytes
+
+        Returns:
+            True if stored, False if the entry is larger than the whole cache
+        """
+        self.delete(key)
+
+        if size_bytes > self.max_bytes:
+            return False
+
+        while self._entries and self.current_bytes + size_bytes > self.max_bytes:
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self.current_bytes -= evicted_size
+            self.evictions += 1
+
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, size_bytes, value)
+        self.current_bytes += size_bytes
+        return True
+
+    def delete(self, key: str) -> bool:
+        """Remove a key; returns True if it was present"""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+
+        self.current_bytes -= entry[1]
+        return True
+
+    def clear(self):
+        """Remove all entries"""
+        self._entries.clear()
+        self.current_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get L1 statistics for this process"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups * 100, 2) if lookups > 0 else 0,
+        }
@@ -5,19 +5,54 @@ Integrates with cache service for cost optimization
 
 import os
 import json
-from typing import Dict, Any, Optional, AsyncIterator
+import time
+import asyncio
+from typing import Dict, Any, Optional, AsyncIterator, Awaitable, Callable
 from datetime import datetime
 from openai import AsyncOpenAI
 from openai.types.chat import ChatCompletion
-import tiktoken
 from dotenv import load_dotenv
 
 from app.services.cache_service import get_cache_service
-from app.utils.prompts import get_sermon_prompt
+from app.utils.prompts import (
+    SERMON_SYSTEM_PROMPT,
+    VERSE_EXPLANATION_SYSTEM_PROMPT,
+    format_verse_block,
+    get_point_count,
+    get_sermon_prompt_prefix,
+    get_sermon_sections_suffix,
+    get_verse_explanation_prompt,
+)
+from app.utils.tokens import count_static_tokens, count_tokens, truncate_to_tokens, warm_up_encoders
+from app.utils.json_stream import IncrementalJSONObjectParser
 from app.models.sermon import SermonConfig, VerseReference, SermonContent
 
 load_dotenv()
 
+# Chat format overhead: tokens per message plus reply priming
+MESSAGE_OVERHEAD_TOKENS = 3 * 2 + 3
+
+# Sermon fields in SermonContent order
+SERMON_SECTIONS = ("title", "introduction", "main_points", "application", "conclusion", "prayer_points")
+
+# Sermon parts cached separately, with the config fields each depends on.
+# The exposition does not depend on tone or length beyond the point count,
+# so a request that changes only those reuses it and the model writes
+# just the framing.
+SERMON_SECTION_GROUPS = {
+    "exposition": {
+        "sections": ("main_points", "application"),
+        "config": ("sermon_type", "target_audience", "point_count", "include_illustrations", "parallel_translation"),
+    },
+    "framing": {
+        "sections": ("title", "introduction", "conclusion", "prayer_points"),
+        "config": (
+            "sermon_type", "target_audience", "length_minutes", "tone",
+            "include_illustrations", "parallel_translation",
+        ),
+    },
+}
+
 
 class OpenAIService:
     """Handles AI sermon generation using OpenAI API"""
@@ -34,12 +69,28 @@ class OpenAIService:
         # Model configuration
         self.default_model = os.getenv("DEFAULT_MODEL", "gpt-3.5-turbo")
         self.premium_model = os.getenv("PREMIUM_MODEL", "gpt-4")
-        self.max_tokens_input = int(os.getenv("MAX_TOKENS_INPUT", 500))
+        self.max_tokens_input = int(os.getenv("MAX_TOKENS_INPUT", 2000))
         self.max_tokens_output = int(os.getenv("MAX_TOKENS_OUTPUT", 1500))
 
         # Cost tracking
         self.daily_spend_limit = float(os.getenv("DAILY_SPEND_LIMIT", 10.0))
 
+        # Request coalescing: in-flight generations keyed by cache key
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.generation_lease_seconds = int(os.getenv("GENERATION_LEASE_SECONDS", 90))
+        self.coalesce_poll_interval = float(os.getenv("COALESCE_POLL_INTERVAL", 0.5))
+
+        # Near-duplicate cache hits: highly overlapping verse ranges with the
+        # same sermon type and audience, for the listed tiers only (none by
+        # default; opt in per tier)
+        self.near_duplicate_threshold = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", 0.75))
+        self.near_duplicate_tiers = {
+            tier.strip() for tier in os.getenv("NEAR_DUPLICATE_TIERS", "").split(",") if tier.strip()
+        }
+
+        # Load tokenizers now rather than on the first request
+        warm_up_encoders([self.default_model, self.premium_model])
+
         print("✅ OpenAI service initialized")
 
     def _get_model_for_tier(self, subscription_tier: str) -> str:
@@ -56,6 +107,34 @@ class OpenAIService:
             return self.premium_model
         return self.default_model
 
+    async def _find_near_duplicate(
+        self,
+        verses_dict: list[Dict[str, Any]],
+        config_dict: Dict[str, Any],
+        subscription_tier: str,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached sermon for overlapping verses, if the tier allows it.
+
+        Returns:
+            The cached response marked from_cache, with "near_duplicate"
+            holding the similarity and the verses the sermon was written
+            for, or None
+        """
+        if subscription_tier not in self.near_duplicate_tiers:
+            return None
+
+        match = await self.cache_service.find_near_duplicate(
+            verses_dict, config_dict, self.near_duplicate_threshold
+        )
+        if not match:
+            return None
+
+        cached_response, similarity, matched_verses = match
+        cached_response["from_cache"] = True
+        cached_response["near_duplicate"] = {"similarity": similarity, "verses": matched_verses}
+        return cached_response
+
     def count_tokens(self, text: str, model: str = "gpt-3.5-turbo") -> int:
         """
         Count tokens in text for cost estimation.
@@ -65,37 +144,107 @@ class OpenAIService:
             model: Model name for encoding
 
         Returns:
-            Number of tokens
+            Number of tokens (estimated if the tokenizer is unavailable)
         """
-        try:
-            encoding = tiktoken.encoding_for_model(model)
-            return len(encoding.encode(text))
-        except Exception as e:
-            # Fallback: rough estimation (1 token ≈ 4 characters)
-            return len(text) // 4
+        return count_tokens(text, model)
 
-    async def generate_sermon(
+    def _build_sermon_prompt(
         self,
-        verses: list[VerseReference],
         verse_texts: list[str],
         config: SermonConfig,
-        subscription_tier: str = "free",
-        use_cache: bool = True,
-    ) -> Dict[str, Any]:
+        model: str,
+        suffix: str = "",
+    ) -> tuple[str, int]:
         """
-        Generate sermon using OpenAI API with caching.
+        Build the sermon prompt within MAX_TOKENS_INPUT.
+
+        The system message and prompt prefix are counted once per
+        configuration (cached); only the verses, which come last, are
+        tokenized per request. Verses over budget are trimmed, see
+        _fit_verses.
+
+        Args:
+            verse_texts: Prompt-ready verse texts
+            config: Sermon configuration
+            model: Model name for encoding
+            suffix: Text after the verses (see get_sermon_sections_suffix)
+
+        Returns:
+            Tuple of (prompt, input tokens including the system message)
+        """
+        prefix = get_sermon_prompt_prefix(config)
+        static_tokens = count_static_tokens(SERMON_SYSTEM_PROMPT + prefix, model) + MESSAGE_OVERHEAD_TOKENS
+        if suffix:
+            static_tokens += count_tokens(suffix, model)
+
+        verse_texts = self._fit_verses(verse_texts, self.max_tokens_input - static_tokens, model)
+        verse_block = format_verse_block(verse_texts)
+
+        return prefix + verse_block + suffix, static_tokens + count_tokens(verse_block, model)
+
+    def _fit_verses(self, verse_texts: list[str], budget: int, model: str) -> list[str]:
+        """
+        Trim verse context to a token budget.
+
+        Parallel-translation and related-verse lines go first; then whole
+        references are kept in order and the first that does not fit is cut
+        short. The first reference is always kept.
+
+        Args:
+            verse_texts: Prompt-ready verse texts (BibleService.get_verse_texts)
+            budget: Tokens available for the verse list
+            model: Model name for encoding
+
+        Returns:
+            Verse texts that fit the budget
+        """
+        if count_tokens(format_verse_block(verse_texts), model) <= budget:
+            return verse_texts
+
+        # Keep only each reference's own text (first line)
+        primary = [text.split("\n", 1)[0] for text in verse_texts]
+        if count_tokens(format_verse_block(primary), model) <= budget:
+            print(f"⚠️  Verse context over {budget} tokens, dropped parallel/related lines")
+            return primary
+
+        kept: list[str] = []
+        used = 0
+        for text in primary:
+            line_tokens = count_tokens(format_verse_block([text]), model) + (1 if kept else 0)
+            if used + line_tokens <= budget:
+                kept.append(text)
+                used += line_tokens
+                continue
+
+            # Room for "\n- " and the ellipsis too
+            remaining = budget - used - count_tokens("\n- …", model)
+            cut = truncate_to_tokens(text, remaining, model)
+            if cut:
+                kept.append(cut + "…")
+            break
+
+        if not kept:
+            kept = [primary[0]]
+            print("⚠️  MAX_TOKENS_INPUT leaves no room for verses; sending the first reference anyway")
+
+        print(f"⚠️  Verse context trimmed to {budget} tokens ({len(kept)}/{len(verse_texts)} references)")
+        return kept
+
+    def _prepare_cache_inputs(
+        self,
+        verses: list[VerseReference],
+        config: SermonConfig,
+    ) -> tuple[list[Dict[str, Any]], Dict[str, Any], str]:
+        """
+        Build the cache key inputs for a sermon request.
 
         Args:
             verses: List of verse references
-            verse_texts: Actual verse text content
             config: Sermon configuration
-            subscription_tier: User's subscription tier
-            use_cache: Whether to use cache (default True)
 
         Returns:
-            Dict containing sermon content and metadata
+            Tuple of (verses_dict, config_dict, cache_key)
         """
-        # Prepare cache key
         verses_dict = [
             {
                 "book_id": v.book_id,
@@ -113,6 +262,9 @@ class OpenAIService:
             "tone": config.tone,
             "include_illustrations": config.include_illustrations,
         }
+        # Only when set, so existing Telugu-only keys stay valid
+        if config.parallel_translation:
+            config_dict["parallel_translation"] = config.parallel_translation
 
         cache_key = self.cache_service.generate_cache_key(
             verses=verses_dict,
@@ -120,42 +272,281 @@ class OpenAIService:
             request_type="sermon"
         )
 
-        # Check cache first
-        if use_cache:
-            cached_response = self.cache_service.get(cache_key)
-            if cached_response:
-                cached_response["from_cache"] = True
-                return cached_response
-
-        # Generate sermon prompt
-        prompt = get_sermon_prompt(
-            verse_texts=verse_texts,
-            config=config,
+        return verses_dict, config_dict, cache_key
+
+    def _section_cache_keys(
+        self,
+        verses_dict: list[Dict[str, Any]],
+        config_dict: Dict[str, Any],
+    ) -> Dict[str, str]:
+        """Cache key of each SERMON_SECTION_GROUPS entry for a request"""
+        fields = {**config_dict, "point_count": get_point_count(config_dict["length_minutes"])}
+
+        return {
+            group: self.cache_service.generate_section_key(
+                verses_dict,
+                {name: fields.get(name) for name in spec["config"]},
+                group,
+            )
+            for group, spec in SERMON_SECTION_GROUPS.items()
+        }
+
+    async def _get_cached_sections(self, section_keys: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Look up cached sermon parts.
+
+        Returns:
+            Group name -> cached entry ({"sections": {...}, "model": ...})
+            for the groups found
+        """
+        entries = await asyncio.gather(*[
+            self.cache_service.get(key, request_type="sermon_section")
+            for key in section_keys.values()
+        ])
+        return {group: entry for group, entry in zip(section_keys, entries) if entry}
+
+    async def _cache_sections(
+        self,
+        section_keys: Dict[str, str],
+        result: Dict[str, Any],
+        verses_dict: list[Dict[str, Any]],
+        config_dict: Dict[str, Any],
+        skip: tuple = (),
+    ):
+        """Cache each part of a generated sermon for reuse by other configs"""
+        sermon_content = result["sermon_content"]
+        writes = []
+
+        for group, key in section_keys.items():
+            names = SERMON_SECTION_GROUPS[group]["sections"]
+            if group in skip or not all(name in sermon_content for name in names):
+                continue
+            writes.append(self.cache_service.set(
+                cache_key=key,
+                response_data={
+                    "sections": {name: sermon_content[name] for name in names},
+                    "model": result["metadata"]["model"],
+                },
+                verses=verses_dict,
+                config=config_dict,
+                request_type="sermon_section",
+            ))
+
+        await asyncio.gather(*writes)
+
+    async def _generate_from_sections(
+        self,
+        verses_dict: list[Dict[str, Any]],
+        config_dict: Dict[str, Any],
+        verse_texts: list[str],
+        config: SermonConfig,
+        subscription_tier: str,
+    ) -> Dict[str, Any]:
+        """
+        Generate a sermon, reusing cached sections from similar requests.
+
+        Only the sections missing from the section cache are requested
+        from the model; if all are cached, no model call is made.
+
+        Returns:
+            Dict containing sermon content and metadata; metadata
+            "reused_sections" lists the section groups taken from cache
+        """
+        section_keys, reused, written = await self._get_reusable_sections(verses_dict, config_dict)
+
+        if len(reused) == len(section_keys):
+            result = self._assemble_sections(reused, written)
+        else:
+            result = await self._call_sermon_model(verse_texts, config, subscription_tier, written)
+            await self._cache_sections(section_keys, result, verses_dict, config_dict, skip=tuple(reused))
+
+        result["metadata"]["reused_sections"] = sorted(reused)
+        return result
+
+    async def _stream_from_sections(
+        self,
+        verses_dict: list[Dict[str, Any]],
+        config_dict: Dict[str, Any],
+        verse_texts: list[str],
+        config: SermonConfig,
+        subscription_tier: str,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a sermon, reusing cached sections from similar requests.
+
+        Streaming counterpart of _generate_from_sections: cached sections
+        are sent first and only the missing ones are streamed from the model.
+
+        Yields:
+            start, section and done events (see generate_sermon_stream)
+        """
+        section_keys, reused, written = await self._get_reusable_sections(verses_dict, config_dict)
+
+        if len(reused) == len(section_keys):
+            events = self._replay_cached(self._assemble_sections(reused, written))
+        else:
+            events = self._stream_sermon_model(verse_texts, config, subscription_tier, written)
+
+        async for event in events:
+            if event["event"] == "done":
+                result = event["result"]
+                await self._cache_sections(section_keys, result, verses_dict, config_dict, skip=tuple(reused))
+                result["metadata"]["reused_sections"] = sorted(reused)
+            yield event
+
+    async def _get_reusable_sections(
+        self,
+        verses_dict: list[Dict[str, Any]],
+        config_dict: Dict[str, Any],
+    ) -> tuple[Dict[str, str], Dict[str, Dict[str, Any]], Dict[str, Any]]:
+        """
+        Look up the cached sections a sermon request can reuse.
+
+        Returns:
+            Tuple of (section_keys, reused, written): the section cache
+            keys, the cached entries by group, and the cached sections
+            by field name
+        """
+        section_keys = self._section_cache_keys(verses_dict, config_dict)
+        reused = await self._get_cached_sections(section_keys)
+        written = {
+            name: value
+            for entry in reused.values()
+            for name, value in entry["sections"].items()
+        }
+
+        if reused and len(reused) < len(section_keys):
+            print(f"♻️  Reusing cached sections: {', '.join(sorted(reused))}")
+        return section_keys, reused, written
+
+    def _assemble_sections(
+        self,
+        reused: Dict[str, Dict[str, Any]],
+        written: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Build a sermon result entirely from cached sections"""
+        print("♻️  Sermon assembled from cached sections")
+        return self._build_sermon_result(
+            {name: written[name] for name in SERMON_SECTIONS},
+            reused["exposition"].get("model"),
+            0, 0, 0,
         )
 
+    def _merge_sections(self, sermon_data: Dict[str, Any], written: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Combine generated sections with those already written.
+
+        Raises:
+            ValueError: If the response lacks a section it was asked for
+        """
+        if not written:
+            return sermon_data
+
+        absent = [name for name in SERMON_SECTIONS if name not in written and name not in sermon_data]
+        if absent:
+            raise ValueError(f"Response is missing sections: {', '.join(absent)}")
+        return {
+            name: written[name] if name in written else sermon_data[name]
+            for name in SERMON_SECTIONS
+        }
+
+    def _build_sermon_messages(self, prompt: str) -> list[Dict[str, str]]:
+        """Build chat messages for a sermon prompt"""
+        return [
+            {
+                "role": "system",
+                "content": SERMON_SYSTEM_PROMPT
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+
+    def _build_sermon_result(
+        self,
+        sermon_data: Dict[str, Any],
+        model: str,
+        input_tokens: int,
+        output_tokens: int,
+        total_tokens: int,
+        cached_tokens: int = 0,
+        generation_ms: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Wrap generated sermon content with generation metadata"""
+        return {
+            "sermon_content": sermon_data,
+            "metadata": {
+                "model": model,
+                "input_tokens": input_tokens,
+                "cached_tokens": cached_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": total_tokens,
+                "generation_ms": generation_ms,
+                "generated_at": datetime.utcnow().isoformat(),
+            },
+            "from_cache": False,
+        }
+
+    def _usage_tokens(self, usage: Any, input_tokens: int) -> tuple[int, int]:
+        """
+        Input and provider-cached prompt tokens from a usage report.
+
+        Args:
+            usage: CompletionUsage, or None if the response had none
+            input_tokens: Local count, used when usage is missing
+
+        Returns:
+            Tuple of (input tokens, cached prompt tokens)
+        """
+        if not usage:
+            return input_tokens, 0
+
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached_tokens = (details.cached_tokens or 0) if details else 0
+        if cached_tokens:
+            print(f"💾 Prompt cache: {cached_tokens}/{usage.prompt_tokens} input tokens cached")
+        return usage.prompt_tokens, cached_tokens
+
+    async def _call_sermon_model(
+        self,
+        verse_texts: list[str],
+        config: SermonConfig,
+        subscription_tier: str,
+        written: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Call OpenAI for a sermon without consulting the cache.
+
+        Args:
+            verse_texts: Actual verse text content
+            config: Sermon configuration
+            subscription_tier: User's subscription tier
+            written: Sermon sections already written; only the others
+                are generated
+
+        Returns:
+            Dict containing sermon content and metadata
+        """
         # Select model based on tier
         model = self._get_model_for_tier(subscription_tier)
 
-        # Count tokens for cost estimation
-        input_tokens = self.count_tokens(prompt, model)
+        written = written or {}
+        missing = [name for name in SERMON_SECTIONS if name not in written]
+        suffix = get_sermon_sections_suffix(missing, written) if written else ""
+
+        # Generate sermon prompt (within the input token budget)
+        prompt, input_tokens = self._build_sermon_prompt(verse_texts, config, model, suffix)
 
         print(f"🤖 Generating sermon with {model}")
         print(f"📊 Input tokens: {input_tokens}")
 
+        started = time.perf_counter()
         try:
             # Call OpenAI API
             response: ChatCompletion = await self.client.chat.completions.create(
                 model=model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a Telugu Christian sermon writer. Generate sermons in Telugu language with deep theological insights."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
+                messages=self._build_sermon_messages(prompt),
                 max_tokens=self.max_tokens_output,
                 temperature=0.7,
                 response_format={"type": "json_object"},
@@ -163,44 +554,418 @@ class OpenAIService:
 
             # Extract response
             content = response.choices[0].message.content
-            sermon_data = json.loads(content)
+            sermon_data = self._merge_sections(json.loads(content), written)
 
             # Token usage
             usage = response.usage
+            input_tokens, cached_tokens = self._usage_tokens(usage, input_tokens)
             output_tokens = usage.completion_tokens if usage else 0
             total_tokens = usage.total_tokens if usage else input_tokens + output_tokens
 
-            # Prepare response
-            result = {
-                "sermon_content": sermon_data,
-                "metadata": {
-                    "model": model,
-                    "input_tokens": input_tokens,
-                    "output_tokens": output_tokens,
-                    "total_tokens": total_tokens,
-                    "generated_at": datetime.utcnow().isoformat(),
-                },
-                "from_cache": False,
-            }
-
-            # Cache the response
-            if use_cache:
-                self.cache_service.set(
-                    cache_key=cache_key,
-                    response_data=result,
-                    verses=verses_dict,
-                    config=config_dict,
-                    request_type="sermon"
-                )
-
             print(f"✅ Sermon generated successfully ({total_tokens} tokens)")
 
-            return result
+            return self._build_sermon_result(
+                sermon_data, model, input_tokens, output_tokens, total_tokens,
+                cached_tokens, round((time.perf_counter() - started) * 1000),
+            )
 
         except Exception as e:
             print(f"❌ OpenAI API error: {e}")
             raise Exception(f"Failed to generate sermon: {str(e)}")
 
+    async def _stream_sermon_model(
+        self,
+        verse_texts: list[str],
+        config: SermonConfig,
+        subscription_tier: str,
+        written: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a sermon from OpenAI without consulting the cache.
+
+        Sections already written are sent right after the start event;
+        the others follow as the model completes each one.
+
+        Args:
+            verse_texts: Actual verse text content
+            config: Sermon configuration
+            subscription_tier: User's subscription tier
+            written: Sermon sections already written; only the others
+                are generated
+
+        Yields:
+            start, section and done events (see generate_sermon_stream)
+        """
+        model = self._get_model_for_tier(subscription_tier)
+
+        written = written or {}
+        missing = [name for name in SERMON_SECTIONS if name not in written]
+        suffix = get_sermon_sections_suffix(missing, written) if written else ""
+
+        prompt, input_tokens = self._build_sermon_prompt(verse_texts, config, model, suffix)
+
+        print(f"🤖 Streaming sermon with {model}")
+        print(f"📊 Input tokens: {input_tokens}")
+
+        parser = IncrementalJSONObjectParser()
+        usage = None
+        started = time.perf_counter()
+
+        yield {"event": "start", "model": model, "from_cache": False}
+        for name in SERMON_SECTIONS:
+            if name in written:
+                yield {"event": "section", "name": name, "data": written[name]}
+
+        try:
+            stream = await self.client.chat.completions.create(
+                model=model,
+                messages=self._build_sermon_messages(prompt),
+                max_tokens=self.max_tokens_output,
+                temperature=0.7,
+                response_format={"type": "json_object"},
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+
+            async for chunk in stream:
+                if chunk.usage:
+                    usage = chunk.usage
+                if not chunk.choices:
+                    continue
+
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+
+                for name, data in parser.feed(delta):
+                    if name not in written:
+                        yield {"event": "section", "name": name, "data": data}
+
+            sermon_data = self._merge_sections(json.loads(parser.buffer), written)
+
+        except Exception as e:
+            print(f"❌ OpenAI streaming error: {e}")
+            raise Exception(f"Failed to generate sermon: {str(e)}")
+
+        input_tokens, cached_tokens = self._usage_tokens(usage, input_tokens)
+        output_tokens = usage.completion_tokens if usage else self.count_tokens(parser.buffer, model)
+        total_tokens = usage.total_tokens if usage else input_tokens + output_tokens
+
+        print(f"✅ Sermon streamed successfully ({total_tokens} tokens)")
+
+        yield {"event": "done", "result": self._build_sermon_result(
+            sermon_data, model, input_tokens, output_tokens, total_tokens,
+            cached_tokens, round((time.perf_counter() - started) * 1000),
+        )}
+
+    def _resolve_inflight(
+        self,
+        cache_key: str,
+        future: asyncio.Future,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[BaseException] = None,
+    ):
+        """Publish the outcome of an in-flight generation to coalesced waiters"""
+        self._inflight.pop(cache_key, None)
+
+        if future.done():
+            return
+
+        if error is None:
+            future.set_result(result)
+            return
+
+        if not isinstance(error, Exception):
+            # Cancellation or client disconnect: fail waiters instead of
+            # cancelling their own requests
+            error = Exception("Sermon generation was interrupted")
+        future.set_exception(error)
+        # Mark as retrieved so an un-awaited failure isn't logged
+        future.exception()
+
+    async def _wait_for_peer(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Wait for another worker holding the generation lease to finish.
+
+        Returns:
+            The peer's cached result, or None if it failed or the lease expired
+        """
+        print(f"⏳ Waiting for peer generation: {cache_key[:16]}...")
+        deadline = time.monotonic() + self.generation_lease_seconds
+
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.coalesce_poll_interval)
+            if not await self.cache_service.is_locked(cache_key):
+                break
+
+        return await self.cache_service.get(cache_key)
+
+    async def _claim_generation(
+        self,
+        cache_key: str,
+    ) -> tuple[Optional[Dict[str, Any]], Optional[tuple[asyncio.Future, Optional[str]]]]:
+        """
+        Claim the generation of a cache key, or take the result of whoever holds it.
+
+        Callers in this process await the holder's future; other workers
+        are held off by a Redis lease and pick the result up from the cache.
+        A claim must be passed to _finish_generation once generation ends.
+
+        Args:
+            cache_key: Cache key identifying the generation
+
+        Returns:
+            Tuple of (result, claim): the coalesced or cached result marked
+            from_cache and no claim, or no result and the claim to generate
+        """
+        inflight = self._inflight.get(cache_key)
+        if inflight:
+            print(f"🔗 Coalesced with in-flight generation: {cache_key[:16]}...")
+            result = await asyncio.shield(inflight)
+            return {**result, "from_cache": True}, None
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
+
+        try:
+            token = await self.cache_service.acquire_lock(cache_key, self.generation_lease_seconds)
+
+            if token is None:
+                cached_response = await self._wait_for_peer(cache_key)
+                if cached_response:
+                    cached_response["from_cache"] = True
+                    self._resolve_inflight(cache_key, future, result=cached_response)
+                    return cached_response, None
+
+                # Peer failed or its lease expired: generate ourselves
+                token = await self.cache_service.acquire_lock(cache_key, self.generation_lease_seconds)
+
+            if token:
+                # A peer may have cached the result since our cache miss
+                cached_response = await self.cache_service.get(cache_key, count=False)
+                if cached_response:
+                    await self.cache_service.release_lock(cache_key, token)
+                    cached_response["from_cache"] = True
+                    self._resolve_inflight(cache_key, future, result=cached_response)
+                    return cached_response, None
+
+        except BaseException as e:
+            self._resolve_inflight(cache_key, future, error=e)
+            raise
+
+        return None, (future, token)
+
+    async def _finish_generation(
+        self,
+        cache_key: str,
+        claim: tuple[asyncio.Future, Optional[str]],
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[BaseException] = None,
+    ):
+        """Release a claim from _claim_generation and publish its outcome"""
+        future, token = claim
+        try:
+            if token:
+                await self.cache_service.release_lock(cache_key, token)
+        finally:
+            self._resolve_inflight(cache_key, future, result=result, error=error)
+
+    async def _single_flight(
+        self,
+        cache_key: str,
+        produce: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> Dict[str, Any]:
+        """
+        Run produce() at most once per cache key across callers and workers.
+
+        Args:
+            cache_key: Cache key identifying the generation
+            produce: Coroutine factory that generates and caches the result
+
+        Returns:
+            Generated (or coalesced) result
+        """
+        result, claim = await self._claim_generation(cache_key)
+        if claim is None:
+            return result
+
+        try:
+            result = await produce()
+        except BaseException as e:
+            await self._finish_generation(cache_key, claim, error=e)
+            raise
+
+        await self._finish_generation(cache_key, claim, result=result)
+        return result
+
+    async def _cache_sermon(
+        self,
+        cache_key: str,
+        result: Dict[str, Any],
+        verses_dict: list[Dict[str, Any]],
+        config_dict: Dict[str, Any],
+    ):
+        """Cache a generated sermon under its full key, indexed for near-duplicates"""
+        await self.cache_service.set(
+            cache_key=cache_key,
+            response_data=result,
+            verses=verses_dict,
+            config=config_dict,
+            request_type="sermon",
+            index_verses=True,
+        )
+
+    async def _get_cached_sermon(
+        self,
+        cache_key: str,
+        verses_dict: list[Dict[str, Any]],
+        config_dict: Dict[str, Any],
+        subscription_tier: str,
+        allow_near_duplicate: bool,
+    ) -> Optional[Dict[str, Any]]:
+        """Cached sermon for the request or, if allowed, for overlapping verses"""
+        cached_response = await self.cache_service.get(cache_key)
+        if cached_response:
+            cached_response["from_cache"] = True
+            return cached_response
+
+        if allow_near_duplicate:
+            return await self._find_near_duplicate(verses_dict, config_dict, subscription_tier)
+        return None
+
+    async def generate_sermon(
+        self,
+        verses: list[VerseReference],
+        verse_texts: list[str],
+        config: SermonConfig,
+        subscription_tier: str = "free",
+        use_cache: bool = True,
+        allow_near_duplicate: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Generate sermon using OpenAI API with caching.
+
+        Concurrent cache misses for the same cache key are coalesced so
+        only one OpenAI call runs per key. On a miss, sections cached by
+        requests for the same verses with another config are reused and
+        only the rest are generated.
+
+        Args:
+            verses: List of verse references
+            verse_texts: Actual verse text content
+            config: Sermon configuration
+            subscription_tier: User's subscription tier
+            use_cache: Whether to use cache (default True)
+            allow_near_duplicate: Whether a cached sermon for overlapping
+                verses may be returned (if the tier allows it); False
+                always yields an entry under this request's own key
+
+        Returns:
+            Dict containing sermon content and metadata
+        """
+        if not use_cache:
+            return await self._call_sermon_model(verse_texts, config, subscription_tier)
+
+        verses_dict, config_dict, cache_key = self._prepare_cache_inputs(verses, config)
+
+        # Check cache first
+        cached_response = await self._get_cached_sermon(
+            cache_key, verses_dict, config_dict, subscription_tier, allow_near_duplicate
+        )
+        if cached_response:
+            return cached_response
+
+        async def produce() -> Dict[str, Any]:
+            result = await self._generate_from_sections(
+                verses_dict, config_dict, verse_texts, config, subscription_tier
+            )
+            await self._cache_sermon(cache_key, result, verses_dict, config_dict)
+            return result
+
+        return await self._single_flight(cache_key, produce)
+
+    async def _replay_cached(self, cached_response: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Replay a finished sermon as stream events"""
+        start = {
+            "event": "start",
+            "model": cached_response.get("metadata", {}).get("model"),
+            "from_cache": cached_response["from_cache"],
+        }
+        if cached_response.get("near_duplicate"):
+            start["near_duplicate"] = cached_response["near_duplicate"]
+        yield start
+        for name, data in cached_response["sermon_content"].items():
+            yield {"event": "section", "name": name, "data": data}
+        yield {"event": "done", "result": cached_response}
+
+    async def generate_sermon_stream(
+        self,
+        verses: list[VerseReference],
+        verse_texts: list[str],
+        config: SermonConfig,
+        subscription_tier: str = "free",
+        use_cache: bool = True,
+        allow_near_duplicate: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Generate sermon with streaming, yielding each section as it completes.
+
+        Yields events of the form:
+            {"event": "start", "model": ..., "from_cache": ...}
+            {"event": "section", "name": "title", "data": ...}
+            {"event": "done", "result": {...}}  (same shape as generate_sermon)
+
+        Caching, coalescing and section reuse work as in generate_sermon:
+        cached and coalesced sermons are replayed, and cached sections are
+        sent before the ones the model writes.
+
+        Args:
+            verses: List of verse references
+            verse_texts: Actual verse text content
+            config: Sermon configuration
+            subscription_tier: User's subscription tier
+            use_cache: Whether to use cache (default True)
+            allow_near_duplicate: Whether a cached sermon for overlapping
+                verses may be returned (if the tier allows it)
+        """
+        if not use_cache:
+            async for event in self._stream_sermon_model(verse_texts, config, subscription_tier):
+                yield event
+            return
+
+        verses_dict, config_dict, cache_key = self._prepare_cache_inputs(verses, config)
+
+        cached_response = await self._get_cached_sermon(
+            cache_key, verses_dict, config_dict, subscription_tier, allow_near_duplicate
+        )
+        claim = None
+        if not cached_response:
+            cached_response, claim = await self._claim_generation(cache_key)
+
+        # Cached sermons are replayed section by section
+        if cached_response:
+            async for event in self._replay_cached(cached_response):
+                yield event
+            return
+
+        result = None
+        try:
+            async for event in self._stream_from_sections(
+                verses_dict, config_dict, verse_texts, config, subscription_tier
+            ):
+                if event["event"] == "done":
+                    result = event["result"]
+                    await self._cache_sermon(cache_key, result, verses_dict, config_dict)
+                    break
+                yield event
+
+        except BaseException as e:
+            await self._finish_generation(cache_key, claim, error=e)
+            raise
+
+        await self._finish_generation(cache_key, claim, result=result)
+        yield {"event": "done", "result": result}
+
     async def generate_devotional(
         self,
         verses: list[VerseReference],
@@ -239,6 +1004,7 @@ class OpenAIService:
         verse_text: str,
         explanation_level: str = "standard",
         subscription_tier: str = "free",
+        cross_references: Optional[list[str]] = None,
     ) -> Dict[str, Any]:
         """
         Generate verse explanation.
@@ -247,25 +1013,16 @@ class OpenAIService:
             verse_text: Verse text to explain
             explanation_level: simple, standard, or deep
             subscription_tier: User's subscription tier
+            cross_references: Related verse labels (BibleService.get_related_verses);
+                returned as the explanation's cross_references instead of
+                asking the model for them
 
         Returns:
             Dict containing explanation
         """
         model = self._get_model_for_tier(subscription_tier)
 
-        prompt = f"""Explain this Bible verse in Telugu:
-
-VERSE: {verse_text}
-
-EXPLANATION LEVEL: {explanation_level}
-
-Provide explanation in JSON format:
-{{
-    "explanation": "Detailed explanation in Telugu",
-    "key_themes": ["theme1", "theme2", "theme3"],
-    "application": "Practical application for daily life"
-}}
-"""
+        prompt = get_verse_explanation_prompt(verse_text, explanation_level, cross_references)
 
         try:
             response: ChatCompletion = await self.client.chat.completions.create(
@@ -273,7 +1030,7 @@ Provide explanation in JSON format:
                 messages=[
                     {
                         "role": "system",
-                        "content": "You are a Telugu Bible scholar. Explain verses clearly."
+                        "content": VERSE_EXPLANATION_SYSTEM_PROMPT
                     },
                     {
                         "role": "user",
@@ -287,6 +1044,8 @@ Provide explanation in JSON format:
 
             content = response.choices[0].message.content
             explanation_data = json.loads(content)
+            if cross_references:
+                explanation_data["cross_references"] = cross_references
 
             return {
                 "explanation": explanation_data,
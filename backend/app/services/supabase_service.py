@@ -5,33 +5,66 @@ Handles user profiles, sermons, subscriptions, and sync
 
 import os
 from typing import Dict, Any, Optional, List
-from datetime import datetime, timedelta
-from supabase import create_client, Client
+from datetime import datetime, timedelta, timezone
+from supabase import acreate_client, AsyncClient
+from supabase.lib.client_options import AsyncClientOptions
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Columns returned by sermon list views (full content only via get_sermon)
+SERMON_SUMMARY_COLUMNS = "id,title,sermon_type,target_audience,created_at"
+
+# Columns read back from the ai_cache table (second-level cache)
+AI_CACHE_COLUMNS = "cache_key,request_type,source_verses,config,response_content,hit_count,expires_at,created_at"
+
 
 class SupabaseService:
     """Handles all Supabase database operations"""
 
     def __init__(self):
-        """Initialize Supabase client"""
-        supabase_url = os.getenv("SUPABASE_URL")
-        supabase_key = os.getenv("SUPABASE_KEY")  # Service role key
+        """Load Supabase settings; the client is created by connect()"""
+        self.supabase_url = os.getenv("SUPABASE_URL")
+        self.supabase_key = os.getenv("SUPABASE_KEY")  # Service role key
 
-        if not supabase_url or not supabase_key:
+        if not self.supabase_url or not self.supabase_key:
             raise ValueError("SUPABASE_URL and SUPABASE_KEY must be set")
 
-        self.client: Client = create_client(supabase_url, supabase_key)
+        self.timeout_seconds = float(os.getenv("SUPABASE_TIMEOUT_SECONDS", 10))
+        self.client: Optional[AsyncClient] = None
+
+    async def connect(self):
+        """
+        Create the async Supabase client.
+
+        Called once from the app lifespan. All requests share the client's
+        PostgREST HTTP session (opened on the first request), so
+        connections are kept alive and reused.
+        """
+        if self.client is not None:
+            return
+
+        self.client = await acreate_client(
+            self.supabase_url,
+            self.supabase_key,
+            options=AsyncClientOptions(postgrest_client_timeout=self.timeout_seconds),
+        )
         print("✅ Supabase connection established")
 
+    async def close(self):
+        """Close the PostgREST HTTP session (called on shutdown)"""
+        if self.client is None:
+            return
+
+        await self.client.postgrest.aclose()
+        self.client = None
+
     # ==================== User Profile Operations ====================
 
     async def get_user_profile(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Get user profile by ID"""
         try:
-            response = self.client.table("user_profiles").select("*").eq("id", user_id).single().execute()
+            response = await self.client.table("user_profiles").select("*").eq("id", user_id).single().execute()
             return response.data
         except Exception as e:
             print(f"❌ Error fetching user profile: {e}")
@@ -40,7 +73,7 @@ class SupabaseService:
     async def update_user_profile(self, user_id: str, updates: Dict[str, Any]) -> bool:
         """Update user profile"""
         try:
-            self.client.table("user_profiles").update(updates).eq("id", user_id).execute()
+            await self.client.table("user_profiles").update(updates).eq("id", user_id).execute()
             return True
         except Exception as e:
             print(f"❌ Error updating user profile: {e}")
@@ -50,53 +83,45 @@ class SupabaseService:
         """
         Check if user has available quota and decrement if available.
 
+        Runs the consume_ai_quota Postgres function (migrations/002), which
+        resets the monthly quota if due and decrements it atomically in a
+        single round trip.
+
         Returns:
-            Dict with success status and remaining quota
+            Dict with success status, remaining quota, reset time and
+            the user's subscription tier
         """
         try:
-            # Get current profile
-            profile = await self.get_user_profile(user_id)
-            if not profile:
+            response = await self.client.rpc("consume_ai_quota", {"p_user_id": user_id}).execute()
+            if not response.data:
                 return {"success": False, "error": "User not found", "quota_remaining": 0}
 
-            quota_monthly = profile["ai_quota_monthly"]
-            quota_used = profile["ai_quota_used"]
-            quota_remaining = quota_monthly - quota_used
-
-            # Check if unlimited (ministry tier)
-            if quota_monthly == -1:
-                return {"success": True, "quota_remaining": -1, "unlimited": True}
-
-            # Check if quota available
-            if quota_remaining <= 0:
-                return {
-                    "success": False,
-                    "error": "Quota exceeded",
-                    "quota_remaining": 0,
-                    "quota_reset_at": profile["ai_quota_reset_at"],
-                }
-
-            # Decrement quota
-            new_quota_used = quota_used + 1
-            await self.update_user_profile(user_id, {"ai_quota_used": new_quota_used})
-
-            return {
-                "success": True,
-                "quota_remaining": quota_remaining - 1,
-                "quota_reset_at": profile["ai_quota_reset_at"],
+            row = response.data[0]
+            result = {
+                "success": row["success"],
+                "quota_remaining": row["quota_remaining"],
+                "quota_reset_at": row["quota_reset_at"],
+                "subscription_tier": row["subscription_tier"],
             }
 
+            if row["unlimited"]:
+                result["unlimited"] = True
+            elif not row["success"]:
+                result["error"] = "Quota exceeded"
+
+            return result
+
         except Exception as e:
             print(f"❌ Error checking quota: {e}")
             return {"success": False, "error": str(e), "quota_remaining": 0}
 
     # ==================== Sermon Operations ====================
 
-    async def create_sermon(self, sermon_data: Dict[str, Any]) -> Optional[str]:
-        """Create new sermon record"""
+    async def create_sermon(self, sermon_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Create new sermon record and return the inserted row"""
         try:
-            response = self.client.table("sermons").insert(sermon_data).execute()
-            return response.data[0]["id"] if response.data else None
+            response = await self.client.table("sermons").insert(sermon_data).execute()
+            return response.data[0] if response.data else None
         except Exception as e:
             print(f"❌ Error creating sermon: {e}")
             return None
@@ -104,7 +129,7 @@ class SupabaseService:
     async def get_sermon(self, sermon_id: str) -> Optional[Dict[str, Any]]:
         """Get sermon by ID"""
         try:
-            response = self.client.table("sermons").select("*").eq("id", sermon_id).single().execute()
+            response = await self.client.table("sermons").select("*").eq("id", sermon_id).single().execute()
             return response.data
         except Exception as e:
             print(f"❌ Error fetching sermon: {e}")
@@ -118,7 +143,7 @@ class SupabaseService:
     ) -> List[Dict[str, Any]]:
         """Get user's sermons with pagination"""
         try:
-            response = (
+            response = await (
                 self.client.table("sermons")
                 .select("*")
                 .eq("user_id", user_id)
@@ -131,20 +156,94 @@ class SupabaseService:
             print(f"❌ Error fetching user sermons: {e}")
             return []
 
-    async def update_sermon(self, sermon_id: str, updates: Dict[str, Any]) -> bool:
-        """Update sermon"""
+    async def get_user_sermon_summaries(
+        self,
+        user_id: str,
+        limit: int = 20,
+        after: Optional[tuple[str, str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get a page of sermon summaries, newest first, using keyset pagination.
+
+        Only the list columns are selected (no JSONB content). Rows are
+        ordered by (created_at, id) descending, so the cost of a page does
+        not grow with how far the user has scrolled.
+
+        Args:
+            user_id: Owner of the sermons
+            limit: Maximum rows to return
+            after: (created_at, id) of the last row of the previous page
+
+        Returns:
+            List of summary rows
+        """
         try:
-            self.client.table("sermons").update(updates).eq("id", sermon_id).execute()
-            return True
+            query = (
+                self.client.table("sermons")
+                .select(SERMON_SUMMARY_COLUMNS)
+                .eq("user_id", user_id)
+            )
+
+            if after:
+                created_at, sermon_id = after
+                query = query.or_(
+                    f'created_at.lt."{created_at}",'
+                    f'and(created_at.eq."{created_at}",id.lt.{sermon_id})'
+                )
+
+            response = await (
+                query
+                .order("created_at", desc=True)
+                .order("id", desc=True)
+                .limit(limit)
+                .execute()
+            )
+            return response.data
+        except Exception as e:
+            print(f"❌ Error fetching sermon summaries: {e}")
+            return []
+
+    async def update_sermon(
+        self,
+        sermon_id: str,
+        user_id: str,
+        updates: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Update a sermon owned by user_id in a single statement.
+
+        Returns:
+            Updated row, or None if no sermon with this ID belongs to the user
+        """
+        try:
+            response = await (
+                self.client.table("sermons")
+                .update(updates)
+                .eq("id", sermon_id)
+                .eq("user_id", user_id)
+                .execute()
+            )
+            return response.data[0] if response.data else None
         except Exception as e:
             print(f"❌ Error updating sermon: {e}")
-            return False
+            return None
+
+    async def delete_sermon(self, sermon_id: str, user_id: str) -> bool:
+        """
+        Delete a sermon owned by user_id in a single statement.
 
-    async def delete_sermon(self, sermon_id: str) -> bool:
-        """Delete sermon"""
+        Returns:
+            True if a sermon was deleted
+        """
         try:
-            self.client.table("sermons").delete().eq("id", sermon_id).execute()
-            return True
+            response = await (
+                self.client.table("sermons")
+                .delete()
+                .eq("id", sermon_id)
+                .eq("user_id", user_id)
+                .execute()
+            )
+            return bool(response.data)
         except Exception as e:
             print(f"❌ Error deleting sermon: {e}")
             return False
@@ -154,7 +253,7 @@ class SupabaseService:
     async def create_subscription(self, subscription_data: Dict[str, Any]) -> Optional[str]:
         """Create subscription record"""
         try:
-            response = self.client.table("subscriptions").insert(subscription_data).execute()
+            response = await self.client.table("subscriptions").insert(subscription_data).execute()
             return response.data[0]["id"] if response.data else None
         except Exception as e:
             print(f"❌ Error creating subscription: {e}")
@@ -163,7 +262,7 @@ class SupabaseService:
     async def get_active_subscription(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Get user's active subscription"""
         try:
-            response = (
+            response = await (
                 self.client.table("subscriptions")
                 .select("*")
                 .eq("user_id", user_id)
@@ -184,7 +283,7 @@ class SupabaseService:
     ) -> bool:
         """Update subscription status"""
         try:
-            self.client.table("subscriptions").update({"status": status}).eq("id", subscription_id).execute()
+            await self.client.table("subscriptions").update({"status": status}).eq("id", subscription_id).execute()
             return True
         except Exception as e:
             print(f"❌ Error updating subscription: {e}")
@@ -195,7 +294,7 @@ class SupabaseService:
     async def create_bookmark(self, bookmark_data: Dict[str, Any]) -> Optional[str]:
         """Create bookmark"""
         try:
-            response = self.client.table("bookmarks").insert(bookmark_data).execute()
+            response = await self.client.table("bookmarks").insert(bookmark_data).execute()
             return response.data[0]["id"] if response.data else None
         except Exception as e:
             print(f"❌ Error creating bookmark: {e}")
@@ -204,7 +303,7 @@ class SupabaseService:
     async def get_user_bookmarks(self, user_id: str) -> List[Dict[str, Any]]:
         """Get user's bookmarks"""
         try:
-            response = (
+            response = await (
                 self.client.table("bookmarks")
                 .select("*")
                 .eq("user_id", user_id)
@@ -219,7 +318,7 @@ class SupabaseService:
     async def delete_bookmark(self, bookmark_id: str) -> bool:
         """Delete bookmark"""
         try:
-            self.client.table("bookmarks").delete().eq("id", bookmark_id).execute()
+            await self.client.table("bookmarks").delete().eq("id", bookmark_id).execute()
             return True
         except Exception as e:
             print(f"❌ Error deleting bookmark: {e}")
@@ -230,7 +329,7 @@ class SupabaseService:
     async def create_highlight(self, highlight_data: Dict[str, Any]) -> Optional[str]:
         """Create highlight"""
         try:
-            response = self.client.table("highlights").insert(highlight_data).execute()
+            response = await self.client.table("highlights").insert(highlight_data).execute()
             return response.data[0]["id"] if response.data else None
         except Exception as e:
             print(f"❌ Error creating highlight: {e}")
@@ -251,7 +350,7 @@ class SupabaseService:
             if chapter is not None:
                 query = query.eq("chapter", chapter)
 
-            response = query.execute()
+            response = await query.execute()
             return response.data
         except Exception as e:
             print(f"❌ Error fetching highlights: {e}")
@@ -262,7 +361,7 @@ class SupabaseService:
     async def create_sync_operation(self, sync_data: Dict[str, Any]) -> Optional[str]:
         """Create sync operation record"""
         try:
-            response = self.client.table("sync_operations").insert(sync_data).execute()
+            response = await self.client.table("sync_operations").insert(sync_data).execute()
             return response.data[0]["id"] if response.data else None
         except Exception as e:
             print(f"❌ Error creating sync operation: {e}")
@@ -275,7 +374,7 @@ class SupabaseService:
     ) -> List[Dict[str, Any]]:
         """Get pending sync operations for user"""
         try:
-            response = (
+            response = await (
                 self.client.table("sync_operations")
                 .select("*")
                 .eq("user_id", user_id)
@@ -292,19 +391,116 @@ class SupabaseService:
     async def mark_sync_processed(self, sync_id: str) -> bool:
         """Mark sync operation as processed"""
         try:
-            self.client.table("sync_operations").update({"processed": True}).eq("id", sync_id).execute()
+            await self.client.table("sync_operations").update({"processed": True}).eq("id", sync_id).execute()
             return True
         except Exception as e:
             print(f"❌ Error marking sync processed: {e}")
             return False
 
+    # ==================== AI Cache Operations ====================
+
+    async def get_ai_cache_entry(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Get an unexpired ai_cache row by cache key"""
+        try:
+            response = await (
+                self.client.table("ai_cache")
+                .select(AI_CACHE_COLUMNS)
+                .eq("cache_key", cache_key)
+                .gt("expires_at", datetime.now(timezone.utc).isoformat())
+                .limit(1)
+                .execute()
+            )
+            return response.data[0] if response.data else None
+        except Exception as e:
+            print(f"❌ Error fetching AI cache entry: {e}")
+            return None
+
+    async def get_hot_ai_cache_entries(self, limit: int, request_type: str) -> List[Dict[str, Any]]:
+        """Get the most-hit ai_cache rows of a request type, expired or not"""
+        try:
+            response = await (
+                self.client.table("ai_cache")
+                .select(AI_CACHE_COLUMNS)
+                .eq("request_type", request_type)
+                .order("hit_count", desc=True)
+                .limit(limit)
+                .execute()
+            )
+            return response.data
+        except Exception as e:
+            print(f"❌ Error fetching hot AI cache entries: {e}")
+            return []
+
+    async def upsert_ai_cache_entries(self, entries: List[Dict[str, Any]]) -> bool:
+        """
+        Insert or replace ai_cache rows in one request.
+
+        Rows are matched on cache_key; hit_count is left as is for
+        existing rows unless given.
+        """
+        try:
+            await self.client.table("ai_cache").upsert(entries, on_conflict="cache_key").execute()
+            return True
+        except Exception as e:
+            print(f"❌ Error writing AI cache entries: {e}")
+            return False
+
+    async def delete_ai_cache_entries(self, cache_keys: List[str]) -> bool:
+        """Delete ai_cache rows by cache key"""
+        try:
+            await self.client.table("ai_cache").delete().in_("cache_key", cache_keys).execute()
+            return True
+        except Exception as e:
+            print(f"❌ Error deleting AI cache entries: {e}")
+            return False
+
+    async def clear_ai_cache(self) -> bool:
+        """Delete every ai_cache row"""
+        try:
+            # PostgREST refuses unfiltered deletes
+            await self.client.table("ai_cache").delete().neq("cache_key", "").execute()
+            return True
+        except Exception as e:
+            print(f"❌ Error clearing AI cache: {e}")
+            return False
+
+    async def increment_ai_cache_hits(self, hits: Dict[str, int]) -> bool:
+        """
+        Add hit counts to ai_cache rows in one round trip.
+
+        Runs the increment_ai_cache_hits Postgres function (migrations/004).
+
+        Args:
+            hits: Cache key -> hits to add
+        """
+        try:
+            await self.client.rpc("increment_ai_cache_hits", {"p_hits": hits}).execute()
+            return True
+        except Exception as e:
+            print(f"❌ Error flushing AI cache hit counts: {e}")
+            return False
+
+    async def cleanup_expired_ai_cache(self) -> int:
+        """
+        Delete expired ai_cache rows (migrations/004).
+
+        Returns:
+            Number of rows deleted
+        """
+        try:
+            response = await self.client.rpc("cleanup_expired_cache", {}).execute()
+            return response.data or 0
+        except Exception as e:
+            print(f"❌ Error cleaning up AI cache: {e}")
+            return 0
+
     # ==================== Subscription Operations ====================
 
     async def upsert_subscription(self, subscription_data: Dict[str, Any]) -> Optional[str]:
         """Create or update subscription"""
         try:
             # Check if subscription exists for this user
-            existing = (
+            existing = await (
                 self.client.table("subscriptions")
                 .select("id")
                 .eq("user_id", subscription_data["user_id"])
@@ -314,7 +510,7 @@ class SupabaseService:
 
             if existing.data:
                 # Update existing subscription
-                response = (
+                response = await (
                     self.client.table("subscriptions")
                     .update(subscription_data)
                     .eq("id", existing.data[0]["id"])
@@ -322,7 +518,7 @@ class SupabaseService:
                 )
             else:
                 # Create new subscription
-                response = self.client.table("subscriptions").insert(subscription_data).execute()
+                response = await self.client.table("subscriptions").insert(subscription_data).execute()
 
             return response.data[0]["id"] if response.data else None
         except Exception as e:
@@ -332,7 +528,7 @@ class SupabaseService:
     async def get_active_subscription(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Get user's active subscription"""
         try:
-            response = (
+            response = await (
                 self.client.table("subscriptions")
                 .select("*")
                 .eq("user_id", user_id)
@@ -349,7 +545,7 @@ class SupabaseService:
     async def update_subscription_status(self, subscription_id: str, status: str) -> bool:
         """Update subscription status"""
         try:
-            self.client.table("subscriptions").update({"status": status}).eq("id", subscription_id).execute()
+            await self.client.table("subscriptions").update({"status": status}).eq("id", subscription_id).execute()
             return True
         except Exception as e:
             print(f"❌ Error updating subscription status: {e}")
@@ -372,7 +568,7 @@ class SupabaseService:
             else:
                 reset_date = datetime(now.year, now.month + 1, 1)
 
-            self.client.table("user_profiles").update({
+            await self.client.table("user_profiles").update({
                 "subscription_tier": tier,
                 "subscription_status": "active",
                 "ai_quota_monthly": quota_monthly,
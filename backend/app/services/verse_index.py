@@ -0,0 +1,142 @@
+"""
+Compact In-Memory Verse Index
+All verse text in one contiguous UTF-8 buffer with an array offset table
+"""
+
+import sqlite3
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+
+class VerseIndex:
+    """
+    Verse text addressed by a dense (book, chapter, verse) ordinal.
+
+    Layout:
+        buffer:  every verse's UTF-8 text, concatenated in canonical order
+        offsets: array('I'); verse with ordinal o spans
+                 buffer[offsets[o]:offsets[o + 1]]
+        chapters: (book_id, chapter) -> (first ordinal, verse count)
+
+    Verses missing from the source (gaps in numbering) have an empty span.
+    The buffer is a single bytes object rather than one str per verse.
+    Each worker process builds its own index at startup.
+    """
+
+    def __init__(
+        self,
+        buffer: bytes,
+        offsets: array,
+        chapters: Dict[Tuple[int, int], Tuple[int, int]],
+    ):
+        self.buffer = buffer
+        self.offsets = offsets
+        self.chapters = chapters
+        self._view = memoryview(buffer)
+
+    @classmethod
+    def from_database(
+        cls,
+        conn: sqlite3.Connection,
+        translation_id: Optional[int] = None,
+    ) -> "VerseIndex":
+        """
+        Build the index from a bible.db connection.
+
+        Ordinals are laid out from each chapter's highest verse number
+        (books only stores per-book totals, which cannot place a verse
+        inside its book).
+
+        Args:
+            conn: Connection to bible.db
+            translation_id: Translation to index (None for databases
+                without translations)
+        """
+        where = ""
+        params: Tuple[int, ...] = ()
+        if translation_id is not None:
+            where = " WHERE translation_id = ?"
+            params = (translation_id,)
+
+        chapters: Dict[Tuple[int, int], Tuple[int, int]] = {}
+        total = 0
+        for book_id, chapter, max_verse in conn.execute(
+            "SELECT book_id, chapter, MAX(verse) FROM verses" + where
+            + " GROUP BY book_id, chapter ORDER BY book_id, chapter",
+            params,
+        ):
+            chapters[(book_id, chapter)] = (total, max_verse)
+            total += max_verse
+
+        offsets = array("I", [0]) * (total + 1)
+        parts: List[bytes] = []
+        position = 0
+        next_ordinal = 0
+
+        for book_id, chapter, verse, text in conn.execute(
+            "SELECT book_id, chapter, verse, text FROM verses" + where
+            + " ORDER BY book_id, chapter, verse",
+            params,
+        ):
+            base, _ = chapters[(book_id, chapter)]
+            ordinal = base + verse - 1
+
+            # Gaps before this verse get empty spans
+            while next_ordinal <= ordinal:
+                offsets[next_ordinal] = position
+                next_ordinal += 1
+
+            encoded = text.encode("utf-8")
+            parts.append(encoded)
+            position += len(encoded)
+
+        while next_ordinal <= total:
+            offsets[next_ordinal] = position
+            next_ordinal += 1
+
+        return cls(b"".join(parts), offsets, chapters)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the text buffer and offset table"""
+        return len(self.buffer) + self.offsets.itemsize * len(self.offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def ordinal(self, book_id: int, chapter: int, verse: int) -> Optional[int]:
+        """Get the ordinal of a verse, or None if out of range"""
+        entry = self.chapters.get((book_id, chapter))
+        if entry is None or not 1 <= verse <= entry[1]:
+            return None
+        return entry[0] + verse - 1
+
+    def get_range(
+        self,
+        book_id: int,
+        chapter: int,
+        verse_start: int,
+        verse_end: int,
+    ) -> Optional[List[Tuple[int, memoryview]]]:
+        """
+        Get a verse range as zero-copy slices of the buffer.
+
+        Returns:
+            List of (verse number, UTF-8 memoryview), or None if any verse
+            in the range is missing
+        """
+        start = self.ordinal(book_id, chapter, verse_start)
+        end = self.ordinal(book_id, chapter, verse_end)
+        if start is None or end is None or end < start:
+            return None
+
+        offsets = self.offsets
+        view = self._view
+        verses = []
+        for ordinal in range(start, end + 1):
+            begin, finish = offsets[ordinal], offsets[ordinal + 1]
+            if begin == finish:
+                return None
+            verses.append((verse_start + ordinal - start, view[begin:finish]))
+
+        return verses
@@ -0,0 +1,222 @@
+"""
+Verse Vector Index
+Memory-mapped verse embeddings for semantic (topic) retrieval
+"""
+
+import json
+import math
+import re
+import unicodedata
+import zlib
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# Words, keeping Indic combining marks and ZWNJ/ZWJ inside words
+# (must match scripts/build_verse_embeddings.py)
+WORD_RE = re.compile(r'[\w\u0900-\u0dff\u200c\u200d]+')
+
+# Rows scored per matrix product, so float16/int8 rows are widened to
+# float32 a block at a time instead of all at once
+BLOCK_ROWS = 8192
+
+
+def vector_paths(db_path: Path) -> Dict[str, Path]:
+    """Files written by scripts/build_verse_embeddings.py next to bible.db"""
+    stem = db_path.with_suffix("")
+    return {
+        name: Path(f"{stem}.vectors{suffix}")
+        for name, suffix in (
+            ("meta", ".json"),
+            ("matrix", ".npy"),
+            ("keys", ".keys.npy"),
+            ("idf", ".idf.npy"),
+            ("centroids", ".centroids.npy"),
+        )
+    }
+
+
+def hashed_features(text: str, ngram: int) -> Iterable[str]:
+    """Words plus character n-grams of each word (Telugu is heavily inflected)"""
+    for word in WORD_RE.findall(unicodedata.normalize("NFC", text).lower()):
+        if word.isdigit():
+            continue
+        yield "w:" + word
+        padded = f"<{word}>"
+        for i in range(len(padded) - ngram + 1):
+            yield "c:" + padded[i:i + ngram]
+
+
+def hashed_tfidf_vector(text: str, idf: np.ndarray, ngram: int) -> np.ndarray:
+    """
+    Embed text as a signed hashed TF-IDF vector of unit length.
+
+    Each feature's CRC32 picks a dimension (low bits) and a sign (top bit),
+    so collisions cancel out on average instead of piling up.
+    """
+    dims = len(idf)
+    vector = np.zeros(dims, dtype=np.float32)
+
+    for feature, count in Counter(hashed_features(text, ngram)).items():
+        h = zlib.crc32(feature.encode("utf-8"))
+        bucket = h % dims
+        sign = 1.0 if h >> 31 else -1.0
+        vector[bucket] += sign * (1.0 + math.log(count)) * idf[bucket]
+
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else vector
+
+
+class VerseVectorIndex:
+    """
+    Unit-length verse embeddings, one row per verse, scored by dot product.
+
+    Layout (all memory-mapped read-only):
+        matrix: (verses, dims) float16 or int8 (scaled by 1/127)
+        keys:   verse key per row (book_id * 1_000_000 + chapter * 1000 + verse)
+        centroids, lists (optional IVF): rows are grouped by nearest
+                centroid; list i spans rows lists[i]:lists[i + 1], so a query
+                scores only the rows of its nprobe closest lists
+    """
+
+    def __init__(
+        self,
+        meta: Dict[str, Any],
+        matrix: np.ndarray,
+        keys: np.ndarray,
+        idf: Optional[np.ndarray] = None,
+        centroids: Optional[np.ndarray] = None,
+    ):
+        self.meta = meta
+        self.matrix = matrix
+        self.keys = keys
+        self.idf = idf
+        self.centroids = centroids
+        self.lists: Optional[List[int]] = meta.get("lists")
+        self.scale = float(meta.get("scale", 1.0))
+        self._rows = {int(key): row for row, key in enumerate(keys)}
+        self._model = None
+
+    @classmethod
+    def load(cls, db_path: Path) -> Optional["VerseVectorIndex"]:
+        """
+        Memory-map the embeddings next to bible.db.
+
+        Returns:
+            The index, or None if no embeddings were built
+        """
+        paths = vector_paths(db_path)
+        if not paths["meta"].is_file():
+            return None
+
+        meta = json.loads(paths["meta"].read_text(encoding="utf-8"))
+        return cls(
+            meta,
+            np.load(paths["matrix"], mmap_mode="r"),
+            np.load(paths["keys"], mmap_mode="r"),
+            np.load(paths["idf"]) if paths["idf"].is_file() else None,
+            np.load(paths["centroids"]) if paths["centroids"].is_file() else None,
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the mapped matrix"""
+        return int(self.matrix.nbytes)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def embed_text(self, text: str) -> np.ndarray:
+        """
+        Embed a query the way the verses were embedded.
+
+        Raises:
+            RuntimeError: If the verses were embedded with a model that
+                is not installed locally
+        """
+        if self.meta["method"] == "hashed-tfidf":
+            return hashed_tfidf_vector(text, self.idf, self.meta["ngram"])
+
+        if self._model is None:
+            try:
+                from sentence_transformers import SentenceTransformer
+                self._model = SentenceTransformer(self.meta["model"], device="cpu", local_files_only=True)
+            except Exception as e:
+                raise RuntimeError(f"Embedding model {self.meta['model']} unavailable: {e}")
+
+        return np.asarray(self._model.encode(text, normalize_embeddings=True), dtype=np.float32)
+
+    def embed_keys(self, keys: Sequence[int]) -> Optional[np.ndarray]:
+        """Mean of the verses' vectors (unit length), or None if none are indexed"""
+        rows = [self._rows[key] for key in keys if key in self._rows]
+        if not rows:
+            return None
+
+        vector = np.asarray(self.matrix[sorted(rows)], dtype=np.float32).sum(axis=0)
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else vector
+
+    def _candidate_ranges(self, query: np.ndarray, nprobe: int) -> List[Tuple[int, int]]:
+        """Row ranges to score: the nprobe closest IVF lists, or everything"""
+        if self.centroids is None or not self.lists or nprobe <= 0:
+            return [(0, len(self.keys))]
+
+        nprobe = min(nprobe, len(self.centroids))
+        closest = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+        return [(self.lists[i], self.lists[i + 1]) for i in sorted(closest)]
+
+    def search(
+        self,
+        query: np.ndarray,
+        limit: int = 10,
+        exclude: Iterable[int] = (),
+        nprobe: int = 0,
+    ) -> List[Tuple[int, float]]:
+        """
+        Top-k verses by cosine similarity.
+
+        Args:
+            query: Unit-length query vector
+            limit: Maximum results
+            exclude: Verse keys to leave out (e.g. the query passage)
+            nprobe: IVF lists to scan (0: exact search over every row)
+
+        Returns:
+            List of (verse key, similarity), most similar first
+        """
+        exclude = set(exclude)
+        wanted = limit + len(exclude)
+        rows: List[np.ndarray] = []
+        scores: List[np.ndarray] = []
+
+        for start, end in self._candidate_ranges(query, nprobe):
+            for block in range(start, end, BLOCK_ROWS):
+                stop = min(block + BLOCK_ROWS, end)
+                block_scores = np.asarray(self.matrix[block:stop], dtype=np.float32) @ query
+                if len(block_scores) > wanted:
+                    top = np.argpartition(-block_scores, wanted - 1)[:wanted]
+                    block_scores = block_scores[top]
+                    rows.append(top + block)
+                else:
+                    rows.append(np.arange(block, stop))
+                scores.append(block_scores)
+
+        if not scores:
+            return []
+
+        all_rows = np.concatenate(rows)
+        all_scores = np.concatenate(scores) * self.scale
+
+        results = []
+        for i in np.argsort(-all_scores, kind="stable"):
+            key = int(self.keys[all_rows[i]])
+            if key in exclude:
+                continue
+            results.append((key, round(float(all_scores[i]), 4)))
+            if len(results) == limit:
+                break
+
+        return results
@@ -0,0 +1,81 @@
+"""
+Incremental JSON parsing for streamed AI responses
+Emits top-level object members as soon as they are complete
+"""
+
+import json
+from typing import Any, List, Tuple
+
+
+class IncrementalJSONObjectParser:
+    """
+    Parse a JSON object that arrives in arbitrary text chunks.
+
+    Only the top-level object is tracked: each ``"key": value`` member is
+    decoded and returned the moment its closing delimiter (``,`` or ``}``)
+    arrives, so callers can forward completed sections while the model is
+    still writing the rest of the object.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._member_start = None
+        self.complete = False
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """
+        Add a chunk of text and return newly completed members.
+
+        Args:
+            chunk: Next piece of the streamed JSON text
+
+        Returns:
+            List of (key, value) tuples completed by this chunk
+        """
+        self.buffer += chunk
+        members = []
+
+        while self._pos < len(self.buffer) and not self.complete:
+            char = self.buffer[self._pos]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+                if self._depth == 1:
+                    self._member_start = self._pos + 1
+            elif char in "}]":
+                if self._depth == 1:
+                    members.extend(self._close_member())
+                    self.complete = True
+                self._depth -= 1
+            elif char == "," and self._depth == 1:
+                members.extend(self._close_member())
+                self._member_start = self._pos + 1
+
+            self._pos += 1
+
+        return members
+
+    def _close_member(self) -> List[Tuple[str, Any]]:
+        """Decode the member between the last delimiter and the current position"""
+        member_text = self.buffer[self._member_start:self._pos].strip()
+        if not member_text:
+            return []
+
+        try:
+            return list(json.loads("{" + member_text + "}").items())
+        except json.JSONDecodeError:
+            # Malformed member; the final full-document parse reports it
+            return []
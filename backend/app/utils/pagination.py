@@ -0,0 +1,40 @@
+"""
+Keyset pagination cursors
+Opaque, URL-safe tokens carrying the sort key of the last item on a page
+"""
+
+import base64
+import binascii
+import json
+from typing import Any
+
+from fastapi import HTTPException
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode the sort key of the last item of a page as an opaque token"""
+    raw = json.dumps(list(values), separators=(",", ":"), ensure_ascii=False).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    """
+    Decode a cursor from encode_cursor.
+
+    Args:
+        cursor: Token from a previous page
+        size: Expected number of sort-key values
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    return values
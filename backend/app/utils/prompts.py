@@ -3,92 +3,82 @@ AI Prompt Templates for Sermon Generation
 Optimized for token efficiency and quality output
 """
 
+import json
+from functools import lru_cache
+from typing import Optional
+
 from app.models.sermon import SermonConfig
 
 
-def get_sermon_prompt(verse_texts: list[str], config: SermonConfig) -> str:
-    """
-    Generate sermon prompt based on configuration.
+SERMON_SYSTEM_PROMPT = (
+    "You are a Telugu Christian sermon writer. "
+    "Generate sermons in Telugu language with deep theological insights."
+)
 
-    Args:
-        verse_texts: List of verse text strings
-        config: Sermon configuration
+VERSE_EXPLANATION_SYSTEM_PROMPT = "You are a Telugu Bible scholar. Explain verses clearly."
 
-    Returns:
-        Formatted prompt string
-    """
-    verses_combined = "\n".join([f"- {verse}" for verse in verse_texts])
-
-    # Sermon type instructions
-    type_instructions = {
-        "expository": "Provide verse-by-verse exposition, explaining the original meaning and context.",
-        "topical": "Organize the sermon around a central theme derived from the verses.",
-        "narrative": "Tell the story in the verses, bringing out lessons and applications.",
-        "devotional": "Focus on personal spiritual growth and daily application.",
-    }
-
-    # Audience adjustments
-    audience_notes = {
-        "youth": "Use relatable examples for young people (ages 15-25).",
-        "children": "Use simple language and stories suitable for ages 6-12.",
-        "adults": "Address mature life topics like career, marriage, parenting.",
-        "seniors": "Focus on wisdom, legacy, and faith in later years.",
-        "general": "Balance accessibility with depth for mixed audience.",
-    }
-
-    # Tone adjustments
-    tone_notes = {
-        "formal": "Use proper theological terminology and structured arguments.",
-        "casual": "Use conversational language and everyday examples.",
-        "passionate": "Use emotive language and urgent calls to action.",
-        "gentle": "Use comforting language and encouraging tone.",
-    }
+# Sermon type instructions
+SERMON_TYPE_INSTRUCTIONS = {
+    "expository": "Provide verse-by-verse exposition, explaining the original meaning and context.",
+    "topical": "Organize the sermon around a central theme derived from the verses.",
+    "narrative": "Tell the story in the verses, bringing out lessons and applications.",
+    "devotional": "Focus on personal spiritual growth and daily application.",
+}
 
-    # Point count based on length
-    point_count_map = {
-        10: 2,
-        15: 3,
-        20: 3,
-        30: 4,
-        45: 5,
-    }
-    point_count = point_count_map.get(config.length_minutes, 3)
+# Audience adjustments
+AUDIENCE_NOTES = {
+    "youth": "Use relatable examples for young people (ages 15-25).",
+    "children": "Use simple language and stories suitable for ages 6-12.",
+    "adults": "Address mature life topics like career, marriage, parenting.",
+    "seniors": "Focus on wisdom, legacy, and faith in later years.",
+    "general": "Balance accessibility with depth for mixed audience.",
+}
 
-    # Build prompt
-    prompt = f"""Generate a {config.sermon_type} sermon in Telugu language.
+# Tone adjustments
+TONE_NOTES = {
+    "formal": "Use proper theological terminology and structured arguments.",
+    "casual": "Use conversational language and everyday examples.",
+    "passionate": "Use emotive language and urgent calls to action.",
+    "gentle": "Use comforting language and encouraging tone.",
+}
 
-VERSE(S):
-{verses_combined}
+# Point count based on length
+POINT_COUNT_MAP = {
+    10: 2,
+    15: 3,
+    20: 3,
+    30: 4,
+    45: 5,
+}
 
-SERMON CONFIGURATION:
-- Type: {config.sermon_type} - {type_instructions.get(config.sermon_type, '')}
-- Target Audience: {config.target_audience} - {audience_notes.get(config.target_audience, '')}
-- Length: {config.length_minutes} minutes (approx {config.length_minutes * 150} words)
-- Tone: {config.tone} - {tone_notes.get(config.tone, '')}
-- Include Illustrations: {'Yes' if config.include_illustrations else 'No'}
+# Instructions shared by every sermon request. Providers cache prompt
+# prefixes, so this goes first and must stay byte-identical: anything
+# request-specific belongs in the configuration or verses after it.
+SERMON_INSTRUCTIONS = """Generate a sermon in Telugu language.
 
 REQUIREMENTS:
 1. Write entirely in Telugu language (తెలుగు)
-2. Include {point_count} main points
+2. Include the number of main points given in the configuration
 3. Each point should have:
    - Clear biblical point
    - Explanation from the verse
-   {"- Practical illustration or story" if config.include_illustrations else ""}
+   - Practical illustration or story, when the configuration includes illustrations
 4. Provide practical application for daily life
 5. Include 3-5 prayer points
 6. Maintain theological accuracy
+7. When cross-referencing, prefer the "Related" verses listed with the verses
 
 OUTPUT FORMAT (JSON only, no markdown):
-{{
+{
   "title": "Sermon title in Telugu",
   "introduction": "Introduction paragraph in Telugu (2-3 sentences setting context)",
   "main_points": [
-    {{
+    {
       "point": "Main point 1 in Telugu",
       "explanation": "Detailed explanation in Telugu (3-4 sentences)",
-      "illustration": "{"Real-life illustration or story in Telugu" if config.include_illustrations else "null"}"
-    }},
-    ... ({point_count} points total)
+      "illustration": "Real-life illustration or story in Telugu, or null without illustrations"
+    },
+    ... (one entry per main point)
   ],
   "application": "Practical application section in Telugu (3-4 sentences)",
   "conclusion": "Conclusion paragraph in Telugu (2-3 sentences with call to action)",
@@ -97,11 +87,92 @@ OUTPUT FORMAT (JSON only, no markdown):
     "Prayer point 2 in Telugu",
     "Prayer point 3 in Telugu"
   ]
-}}
+}
+"""
 
-Generate the sermon now:"""
 
-    return prompt
+def get_point_count(length_minutes: int) -> int:
+    """Number of main points for a sermon length"""
+    return POINT_COUNT_MAP.get(length_minutes, 3)
+
+
+def format_verse_block(verse_texts: list[str]) -> str:
+    """Format verse texts as the prompt's VERSE(S) list"""
+    return "\n".join([f"- {verse}" for verse in verse_texts])
+
+
+def get_sermon_prompt_prefix(config: SermonConfig) -> str:
+    """
+    Get the sermon prompt text that comes before the verses.
+
+    Byte-identical for equal configurations, and shared instructions come
+    before the configuration, so provider-side prompt caching can match
+    across configurations too. Cached, so the text (and its token count)
+    is built once per configuration.
+
+    Returns:
+        Prompt text ending where the verse list starts
+    """
+    return _sermon_prompt_prefix(
+        config.sermon_type,
+        config.target_audience,
+        config.length_minutes,
+        config.tone,
+        config.include_illustrations,
+    )
+
+
+@lru_cache(maxsize=None)
+def _sermon_prompt_prefix(
+    sermon_type: str,
+    target_audience: str,
+    length_minutes: int,
+    tone: str,
+    include_illustrations: bool,
+) -> str:
+    """Build the sermon prompt prefix for one configuration"""
+    point_count = get_point_count(length_minutes)
+
+    return f"""{SERMON_INSTRUCTIONS}
+SERMON CONFIGURATION:
+- Type: {sermon_type} - {SERMON_TYPE_INSTRUCTIONS.get(sermon_type, '')}
+- Target Audience: {target_audience} - {AUDIENCE_NOTES.get(target_audience, '')}
+- Length: {length_minutes} minutes (approx {length_minutes * 150} words)
+- Tone: {tone} - {TONE_NOTES.get(tone, '')}
+- Include Illustrations: {'Yes' if include_illustrations else 'No'}
+- Main Points: {point_count}
+
+VERSE(S):
+"""
+
+
+def get_sermon_sections_suffix(sections: list[str], written: dict) -> str:
+    """
+    Instructions to generate only some sermon sections.
+
+    Appended after the verses, so the prompt prefix stays shared with
+    full sermon requests. Written main points are summarized by their
+    headings to keep the prompt short.
+
+    Args:
+        sections: Sermon fields to generate
+        written: Sermon fields already written (from cache)
+
+    Returns:
+        Text to append to the sermon prompt, after the verses
+    """
+    context = {
+        name: [point.get("point") for point in value] if name == "main_points" else value
+        for name, value in written.items()
+    }
+
+    return f"""
+
+ALREADY WRITTEN (main points by heading):
+{json.dumps(context, ensure_ascii=False, indent=2)}
+
+Write only these fields, consistent with what is already written: {', '.join(sections)}
+Return a JSON object with exactly these fields."""
 
 
 def get_devotional_prompt(verse_texts: list[str]) -> str:
@@ -139,13 +210,20 @@ OUTPUT FORMAT (JSON only):
     return prompt
 
 
-def get_verse_explanation_prompt(verse_text: str, level: str = "standard") -> str:
+def get_verse_explanation_prompt(
+    verse_text: str,
+    level: str = "standard",
+    cross_references: Optional[list[str]] = None,
+) -> str:
     """
     Generate verse explanation prompt.
 
     Args:
         verse_text: Verse text to explain
         level: simple, standard, or deep
+        cross_references: Related verse labels from the cross-reference
+            table; when given, the model uses them instead of inventing
+            its own (and does not return them)
 
     Returns:
         Formatted prompt string
@@ -156,10 +234,19 @@ def get_verse_explanation_prompt(verse_text: str, level: str = "standard") -> st
         "deep": "Provide scholarly exposition with original language insights, historical context, and theological implications.",
     }
 
+    if cross_references:
+        references_section = "\nCROSS REFERENCES (draw on these where relevant):\n" + "\n".join(
+            f"- {reference}" for reference in cross_references
+        ) + "\n"
+        cross_references_field = ""
+    else:
+        references_section = ""
+        cross_references_field = ',\n  "cross_references": ["Book Chapter:Verse", "..."] (optional, if relevant)'
+
     prompt = f"""Explain this Bible verse in Telugu language.
 
 VERSE: {verse_text}
-
+{references_section}
 EXPLANATION LEVEL: {level}
 {depth_instructions.get(level, depth_instructions['standard'])}
 
@@ -167,8 +254,7 @@ OUTPUT FORMAT (JSON only):
 {{
   "explanation": "Detailed explanation in Telugu (3-5 sentences)",
   "key_themes": ["theme 1", "theme 2", "theme 3"],
-  "application": "How to apply this verse in daily life (Telugu, 2-3 sentences)",
-  "cross_references": ["Book Chapter:Verse", "..."] (optional, if relevant)
+  "application": "How to apply this verse in daily life (Telugu, 2-3 sentences)"{cross_references_field}
 }}"""
 
     return prompt
@@ -0,0 +1,96 @@
+"""
+HTTP conditional and range responses for immutable downloads
+"""
+
+import re
+from typing import Optional
+
+from fastapi import Request, Response
+
+
+RANGE_RE = re.compile(r"bytes=(\d*)-(\d*)")
+
+
+def _parse_range(header: str, size: int) -> Optional[tuple[int, int]]:
+    """
+    Parse a single "bytes=start-end" range into inclusive offsets.
+
+    Returns:
+        (start, end), or None if the range cannot be satisfied
+
+    Raises:
+        ValueError: If the header is not a single byte range
+    """
+    match = RANGE_RE.fullmatch(header.strip())
+    if not match or match.groups() == ("", ""):
+        raise ValueError("Unsupported range")
+
+    start, end = match.groups()
+    if start == "":
+        # Suffix range: the last N bytes
+        length = int(end)
+        if length == 0:
+            return None
+        return max(size - length, 0), size - 1
+
+    first = int(start)
+    last = min(int(end), size - 1) if end else size - 1
+    if first >= size or last < first:
+        return None
+    return first, last
+
+
+def immutable_response(
+    request: Request,
+    data: bytes,
+    etag: str,
+    media_type: str,
+) -> Response:
+    """
+    Serve content-addressed bytes with ETag and single-range support.
+
+    - If-None-Match with the ETag returns 304
+    - Range: bytes=... returns 206 (or 416 if unsatisfiable), so
+      interrupted downloads resume; If-Range with another ETag sends
+      the full body instead
+    - Multiple or malformed ranges are ignored (full body)
+
+    Args:
+        request: Incoming request
+        data: Response body
+        etag: Strong validator (e.g. the body's sha256)
+        media_type: Content type
+
+    Returns:
+        Response with Cache-Control for immutable content
+    """
+    quoted = f'"{etag}"'
+    headers = {
+        "ETag": quoted,
+        "Accept-Ranges": "bytes",
+        # Private: downloads are authenticated
+        "Cache-Control": "private, max-age=31536000, immutable",
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or quoted in [t.strip() for t in if_none_match.split(",")]):
+        return Response(status_code=304, headers=headers)
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (if_range is None or if_range.strip() == quoted):
+        try:
+            byte_range = _parse_range(range_header, len(data))
+        except ValueError:
+            byte_range = (0, len(data) - 1)
+
+        if byte_range is None:
+            headers["Content-Range"] = f"bytes */{len(data)}"
+            return Response(status_code=416, headers=headers)
+
+        start, end = byte_range
+        if (start, end) != (0, len(data) - 1):
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(data)}"
+            return Response(data[start:end + 1], status_code=206, headers=headers, media_type=media_type)
+
+    return Response(data, headers=headers, media_type=media_type)
@@ -0,0 +1,93 @@
+"""
+Token counting with cached tiktoken encoders
+Falls back to a script-aware estimate when an encoder cannot be loaded
+"""
+
+import math
+from functools import lru_cache
+from typing import Iterable, Optional
+
+import tiktoken
+
+
+# Encoding for model names tiktoken does not know
+DEFAULT_ENCODING = "cl100k_base"
+
+
+@lru_cache(maxsize=None)
+def get_encoding(model: str) -> Optional[tiktoken.Encoding]:
+    """
+    Get the tokenizer for a model, loaded once per process.
+
+    Returns:
+        The encoding, or None if it cannot be loaded (e.g. the BPE file
+        is not cached and there is no network); counts are then estimated
+    """
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding(DEFAULT_ENCODING)
+    except Exception as e:
+        print(f"⚠️  Tokenizer for {model} unavailable, estimating token counts: {e}")
+        return None
+
+
+def warm_up_encoders(models: Iterable[str]):
+    """Load the encoders for these models (call at startup)"""
+    for model in set(models):
+        if get_encoding(model) is not None:
+            print(f"✅ Tokenizer loaded for {model}")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate a token count without a tokenizer.
+
+    English averages about 4 characters per token, but BPE vocabularies
+    have few merges for Indic scripts: Telugu runs at roughly one token per
+    2 UTF-8 bytes (1.5 per character), so non-ASCII text is counted by bytes.
+    Errs high, which is the safe side for budgets.
+    """
+    ascii_chars = sum(1 for char in text if char < "\x80")
+    other_bytes = len(text.encode("utf-8")) - ascii_chars
+    return math.ceil(ascii_chars / 4 + other_bytes / 2)
+
+
+def count_tokens(text: str, model: str) -> int:
+    """Count tokens in text for a model"""
+    encoding = get_encoding(model)
+    if encoding is None:
+        return estimate_tokens(text)
+    return len(encoding.encode(text))
+
+
+@lru_cache(maxsize=1024)
+def count_static_tokens(text: str, model: str) -> int:
+    """count_tokens for text that repeats across requests (prompt templates)"""
+    return count_tokens(text, model)
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: str) -> str:
+    """
+    Cut text to at most max_tokens tokens.
+
+    Cuts on a token boundary, dropping a partial multi-byte character.
+    """
+    if max_tokens <= 0:
+        return ""
+
+    encoding = get_encoding(model)
+    if encoding is None:
+        # Estimate is additive per character, so cut where it runs out
+        used = 0.0
+        for i, char in enumerate(text):
+            used += 0.25 if char < "\x80" else len(char.encode("utf-8")) / 2
+            if math.ceil(used) > max_tokens:
+                return text[:i]
+        return text
+
+    tokens = encoding.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode_bytes(tokens[:max_tokens]).decode("utf-8", errors="ignore")
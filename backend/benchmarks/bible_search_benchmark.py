@@ -0,0 +1,98 @@
+"""
+Benchmark verse search latency over the Bible database
+Reports p50/p99 per query type for GET /api/v1/bible/search
+
+Usage (from backend/):
+    python benchmarks/bible_search_benchmark.py [path/to/bible.db]
+
+Run against the full Bible built by scripts/create_bible_db.py; the
+bundled minimal database only contains a few verses.
+"""
+
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.bible_service import BibleService
+
+
+QUERIES_PER_TYPE = 500
+PAGE_SIZE = 21  # endpoint default (20) plus the look-ahead row
+SEED = 42
+
+
+def sample_words(service: BibleService, count: int) -> list[str]:
+    """Sample words from random verses"""
+    rng = random.Random(SEED)
+    texts = [text for (text,) in service.conn.execute("SELECT text FROM verses")]
+    words = []
+    while len(words) < count:
+        candidates = [w.strip(".,;:!?\"'()") for w in rng.choice(texts).split()]
+        candidates = [w for w in candidates if len(w) >= 4]
+        if candidates:
+            words.append(rng.choice(candidates))
+    return words
+
+
+def build_queries(words: list[str]) -> dict:
+    """Build query sets for each search path"""
+    rng = random.Random(SEED)
+    return {
+        "word": [(w, {}) for w in words],
+        "two words": [(f"{a} {b}", {}) for a, b in zip(words, reversed(words))],
+        "prefix": [(w[:3], {}) for w in words],
+        "partial": [(w[1:-1], {}) for w in words],
+        "word + NT filter": [(w, {"testament": "NT"}) for w in words],
+        "word + book filter": [(w, {"book_id": rng.randint(1, 66)}) for w in words],
+    }
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * len(ordered))))]
+
+
+def main():
+    """Main execution function"""
+    print("=" * 60)
+    print("Bible Search Benchmark")
+    print("=" * 60)
+
+    db_path = sys.argv[1] if len(sys.argv) > 1 else None
+    service = BibleService(db_path)
+
+    if not service.search_enabled:
+        print("\n❌ Search index missing; run scripts/create_bible_db.py --rebuild-search")
+        return
+
+    verse_count = service.conn.execute("SELECT COUNT(*) FROM verses").fetchone()[0]
+    queries = build_queries(sample_words(service, QUERIES_PER_TYPE))
+
+    print(f"\nDatabase: {service.db_path} ({verse_count} verses, {QUERIES_PER_TYPE} queries/type)\n")
+    print(f"{'Query type':<22}{'p50 ms':>9}{'p99 ms':>9}{'mean hits':>11}{'partial':>9}")
+
+    for name, cases in queries.items():
+        latencies = []
+        hits = []
+        partial = 0
+        for query, filters in cases:
+            start = time.perf_counter()
+            page = service.search(query, limit=PAGE_SIZE, **filters)
+            latencies.append((time.perf_counter() - start) * 1000)
+            hits.append(len(page["results"]))
+            partial += page["mode"] == "partial"
+
+        print(
+            f"{name:<22}{percentile(latencies, 50):>9.2f}{percentile(latencies, 99):>9.2f}"
+            f"{statistics.mean(hits):>11.1f}{partial / len(cases):>9.0%}"
+        )
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
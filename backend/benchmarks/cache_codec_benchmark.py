@@ -0,0 +1,113 @@
+"""
+Benchmark cache entry codecs on a sample Telugu sermon
+Reports bytes per entry and encode/decode time for each codec
+
+Usage (from backend/):
+    python benchmarks/cache_codec_benchmark.py
+"""
+
+import json
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.cache_codec import CacheCodec, zstandard
+
+
+SAMPLE_FILE = Path(__file__).resolve().parents[1] / "test_sermon_output.txt"
+ITERATIONS = 2000
+
+
+def build_sample_entry(text: str) -> dict:
+    """Build a cached sermon result shaped like OpenAIService output"""
+    paragraphs = [p.strip() for p in text.split("\n") if p.strip()]
+
+    return {
+        "sermon_content": {
+            "title": paragraphs[0],
+            "introduction": paragraphs[1],
+            "main_points": [
+                {"point": paragraph, "explanation": paragraph, "illustration": None}
+                for paragraph in paragraphs[3:-1]
+            ],
+            "application": paragraphs[1],
+            "conclusion": paragraphs[-1],
+            "prayer_points": paragraphs[3:-1],
+        },
+        "metadata": {
+            "model": "gpt-4",
+            "input_tokens": 512,
+            "output_tokens": 1500,
+            "total_tokens": 2012,
+            "generated_at": "2026-02-01T00:00:00",
+        },
+        "from_cache": False,
+    }
+
+
+class LegacyJSONCodec:
+    """The pre-codec format: json.dumps text with ASCII escapes"""
+
+    def encode(self, value):
+        data = json.dumps(value).encode()
+        return data, len(data)
+
+    def decode(self, payload):
+        return json.loads(payload), len(payload)
+
+
+def benchmark(name: str, codec: CacheCodec, entry: dict) -> dict:
+    """Measure size and per-entry encode/decode time for one codec"""
+    payload, _ = codec.encode(entry)
+    assert codec.decode(payload)[0] == entry
+
+    encode_s = timeit.timeit(lambda: codec.encode(entry), number=ITERATIONS)
+    decode_s = timeit.timeit(lambda: codec.decode(payload), number=ITERATIONS)
+
+    return {
+        "name": name,
+        "bytes": len(payload),
+        "encode_us": encode_s / ITERATIONS * 1e6,
+        "decode_us": decode_s / ITERATIONS * 1e6,
+    }
+
+
+def main():
+    """Main execution function"""
+    print("=" * 60)
+    print("Cache Codec Benchmark")
+    print("=" * 60)
+
+    if not SAMPLE_FILE.exists():
+        print(f"\n❌ Sample file not found: {SAMPLE_FILE}")
+        return
+
+    entry = build_sample_entry(SAMPLE_FILE.read_text(encoding="utf-8"))
+
+    codecs = [
+        ("legacy json", LegacyJSONCodec()),
+        ("utf-8 json", CacheCodec("json")),
+        ("json+zlib", CacheCodec("zlib")),
+    ]
+    if zstandard is not None:
+        codecs.append(("orjson+zstd", CacheCodec("zstd")))
+    else:
+        print("\n⚠️  zstandard not installed; skipping orjson+zstd")
+
+    results = [benchmark(name, codec, entry) for name, codec in codecs]
+    baseline = results[0]["bytes"]
+
+    print(f"\nSample: {SAMPLE_FILE.name} ({ITERATIONS} iterations)\n")
+    print(f"{'Codec':<16}{'Bytes':>8}{'Ratio':>8}{'Encode µs':>12}{'Decode µs':>12}")
+    for r in results:
+        print(
+            f"{r['name']:<16}{r['bytes']:>8}{r['bytes'] / baseline:>8.2f}"
+            f"{r['encode_us']:>12.1f}{r['decode_us']:>12.1f}"
+        )
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
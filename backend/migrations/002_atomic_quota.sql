@@ -0,0 +1,73 @@
+-- Bible Sermon Assistant - Atomic AI Quota Consumption
+-- Run this script in your Supabase SQL Editor after 001_initial_schema.sql
+
+-- Check, reset (if due) and decrement a user's AI quota in one statement.
+-- The UPDATE takes a row lock, so concurrent generations from the same
+-- account cannot both pass the check (no lost updates).
+--
+-- Returns one row (none if the profile does not exist):
+--   success           - TRUE if a generation may proceed
+--   quota_remaining   - quota left after this call (-1 = unlimited)
+--   quota_reset_at    - when the monthly quota resets
+--   subscription_tier - user's tier (saves a separate profile lookup)
+--   unlimited         - TRUE for unlimited (ministry) plans
+CREATE OR REPLACE FUNCTION consume_ai_quota(p_user_id UUID)
+RETURNS TABLE (
+    success BOOLEAN,
+    quota_remaining INTEGER,
+    quota_reset_at TIMESTAMPTZ,
+    subscription_tier TEXT,
+    unlimited BOOLEAN
+) AS $$
+DECLARE
+    v_profile user_profiles%ROWTYPE;
+BEGIN
+    -- Roll the monthly quota over if the reset date has passed, then
+    -- consume one unit if any remain
+    UPDATE user_profiles AS p
+    SET
+        ai_quota_used = CASE
+            WHEN p.ai_quota_reset_at <= NOW() THEN 1
+            ELSE p.ai_quota_used + 1
+        END,
+        ai_quota_reset_at = CASE
+            WHEN p.ai_quota_reset_at <= NOW() THEN NOW() + INTERVAL '1 month'
+            ELSE p.ai_quota_reset_at
+        END
+    WHERE p.id = p_user_id
+      AND p.ai_quota_monthly <> -1
+      AND (CASE WHEN p.ai_quota_reset_at <= NOW() THEN 0 ELSE p.ai_quota_used END) < p.ai_quota_monthly
+    RETURNING p.* INTO v_profile;
+
+    IF FOUND THEN
+        RETURN QUERY SELECT
+            TRUE,
+            v_profile.ai_quota_monthly - v_profile.ai_quota_used,
+            v_profile.ai_quota_reset_at,
+            v_profile.subscription_tier,
+            FALSE;
+        RETURN;
+    END IF;
+
+    -- Nothing consumed: unlimited plan, quota exhausted, or no profile
+    SELECT * INTO v_profile FROM user_profiles AS p WHERE p.id = p_user_id;
+    IF NOT FOUND THEN
+        RETURN;
+    END IF;
+
+    RETURN QUERY SELECT
+        v_profile.ai_quota_monthly = -1,
+        CASE WHEN v_profile.ai_quota_monthly = -1 THEN -1 ELSE 0 END,
+        v_profile.ai_quota_reset_at,
+        v_profile.subscription_tier,
+        v_profile.ai_quota_monthly = -1;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Only the backend (service role) may consume quota on a user's behalf;
+-- 001 granted all functions to anon/authenticated
+REVOKE EXECUTE ON FUNCTION consume_ai_quota(UUID) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION consume_ai_quota(UUID) TO service_role;
+
+-- Rollback:
+--   DROP FUNCTION IF EXISTS consume_ai_quota(UUID);
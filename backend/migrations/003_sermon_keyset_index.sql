@@ -0,0 +1,10 @@
+-- Bible Sermon Assistant - Sermon List Keyset Index
+-- Run this script in your Supabase SQL Editor after 002_atomic_quota.sql
+
+-- Supports GET /api/v1/sermons/summaries, which pages a user's sermons
+-- by (created_at, id) descending instead of OFFSET
+CREATE INDEX IF NOT EXISTS idx_sermons_user_created_id
+    ON sermons(user_id, created_at DESC, id DESC);
+
+-- Rollback:
+--   DROP INDEX IF EXISTS idx_sermons_user_created_id;
@@ -0,0 +1,52 @@
+-- Bible Sermon Assistant - AI Cache as Durable Second-Level Cache
+-- Run this script in your Supabase SQL Editor after 003_sermon_keyset_index.sql
+
+-- The backend writes Redis cache entries behind to ai_cache and reads them
+-- back on Redis misses. Hits are counted in Redis and added here in bulk.
+
+-- Add hit counts for many entries in one statement.
+--
+-- p_hits: {"<cache_key>": <hits to add>, ...}
+-- Returns the number of rows updated (keys not in the table are skipped).
+CREATE OR REPLACE FUNCTION increment_ai_cache_hits(p_hits JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+    v_updated INTEGER;
+BEGIN
+    UPDATE ai_cache AS c
+    SET hit_count = c.hit_count + h.value::INTEGER
+    FROM jsonb_each_text(p_hits) AS h
+    WHERE c.cache_key = h.key;
+
+    GET DIAGNOSTICS v_updated = ROW_COUNT;
+    RETURN v_updated;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Report how many expired entries were deleted (001 returned void).
+-- The return type changes, so the function is recreated; the cron job
+-- from migrations/README.md calls it by name and keeps working.
+DROP FUNCTION IF EXISTS cleanup_expired_cache();
+CREATE FUNCTION cleanup_expired_cache()
+RETURNS INTEGER AS $$
+DECLARE
+    v_deleted INTEGER;
+BEGIN
+    DELETE FROM ai_cache WHERE expires_at <= NOW();
+
+    GET DIAGNOSTICS v_deleted = ROW_COUNT;
+    RETURN v_deleted;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Cache entries are shared across users: only the backend (service role)
+-- may change them; 001 granted all functions to anon/authenticated
+REVOKE EXECUTE ON FUNCTION increment_ai_cache_hits(JSONB) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION cleanup_expired_cache() FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION increment_ai_cache_hits(JSONB) TO service_role;
+GRANT EXECUTE ON FUNCTION cleanup_expired_cache() TO service_role;
+
+-- Rollback:
+--   DROP FUNCTION IF EXISTS increment_ai_cache_hits(JSONB);
+--   DROP FUNCTION IF EXISTS cleanup_expired_cache();
+--   (then re-run the cleanup_expired_cache definition from 001_initial_schema.sql)
@@ -0,0 +1,100 @@
+"""
+Prewarm the sermon cache before peak traffic
+Generates sermons for upcoming lectionary readings and the most-hit cached
+passages, spending at most PREWARM_SPEND_SHARE of DAILY_SPEND_LIMIT a day
+
+Progress is saved to the state file after every sermon, so an interrupted
+run picks up where it stopped when started again the same day.
+
+Usage (from backend/):
+    python prewarm_cache.py --lectionary ../data/lectionary.json
+    python prewarm_cache.py --hot 200 --budget 2.50   # hot passages only
+
+Cron (Saturday evening, ahead of Sunday):
+    0 18 * * 6  cd /srv/app/backend && python prewarm_cache.py --lectionary ../data/lectionary.json
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from dotenv import load_dotenv
+
+from app.services.cache_prewarm import CachePrewarmer, PrewarmState, load_lectionary
+from app.services.cache_service import get_cache_service
+from app.services.supabase_service import get_supabase_service
+
+
+async def prewarm(args: argparse.Namespace):
+    """Connect the services, prewarm and print a summary"""
+    cache_service = get_cache_service()
+    if not await cache_service.connect():
+        print("❌ Redis unavailable, nothing to prewarm")
+        return
+
+    supabase_service = None
+    try:
+        supabase_service = get_supabase_service()
+        await supabase_service.connect()
+    except ValueError as e:
+        print(f"⚠️  Database disabled, using Redis hit counts only: {e}")
+
+    try:
+        readings = []
+        if args.lectionary:
+            readings = load_lectionary(args.lectionary, datetime.utcnow().date(), args.days)
+            print(f"✅ Lectionary: {len(readings)} readings in the next {args.days} days")
+
+        prewarmer = CachePrewarmer(
+            PrewarmState(args.state),
+            budget=args.budget,
+            concurrency=args.concurrency,
+            horizon_hours=args.hours,
+            subscription_tier=args.tier,
+        )
+        targets = await prewarmer.plan(readings, hot_limit=args.hot, config_count=args.configs)
+        print(f"✅ {len(targets)} sermons to prewarm (budget ${prewarmer.budget:.2f}, "
+              f"${prewarmer.state.spent:.2f} spent today)")
+
+        summary = await prewarmer.run(targets)
+        print(f"\nPrewarm summary: {summary}")
+    finally:
+        await cache_service.close()
+        if supabase_service:
+            await supabase_service.close()
+
+
+def main():
+    """Main execution function"""
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Prewarm the sermon cache")
+    parser.add_argument("--lectionary", help="Lectionary JSON file (see app/services/cache_prewarm.py)")
+    parser.add_argument("--days", type=int, default=7, help="Lectionary days ahead to prewarm")
+    parser.add_argument("--hot", type=int, default=100, help="Most-hit cached sermons to keep warm (0: none)")
+    parser.add_argument("--configs", type=int, default=3, help="Most-hit configs to generate per reading")
+    parser.add_argument("--concurrency", type=int, default=4, help="Sermons generated at once")
+    parser.add_argument("--hours", type=float, default=48, help="Refresh entries expiring within this many hours")
+    parser.add_argument("--tier", default="free", help="Subscription tier to generate as (selects the model)")
+    parser.add_argument(
+        "--budget",
+        type=float,
+        help="USD to spend today (default: PREWARM_SPEND_SHARE of DAILY_SPEND_LIMIT)",
+    )
+    parser.add_argument("--state", default="prewarm_state.json", help="Progress file for resuming")
+    args = parser.parse_args()
+
+    if args.lectionary and not os.path.exists(args.lectionary):
+        print(f"\n❌ Lectionary not found: {args.lectionary}")
+        return
+
+    asyncio.run(prewarm(args))
+
+
+if __name__ == "__main__":
+    main()
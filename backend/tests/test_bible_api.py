@@ -0,0 +1,310 @@
+"""
+Bible API Tests
+Tests for the verse search and parallel translation endpoints
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.sermon import VerseReference
+from app.routers.bible import _decode_search_cursor
+from app.services.bible_service import SearchUnavailableError, TranslationNotFoundError
+from app.utils.auth import get_current_user
+
+client = TestClient(app)
+
+RESULTS = [
+    {
+        "id": i,
+        "book_id": 43,
+        "book_name": "యోహాను సువార్త",
+        "chapter": 3,
+        "verse": 15 + i,
+        "text": f"text {i}",
+        "snippet": f"<mark>text</mark> {i}",
+        "score": -2.0 + i * 0.1,
+    }
+    for i in (1, 2, 3)
+]
+
+
+@pytest.fixture(autouse=True)
+def authenticated():
+    """Authenticate requests as test-user-123"""
+    app.dependency_overrides[get_current_user] = lambda: "test-user-123"
+    yield
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+class TestVerseSearch:
+    """Tests for GET /api/v1/bible/search"""
+
+    def test_search_pages_with_cursor(self, mocker):
+        """Test that a full page returns a cursor for the last result"""
+        mock_bible = mocker.patch('app.routers.bible.get_bible_service')
+        mock_bible.return_value.search.return_value = {"mode": "word", "results": RESULTS}
+
+        response = client.get("/api/v1/bible/search", params={"q": "text", "limit": 2, "testament": "NT"})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["mode"] == "word"
+        assert [r["verse"] for r in data["results"]] == [16, 17]
+        assert _decode_search_cursor(data["next_cursor"]) == ("word", RESULTS[1]["score"], 2)
+        mock_bible.return_value.search.assert_called_once_with(
+            "text", book_id=None, testament="NT", limit=3, after=None, translation=None
+        )
+
+    def test_last_page(self, mocker):
+        """Test that the last page has no cursor"""
+        mock_bible = mocker.patch('app.routers.bible.get_bible_service')
+        mock_bible.return_value.search.return_value = {"mode": "partial", "results": RESULTS[:1]}
+
+        response = client.get("/api/v1/bible/search", params={"q": "tex"})
+
+        assert response.status_code == 200
+        assert response.json()["next_cursor"] is None
+
+    def test_invalid_cursor(self, mocker):
+        """Test that a malformed cursor is rejected"""
+        mocker.patch('app.routers.bible.get_bible_service')
+
+        response = client.get("/api/v1/bible/search", params={"q": "text", "cursor": "bm90LWpzb24"})
+
+        assert response.status_code == 400
+
+    def test_search_unavailable(self, mocker):
+        """Test that a missing search index returns 503"""
+        mock_bible = mocker.patch('app.routers.bible.get_bible_service')
+        mock_bible.return_value.search.side_effect = SearchUnavailableError("Bible search index is not built")
+
+        response = client.get("/api/v1/bible/search", params={"q": "text"})
+
+        assert response.status_code == 503
+
+
+class TestParallelPassage:
+    """Tests for GET /api/v1/bible/translations and /parallel"""
+
+    def test_list_translations(self, mocker):
+        """Test that translations are listed in database order"""
+        mock_bible = mocker.patch('app.routers.bible.get_bible_service')
+        mock_bible.return_value.translations = {
+            "tel": {"id": 1, "code": "tel", "name": "Telugu", "language": "te"},
+            "hin": {"id": 2, "code": "hin", "name": "Hindi", "language": "hi"},
+        }
+
+        response = client.get("/api/v1/bible/translations")
+
+        assert response.status_code == 200
+        assert [t["code"] for t in response.json()] == ["tel", "hin"]
+
+    def test_parallel_passage(self, mocker):
+        """Test that every requested translation is returned in order"""
+        mock_bible = mocker.patch('app.routers.bible.get_bible_service')
+        mock_bible.return_value.get_parallel_verses.return_value = {
+            "tel": [[(16, "తెలుగు")]],
+            "hin": [[(16, "हिंदी")]],
+        }
+        mock_bible.return_value.get_book_name.side_effect = lambda book_id, code: f"{code}-{book_id}"
+
+        response = client.get("/api/v1/bible/parallel", params={
+            "book_id": 43, "chapter": 3, "verse_start": 16, "translations": ["tel", "hin"],
+        })
+
+        assert response.status_code == 200
+        passages = response.json()["passages"]
+        assert [(p["translation"], p["book_name"]) for p in passages] == [("tel", "tel-43"), ("hin", "hin-43")]
+        assert passages[1]["verses"] == [{"verse": 16, "text": "हिंदी"}]
+        refs, codes = mock_bible.return_value.get_parallel_verses.call_args.args
+        assert refs[0].verse_start == 16
+        assert codes == ["tel", "hin"]
+
+    def test_unknown_translation(self, mocker):
+        """Test that an unknown translation code returns 404"""
+        mock_bible = mocker.patch('app.routers.bible.get_bible_service')
+        mock_bible.return_value.get_parallel_verses.side_effect = TranslationNotFoundError("Translation not found: xyz")
+
+        response = client.get("/api/v1/bible/parallel", params={
+            "book_id": 43, "chapter": 3, "verse_start": 16, "translations": ["tel", "xyz"],
+        })
+
+        assert response.status_code == 404
+
+
+class TestSimilarVerses:
+    """Tests for GET /api/v1/bible/similar"""
+
+    def test_topic_query(self, mocker):
+        """Test that a topic query returns ranked verses"""
+        mock_bible = mocker.patch('app.routers.bible.get_bible_service')
+        mock_bible.return_value.find_similar_verses.return_value = [
+            {k: v for k, v in RESULTS[0].items() if k not in ("id", "snippet")},
+        ]
+
+        response = client.get("/api/v1/bible/similar", params={"q": "ప్రేమ", "limit": 5})
+
+        assert response.status_code == 200
+        assert response.json()[0]["verse"] == 16
+        mock_bible.return_value.find_similar_verses.assert_called_once_with("ప్రేమ", None, 5)
+
+    def test_passage_query(self, mocker):
+        """Test that a passage is passed as a reference"""
+        mock_bible = mocker.patch('app.routers.bible.get_bible_service')
+        mock_bible.return_value.find_similar_verses.return_value = []
+
+        response = client.get("/api/v1/bible/similar", params={"book_id": 43, "chapter": 3, "verse_start": 16})
+
+        assert response.status_code == 200
+        query, reference, limit = mock_bible.return_value.find_similar_verses.call_args.args
+        assert query is None
+        assert (reference.book_id, reference.chapter, reference.verse_start) == (43, 3, 16)
+
+    def test_query_required(self):
+        """Test that a topic or passage is required"""
+        response = client.get("/api/v1/bible/similar", params={"book_id": 43})
+
+        assert response.status_code == 400
+
+    def test_embeddings_missing(self, mocker):
+        """Test that missing embeddings return 503"""
+        mock_bible = mocker.patch('app.routers.bible.get_bible_service')
+        mock_bible.return_value.find_similar_verses.side_effect = SearchUnavailableError("Verse embeddings are not built")
+
+        response = client.get("/api/v1/bible/similar", params={"q": "ప్రేమ"})
+
+        assert response.status_code == 503
+
+
+class TestRelatedVerses:
+    """Tests for GET /api/v1/bible/related"""
+
+    def test_related_verses(self, mocker):
+        """Test that related verses are returned with their references"""
+        mock_bible = mocker.patch('app.routers.bible.get_bible_service')
+        mock_bible.return_value.get_related_verses.return_value = [{
+            "reference": VerseReference(book_id=45, chapter=5, verse_start=8),
+            "label": "రోమీయులకు 5:8",
+            "source": "openbible",
+            "score": 300.0,
+        }]
+
+        response = client.get("/api/v1/bible/related", params={"book_id": 43, "chapter": 3, "verse_start": 16, "limit": 3})
+
+        assert response.status_code == 200
+        assert response.json() == [{
+            "reference": {"book_id": 45, "chapter": 5, "verse_start": 8, "verse_end": None},
+            "label": "రోమీయులకు 5:8",
+            "source": "openbible",
+            "score": 300.0,
+        }]
+        refs, limit = mock_bible.return_value.get_related_verses.call_args.args
+        assert refs[0].verse_start == 16
+        assert limit == 3
+
+
+class TestBibleUpdates:
+    """Tests for GET /api/v1/bible/updates and /deltas"""
+
+    DELTA = bytes(range(100))
+
+    def test_update_available(self, mocker):
+        """Test that an available delta is described with its URL"""
+        mock_updates = mocker.patch('app.routers.bible.get_bible_update_service')
+        mock_updates.return_value.get_update.return_value = {
+            "latest_version": "bbbb",
+            "up_to_date": False,
+            "full_download_required": False,
+            "delta_size": 100,
+            "delta_sha256": "abc123",
+        }
+
+        response = client.get("/api/v1/bible/updates", params={"from_version": "aaaa"})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["delta_url"] == "/api/v1/bible/deltas/aaaa/bbbb"
+        assert data["delta_sha256"] == "abc123"
+
+    def test_full_download_required(self, mocker):
+        """Test that an unknown version gets no delta URL"""
+        mock_updates = mocker.patch('app.routers.bible.get_bible_update_service')
+        mock_updates.return_value.get_update.return_value = {
+            "latest_version": "bbbb",
+            "up_to_date": False,
+            "full_download_required": True,
+            "delta_size": None,
+            "delta_sha256": None,
+        }
+
+        response = client.get("/api/v1/bible/updates", params={"from_version": "zzzz"})
+
+        assert response.status_code == 200
+        assert response.json()["full_download_required"] is True
+        assert response.json()["delta_url"] is None
+
+    def test_download_delta(self, mocker):
+        """Test that a delta is served with its sha256 as a strong ETag"""
+        mock_updates = mocker.patch('app.routers.bible.get_bible_update_service')
+        mock_updates.return_value.get_delta.return_value = (self.DELTA, "abc123")
+
+        response = client.get("/api/v1/bible/deltas/aaaa/bbbb")
+
+        assert response.status_code == 200
+        assert response.content == self.DELTA
+        assert response.headers["etag"] == '"abc123"'
+        assert response.headers["accept-ranges"] == "bytes"
+        assert "immutable" in response.headers["cache-control"]
+
+    def test_not_modified(self, mocker):
+        """Test that If-None-Match with the current ETag returns 304"""
+        mock_updates = mocker.patch('app.routers.bible.get_bible_update_service')
+        mock_updates.return_value.get_delta.return_value = (self.DELTA, "abc123")
+
+        response = client.get("/api/v1/bible/deltas/aaaa/bbbb", headers={"If-None-Match": '"abc123"'})
+
+        assert response.status_code == 304
+        assert response.content == b""
+
+    def test_resume_with_range(self, mocker):
+        """Test that a Range request returns only the remaining bytes"""
+        mock_updates = mocker.patch('app.routers.bible.get_bible_update_service')
+        mock_updates.return_value.get_delta.return_value = (self.DELTA, "abc123")
+
+        response = client.get("/api/v1/bible/deltas/aaaa/bbbb", headers={"Range": "bytes=60-", "If-Range": '"abc123"'})
+        suffix = client.get("/api/v1/bible/deltas/aaaa/bbbb", headers={"Range": "bytes=-10"})
+
+        assert response.status_code == 206
+        assert response.content == self.DELTA[60:]
+        assert response.headers["content-range"] == "bytes 60-99/100"
+        assert suffix.content == self.DELTA[90:]
+
+    def test_range_with_stale_if_range(self, mocker):
+        """Test that If-Range with an old ETag sends the whole delta"""
+        mock_updates = mocker.patch('app.routers.bible.get_bible_update_service')
+        mock_updates.return_value.get_delta.return_value = (self.DELTA, "abc123")
+
+        response = client.get("/api/v1/bible/deltas/aaaa/bbbb", headers={"Range": "bytes=60-", "If-Range": '"old"'})
+
+        assert response.status_code == 200
+        assert response.content == self.DELTA
+
+    def test_unsatisfiable_range(self, mocker):
+        """Test that a range past the end returns 416"""
+        mock_updates = mocker.patch('app.routers.bible.get_bible_update_service')
+        mock_updates.return_value.get_delta.return_value = (self.DELTA, "abc123")
+
+        response = client.get("/api/v1/bible/deltas/aaaa/bbbb", headers={"Range": "bytes=100-"})
+
+        assert response.status_code == 416
+        assert response.headers["content-range"] == "bytes */100"
+
+    def test_unknown_delta(self, mocker):
+        """Test that versions without a delta chain return 404"""
+        mock_updates = mocker.patch('app.routers.bible.get_bible_update_service')
+        mock_updates.return_value.get_delta.return_value = None
+
+        response = client.get("/api/v1/bible/deltas/aaaa/zzzz")
+
+        assert response.status_code == 404
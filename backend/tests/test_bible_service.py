@@ -0,0 +1,544 @@
+"""
+Bible Service Tests
+Tests for verse lookup against a temporary SQLite Bible
+"""
+
+import json
+import sqlite3
+
+import numpy as np
+import pytest
+
+from app.models.sermon import VerseReference
+from app.services.bible_service import (
+    BibleService,
+    SearchUnavailableError,
+    TranslationNotFoundError,
+    VerseNotFoundError,
+    get_prompt_verse_texts,
+)
+from app.services.verse_index import VerseIndex
+from app.services.verse_vectors import VerseVectorIndex, hashed_tfidf_vector, vector_paths
+
+
+@pytest.fixture
+def bible_db(tmp_path):
+    """Small database with the create_bible_db.py schema"""
+    db_path = tmp_path / "bible.db"
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        CREATE TABLE books (
+            id INTEGER PRIMARY KEY,
+            name_telugu TEXT NOT NULL,
+            name_english TEXT NOT NULL,
+            testament TEXT NOT NULL,
+            chapter_count INTEGER NOT NULL DEFAULT 0,
+            verse_count INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE verses (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            book_id INTEGER NOT NULL,
+            chapter INTEGER NOT NULL,
+            verse INTEGER NOT NULL,
+            text TEXT NOT NULL
+        );
+        CREATE INDEX idx_verses_book_chapter_verse ON verses(book_id, chapter, verse);
+        INSERT INTO books VALUES (1, 'ఆదికాండము', 'Genesis', 'OT', 1, 3);
+        INSERT INTO books VALUES (43, 'యోహాను సువార్త', 'John', 'NT', 1, 2);
+        INSERT INTO verses (book_id, chapter, verse, text) VALUES
+            (1, 1, 1, 'G1'), (1, 1, 2, 'G2'), (1, 1, 3, 'G3'),
+            (43, 3, 16, 'J16'), (43, 3, 17, 'J17');
+    """)
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+@pytest.fixture
+def translations_db(tmp_path):
+    """Two translations with the create_bible_db.py schema (Hindi: NT only)"""
+    db_path = tmp_path / "translations.db"
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        CREATE TABLE books (
+            id INTEGER PRIMARY KEY,
+            name_telugu TEXT NOT NULL,
+            name_english TEXT NOT NULL,
+            testament TEXT NOT NULL,
+            chapter_count INTEGER NOT NULL DEFAULT 0,
+            verse_count INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE translations (
+            id INTEGER PRIMARY KEY,
+            code TEXT NOT NULL UNIQUE,
+            name TEXT NOT NULL,
+            language TEXT NOT NULL
+        );
+        CREATE TABLE book_names (
+            translation_id INTEGER NOT NULL,
+            book_id INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            PRIMARY KEY (translation_id, book_id)
+        );
+        CREATE TABLE verses (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            translation_id INTEGER NOT NULL DEFAULT 1,
+            book_id INTEGER NOT NULL,
+            chapter INTEGER NOT NULL,
+            verse INTEGER NOT NULL,
+            text TEXT NOT NULL
+        );
+        CREATE UNIQUE INDEX idx_verses_translation_book_chapter_verse ON verses(translation_id, book_id, chapter, verse);
+        INSERT INTO books VALUES (1, 'ఆదికాండము', 'Genesis', 'OT', 1, 1);
+        INSERT INTO books VALUES (43, 'యోహాను సువార్త', 'John', 'NT', 1, 2);
+        INSERT INTO translations VALUES (1, 'tel', 'Telugu', 'te'), (2, 'hin', 'Hindi', 'hi');
+        INSERT INTO book_names VALUES (1, 43, 'యోహాను'), (2, 43, 'यूहन्ना');
+        INSERT INTO verses (translation_id, book_id, chapter, verse, text) VALUES
+            (1, 1, 1, 1, 'G1'), (1, 43, 3, 16, 'J16'), (1, 43, 3, 17, 'J17'),
+            (2, 43, 3, 16, 'H16'), (2, 43, 3, 17, 'H17');
+        CREATE VIEW verses_tel AS SELECT id, text FROM verses WHERE translation_id = 1;
+        CREATE VIEW verses_hin AS SELECT id, text FROM verses WHERE translation_id = 2;
+        CREATE VIRTUAL TABLE verses_fts USING fts5(text, content=verses_tel, content_rowid=id);
+        CREATE VIRTUAL TABLE verses_fts_trigram USING fts5(text, content=verses_tel, content_rowid=id, tokenize='trigram');
+        CREATE VIRTUAL TABLE verses_fts_hin USING fts5(text, content=verses_hin, content_rowid=id);
+        CREATE VIRTUAL TABLE verses_fts_trigram_hin USING fts5(text, content=verses_hin, content_rowid=id, tokenize='trigram');
+        INSERT INTO verses_fts(verses_fts) VALUES('rebuild');
+        INSERT INTO verses_fts_trigram(verses_fts_trigram) VALUES('rebuild');
+        INSERT INTO verses_fts_hin(verses_fts_hin) VALUES('rebuild');
+        INSERT INTO verses_fts_trigram_hin(verses_fts_trigram_hin) VALUES('rebuild');
+    """)
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+@pytest.fixture(params=["sqlite", "index"])
+def translations_service(request, translations_db, monkeypatch):
+    """BibleService over the two-translation database"""
+    monkeypatch.setenv("BIBLE_IN_MEMORY_INDEX", "true" if request.param == "index" else "false")
+    service = BibleService(str(translations_db))
+    yield service
+    service.close()
+
+
+@pytest.fixture(params=["sqlite", "index"])
+def bible_service(request, bible_db, monkeypatch):
+    """BibleService served from SQLite and from the in-memory index"""
+    monkeypatch.setenv("BIBLE_IN_MEMORY_INDEX", "true" if request.param == "index" else "false")
+    service = BibleService(str(bible_db))
+    yield service
+    service.close()
+
+
+@pytest.fixture
+def search_service(bible_db):
+    """BibleService over the test database plus search tables"""
+    conn = sqlite3.connect(bible_db)
+    conn.executescript("""
+        INSERT INTO books VALUES (19, 'కీర్తనలు', 'Psalms', 'OT', 1, 2);
+        INSERT INTO verses (book_id, chapter, verse, text) VALUES
+            (19, 1, 1, 'దేవుడు ప్రేమించాడు'),
+            (19, 1, 2, 'దేవుడు ప్రేమ'),
+            (43, 1, 1, 'దేవుడు లోకాన్ని ప్రేమించాడు');
+        CREATE VIRTUAL TABLE verses_fts USING fts5(
+            text, content=verses, content_rowid=id,
+            tokenize="unicode61 remove_diacritics 2 categories 'L* M* N* Co' tokenchars '\u200c\u200d'"
+        );
+        CREATE VIRTUAL TABLE verses_fts_trigram USING fts5(
+            text, content=verses, content_rowid=id, tokenize='trigram'
+        );
+        INSERT INTO verses_fts(verses_fts) VALUES('rebuild');
+        INSERT INTO verses_fts_trigram(verses_fts_trigram) VALUES('rebuild');
+    """)
+    conn.commit()
+    conn.close()
+
+    service = BibleService(str(bible_db))
+    yield service
+    service.close()
+
+
+class TestBibleService:
+    """Tests for BibleService"""
+
+    def test_resolves_references_and_ranges(self, bible_service):
+        """Test that single verses and ranges resolve in request order"""
+        refs = [
+            VerseReference(book_id=43, chapter=3, verse_start=16),
+            VerseReference(book_id=1, chapter=1, verse_start=1, verse_end=3),
+        ]
+
+        assert bible_service.get_verses(refs) == [
+            [(16, "J16")],
+            [(1, "G1"), (2, "G2"), (3, "G3")],
+        ]
+
+    def test_verse_texts_for_prompt(self, bible_service):
+        """Test prompt formatting with book names and verse markers"""
+        refs = [
+            VerseReference(book_id=43, chapter=3, verse_start=16),
+            VerseReference(book_id=43, chapter=3, verse_start=16, verse_end=17),
+        ]
+
+        assert bible_service.get_verse_texts(refs) == [
+            "యోహాను సువార్త 3:16 - J16",
+            "యోహాను సువార్త 3:16-17 - [16] J16 [17] J17",
+        ]
+
+    def test_missing_verse(self, bible_service):
+        """Test that unknown references and partial ranges are rejected"""
+        with pytest.raises(VerseNotFoundError):
+            bible_service.get_verses([VerseReference(book_id=43, chapter=3, verse_start=99)])
+
+        with pytest.raises(VerseNotFoundError):
+            bible_service.get_verses([VerseReference(book_id=43, chapter=3, verse_start=16, verse_end=18)])
+
+    def test_database_is_read_only(self, bible_service):
+        """Test that the connection cannot modify the database"""
+        with pytest.raises(sqlite3.OperationalError):
+            bible_service.conn.execute("DELETE FROM verses")
+
+    def test_invalid_range(self, bible_service):
+        """Test that a range ending before it starts is rejected"""
+        with pytest.raises(VerseNotFoundError):
+            bible_service.get_verses([VerseReference(book_id=1, chapter=1, verse_start=3, verse_end=2)])
+
+    def test_missing_database(self, tmp_path):
+        """Test that a missing database file is reported clearly"""
+        with pytest.raises(ValueError, match="not found"):
+            BibleService(str(tmp_path / "missing.db"))
+
+
+class TestVerseSearch:
+    """Tests for full-text verse search"""
+
+    def test_whole_word_match(self, search_service):
+        """Test that Telugu words with vowel signs match as whole words"""
+        page = search_service.search("ప్రేమించాడు")
+
+        assert page["mode"] == "word"
+        assert [(r["book_id"], r["chapter"], r["verse"]) for r in page["results"]] == [(19, 1, 1), (43, 1, 1)]
+        assert page["results"][0]["snippet"] == "దేవుడు <mark>ప్రేమించాడు</mark>"
+        assert page["results"][0]["book_name"] == "కీర్తనలు"
+
+    def test_last_term_is_prefix(self, search_service):
+        """Test that the last query term matches word prefixes"""
+        page = search_service.search("దేవుడు ప్రేమ")
+
+        assert page["mode"] == "word"
+        assert len(page["results"]) == 3
+
+    def test_partial_word_fallback(self, search_service):
+        """Test that word-internal substrings fall back to the trigram index"""
+        page = search_service.search("మించా")
+
+        assert page["mode"] == "partial"
+        assert len(page["results"]) == 2
+        assert "<mark>మించా</mark>" in page["results"][0]["snippet"]
+
+    def test_filters(self, search_service):
+        """Test book and testament filters"""
+        assert [r["book_id"] for r in search_service.search("దేవుడు", testament="NT")["results"]] == [43]
+        assert len(search_service.search("దేవుడు", book_id=19)["results"]) == 2
+
+    def test_keyset_pagination(self, search_service):
+        """Test that pages continue after the last (score, id) without overlap"""
+        first = search_service.search("దేవుడు", limit=2)["results"]
+        last = first[-1]
+        rest = search_service.search("దేవుడు", limit=2, after=("word", last["score"], last["id"]))["results"]
+
+        ids = [r["id"] for r in first + rest]
+        assert len(ids) == 3
+        assert len(set(ids)) == 3
+
+    def test_query_syntax_is_escaped(self, search_service):
+        """Test that FTS5 operators in user input are treated as text"""
+        assert search_service.search('దేవుడు" OR "x')["results"] == []
+
+    def test_search_without_index(self, bible_db):
+        """Test that search reports a missing index"""
+        service = BibleService(str(bible_db))
+
+        with pytest.raises(SearchUnavailableError):
+            service.search("దేవుడు")
+
+
+class TestTranslations:
+    """Tests for multi-translation lookups"""
+
+    def test_default_translation(self, translations_service):
+        """Test that lookups without a translation read the default only"""
+        refs = [VerseReference(book_id=43, chapter=3, verse_start=16, verse_end=17)]
+
+        assert translations_service.default_translation == "tel"
+        assert translations_service.get_verses(refs) == [[(16, "J16"), (17, "J17")]]
+        assert translations_service.get_verses(refs, "hin") == [[(16, "H16"), (17, "H17")]]
+
+    def test_parallel_verses_in_one_query(self, translations_service):
+        """Test that missing verses in secondary translations are empty"""
+        refs = [
+            VerseReference(book_id=43, chapter=3, verse_start=16),
+            VerseReference(book_id=1, chapter=1, verse_start=1),
+        ]
+
+        assert translations_service.get_parallel_verses(refs, ["tel", "hin"]) == {
+            "tel": [[(16, "J16")], [(1, "G1")]],
+            "hin": [[(16, "H16")], []],
+        }
+
+    def test_primary_translation_must_have_verses(self, translations_service):
+        """Test that the first translation is validated like get_verses"""
+        with pytest.raises(VerseNotFoundError):
+            translations_service.get_parallel_verses(
+                [VerseReference(book_id=1, chapter=1, verse_start=1)], ["hin", "tel"]
+            )
+
+    def test_unknown_translation(self, translations_service):
+        """Test that unknown translation codes are rejected"""
+        with pytest.raises(TranslationNotFoundError):
+            translations_service.get_verses([VerseReference(book_id=43, chapter=3, verse_start=16)], "xyz")
+
+    def test_bilingual_verse_texts(self, translations_service):
+        """Test that the parallel translation is quoted under each reference"""
+        refs = [
+            VerseReference(book_id=43, chapter=3, verse_start=16, verse_end=17),
+            VerseReference(book_id=1, chapter=1, verse_start=1),
+        ]
+
+        assert translations_service.get_verse_texts(refs, parallel_translation="hin") == [
+            "యోహాను సువార్త 3:16-17 - [16] J16 [17] J17\n  [Hindi] यूहन्ना 3:16-17 - [16] H16 [17] H17",
+            "ఆదికాండము 1:1 - G1",
+        ]
+
+    def test_search_per_translation(self, translations_service):
+        """Test that each translation searches its own index"""
+        assert [r["text"] for r in translations_service.search("J16")["results"]] == ["J16"]
+        assert translations_service.search("J16", translation="hin")["results"] == []
+
+        results = translations_service.search("H17", translation="hin")["results"]
+        assert [(r["text"], r["book_name"]) for r in results] == [("H17", "यूहन्ना")]
+
+
+class TestVerseIndex:
+    """Tests for the contiguous-buffer verse index"""
+
+    def test_layout(self, bible_db):
+        """Test ordinals, offsets and buffer size"""
+        index = VerseIndex.from_database(sqlite3.connect(bible_db))
+
+        # Genesis 1 has 3 verses; John 3 is numbered up to 17
+        assert len(index) == 3 + 17
+        assert index.ordinal(43, 3, 16) == 3 + 15
+        assert index.ordinal(43, 3, 18) is None
+        assert index.buffer == b"G1G2G3J16J17"
+        assert index.nbytes == len(index.buffer) + index.offsets.itemsize * 21
+
+    def test_range_slices_are_zero_copy(self, bible_db):
+        """Test that ranges are memoryview slices of the shared buffer"""
+        index = VerseIndex.from_database(sqlite3.connect(bible_db))
+
+        verses = index.get_range(1, 1, 2, 3)
+
+        assert [(verse, bytes(text)) for verse, text in verses] == [(2, b"G2"), (3, b"G3")]
+        assert all(text.obj is index.buffer for _, text in verses)
+
+    def test_gaps_are_missing(self, bible_db):
+        """Test that unnumbered verses inside a chapter are not returned"""
+        index = VerseIndex.from_database(sqlite3.connect(bible_db))
+
+        assert index.get_range(43, 3, 1, 1) is None
+        assert index.get_range(43, 3, 15, 16) is None
+        assert index.get_range(2, 1, 1, 1) is None
+
+
+@pytest.fixture
+def related_service(bible_db):
+    """BibleService over the test database plus a cross_references table"""
+    conn = sqlite3.connect(bible_db)
+    conn.executescript("""
+        CREATE TABLE cross_references (
+            verse_key INTEGER NOT NULL,
+            rank INTEGER NOT NULL,
+            related_key INTEGER NOT NULL,
+            related_end_key INTEGER NOT NULL,
+            source TEXT NOT NULL,
+            score REAL NOT NULL,
+            PRIMARY KEY (verse_key, rank)
+        ) WITHOUT ROWID;
+        INSERT INTO cross_references VALUES
+            (43003016, 0, 1001001, 1001002, 'openbible', 300),
+            (43003016, 1, 43003017, 43003017, 'similar', 0.6),
+            (43003016, 2, 1001003, 1001003, 'similar', 0.4),
+            (43003017, 0, 1001003, 1001003, 'openbible', 40),
+            (43003017, 1, 1001002, 1001002, 'similar', 0.3);
+    """)
+    conn.commit()
+    conn.close()
+
+    service = BibleService(str(bible_db))
+    yield service
+    service.close()
+
+
+class TestRelatedVerses:
+    """Tests for cross-reference lookups"""
+
+    def test_related_verses_ranked(self, related_service):
+        """Test that cross-references rank before similar verses"""
+        related = related_service.get_related_verses([VerseReference(book_id=43, chapter=3, verse_start=16)])
+
+        assert [(r["label"], r["source"]) for r in related] == [
+            ("ఆదికాండము 1:1-2", "openbible"),
+            ("యోహాను సువార్త 3:17", "similar"),
+            ("ఆదికాండము 1:3", "similar"),
+        ]
+        assert related[0]["reference"] == VerseReference(book_id=1, chapter=1, verse_start=1, verse_end=2)
+
+    def test_range_merges_and_skips_own_verses(self, related_service):
+        """Test that a range merges its verses' references by rank"""
+        related = related_service.get_related_verses(
+            [VerseReference(book_id=43, chapter=3, verse_start=16, verse_end=17)],
+            limit=2,
+        )
+
+        # 3:17 is inside the range; Genesis 1:3 is listed once
+        assert [r["label"] for r in related] == ["ఆదికాండము 1:1-2", "ఆదికాండము 1:3"]
+
+    def test_verse_texts_list_related(self, related_service):
+        """Test that prompts list related verses under each reference"""
+        texts = related_service.get_verse_texts(
+            [VerseReference(book_id=43, chapter=3, verse_start=16)],
+            related_verses=2,
+        )
+
+        assert texts == ["యోహాను సువార్త 3:16 - J16\n  Related: ఆదికాండము 1:1-2; యోహాను సువార్త 3:17"]
+        assert related_service.get_verse_texts(
+            [VerseReference(book_id=43, chapter=3, verse_start=16)], related_verses=0
+        ) == ["యోహాను సువార్త 3:16 - J16"]
+
+    def test_without_cross_references(self, bible_service):
+        """Test that databases without the table have no related verses"""
+        assert bible_service.get_related_verses([VerseReference(book_id=43, chapter=3, verse_start=16)]) == []
+
+
+@pytest.fixture
+def vectors_service(bible_db):
+    """BibleService over the test database plus int8 hashed TF-IDF embeddings"""
+    texts = {
+        1001001: "ఆదియందు దేవుడు భూమిని సృజించెను",
+        1001002: "భూమి నిరాకారముగా ఉండెను",
+        1001003: "వెలుగు కమ్మని దేవుడు పలికెను",
+        43003016: "దేవుడు లోకమును ప్రేమించెను",
+        43003017: "లోకమును రక్షించుటకే కుమారుని పంపెను",
+    }
+    conn = sqlite3.connect(bible_db)
+    for key, text in texts.items():
+        conn.execute(
+            "UPDATE verses SET text = ? WHERE book_id = ? AND chapter = ? AND verse = ?",
+            (text, key // 1_000_000, key // 1000 % 1000, key % 1000),
+        )
+    conn.commit()
+    conn.close()
+
+    idf = np.ones(256, dtype=np.float32)
+    matrix = np.stack([hashed_tfidf_vector(text, idf, 3) for text in texts.values()])
+    paths = vector_paths(bible_db)
+    np.save(paths["matrix"], np.round(matrix * 127).astype(np.int8))
+    np.save(paths["keys"], np.array(list(texts), dtype=np.int32))
+    np.save(paths["idf"], idf)
+    paths["meta"].write_text(json.dumps({
+        "method": "hashed-tfidf", "ngram": 3, "dims": 256, "dtype": "int8", "scale": 1 / 127, "lists": None,
+    }))
+
+    service = BibleService(str(bible_db))
+    yield service
+    service.close()
+
+
+class TestSimilarVerses:
+    """Tests for embedding-based verse retrieval"""
+
+    def test_topic_query(self, vectors_service):
+        """Test that a topic finds the verses sharing its words first"""
+        results = vectors_service.find_similar_verses("లోకమును ప్రేమించెను", limit=2)
+
+        assert [(r["book_id"], r["chapter"], r["verse"]) for r in results] == [(43, 3, 16), (43, 3, 17)]
+        assert results[0]["text"] == "దేవుడు లోకమును ప్రేమించెను"
+        assert results[0]["score"] > results[1]["score"]
+
+    def test_passage_query_excludes_passage(self, vectors_service):
+        """Test that a passage query leaves out the passage itself"""
+        results = vectors_service.find_similar_verses(
+            ref=VerseReference(book_id=43, chapter=3, verse_start=16, verse_end=17),
+        )
+
+        assert (43, 3, 16) not in [(r["book_id"], r["chapter"], r["verse"]) for r in results]
+        assert (43, 3, 17) not in [(r["book_id"], r["chapter"], r["verse"]) for r in results]
+        assert len(results) == 3
+
+    def test_unknown_words(self, vectors_service):
+        """Test that a query with no words returns nothing"""
+        assert vectors_service.find_similar_verses("!!!") == []
+
+    def test_passage_not_embedded(self, vectors_service):
+        """Test that a passage without embeddings is rejected"""
+        with pytest.raises(VerseNotFoundError):
+            vectors_service.find_similar_verses(ref=VerseReference(book_id=2, chapter=1, verse_start=1))
+
+    def test_without_embeddings(self, bible_service):
+        """Test that similarity search needs built embeddings"""
+        with pytest.raises(SearchUnavailableError):
+            bible_service.find_similar_verses("దేవుడు")
+
+    def test_ivf_scans_nearest_lists(self):
+        """Test that nprobe limits scoring to the closest IVF lists"""
+        index = VerseVectorIndex(
+            {"method": "hashed-tfidf", "lists": [0, 2, 3]},
+            np.array([[1, 0], [0.8, 0.6], [0, 1]], dtype=np.float16),
+            np.array([1001001, 1001002, 1001003], dtype=np.int32),
+            centroids=np.array([[1, 0], [0, 1]], dtype=np.float32),
+        )
+        query = np.array([0.6, 0.8], dtype=np.float32)
+
+        assert [key for key, _ in index.search(query, limit=3)] == [1001002, 1001003, 1001001]
+        assert [key for key, _ in index.search(query, limit=3, nprobe=1)] == [1001003]
+
+
+class TestPromptVerseTexts:
+    """Tests for get_prompt_verse_texts (verse text with a reference-only fallback)"""
+
+    @pytest.fixture(autouse=True)
+    def reset_singleton(self, mocker):
+        """Give each test a fresh BibleService singleton"""
+        mocker.patch("app.services.bible_service._bible_service_instance", None)
+
+    def test_missing_database(self, tmp_path, monkeypatch):
+        """Test that references are sent alone when there is no database"""
+        monkeypatch.setenv("BIBLE_DB_PATH", str(tmp_path / "missing.db"))
+        refs = [
+            VerseReference(book_id=43, chapter=3, verse_start=16),
+            VerseReference(book_id=19, chapter=23, verse_start=1, verse_end=6),
+        ]
+
+        assert get_prompt_verse_texts(refs) == ["Verse 43:3:16", "Verse 19:23:1-6"]
+
+    def test_books_missing_from_partial_database(self, bible_db, monkeypatch):
+        """Test that only references to books the database lacks fall back"""
+        monkeypatch.setenv("BIBLE_DB_PATH", str(bible_db))
+        monkeypatch.setenv("BIBLE_PROMPT_RELATED_VERSES", "0")
+        refs = [
+            VerseReference(book_id=19, chapter=23, verse_start=1),
+            VerseReference(book_id=43, chapter=3, verse_start=16),
+        ]
+
+        texts = get_prompt_verse_texts(refs)
+
+        assert texts[0] == "Verse 19:23:1"
+        assert texts[1].endswith(" 3:16 - J16")
+
+    def test_missing_verse_in_held_book(self, bible_db, monkeypatch):
+        """Test that a verse missing from a book the database holds is still an error"""
+        monkeypatch.setenv("BIBLE_DB_PATH", str(bible_db))
+
+        with pytest.raises(VerseNotFoundError):
+            get_prompt_verse_texts([VerseReference(book_id=43, chapter=3, verse_start=99)])
@@ -0,0 +1,118 @@
+"""
+Bible Update Service Tests
+Tests for delta chains over a temporary release directory
+"""
+
+import gzip
+import hashlib
+import json
+
+import pytest
+
+from app.services.bible_update_service import BibleUpdateService
+
+
+VERSE = {"key": ["translation_id", "book_id", "chapter", "verse"], "columns": ["translation_id", "book_id", "chapter", "verse", "text"]}
+
+
+def _delta(old, new, upsert=(), delete=()):
+    """Delta in the scripts/bible_release.py format"""
+    return {
+        "format": 1,
+        "from": old,
+        "to": new,
+        "tables": {"verses": {**VERSE, "upsert": list(upsert), "delete": list(delete)}},
+    }
+
+
+@pytest.fixture
+def releases(tmp_path):
+    """Releases v1 -> v2 -> v3, v1 published without a delta"""
+    (tmp_path / "deltas").mkdir()
+    entries = [{"version": "v1", "previous": None, "delta": None}]
+
+    for delta in (
+        _delta("v1", "v2", upsert=[[1, 43, 3, 16, "two"], [1, 43, 3, 17, "seventeen"]]),
+        _delta("v2", "v3", upsert=[[1, 43, 3, 16, "three"]], delete=[[1, 43, 3, 17]]),
+    ):
+        payload = gzip.compress(json.dumps(delta).encode(), mtime=0)
+        sha256 = hashlib.sha256(payload).hexdigest()
+        (tmp_path / "deltas" / f"{sha256}.json.gz").write_bytes(payload)
+        entries.append({
+            "version": delta["to"],
+            "previous": delta["from"],
+            "delta": {"file": f"deltas/{sha256}.json.gz", "sha256": sha256, "size": len(payload)},
+        })
+
+    (tmp_path / "manifest.json").write_text(json.dumps({"format": 1, "latest": "v3", "releases": entries}))
+    return tmp_path
+
+
+class TestBibleUpdates:
+    """Tests for BibleUpdateService"""
+
+    def test_up_to_date(self, releases):
+        """Test that the latest version needs no update"""
+        update = BibleUpdateService(str(releases)).get_update("v3")
+
+        assert update["up_to_date"] is True
+        assert update["delta_size"] is None
+
+    def test_single_release_served_as_published(self, releases):
+        """Test that a one-step delta is the published file"""
+        service = BibleUpdateService(str(releases))
+        payload, sha256 = service.get_delta("v2", "v3")
+
+        manifest = json.loads((releases / "manifest.json").read_text())
+        assert sha256 == manifest["releases"][2]["delta"]["sha256"]
+        assert json.loads(gzip.decompress(payload))["from"] == "v2"
+
+    def test_chain_is_squashed(self, releases):
+        """Test that a longer chain becomes one delta, latest change winning"""
+        service = BibleUpdateService(str(releases))
+        update = service.get_update("v1")
+        payload, sha256 = service.get_delta("v1", "v3")
+        delta = json.loads(gzip.decompress(payload))
+
+        assert update["delta_sha256"] == sha256
+        assert (delta["from"], delta["to"]) == ("v1", "v3")
+        assert delta["tables"]["verses"]["upsert"] == [[1, 43, 3, 16, "three"]]
+        assert delta["tables"]["verses"]["delete"] == [[1, 43, 3, 17]]
+
+    def test_unknown_version(self, releases):
+        """Test that an unknown version requires a full download"""
+        service = BibleUpdateService(str(releases))
+
+        assert service.get_update("v0")["full_download_required"] is True
+        assert service.get_delta("v3", "v1") is None
+
+    def test_deltas_are_cached(self, releases, monkeypatch):
+        """Test that each chain is built once and evicted least recently used"""
+        monkeypatch.setenv("BIBLE_DELTA_CACHE_SIZE", "1")
+        service = BibleUpdateService(str(releases))
+        read = service._read_delta_file
+        calls = []
+        monkeypatch.setattr(service, "_read_delta_file", lambda r: calls.append(r["version"]) or read(r))
+
+        service.get_delta("v1", "v3")
+        service.get_delta("v1", "v3")
+        assert calls == ["v2", "v3"]
+
+        service.get_delta("v2", "v3")
+        service.get_delta("v1", "v3")
+        assert calls == ["v2", "v3", "v3", "v2", "v3"]
+
+    def test_corrupt_delta(self, releases):
+        """Test that a delta not matching its sha256 is rejected"""
+        service = BibleUpdateService(str(releases))
+        next((releases / "deltas").iterdir()).write_bytes(b"corrupt")
+
+        with pytest.raises(ValueError):
+            service.get_delta("v1", "v3")
+
+    def test_no_releases(self, tmp_path):
+        """Test that a missing manifest reports no release"""
+        update = BibleUpdateService(str(tmp_path)).get_update("v1")
+
+        assert update["latest_version"] is None
+        assert update["full_download_required"] is False
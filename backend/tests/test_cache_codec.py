@@ -0,0 +1,68 @@
+"""
+Cache Codec Tests
+Tests for versioned binary encoding of cached AI responses
+"""
+
+import json
+
+import pytest
+
+from app.services.cache_codec import (
+    CacheCodec,
+    CacheCodecError,
+    FORMAT_JSON_ZLIB,
+    FORMAT_ORJSON_ZSTD,
+)
+
+
+SAMPLE_ENTRY = {
+    "sermon_content": {"title": "దేవుని ప్రేమ", "prayer_points": ["ప్రార్థన"] * 3},
+    "metadata": {"model": "gpt-4", "total_tokens": 2012},
+    "from_cache": False,
+}
+
+
+class TestCacheCodec:
+    """Tests for CacheCodec"""
+
+    @pytest.mark.parametrize("codec_name,version", [
+        ("zstd", FORMAT_ORJSON_ZSTD),
+        ("zlib", FORMAT_JSON_ZLIB),
+    ])
+    def test_round_trip_with_version_byte(self, codec_name, version):
+        """Test that compressed entries round-trip and carry a version byte"""
+        codec = CacheCodec(codec_name)
+        payload, size = codec.encode(SAMPLE_ENTRY)
+
+        assert payload[0] == version
+        assert codec.decode(payload) == (SAMPLE_ENTRY, size)
+
+    def test_reads_legacy_plain_json(self):
+        """Test that entries written as plain json.dumps text still decode"""
+        legacy = json.dumps(SAMPLE_ENTRY).encode()
+
+        for codec_name in ("zstd", "zlib", "json"):
+            assert CacheCodec(codec_name).decode(legacy)[0] == SAMPLE_ENTRY
+
+    def test_reads_entries_written_by_other_codec(self):
+        """Test that changing CACHE_CODEC keeps existing entries readable"""
+        payload, _ = CacheCodec("zstd").encode(SAMPLE_ENTRY)
+
+        assert CacheCodec("zlib").decode(payload)[0] == SAMPLE_ENTRY
+
+    def test_compressed_entry_is_smaller(self):
+        """Test that Telugu text compresses below the legacy JSON size"""
+        payload, _ = CacheCodec("zstd").encode(SAMPLE_ENTRY)
+
+        assert len(payload) < len(json.dumps(SAMPLE_ENTRY))
+
+    def test_rejects_unknown_or_corrupt_entries(self):
+        """Test that bad entries raise CacheCodecError"""
+        codec = CacheCodec("zstd")
+
+        with pytest.raises(CacheCodecError):
+            codec.decode(b"\x7fgarbage")
+        with pytest.raises(CacheCodecError):
+            codec.decode(bytes([FORMAT_ORJSON_ZSTD]) + b"not zstd")
+        with pytest.raises(CacheCodecError):
+            codec.decode(b"")
@@ -0,0 +1,204 @@
+"""
+Cache Prewarm Tests
+Tests for lectionary loading, resumable state, planning and the spend budget
+"""
+
+import asyncio
+import json
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.models.sermon import VerseReference
+from app.services.cache_prewarm import (
+    DEFAULT_PREWARM_CONFIGS,
+    CachePrewarmer,
+    PrewarmState,
+    load_lectionary,
+)
+
+
+TODAY = date(2026, 10, 16)
+
+YOUTH_CONFIG = {
+    "sermon_type": "topical",
+    "target_audience": "youth",
+    "length_minutes": 15,
+    "tone": "casual",
+    "include_illustrations": True,
+}
+
+
+def john(chapter):
+    """Verse reference dicts for John chapter:16"""
+    return [{"book_id": 43, "chapter": chapter, "verse_start": 16, "verse_end": None}]
+
+
+def reading(chapter):
+    """A lectionary reading of John chapter:16"""
+    return {"date": TODAY, "name": f"John {chapter}", "verses": [VerseReference(**v) for v in john(chapter)]}
+
+
+@pytest.fixture
+def services(mocker):
+    """Mocked cache and OpenAI services and verse lookup (generation costs $0.20, at most $0.35)"""
+    cache = MagicMock()
+    cache.get_hot_entries = AsyncMock(return_value=[])
+    cache.expires_in = AsyncMock(return_value=None)
+    cache.refresh = AsyncMock(return_value=True)
+    cache.get = AsyncMock(return_value=None)
+    mocker.patch("app.services.cache_prewarm.get_cache_service", return_value=cache)
+
+    openai = MagicMock()
+    openai.daily_spend_limit = 10.0
+    openai.max_tokens_input = 2000
+    openai.max_tokens_output = 1500
+    openai._get_model_for_tier.return_value = "gpt-4o-mini"
+    openai.get_cost_estimate.side_effect = lambda input_tokens, output_tokens, model: (
+        (input_tokens + output_tokens) / 10000
+    )
+    openai._prepare_cache_inputs.side_effect = lambda verses, config: (
+        [], {}, f"ai_sermon:{verses[0].chapter}:{config.sermon_type}:{config.target_audience}"
+    )
+    openai.generate_sermon = AsyncMock(return_value={
+        "from_cache": False,
+        "metadata": {"input_tokens": 1000, "output_tokens": 1000, "total_tokens": 2000, "model": "gpt-4o-mini"},
+    })
+    mocker.patch("app.services.cache_prewarm.get_openai_service", return_value=openai)
+
+    mocker.patch("app.services.cache_prewarm.get_prompt_verse_texts", return_value=["text"])
+
+    return cache, openai
+
+
+def make_prewarmer(tmp_path, **kwargs):
+    """CachePrewarmer with state in tmp_path"""
+    return CachePrewarmer(PrewarmState(str(tmp_path / "state.json"), today=TODAY), **kwargs)
+
+
+class TestLectionary:
+    """Tests for load_lectionary"""
+
+    def test_keeps_upcoming_readings_in_order(self, tmp_path):
+        """Test that only readings within the window are kept, by date"""
+        path = tmp_path / "lectionary.json"
+        path.write_text(json.dumps({"readings": [
+            {"date": "2026-10-25", "name": "Later", "verses": john(4)},
+            {"date": "2026-10-18", "name": "Sunday", "verses": john(3)},
+            {"date": "2026-10-15", "name": "Past", "verses": john(2)},
+        ]}))
+
+        readings = load_lectionary(str(path), TODAY, 7)
+
+        assert [r["name"] for r in readings] == ["Sunday"]
+        assert readings[0]["verses"][0].chapter == 3
+
+    def test_invalid_file(self, tmp_path):
+        """Test that a malformed reading raises ValueError"""
+        path = tmp_path / "lectionary.json"
+        path.write_text(json.dumps({"readings": [{"date": "2026-10-18"}]}))
+
+        with pytest.raises(ValueError):
+            load_lectionary(str(path), TODAY, 7)
+
+
+class TestPrewarmState:
+    """Tests for resumable prewarm state"""
+
+    def test_resumes_same_day_and_resets_next_day(self, tmp_path):
+        """Test that progress is kept for the day it was saved on"""
+        path = str(tmp_path / "state.json")
+        state = PrewarmState(path, today=TODAY)
+        state.spent = 1.5
+        state.done["ai_sermon:abc"] = "generated"
+        state.save()
+
+        resumed = PrewarmState(path, today=TODAY)
+        next_day = PrewarmState(path, today=date(2026, 10, 17))
+
+        assert (resumed.spent, resumed.done) == (1.5, {"ai_sermon:abc": "generated"})
+        assert (next_day.spent, next_day.done) == (0.0, {})
+
+
+class TestPlan:
+    """Tests for CachePrewarmer.plan"""
+
+    def test_readings_get_common_configs_and_hot_entries_their_own(self, tmp_path, services):
+        """Test that readings are planned per config, then hot entries, without duplicates"""
+        cache, _ = services
+        cache.get_hot_entries.return_value = [
+            {"cache_key": "k1", "hit_count": 9, "verses": john(5), "config": YOUTH_CONFIG},
+            {"cache_key": "k2", "hit_count": 4, "verses": john(3), "config": DEFAULT_PREWARM_CONFIGS[0]},
+            {"cache_key": "k3", "hit_count": 1, "verses": john(6), "config": {"sermon_type": "unknown"}},
+        ]
+
+        targets = asyncio.run(make_prewarmer(tmp_path).plan([reading(3)], hot_limit=10, config_count=1))
+
+        assert [t["cache_key"] for t in targets] == [
+            "ai_sermon:3:expository:general",
+            "ai_sermon:3:devotional:general",
+            "ai_sermon:3:topical:youth",
+            "ai_sermon:5:topical:youth",
+        ]
+        cache.get_hot_entries.assert_awaited_once_with(10)
+
+
+class TestRun:
+    """Tests for CachePrewarmer.run"""
+
+    def targets(self, prewarmer, chapters):
+        """Plan the default expository config for John chapter:16 readings"""
+        return asyncio.run(prewarmer.plan([reading(c) for c in chapters], hot_limit=0))[::2]
+
+    def test_cached_refreshed_and_generated(self, tmp_path, services):
+        """Test that entries are left, refreshed or generated by remaining TTL"""
+        cache, openai = services
+        ttls = {
+            "ai_sermon:1:expository:general": 72 * 3600,
+            "ai_sermon:2:expository:general": 3600,
+        }
+        cache.expires_in.side_effect = ttls.get
+        prewarmer = make_prewarmer(tmp_path)
+
+        summary = asyncio.run(prewarmer.run(self.targets(prewarmer, [1, 2, 3])))
+
+        assert summary == {"cached": 1, "refreshed": 1, "generated": 1, "spent": 0.2, "budget": 5.0}
+        cache.refresh.assert_awaited_once_with("ai_sermon:2:expository:general")
+        assert openai.generate_sermon.await_args.kwargs["allow_near_duplicate"] is False
+
+    def test_refresh_promotes_l2_entry_uncounted(self, tmp_path, services):
+        """Test that an entry only in L2 is read back without counting a hit, then refreshed"""
+        cache, openai = services
+        cache.expires_in.return_value = 3600
+        cache.refresh.side_effect = [False, True]
+        cache.get.return_value = {"sermon_content": {}}
+        prewarmer = make_prewarmer(tmp_path)
+
+        summary = asyncio.run(prewarmer.run(self.targets(prewarmer, [1])))
+
+        assert summary["refreshed"] == 1
+        cache.get.assert_awaited_once_with("ai_sermon:1:expository:general", count=False)
+        openai.generate_sermon.assert_not_awaited()
+
+    def test_rerun_skips_finished_targets(self, tmp_path, services):
+        """Test that a second run the same day only does unfinished targets"""
+        _, openai = services
+        prewarmer = make_prewarmer(tmp_path)
+        asyncio.run(prewarmer.run(self.targets(prewarmer, [1])))
+
+        resumed = make_prewarmer(tmp_path)
+        summary = asyncio.run(resumed.run(self.targets(resumed, [1, 2])))
+
+        assert summary == {"done": 1, "generated": 1, "spent": 0.4, "budget": 5.0}
+        assert openai.generate_sermon.await_count == 2
+
+    def test_budget_reserves_worst_case_cost(self, tmp_path, services):
+        """Test that generation stops once the worst case would exceed the budget"""
+        _, openai = services
+        prewarmer = make_prewarmer(tmp_path, budget=0.5, concurrency=1)
+
+        summary = asyncio.run(prewarmer.run(self.targets(prewarmer, [1, 2, 3])))
+
+        assert summary == {"generated": 1, "over_budget": 2, "spent": 0.2, "budget": 0.5}
+        assert openai.generate_sermon.await_count == 1
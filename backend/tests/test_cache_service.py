@@ -0,0 +1,478 @@
+"""
+Cache Service Tests
+Tests for stats counters, hit counting, near-duplicate lookups and the ai_cache
+L2 tier (in-memory Redis)
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import fakeredis
+import pytest
+
+from app.services import cache_service as cache_service_module
+from app.services.cache_service import CacheService, get_cache_service
+
+
+CONFIG = {
+    "sermon_type": "expository",
+    "target_audience": "general",
+    "length_minutes": 20,
+    "tone": "formal",
+    "include_illustrations": True,
+}
+
+
+def john_3(start, end):
+    """Verse references for John 3:start-end"""
+    return [{"book_id": 43, "chapter": 3, "verse_start": start, "verse_end": end}]
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """Make CacheService connect to an in-memory Redis"""
+    monkeypatch.setenv("REDIS_URL", "redis://localhost:6379")
+    monkeypatch.setattr(
+        "app.services.cache_service.redis.Redis",
+        lambda connection_pool: fakeredis.FakeAsyncRedis(),
+    )
+
+
+@pytest.fixture
+def cache_service(fake_redis):
+    """CacheService on an in-memory Redis, without L2"""
+    return CacheService()
+
+
+@pytest.fixture
+def database():
+    """Mocked SupabaseService for the ai_cache table"""
+    database = MagicMock()
+    database.get_ai_cache_entry = AsyncMock(return_value=None)
+    database.upsert_ai_cache_entries = AsyncMock(return_value=True)
+    database.delete_ai_cache_entries = AsyncMock(return_value=True)
+    database.increment_ai_cache_hits = AsyncMock(return_value=True)
+    return database
+
+
+@pytest.fixture
+def l2_cache_service(fake_redis, database):
+    """CacheService with a mocked ai_cache L2"""
+    return CacheService(database=database)
+
+
+async def cache_sermon(service, verses, config=CONFIG, title="cached"):
+    """Cache a sermon for verses and return its key"""
+    cache_key = service.generate_cache_key(verses, config)
+    await service.set(cache_key, {"sermon_content": {"title": title}}, verses, config, index_verses=True)
+    return cache_key
+
+
+class TestNearDuplicate:
+    """Tests for CacheService.find_near_duplicate"""
+
+    def test_overlapping_range(self, cache_service):
+        """Test that an overlapping range is found with its Jaccard similarity"""
+        async def run():
+            await cache_sermon(cache_service, john_3(14, 17))
+            return await cache_service.find_near_duplicate(john_3(16, 18), CONFIG, 0.4)
+
+        cached, similarity, verses = asyncio.run(run())
+
+        assert cached["sermon_content"]["title"] == "cached"
+        assert similarity == 0.4
+        assert verses == john_3(14, 17)
+
+    def test_best_match_above_threshold(self, cache_service):
+        """Test that the most similar entry wins and the threshold applies"""
+        async def run():
+            await cache_sermon(cache_service, john_3(14, 17), title="far")
+            await cache_sermon(cache_service, john_3(15, 18), title="near")
+            return (
+                await cache_service.find_near_duplicate(john_3(16, 18), CONFIG, 0.5),
+                await cache_service.find_near_duplicate(john_3(16, 18), CONFIG, 0.8),
+            )
+
+        best, none = asyncio.run(run())
+
+        assert best == ({"sermon_content": {"title": "near"}}, 0.75, john_3(15, 18))
+        assert none is None
+
+    def test_requires_same_type_and_audience(self, cache_service):
+        """Test that entries for another audience are not offered"""
+        async def run():
+            await cache_sermon(cache_service, john_3(14, 17))
+            return await cache_service.find_near_duplicate(
+                john_3(14, 17), {**CONFIG, "target_audience": "youth"}, 0.1
+            )
+
+        assert asyncio.run(run()) is None
+
+    def test_prunes_expired_entries(self, cache_service):
+        """Test that index members of expired entries are removed"""
+        async def run():
+            cache_key = await cache_sermon(cache_service, john_3(16, 16))
+            await cache_service.redis_client.delete(cache_key, f"{cache_key}:meta")
+            result = await cache_service.find_near_duplicate(john_3(16, 16), CONFIG, 0.1)
+            members = await cache_service.redis_client.smembers(f"{cache_service.verse_index_prefix}43003016")
+            return result, members
+
+        result, members = asyncio.run(run())
+
+        assert result is None
+        assert members == set()
+
+    def test_counts_hit_on_entry(self, cache_service):
+        """Test that a near hit bumps the matched entry's hit_count"""
+        async def run():
+            cache_key = await cache_sermon(cache_service, john_3(14, 17))
+            await cache_service.find_near_duplicate(john_3(16, 18), CONFIG, 0.4)
+            return await cache_service.redis_client.hget(f"{cache_key}:meta", "hit_count")
+
+        assert asyncio.run(run()) == b"1"
+
+    def test_entry_expiring_mid_lookup(self, cache_service):
+        """Test that an entry expiring after its meta was read leaves no TTL-less meta behind"""
+        redis_client = cache_service.redis_client
+        pipeline = redis_client.pipeline
+
+        def expire_after_meta_read(**kwargs):
+            """Pipeline whose first execute() is followed by the entry expiring"""
+            pipe = pipeline(**kwargs)
+            execute = pipe.execute
+
+            async def execute_then_expire():
+                """Run the meta reads, then delete the entry and its meta"""
+                result = await execute()
+                redis_client.pipeline = pipeline
+                await redis_client.delete(cache_key, f"{cache_key}:meta")
+                return result
+
+            pipe.execute = execute_then_expire
+            return pipe
+
+        async def run():
+            result = await cache_service.find_near_duplicate(john_3(16, 18), CONFIG, 0.4)
+            return result, await redis_client.exists(f"{cache_key}:meta")
+
+        cache_key = asyncio.run(cache_sermon(cache_service, john_3(14, 17)))
+        redis_client.pipeline = expire_after_meta_read
+
+        assert asyncio.run(run()) == (None, 0)
+
+
+class TestHitCounting:
+    """Tests for the GET_AND_COUNT script behind get()"""
+
+    def test_hit_counted_in_one_round_trip(self, cache_service):
+        """Test that a hit reads the entry and bumps hit_count and stats in one command"""
+        async def run():
+            cache_key = await cache_sermon(cache_service, john_3(16, 16))
+            await cache_service.get(cache_key)
+            execute_command = AsyncMock(side_effect=cache_service.redis_client.execute_command)
+            cache_service.redis_client.execute_command = execute_command
+            data = await cache_service.get(cache_key)
+            hit_count = await cache_service.redis_client.hget(f"{cache_key}:meta", "hit_count")
+            return data, execute_command.await_count - 1, hit_count, await cache_service.get_stats()
+
+        data, round_trips, hit_count, stats = asyncio.run(run())
+
+        assert data == {"sermon_content": {"title": "cached"}}
+        assert round_trips == 1
+        assert hit_count == b"2"
+        assert stats["totals"]["hits"] == 2
+
+    def test_missing_meta_not_recreated(self, cache_service):
+        """Test that a hit on an entry without meta is served and counted in stats only"""
+        async def run():
+            cache_key = await cache_sermon(cache_service, john_3(16, 16))
+            await cache_service.redis_client.delete(f"{cache_key}:meta")
+            data = await cache_service.get(cache_key)
+            return data, await cache_service.redis_client.exists(f"{cache_key}:meta"), await cache_service.get_stats()
+
+        data, meta_exists, stats = asyncio.run(run())
+
+        assert data == {"sermon_content": {"title": "cached"}}
+        assert meta_exists == 0
+        assert stats["totals"]["hits"] == 1
+
+
+class TestStatsCounters:
+    """Tests for the stats counters and clear_all()"""
+
+    def test_counts_hits_misses_sets_and_evictions(self, cache_service):
+        """Test that get/set/delete update the total, daily and per-type counters"""
+        async def run():
+            cache_key = await cache_sermon(cache_service, john_3(16, 16))
+            await cache_service.get(cache_key)
+            await cache_service.get(cache_key)
+            await cache_service.get(cache_service.generate_cache_key(john_3(17, 17), CONFIG))
+            await cache_service.delete(cache_key)
+            payload_size = len(cache_service.codec.encode({"sermon_content": {"title": "cached"}})[0])
+            return await cache_service.get_stats(), payload_size
+
+        stats, payload_size = asyncio.run(run())
+
+        expected = {
+            "hits": 2, "misses": 1, "near_hits": 0, "l2_hits": 0, "sets": 1,
+            "evictions": 1, "bytes_written": payload_size, "hit_rate": 66.67,
+        }
+        assert stats["totals"] == stats["today"] == expected
+        # delete() does not know the request type, so evictions are not per type
+        assert stats["by_type"]["sermon"] == {**expected, "evictions": 0}
+
+    def test_clear_all_removes_only_cache_keys(self, cache_service):
+        """Test that clear_all() unlinks ai_sermon: keys in batches and keeps the rest"""
+        cache_service.scan_batch_size = 2
+
+        async def run():
+            for verse in (16, 17, 18):
+                await cache_sermon(cache_service, john_3(verse, verse))
+            await cache_service.redis_client.set("ai_sermon_lock:other", b"token")
+            await cache_service.redis_client.set("session:1", b"user")
+            cleared = await cache_service.clear_all()
+            keys = {key.decode() for key in await cache_service.redis_client.keys("*")}
+            return cleared, keys, await cache_service.get_stats()
+
+        cleared, keys, stats = asyncio.run(run())
+
+        assert cleared is True
+        assert {key for key in keys if not key.startswith(cache_service.stats_prefix)} == {
+            "ai_sermon_lock:other", "session:1",
+        }
+        assert stats["totals"]["evictions"] == 3
+        assert stats["totals"]["sets"] == 3
+
+
+class TestL2Cache:
+    """Tests for the write-behind ai_cache tier"""
+
+    KEY = "ai_sermon:abc"
+    RESPONSE = {"sermon_content": {"title": "cached"}}
+
+    def row(self, hit_count=7):
+        """ai_cache row expiring in one day"""
+        return {
+            "cache_key": self.KEY,
+            "request_type": "sermon",
+            "source_verses": john_3(16, 16),
+            "config": CONFIG,
+            "response_content": self.RESPONSE,
+            "hit_count": hit_count,
+            "expires_at": (datetime.now(timezone.utc) + timedelta(days=1)).isoformat(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+    def test_miss_falls_through_and_promotes(self, l2_cache_service, database):
+        """Test that a Redis miss is served from L2 and promoted into Redis"""
+        database.get_ai_cache_entry.return_value = self.row()
+
+        async def run():
+            first = await l2_cache_service.get(self.KEY)
+            second = await l2_cache_service.get(self.KEY)
+            ttl = await l2_cache_service.redis_client.ttl(self.KEY)
+            hit_count = await l2_cache_service.redis_client.hget(f"{self.KEY}:meta", "hit_count")
+            return first, second, ttl, hit_count
+
+        first, second, ttl, hit_count = asyncio.run(run())
+
+        assert first == second == self.RESPONSE
+        database.get_ai_cache_entry.assert_awaited_once_with(self.KEY)
+        assert 0 < ttl <= 24 * 60 * 60
+        assert hit_count == b"8"
+        assert l2_cache_service._pending_l2_hits[self.KEY] == 2
+
+    def test_writes_are_batched(self, l2_cache_service, database):
+        """Test that sets are written behind in batches, latest write winning"""
+        l2_cache_service.l2_batch_size = 2
+
+        async def run():
+            for title in ("first", "second"):
+                await cache_sermon(l2_cache_service, john_3(16, 16), title=title)
+            await cache_sermon(l2_cache_service, john_3(17, 17))
+            await cache_sermon(l2_cache_service, john_3(18, 18))
+            database.upsert_ai_cache_entries.assert_not_awaited()
+            await l2_cache_service.get(l2_cache_service.generate_cache_key(john_3(17, 17), CONFIG))
+            await l2_cache_service._flush_l2()
+
+        asyncio.run(run())
+
+        batches = [c.args[0] for c in database.upsert_ai_cache_entries.await_args_list]
+        assert [len(batch) for batch in batches] == [2, 1]
+        assert batches[0][0]["response_content"] == {"sermon_content": {"title": "second"}}
+        assert batches[0][0]["source_verses"] == john_3(16, 16)
+        database.increment_ai_cache_hits.assert_awaited_once()
+        assert list(database.increment_ai_cache_hits.await_args.args[0].values()) == [1]
+
+    def test_failed_flush_is_retried(self, l2_cache_service, database):
+        """Test that writes and hit counts are kept when the database fails"""
+        database.upsert_ai_cache_entries.return_value = False
+        database.increment_ai_cache_hits.return_value = False
+
+        async def run():
+            cache_key = await cache_sermon(l2_cache_service, john_3(16, 16))
+            await l2_cache_service.get(cache_key)
+            await l2_cache_service._flush_l2()
+            return cache_key
+
+        cache_key = asyncio.run(run())
+
+        assert list(l2_cache_service._pending_l2_writes) == [cache_key]
+        assert l2_cache_service._pending_l2_hits[cache_key] == 1
+
+    def test_delete_reaches_l2(self, l2_cache_service, database):
+        """Test that a deleted entry is not written and is removed from L2"""
+        async def run():
+            cache_key = await cache_sermon(l2_cache_service, john_3(16, 16))
+            await l2_cache_service.delete(cache_key)
+            await l2_cache_service._flush_l2()
+            return cache_key
+
+        cache_key = asyncio.run(run())
+
+        database.upsert_ai_cache_entries.assert_not_awaited()
+        database.delete_ai_cache_entries.assert_awaited_once_with([cache_key])
+
+    def test_section_keys_stay_in_redis(self, l2_cache_service, database):
+        """Test that sermon sections are neither looked up in nor written to L2"""
+        section_key = l2_cache_service.generate_section_key(john_3(16, 16), CONFIG, "introduction")
+
+        async def run():
+            missed = await l2_cache_service.get(section_key, request_type="sermon_section")
+            await l2_cache_service.set(
+                section_key, {"content": "intro"}, john_3(16, 16), CONFIG, request_type="sermon_section"
+            )
+            await l2_cache_service.get(section_key, request_type="sermon_section")
+            await l2_cache_service._flush_l2()
+            return missed
+
+        assert asyncio.run(run()) is None
+        database.get_ai_cache_entry.assert_not_awaited()
+        database.upsert_ai_cache_entries.assert_not_awaited()
+        database.increment_ai_cache_hits.assert_not_awaited()
+
+
+class TestGetCacheService:
+    """Tests for the CacheService singleton's L2 store"""
+
+    @pytest.fixture(autouse=True)
+    def reset_singleton(self, fake_redis, monkeypatch):
+        """Start each test without a CacheService instance"""
+        monkeypatch.setattr(cache_service_module, "_cache_service_instance", None)
+
+    def test_injects_supabase_service(self, monkeypatch, database):
+        """Test that the SupabaseService singleton is used as the L2 store"""
+        monkeypatch.setenv("CACHE_L2_ENABLED", "true")
+        monkeypatch.setattr(cache_service_module, "get_supabase_service", lambda: database)
+
+        assert get_cache_service().database is database
+
+    def test_disabled(self, monkeypatch):
+        """Test that CACHE_L2_ENABLED=false leaves L2 out without touching the database"""
+        monkeypatch.setenv("CACHE_L2_ENABLED", "false")
+        get_supabase_service = MagicMock()
+        monkeypatch.setattr(cache_service_module, "get_supabase_service", get_supabase_service)
+
+        assert get_cache_service().database is None
+        get_supabase_service.assert_not_called()
+
+
+class TestPrewarmSupport:
+    """Tests for the cache methods used by the prewarm job"""
+
+    def test_refresh_keeps_hit_count(self, cache_service):
+        """Test that refresh restarts the TTL without resetting hits"""
+        async def run():
+            cache_key = await cache_sermon(cache_service, john_3(16, 16))
+            await cache_service.get(cache_key)
+            await cache_service.redis_client.expire(cache_key, 60)
+            before = await cache_service.expires_in(cache_key)
+            refreshed = await cache_service.refresh(cache_key)
+            after = await cache_service.expires_in(cache_key)
+            hit_count = await cache_service.redis_client.hget(f"{cache_key}:meta", "hit_count")
+            return before, refreshed, after, hit_count
+
+        before, refreshed, after, hit_count = asyncio.run(run())
+
+        assert before <= 60
+        assert refreshed is True
+        assert after > 60 * 60
+        assert hit_count == b"1"
+
+    def test_missing_entry(self, cache_service):
+        """Test that a missing entry has no TTL and cannot be refreshed"""
+        async def run():
+            return await cache_service.expires_in("ai_sermon:missing"), await cache_service.refresh("ai_sermon:missing")
+
+        assert asyncio.run(run()) == (None, False)
+
+    def test_hot_entries_merge_redis_and_l2(self, l2_cache_service, database):
+        """Test that hot entries come from Redis meta and ai_cache, most hits first"""
+        database.get_hot_ai_cache_entries = AsyncMock(return_value=[{
+            "cache_key": "ai_sermon:evicted",
+            "source_verses": john_3(1, 2),
+            "config": CONFIG,
+            "hit_count": 5,
+        }])
+
+        async def run():
+            hot_key = await cache_sermon(l2_cache_service, john_3(16, 16))
+            cold_key = await cache_sermon(l2_cache_service, john_3(17, 17))
+            for _ in range(9):
+                await l2_cache_service.get(hot_key)
+            return hot_key, cold_key, await l2_cache_service.get_hot_entries(10)
+
+        hot_key, cold_key, entries = asyncio.run(run())
+
+        assert [(e["cache_key"], e["hit_count"]) for e in entries] == [
+            (hot_key, 9), ("ai_sermon:evicted", 5), (cold_key, 0),
+        ]
+        assert entries[0]["verses"] == john_3(16, 16)
+        assert entries[0]["config"] == CONFIG
+        database.get_hot_ai_cache_entries.assert_awaited_once_with(10, "sermon")
+
+
+class TestUncountedGet:
+    """Tests for CacheService.get(count=False)"""
+
+    def test_leaves_hit_counts_and_stats(self, cache_service):
+        """Test that an uncounted read changes no hit count or stats"""
+        async def run():
+            cache_key = await cache_sermon(cache_service, john_3(16, 16))
+            data = await cache_service.get(cache_key, count=False)
+            missing = await cache_service.get("ai_sermon:missing", count=False)
+            hit_count = await cache_service.redis_client.hget(f"{cache_key}:meta", "hit_count")
+            stats = await cache_service.redis_client.hgetall(f"{cache_service.stats_prefix}total")
+            return data, missing, hit_count, stats
+
+        data, missing, hit_count, stats = asyncio.run(run())
+
+        assert data == {"sermon_content": {"title": "cached"}}
+        assert missing is None
+        assert hit_count == b"0"
+        assert b"hits" not in stats and b"misses" not in stats
+
+
+class TestInvalidation:
+    """Tests for L1 invalidation across workers"""
+
+    def test_overwrite_is_published(self, cache_service):
+        """Test that set() and refresh() publish the key so peers drop their L1 copy"""
+        async def run():
+            pubsub = cache_service.redis_client.pubsub(ignore_subscribe_messages=True)
+            await pubsub.subscribe(cache_service.invalidation_channel)
+            cache_key = await cache_sermon(cache_service, john_3(16, 16))
+            await cache_service.refresh(cache_key)
+
+            messages = []
+            for _ in range(5):  # Subscribe confirmations come back as None
+                message = await pubsub.get_message(timeout=0.1)
+                if message:
+                    messages.append(message["data"].decode())
+            await pubsub.aclose()
+            return cache_key, messages
+
+        cache_key, messages = asyncio.run(run())
+
+        assert messages == [cache_key, cache_key]
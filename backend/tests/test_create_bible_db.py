@@ -0,0 +1,164 @@
+"""
+Bible Database Build Tests
+Tests for scripts/create_bible_db.py (verse key, bulk and incremental
+builds) on temporary databases
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+from create_bible_db import BibleDatabaseCreator, search_table_names  # noqa: E402
+
+
+JOHN = {"id": 43, "name_telugu": "యోహాను", "name_english": "John", "testament": "NT"}
+RUTH = {"id": 8, "name_telugu": "రూతు", "name_english": "Ruth", "testament": "OT"}
+
+
+def parsed_books(john_16="దేవుడు లోకమును ఎంతో ప్రేమించెను"):
+    """Telugu and English books in the parse_usfm.iter_translation_books format"""
+    return [
+        {"translation": "tel", "book": RUTH, "verses": [(8, 1, 1, "న్యాయాధిపతులు ఏలిన దినములలో")]},
+        {"translation": "tel", "book": JOHN, "verses": [
+            (43, 3, 16, john_16), (43, 3, 17, "లోకము రక్షింపబడుటకే"),
+        ]},
+        {"translation": "eng", "book": {**JOHN, "name": "John"}, "verses": [
+            (43, 3, 16, "For God so loved the world"), (43, 3, 17, "that the world might be saved"),
+        ]},
+    ]
+
+
+def bulk_build(path, books):
+    """Full build as create_bible_db.main() does it (no journal, FTS indexed once)"""
+    with BibleDatabaseCreator(path) as db:
+        db.begin_bulk_load()
+        db.create_schema()
+        for code in ("tel", "eng"):
+            db.add_translation(code)
+            db.create_search_tables(code)
+        db.insert_parsed_books(books)
+        for code in ("tel", "eng"):
+            db.create_search_triggers(code)
+        db.optimize_database()
+        db.end_bulk_load()
+
+
+def incremental_build(path, books):
+    """Update an existing database as create_bible_db.main() --incremental does"""
+    with BibleDatabaseCreator(path) as db:
+        db.create_schema()
+        for code in ("tel", "eng"):
+            db.add_translation(code)
+        changed = db.update_changed_books(books)
+        if changed:
+            db.optimize_database(rebuild_search=False)
+    return changed
+
+
+def snapshot(path):
+    """Verse rows and every FTS index entry, keyed by verse instead of row id"""
+    conn = sqlite3.connect(path)
+    keys = {
+        row[0]: row[1:]
+        for row in conn.execute("SELECT id, translation_id, book_id, chapter, verse FROM verses")
+    }
+    verses = sorted(conn.execute("SELECT translation_id, book_id, chapter, verse, text FROM verses"))
+
+    search = {}
+    for translation_id, code in conn.execute("SELECT id, code FROM translations"):
+        for table in search_table_names(translation_id, code):
+            conn.execute(f"CREATE VIRTUAL TABLE temp.vocab USING fts5vocab(main, {table}, instance)")
+            search[table] = sorted(
+                (term, keys[doc], offset) for term, doc, offset in conn.execute("SELECT term, doc, offset FROM temp.vocab")
+            )
+            conn.execute("DROP TABLE temp.vocab")
+
+    journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    conn.close()
+    return verses, search, journal_mode
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Path of a database with the schema and the default translation"""
+    path = str(tmp_path / "bible.db")
+    with BibleDatabaseCreator(path) as db:
+        db.create_schema()
+        db.add_translation("tel")
+        db.create_search_tables("tel")
+        db.create_search_triggers("tel")
+        db.conn.commit()
+    return path
+
+
+class TestVerseKey:
+    """Tests for the unique (translation_id, book_id, chapter, verse) key"""
+
+    def test_duplicate_verse_rejected(self, db_path):
+        """Test that writing a stored verse again fails instead of duplicating it"""
+        with BibleDatabaseCreator(db_path) as db:
+            db._write_book(1, JOHN, [(43, 3, 16, "first")])
+
+            with pytest.raises(sqlite3.IntegrityError):
+                db._write_book(1, JOHN, [(43, 3, 16, "second")])
+
+    def test_upgrades_non_unique_index(self, db_path):
+        """Test that a database with the old index keeps only the newest copy of each verse"""
+        with BibleDatabaseCreator(db_path) as db:
+            db.cursor.execute("DROP INDEX idx_verses_translation_book_chapter_verse")
+            db.cursor.execute(
+                "CREATE INDEX idx_verses_translation_book_chapter_verse"
+                " ON verses(translation_id, book_id, chapter, verse)"
+            )
+            db._write_book(1, JOHN, [(43, 3, 16, "old"), (43, 3, 17, "seventeen")])
+            db._write_book(1, JOHN, [(43, 3, 16, "new")])
+            db.conn.commit()
+
+        with BibleDatabaseCreator(db_path) as db:
+            db.create_schema()
+            verses = db.cursor.execute("SELECT verse, text FROM verses ORDER BY verse").fetchall()
+            old_matches = db.cursor.execute("SELECT rowid FROM verses_fts WHERE verses_fts MATCH 'old'").fetchall()
+
+        assert verses == [(16, "new"), (17, "seventeen")]
+        assert old_matches == []
+
+
+class TestBuildModes:
+    """Tests for bulk-load and incremental builds"""
+
+    def test_incremental_update_matches_bulk_build(self, tmp_path):
+        """Test that updating a changed book gives the same rows and search index as a full build"""
+        bulk_path = str(tmp_path / "bulk.db")
+        incremental_path = str(tmp_path / "incremental.db")
+        bulk_build(bulk_path, parsed_books(john_16="దేవుడు లోకమును ప్రేమించెను"))
+        bulk_build(incremental_path, parsed_books())
+
+        changed = incremental_build(incremental_path, parsed_books(john_16="దేవుడు లోకమును ప్రేమించెను"))
+
+        assert changed == ["tel:John"]
+        bulk, incremental = snapshot(bulk_path), snapshot(incremental_path)
+        assert incremental[0] == bulk[0]
+        assert len(bulk[0]) == 5
+        assert incremental[1] == bulk[1]
+        assert set(bulk[1]) == {"verses_fts", "verses_fts_trigram", "verses_fts_eng", "verses_fts_trigram_eng"}
+        assert all(bulk[1].values())
+
+    def test_bulk_load_restores_journaling(self, tmp_path):
+        """Test that the bulk build leaves the database in rollback-journal mode"""
+        path = str(tmp_path / "bible.db")
+        bulk_build(path, parsed_books())
+
+        assert snapshot(path)[2] == "delete"
+
+    def test_unchanged_books_not_rewritten(self, tmp_path):
+        """Test that an update with identical sources changes nothing"""
+        path = str(tmp_path / "bible.db")
+        bulk_build(path, parsed_books())
+        before = snapshot(path)
+
+        assert incremental_build(path, parsed_books()) == []
+        assert snapshot(path) == before
@@ -0,0 +1,56 @@
+"""
+Incremental JSON Parser Tests
+Tests for section-by-section parsing of streamed sermon JSON
+"""
+
+import json
+
+from app.utils.json_stream import IncrementalJSONObjectParser
+
+
+SERMON_JSON = json.dumps({
+    "title": "దేవుని ప్రేమ",
+    "introduction": "He said \"come\", {not a brace}",
+    "main_points": [
+        {"point": "Point 1", "explanation": "Explanation, with comma", "illustration": None}
+    ],
+    "application": "Application",
+    "conclusion": "Conclusion",
+    "prayer_points": ["Prayer 1", "Prayer 2"],
+}, ensure_ascii=False)
+
+
+class TestIncrementalJSONObjectParser:
+    """Tests for IncrementalJSONObjectParser"""
+
+    def test_emits_sections_in_order(self):
+        """Test that all top-level members are emitted in document order"""
+        parser = IncrementalJSONObjectParser()
+        members = []
+        for i in range(0, len(SERMON_JSON), 7):
+            members.extend(parser.feed(SERMON_JSON[i:i + 7]))
+
+        assert [name for name, _ in members] == [
+            "title", "introduction", "main_points",
+            "application", "conclusion", "prayer_points",
+        ]
+        assert dict(members) == json.loads(SERMON_JSON)
+        assert parser.complete
+
+    def test_section_emitted_as_soon_as_complete(self):
+        """Test that a member is emitted when its delimiter arrives"""
+        parser = IncrementalJSONObjectParser()
+
+        assert parser.feed('{"title": "Grace') == []
+        assert parser.feed('", "intro') == [("title", "Grace")]
+        assert parser.feed('duction": "Hi"}') == [("introduction", "Hi")]
+
+    def test_character_by_character(self):
+        """Test that single-character chunks parse correctly"""
+        parser = IncrementalJSONObjectParser()
+        members = []
+        for char in SERMON_JSON:
+            members.extend(parser.feed(char))
+
+        assert dict(members) == json.loads(SERMON_JSON)
+        assert parser.buffer == SERMON_JSON
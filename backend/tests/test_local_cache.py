@@ -0,0 +1,64 @@
+"""
+Local LRU Cache Tests
+Tests for the in-process L1 cache in front of Redis
+"""
+
+from app.services.local_cache import LocalLRUCache
+
+
+class TestLocalLRUCache:
+    """Tests for LocalLRUCache"""
+
+    def test_get_and_set(self):
+        """Test storing and reading entries with byte accounting"""
+        cache = LocalLRUCache(max_bytes=100, ttl_seconds=60)
+        cache.set("ai_sermon:a", {"title": "A"}, 40)
+
+        assert cache.get("ai_sermon:a") == {"title": "A"}
+        assert cache.get("ai_sermon:missing") is None
+        assert cache.current_bytes == 40
+        assert cache.get_stats()["hit_rate"] == 50.0
+
+    def test_evicts_least_recently_used(self):
+        """Test that the byte budget evicts least recently used entries first"""
+        cache = LocalLRUCache(max_bytes=100, ttl_seconds=60)
+        cache.set("a", "A", 40)
+        cache.set("b", "B", 40)
+        cache.get("a")
+        cache.set("c", "C", 40)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "A"
+        assert cache.get("c") == "C"
+        assert cache.current_bytes == 80
+        assert cache.evictions == 1
+
+    def test_rejects_oversized_entry(self):
+        """Test that entries larger than the whole cache are not stored"""
+        cache = LocalLRUCache(max_bytes=100, ttl_seconds=60)
+        cache.set("a", "A", 40)
+
+        assert cache.set("big", "B", 101) is False
+        assert cache.get("a") == "A"
+
+    def test_expired_entries_are_dropped(self, mocker):
+        """Test that entries are dropped after their TTL"""
+        clock = mocker.patch("app.services.local_cache.time.monotonic", return_value=1000.0)
+        cache = LocalLRUCache(max_bytes=100, ttl_seconds=60)
+        cache.set("a", "A", 10)
+
+        clock.return_value = 1061.0
+
+        assert cache.get("a") is None
+        assert cache.current_bytes == 0
+
+    def test_replace_and_delete(self):
+        """Test that replacing or deleting an entry releases its bytes"""
+        cache = LocalLRUCache(max_bytes=100, ttl_seconds=60)
+        cache.set("a", "A", 30)
+        cache.set("a", "A2", 50)
+
+        assert cache.current_bytes == 50
+        assert cache.delete("a") is True
+        assert cache.current_bytes == 0
+        assert len(cache) == 0
@@ -0,0 +1,65 @@
+"""
+Application Lifespan Tests
+Tests for service startup and shutdown order
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import fakeredis
+import pytest
+
+from app.main import app, lifespan
+from app.services.cache_service import CacheService
+
+
+@pytest.fixture
+def database():
+    """Mocked SupabaseService whose close() disconnects it like the real one"""
+    database = MagicMock()
+    database.client = MagicMock()
+    database.connect = AsyncMock()
+    database.upsert_ai_cache_entries = AsyncMock(return_value=True)
+
+    async def close():
+        """Drop the client, as SupabaseService.close() does"""
+        database.client = None
+
+    database.close = AsyncMock(side_effect=close)
+    return database
+
+
+@pytest.fixture
+def services(monkeypatch, database):
+    """CacheService on an in-memory Redis with the mocked database as L2"""
+    monkeypatch.setattr(
+        "app.services.cache_service.redis.Redis",
+        lambda connection_pool: fakeredis.FakeAsyncRedis(),
+    )
+    cache_service = CacheService(database=database)
+    monkeypatch.setattr("app.main.get_cache_service", lambda: cache_service)
+    monkeypatch.setattr("app.main.get_supabase_service", lambda: database)
+    monkeypatch.setattr("app.main.get_bible_service", MagicMock())
+    monkeypatch.setattr("app.main.get_openai_service", MagicMock())
+    return cache_service, database
+
+
+class TestLifespan:
+    """Tests for the FastAPI lifespan handler"""
+
+    def test_shutdown_flushes_queued_l2_writes(self, services):
+        """Test that cache entries queued for ai_cache are written before the database closes"""
+        cache_service, database = services
+        verses = [{"book_id": 43, "chapter": 3, "verse_start": 16, "verse_end": None}]
+
+        async def run():
+            async with lifespan(app):
+                cache_key = cache_service.generate_cache_key(verses, {"sermon_type": "expository"})
+                await cache_service.set(cache_key, {"sermon_content": {}}, verses, {"sermon_type": "expository"})
+            return cache_key
+
+        cache_key = asyncio.run(run())
+
+        database.upsert_ai_cache_entries.assert_awaited_once()
+        assert [row["cache_key"] for row in database.upsert_ai_cache_entries.await_args.args[0]] == [cache_key]
+        database.close.assert_awaited_once()
@@ -0,0 +1,453 @@
+"""
+OpenAI Service Tests
+Tests for request coalescing, section reuse and prompt budgets
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.models.sermon import SermonConfig, VerseReference
+from app.services.openai_service import OpenAIService
+from app.utils.prompts import SERMON_SYSTEM_PROMPT, get_sermon_prompt_prefix
+from app.utils.tokens import count_static_tokens
+
+
+SERMON_CONTENT = {
+    "title": "Title",
+    "introduction": "Introduction",
+    "main_points": [],
+    "application": "Application",
+    "conclusion": "Conclusion",
+    "prayer_points": [],
+}
+
+
+def make_completion():
+    """Build a fake ChatCompletion response"""
+    response = MagicMock()
+    response.choices[0].message.content = json.dumps(SERMON_CONTENT)
+    response.usage.prompt_tokens = 50
+    response.usage.prompt_tokens_details.cached_tokens = 0
+    response.usage.completion_tokens = 100
+    response.usage.total_tokens = 150
+    return response
+
+
+def make_stream(content=SERMON_CONTENT):
+    """Build a fake streamed ChatCompletion: content chunks, then usage"""
+    text = json.dumps(content)
+    chunks = []
+    for start in range(0, len(text), 10):
+        chunk = MagicMock()
+        chunk.usage = None
+        chunk.choices[0].delta.content = text[start:start + 10]
+        chunks.append(chunk)
+
+    final = MagicMock()
+    final.choices = []
+    final.usage = make_completion().usage
+    chunks.append(final)
+
+    async def iterate():
+        for chunk in chunks:
+            yield chunk
+
+    return iterate()
+
+
+@pytest.fixture
+def openai_service(mocker):
+    """OpenAIService with mocked OpenAI client and cache"""
+    cache = MagicMock()
+    cache.generate_cache_key.return_value = "ai_sermon:abc"
+    cache.generate_section_key.side_effect = lambda verses, fields, section: f"ai_sermon:section:{section}"
+    cache.get = AsyncMock(return_value=None)
+    cache.set = AsyncMock(return_value=True)
+    cache.acquire_lock = AsyncMock(return_value="token")
+    cache.release_lock = AsyncMock(return_value=True)
+    cache.is_locked = AsyncMock(return_value=False)
+    cache.find_near_duplicate = AsyncMock(return_value=None)
+    mocker.patch("app.services.openai_service.get_cache_service", return_value=cache)
+
+    service = OpenAIService()
+    service.coalesce_poll_interval = 0.01
+
+    async def slow_create(**kwargs):
+        await asyncio.sleep(0.05)
+        return make_stream() if kwargs.get("stream") else make_completion()
+
+    service.client = MagicMock()
+    service.client.chat.completions.create = AsyncMock(side_effect=slow_create)
+    return service
+
+
+def generate(service, count):
+    """Run count identical generations concurrently"""
+    verses = [VerseReference(book_id=43, chapter=3, verse_start=16)]
+    config = SermonConfig(sermon_type="expository", target_audience="general", length_minutes=20)
+
+    async def run():
+        return await asyncio.gather(*[
+            service.generate_sermon(verses=verses, verse_texts=["text"], config=config)
+            for _ in range(count)
+        ])
+
+    return asyncio.run(run())
+
+
+async def collect(events):
+    """Drain a sermon event stream into a list"""
+    return [event async for event in events]
+
+
+def stream(service, tone="formal"):
+    """Stream one generation and return its events"""
+    verses = [VerseReference(book_id=43, chapter=3, verse_start=16)]
+    config = SermonConfig(sermon_type="expository", target_audience="general", length_minutes=20, tone=tone)
+    return asyncio.run(collect(service.generate_sermon_stream(verses=verses, verse_texts=["text"], config=config)))
+
+
+class TestRequestCoalescing:
+    """Tests for single-flight sermon generation"""
+
+    def test_concurrent_requests_call_openai_once(self, openai_service):
+        """Test that identical concurrent requests share one OpenAI call"""
+        results = generate(openai_service, 5)
+
+        assert openai_service.client.chat.completions.create.await_count == 1
+        assert all(r["sermon_content"] == SERMON_CONTENT for r in results)
+        assert [r["from_cache"] for r in results].count(False) == 1
+        cached_keys = [c.kwargs["cache_key"] for c in openai_service.cache_service.set.await_args_list]
+        assert cached_keys.count("ai_sermon:abc") == 1
+        openai_service.cache_service.release_lock.assert_awaited_once_with("ai_sermon:abc", "token")
+        assert openai_service._inflight == {}
+
+    def test_waits_for_peer_worker(self, openai_service):
+        """Test that a lease held by another worker is awaited, not duplicated"""
+        cache = openai_service.cache_service
+        cache.acquire_lock.return_value = None
+        cache.is_locked.side_effect = [True, False]
+        cache.get.side_effect = [None, {"sermon_content": SERMON_CONTENT, "metadata": {}}]
+
+        results = generate(openai_service, 1)
+
+        openai_service.client.chat.completions.create.assert_not_awaited()
+        assert results[0]["from_cache"] is True
+
+    def test_rechecks_cache_after_lease(self, openai_service):
+        """Test that a result cached by a peer before the lease is not regenerated"""
+        cache = openai_service.cache_service
+        cache.get.side_effect = [None, {"sermon_content": SERMON_CONTENT, "metadata": {}}]
+
+        results = generate(openai_service, 1)
+
+        openai_service.client.chat.completions.create.assert_not_awaited()
+        assert results[0]["from_cache"] is True
+        assert cache.get.await_args.kwargs == {"count": False}
+        cache.release_lock.assert_awaited_once_with("ai_sermon:abc", "token")
+
+    def test_failure_propagates_to_waiters(self, openai_service):
+        """Test that a failed generation fails all coalesced callers"""
+        async def failing_create(**kwargs):
+            await asyncio.sleep(0.05)
+            raise RuntimeError("boom")
+
+        openai_service.client.chat.completions.create.side_effect = failing_create
+
+        with pytest.raises(Exception, match="boom"):
+            generate(openai_service, 3)
+
+        assert openai_service.client.chat.completions.create.await_count == 1
+        assert openai_service._inflight == {}
+
+    def test_stream_and_generate_share_one_call(self, openai_service):
+        """Test that a non-streaming request coalesces with an in-flight stream"""
+        verses = [VerseReference(book_id=43, chapter=3, verse_start=16)]
+        config = SermonConfig(sermon_type="expository", target_audience="general", length_minutes=20)
+
+        async def run():
+            return await asyncio.gather(
+                collect(openai_service.generate_sermon_stream(verses=verses, verse_texts=["text"], config=config)),
+                openai_service.generate_sermon(verses=verses, verse_texts=["text"], config=config),
+            )
+
+        events, result = asyncio.run(run())
+
+        assert openai_service.client.chat.completions.create.await_count == 1
+        assert events[-1]["result"]["from_cache"] is False
+        assert result["from_cache"] is True
+        assert result["sermon_content"] == SERMON_CONTENT
+
+    def test_stream_rechecks_cache_after_lease(self, openai_service):
+        """Test that a stream replays a result a peer cached before the lease"""
+        cache = openai_service.cache_service
+        cache.get.side_effect = [None, {"sermon_content": SERMON_CONTENT, "metadata": {}}]
+
+        events = stream(openai_service)
+
+        openai_service.client.chat.completions.create.assert_not_awaited()
+        assert events[0] == {"event": "start", "model": None, "from_cache": True}
+        assert cache.get.await_args.kwargs == {"count": False}
+        cache.release_lock.assert_awaited_once_with("ai_sermon:abc", "token")
+
+    def test_stream_failure_releases_lease(self, openai_service):
+        """Test that a stream failing mid-way releases the lease and fails waiters"""
+        async def broken_stream():
+            chunk = MagicMock()
+            chunk.usage = None
+            chunk.choices[0].delta.content = '{"title": "T", '
+            yield chunk
+            raise RuntimeError("connection reset")
+
+        openai_service.client.chat.completions.create = AsyncMock(return_value=broken_stream())
+
+        with pytest.raises(Exception, match="connection reset"):
+            stream(openai_service)
+
+        openai_service.cache_service.release_lock.assert_awaited_once_with("ai_sermon:abc", "token")
+        openai_service.cache_service.set.assert_not_awaited()
+        assert openai_service._inflight == {}
+
+
+class TestExplainVerse:
+    """Tests for verse explanations with precomputed cross-references"""
+
+    def test_cross_references_from_dataset(self, openai_service):
+        """Test that given cross-references are prompted and returned, not generated"""
+        response = MagicMock()
+        response.choices[0].message.content = json.dumps({"explanation": "E", "key_themes": [], "application": "A"})
+        openai_service.client.chat.completions.create = AsyncMock(return_value=response)
+
+        result = asyncio.run(openai_service.explain_verse("V", cross_references=["రోమీయులకు 5:8"]))
+
+        prompt = openai_service.client.chat.completions.create.call_args.kwargs["messages"][1]["content"]
+        assert "- రోమీయులకు 5:8" in prompt
+        assert '"cross_references"' not in prompt
+        assert result["explanation"]["cross_references"] == ["రోమీయులకు 5:8"]
+
+
+class TestInputBudget:
+    """Tests for MAX_TOKENS_INPUT enforcement"""
+
+    CONFIG = SermonConfig(sermon_type="expository", target_audience="general", length_minutes=15)
+
+    @pytest.fixture(autouse=True)
+    def estimated_tokens(self, mocker):
+        """Count tokens with the fallback estimate (no tokenizer download)"""
+        mocker.patch("app.utils.tokens.get_encoding", return_value=None)
+        count_static_tokens.cache_clear()
+        yield
+        count_static_tokens.cache_clear()
+
+    def test_within_budget(self, openai_service):
+        """Test that verses within budget are sent unchanged"""
+        texts = ["యోహాను 3:16 - దేవుడు లోకమును ప్రేమించెను\n  Related: రోమా 5:8"]
+
+        prompt, input_tokens = openai_service._build_sermon_prompt(texts, self.CONFIG, "gpt-3.5-turbo")
+
+        assert "- " + texts[0] in prompt
+        assert input_tokens > 0
+
+    def test_drops_related_lines_first(self, openai_service):
+        """Test that parallel and related lines are dropped before verse text"""
+        texts = ["A 1:1 - " + "x" * 40 + "\n  Related: " + "y" * 400]
+
+        fitted = openai_service._fit_verses(texts, 30, "gpt-3.5-turbo")
+
+        assert fitted == ["A 1:1 - " + "x" * 40]
+
+    def test_trims_to_budget(self, openai_service):
+        """Test that later references are cut to keep the prompt within MAX_TOKENS_INPUT"""
+        texts = [f"యోహాను 3:{v} - " + "దేవుడు లోకమును ప్రేమించెను " * 5 for v in range(16, 26)]
+        openai_service.max_tokens_input = 900
+
+        prompt, input_tokens = openai_service._build_sermon_prompt(texts, self.CONFIG, "gpt-3.5-turbo")
+
+        assert input_tokens <= 900
+        assert "- " + texts[0] in prompt
+        assert texts[-1] not in prompt
+        assert "…" in prompt
+
+    def test_first_reference_always_kept(self, openai_service):
+        """Test that a budget smaller than the template still sends a verse"""
+        openai_service.max_tokens_input = 10
+
+        prompt, _ = openai_service._build_sermon_prompt(["A 1:1 - text"], self.CONFIG, "gpt-3.5-turbo")
+
+        assert "- A 1:1 - text" in prompt
+
+
+class TestPromptPrefix:
+    """Tests for the cache-friendly sermon prompt layout"""
+
+    def test_verses_come_last(self, openai_service):
+        """Test that requests differing only in verses share the whole prefix"""
+        config = SermonConfig(sermon_type="topical", target_audience="youth", length_minutes=30, tone="casual")
+
+        first, _ = openai_service._build_sermon_prompt(["A 1:1 - one"], config, "gpt-3.5-turbo")
+        second, _ = openai_service._build_sermon_prompt(["B 2:2 - two"], config, "gpt-3.5-turbo")
+
+        prefix = get_sermon_prompt_prefix(config)
+        assert first == prefix + "- A 1:1 - one"
+        assert second == prefix + "- B 2:2 - two"
+        assert "- Main Points: 4" in prefix
+
+    def test_instructions_shared_across_configs(self):
+        """Test that the configuration comes after the shared instructions"""
+        formal = get_sermon_prompt_prefix(SermonConfig(sermon_type="expository", target_audience="adults", length_minutes=20, tone="formal"))
+        gentle = get_sermon_prompt_prefix(SermonConfig(sermon_type="narrative", target_audience="children", length_minutes=10, tone="gentle"))
+
+        shared = formal.split("SERMON CONFIGURATION:")[0]
+        assert gentle.startswith(shared)
+        assert "OUTPUT FORMAT" in shared
+
+    def test_cached_tokens_recorded(self, openai_service):
+        """Test that provider-cached prompt tokens are recorded in the metadata"""
+        response = make_completion()
+        response.usage.prompt_tokens = 1200
+        response.usage.prompt_tokens_details.cached_tokens = 1024
+        openai_service.client.chat.completions.create = AsyncMock(return_value=response)
+
+        result = generate(openai_service, 1)[0]
+
+        messages = openai_service.client.chat.completions.create.call_args.kwargs["messages"]
+        assert messages[0]["content"] == SERMON_SYSTEM_PROMPT
+        assert result["metadata"]["input_tokens"] == 1200
+        assert result["metadata"]["cached_tokens"] == 1024
+        assert result["metadata"]["generation_ms"] >= 0
+
+
+class TestSectionCache:
+    """Tests for reusing cached sermon sections across configs"""
+
+    VERSES = [VerseReference(book_id=43, chapter=3, verse_start=16)]
+
+    @pytest.fixture
+    def store(self, openai_service):
+        """Dict-backed cache keyed on the full config"""
+        entries = {}
+        cache = openai_service.cache_service
+        cache.generate_cache_key.side_effect = (
+            lambda verses, config, request_type: "ai_sermon:" + json.dumps(config, sort_keys=True)
+        )
+        cache.generate_section_key.side_effect = (
+            lambda verses, fields, section: f"ai_sermon:section:{section}:" + json.dumps(fields, sort_keys=True)
+        )
+        cache.get.side_effect = lambda key, request_type="sermon", count=True: entries.get(key)
+        cache.set.side_effect = lambda cache_key, response_data, **kwargs: entries.update({cache_key: response_data})
+        return entries
+
+    def run(self, service, tone, length_minutes=20):
+        """Generate a sermon for the passage with one tone and length"""
+        config = SermonConfig(
+            sermon_type="expository", target_audience="general", length_minutes=length_minutes, tone=tone
+        )
+        return asyncio.run(service.generate_sermon(verses=self.VERSES, verse_texts=["text"], config=config))
+
+    def test_tone_change_generates_framing_only(self, openai_service, store):
+        """Test that changing the tone reuses the cached exposition"""
+        self.run(openai_service, "formal")
+
+        framing = {"title": "T2", "introduction": "I2", "conclusion": "C2", "prayer_points": ["P2"]}
+        response = make_completion()
+        response.choices[0].message.content = json.dumps(framing)
+        openai_service.client.chat.completions.create = AsyncMock(return_value=response)
+
+        result = self.run(openai_service, "passionate")
+
+        prompt = openai_service.client.chat.completions.create.call_args.kwargs["messages"][1]["content"]
+        assert "Write only these fields, consistent with what is already written: " \
+            "title, introduction, conclusion, prayer_points" in prompt
+        assert list(result["sermon_content"]) == list(SERMON_CONTENT)
+        assert result["sermon_content"]["application"] == SERMON_CONTENT["application"]
+        assert result["sermon_content"]["title"] == "T2"
+        assert result["metadata"]["reused_sections"] == ["exposition"]
+
+    def test_same_point_count_shares_exposition(self, openai_service, store):
+        """Test that lengths with the same point count share the exposition"""
+        self.run(openai_service, "formal", length_minutes=15)
+        self.run(openai_service, "formal", length_minutes=30)
+
+        assert len([key for key in store if key.startswith("ai_sermon:section:exposition")]) == 2
+
+    def test_all_sections_cached(self, openai_service, store):
+        """Test that a sermon is assembled from sections without a model call"""
+        first = self.run(openai_service, "formal")
+        del store[next(key for key in store if not key.startswith("ai_sermon:section:"))]
+
+        result = self.run(openai_service, "formal")
+
+        assert openai_service.client.chat.completions.create.await_count == 1
+        assert result["sermon_content"] == first["sermon_content"]
+        assert result["metadata"]["reused_sections"] == ["exposition", "framing"]
+
+    def test_missing_section_in_response(self, openai_service, store):
+        """Test that a partial response lacking a requested section fails"""
+        self.run(openai_service, "formal")
+        response = make_completion()
+        response.choices[0].message.content = json.dumps({"title": "T2"})
+        openai_service.client.chat.completions.create = AsyncMock(return_value=response)
+
+        with pytest.raises(Exception, match="missing sections"):
+            self.run(openai_service, "gentle")
+
+    def test_stream_reuses_cached_exposition(self, openai_service, store):
+        """Test that a stream sends the cached exposition and streams only the framing"""
+        self.run(openai_service, "formal")
+        framing = {"title": "T2", "introduction": "I2", "conclusion": "C2", "prayer_points": ["P2"]}
+        openai_service.client.chat.completions.create = AsyncMock(return_value=make_stream(framing))
+
+        events = stream(openai_service, tone="passionate")
+
+        prompt = openai_service.client.chat.completions.create.call_args.kwargs["messages"][1]["content"]
+        assert "title, introduction, conclusion, prayer_points" in prompt
+        sections = [event["name"] for event in events if event["event"] == "section"]
+        assert sections == ["main_points", "application", "title", "introduction", "conclusion", "prayer_points"]
+        result = events[-1]["result"]
+        assert result["sermon_content"]["title"] == "T2"
+        assert result["metadata"]["reused_sections"] == ["exposition"]
+        assert any(entry is result for entry in store.values())
+
+
+class TestNearDuplicate:
+    """Tests for near-duplicate cache hits per subscription tier"""
+
+    VERSES = [VerseReference(book_id=43, chapter=3, verse_start=16, verse_end=18)]
+    MATCHED = {"book_id": 43, "chapter": 3, "verse_start": 16, "verse_end": 19}
+    CONFIG = SermonConfig(sermon_type="expository", target_audience="general", length_minutes=20)
+
+    def run(self, service, tier):
+        """Generate a sermon for John 3:16-18 on a tier"""
+        service.near_duplicate_tiers = {"free"}
+        service.cache_service.find_near_duplicate.return_value = (
+            {"sermon_content": SERMON_CONTENT, "metadata": {}}, 0.8, [self.MATCHED]
+        )
+        return asyncio.run(service.generate_sermon(
+            verses=self.VERSES, verse_texts=["text"], config=self.CONFIG, subscription_tier=tier
+        ))
+
+    def test_offered_to_opted_in_tier(self, openai_service):
+        """Test that an opted-in tier gets the overlapping sermon without a model call"""
+        result = self.run(openai_service, "free")
+
+        openai_service.client.chat.completions.create.assert_not_awaited()
+        assert result["from_cache"] is True
+        assert result["near_duplicate"] == {"similarity": 0.8, "verses": [self.MATCHED]}
+
+    def test_off_by_default(self, openai_service):
+        """Test that no tier gets near-duplicates unless configured"""
+        assert openai_service.near_duplicate_tiers == set()
+        assert openai_service.near_duplicate_threshold >= 0.7
+
+    def test_other_tiers_generate(self, openai_service):
+        """Test that tiers not opted in always get a sermon for their exact verses"""
+        result = self.run(openai_service, "premium")
+
+        openai_service.cache_service.find_near_duplicate.assert_not_awaited()
+        assert result["from_cache"] is False
+        full_entry = openai_service.cache_service.set.await_args_list[-1].kwargs
+        assert full_entry["cache_key"] == "ai_sermon:abc"
+        assert full_entry["index_verses"] is True
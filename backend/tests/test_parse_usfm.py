@@ -0,0 +1,99 @@
+"""
+USFM Parser Tests
+Tests for scripts/parse_usfm.py on small USFM fixtures
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+from parse_usfm import USFMParser, iter_translation_books, parse_book  # noqa: E402
+
+
+JOHN_USFM = """\\id JHN Telugu test
+\\h యోహాను సువార్త
+\\toc2 యోహాను
+\\mt1 యోహాను సువార్త
+
+\\c 3
+\\s1 నీకొదేము
+\\p
+\\v 16 దేవుడు \\wj లోకమును ఎంతో\\wj* ప్రేమించెను.\\f + \\fr 3:16 \\ft అద్వితీయ\\f*
+\\v 17 లోకము   రక్షింపబడుటకే   \\add తన\\add* కుమారుని పంపెను.
+\\c 4
+\\p
+\\v 1 యేసు \\x - \\xo 4:1 \\xt యోహా 3:22\\x* శిష్యులను చేసెను.
+"""
+
+# Output of the line-splitting parser this one replaced, for JOHN_USFM
+JOHN_VERSES = [
+    {"book_id": 43, "chapter": 3, "verse": 16, "text": "దేవుడు లోకమును ఎంతో ప్రేమించెను.+ 3:16 అద్వితీయ"},
+    {"book_id": 43, "chapter": 3, "verse": 17, "text": "లోకము రక్షింపబడుటకే తన కుమారుని పంపెను."},
+    {"book_id": 43, "chapter": 4, "verse": 1, "text": "యేసు - 4:1 యోహా 3:22 శిష్యులను చేసెను."},
+]
+
+RUTH_USFM = """\\id RUT English test
+\\c 1
+\\v 1 In the days when the judges ruled.
+"""
+
+
+@pytest.fixture
+def usfm_dir(tmp_path):
+    """Directory with John, Ruth and a file with an unknown book code"""
+    (tmp_path / "44JHN.usfm").write_text(JOHN_USFM, encoding="utf-8")
+    (tmp_path / "08RUT.USFM").write_text(RUTH_USFM, encoding="utf-8")
+    (tmp_path / "99XYZ.usfm").write_text("\\id XYZ unknown\n\\c 1\n\\v 1 ignored\n", encoding="utf-8")
+    return tmp_path
+
+
+class TestParseBook:
+    """Tests for the stateless per-file parser"""
+
+    def test_matches_previous_parser(self, usfm_dir):
+        """Test that verses, chapters and marker cleanup match the previous parser's output"""
+        data = USFMParser().parse_file(str(usfm_dir / "44JHN.usfm"))
+
+        assert data["verses"] == JOHN_VERSES
+        assert data["book"]["id"] == 43
+
+    def test_book_name_from_header(self, usfm_dir):
+        """Test that \\h names the book, falling back to the Telugu name"""
+        john, _ = parse_book(str(usfm_dir / "44JHN.usfm"))
+        ruth, _ = parse_book(str(usfm_dir / "08RUT.USFM"))
+
+        assert john["name"] == "యోహాను సువార్త"
+        assert ruth["name"] == "రూతు"
+
+    def test_calls_are_independent(self, usfm_dir):
+        """Test that parsing one file does not carry chapter state into the next"""
+        parse_book(str(usfm_dir / "44JHN.usfm"))
+        _, verses = parse_book(str(usfm_dir / "08RUT.USFM"))
+
+        assert verses == [(8, 1, 1, "In the days when the judges ruled.")]
+
+
+class TestIterTranslationBooks:
+    """Tests for parsing in worker processes"""
+
+    def test_yields_books_in_order(self, usfm_dir):
+        """Test that books come back per translation in file order, unknown books skipped"""
+        books = list(iter_translation_books({"tel": str(usfm_dir), "eng": str(usfm_dir)}, workers=2))
+
+        assert [(b["translation"], b["book"]["id"]) for b in books] == [
+            ("tel", 8), ("tel", 43), ("eng", 8), ("eng", 43),
+        ]
+        assert books[1]["verses"] == [tuple(v.values()) for v in JOHN_VERSES]
+
+    def test_parse_directory_matches_parse_file(self, usfm_dir):
+        """Test that the parallel directory parse gives the same verses as per-file parsing"""
+        parser = USFMParser()
+
+        by_directory = parser.parse_directory(str(usfm_dir))
+
+        assert [book["verses"] for book in by_directory] == [
+            parser.parse_file(str(usfm_dir / name))["verses"] for name in ("08RUT.USFM", "44JHN.usfm")
+        ]
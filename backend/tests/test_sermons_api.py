@@ -3,9 +3,15 @@ Sermon API Integration Tests
 Tests for sermon generation and management endpoints
 """
 
+import json
 import pytest
+from unittest.mock import AsyncMock, MagicMock
 from fastapi.testclient import TestClient
 from app.main import app
+from app.routers.sermons import _decode_sermon_cursor
+from app.services.openai_service import OpenAIService
+from app.utils.auth import get_current_user
+from app.utils.pagination import encode_cursor
 
 client = TestClient(app)
 
@@ -231,18 +237,237 @@ class TestSermonRetrieval:
         )
 
 
+SUMMARY_ROWS = [
+    {
+        "id": f"00000000-0000-0000-0000-00000000000{i}",
+        "title": f"Sermon {i}",
+        "sermon_type": "expository",
+        "target_audience": "general",
+        "created_at": f"2026-02-0{i}T10:00:00+00:00",
+    }
+    for i in (3, 2, 1)
+]
+
+
+@pytest.fixture
+def authenticated():
+    """Authenticate requests as test-user-123"""
+    app.dependency_overrides[get_current_user] = lambda: "test-user-123"
+    yield
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+class TestSermonSummaries:
+    """Tests for the cursor-paginated sermon list"""
+
+    def test_cursor_round_trip(self):
+        """Test that cursors are opaque and decode to the keyset position"""
+        cursor = encode_cursor(SUMMARY_ROWS[0]["created_at"], SUMMARY_ROWS[0]["id"])
+
+        assert "=" not in cursor
+        assert _decode_sermon_cursor(cursor) == (SUMMARY_ROWS[0]["created_at"], SUMMARY_ROWS[0]["id"])
+
+    def test_first_page_returns_next_cursor(self, mocker, authenticated):
+        """Test that a full page returns a cursor for the last item"""
+        mock_supabase = mocker.patch('app.routers.sermons.get_supabase_service')
+        summaries = AsyncMock(return_value=SUMMARY_ROWS)
+        mock_supabase.return_value.get_user_sermon_summaries = summaries
+
+        response = client.get("/api/v1/sermons/summaries", params={"limit": 2})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [item["title"] for item in data["items"]] == ["Sermon 3", "Sermon 2"]
+        assert "content" not in data["items"][0]
+        assert _decode_sermon_cursor(data["next_cursor"]) == (SUMMARY_ROWS[1]["created_at"], SUMMARY_ROWS[1]["id"])
+        summaries.assert_awaited_once_with(user_id="test-user-123", limit=3, after=None)
+
+    def test_last_page_has_no_cursor(self, mocker, authenticated):
+        """Test that the cursor is passed through and the last page ends the list"""
+        mock_supabase = mocker.patch('app.routers.sermons.get_supabase_service')
+        summaries = AsyncMock(return_value=SUMMARY_ROWS[2:])
+        mock_supabase.return_value.get_user_sermon_summaries = summaries
+        cursor = encode_cursor(SUMMARY_ROWS[1]["created_at"], SUMMARY_ROWS[1]["id"])
+
+        response = client.get("/api/v1/sermons/summaries", params={"limit": 2, "cursor": cursor})
+
+        assert response.status_code == 200
+        assert response.json()["next_cursor"] is None
+        summaries.assert_awaited_once_with(
+            user_id="test-user-123",
+            limit=3,
+            after=(SUMMARY_ROWS[1]["created_at"], SUMMARY_ROWS[1]["id"]),
+        )
+
+    def test_invalid_cursor(self, mocker, authenticated):
+        """Test that a tampered cursor is rejected"""
+        mocker.patch('app.routers.sermons.get_supabase_service')
+        cursor = encode_cursor("2026-02-01T10:00:00+00:00", "x,or(id.neq.0)")
+
+        response = client.get("/api/v1/sermons/summaries", params={"cursor": cursor})
+
+        assert response.status_code == 400
+
+
+class TestNearDuplicateResponse:
+    """Tests for sermons served from a cached near-duplicate"""
+
+    MATCHED = {"book_id": 43, "chapter": 3, "verse_start": 16, "verse_end": 19}
+    CONTENT = {
+        "title": "Cached",
+        "introduction": "I",
+        "main_points": [],
+        "application": "A",
+        "conclusion": "C",
+        "prayer_points": [],
+    }
+
+    def test_marker_returned_and_saved_under_matched_verses(self, mocker, authenticated):
+        """Test that the client sees the marker and the sermon keeps the verses it was written for"""
+        mocker.patch('app.routers.sermons.get_prompt_verse_texts', return_value=["text"])
+        mock_openai = mocker.patch('app.routers.sermons.get_openai_service')
+        mock_openai.return_value.generate_sermon = AsyncMock(return_value={
+            "sermon_content": self.CONTENT,
+            "metadata": {"model": "gpt-3.5-turbo"},
+            "from_cache": True,
+            "near_duplicate": {"similarity": 0.8, "verses": [self.MATCHED]},
+        })
+        mock_supabase = mocker.patch('app.routers.sermons.get_supabase_service')
+        mock_supabase.return_value.check_and_decrement_quota = AsyncMock(return_value={
+            "success": True, "subscription_tier": "free", "quota_remaining": 4,
+        })
+        create_sermon = AsyncMock(side_effect=lambda data: {
+            **data,
+            "id": "00000000-0000-0000-0000-000000000001",
+            "created_at": "2026-02-01T10:00:00+00:00",
+            "updated_at": "2026-02-01T10:00:00+00:00",
+        })
+        mock_supabase.return_value.create_sermon = create_sermon
+
+        response = client.post("/api/v1/sermons/generate", json={
+            "verses": [{"book_id": 43, "chapter": 3, "verse_start": 16, "verse_end": 18}],
+            "config": {"sermon_type": "expository", "target_audience": "general", "length_minutes": 20},
+        })
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["near_duplicate"] == {"similarity": 0.8, "verses": [self.MATCHED]}
+        assert data["sermon"]["source_verses"] == [self.MATCHED]
+        assert create_sermon.await_args.args[0]["source_verses"] == [self.MATCHED]
+
+
+class TestSermonStream:
+    """Tests for the NDJSON sermon stream endpoint"""
+
+    CONTENT = TestNearDuplicateResponse.CONTENT
+    REQUEST = {
+        "verses": [{"book_id": 43, "chapter": 3, "verse_start": 16}],
+        "config": {"sermon_type": "expository", "target_audience": "general", "length_minutes": 20},
+    }
+
+    @pytest.fixture
+    def supabase(self, mocker, authenticated):
+        """Supabase service with quota available and sermons saved as given"""
+        mocker.patch('app.routers.sermons.get_prompt_verse_texts', return_value=["text"])
+        mock_supabase = mocker.patch('app.routers.sermons.get_supabase_service')
+        mock_supabase.return_value.check_and_decrement_quota = AsyncMock(return_value={
+            "success": True, "subscription_tier": "free", "quota_remaining": 4,
+        })
+        mock_supabase.return_value.create_sermon = AsyncMock(side_effect=lambda data: {
+            **data,
+            "id": "00000000-0000-0000-0000-000000000001",
+            "created_at": "2026-02-01T10:00:00+00:00",
+            "updated_at": "2026-02-01T10:00:00+00:00",
+        })
+        return mock_supabase.return_value
+
+    def post(self):
+        """Call the stream endpoint and decode its NDJSON lines"""
+        response = client.post("/api/v1/sermons/generate/stream", json=self.REQUEST)
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        return [json.loads(line) for line in response.text.splitlines()]
+
+    def mock_stream(self, mocker, events, error=None):
+        """Patch the OpenAI service to stream the given events, then raise error"""
+        async def generate_sermon_stream(**kwargs):
+            for event in events:
+                yield event
+            if error:
+                raise error
+
+        mock_openai = mocker.patch('app.routers.sermons.get_openai_service')
+        mock_openai.return_value.generate_sermon_stream = generate_sermon_stream
+
+    def test_event_order(self, mocker, supabase):
+        """Test that sections stream between start and the saved sermon"""
+        result = {"sermon_content": self.CONTENT, "metadata": {"model": "gpt-3.5-turbo"}, "from_cache": False}
+        self.mock_stream(mocker, [
+            {"event": "start", "model": "gpt-3.5-turbo", "from_cache": False},
+            *[{"event": "section", "name": name, "data": data} for name, data in self.CONTENT.items()],
+            {"event": "done", "result": result},
+        ])
+
+        events = self.post()
+
+        assert [event["event"] for event in events] == ["start"] + ["section"] * 6 + ["complete"]
+        assert [event["name"] for event in events[1:-1]] == list(self.CONTENT)
+        assert events[-1]["sermon"]["content"] == self.CONTENT
+        assert events[-1]["quota_remaining"] == 4
+        supabase.create_sermon.assert_awaited_once()
+
+    def test_error_event(self, mocker, supabase):
+        """Test that a failure mid-stream ends it with an error event and saves nothing"""
+        self.mock_stream(mocker, [
+            {"event": "start", "model": "gpt-3.5-turbo", "from_cache": False},
+            {"event": "section", "name": "title", "data": "Title"},
+        ], error=Exception("Failed to generate sermon: connection reset"))
+
+        events = self.post()
+
+        assert [event["event"] for event in events] == ["start", "section", "error"]
+        assert events[-1]["message"] == "Failed to generate sermon: connection reset"
+        supabase.create_sermon.assert_not_awaited()
+
+    def test_cache_hit_replay(self, mocker, supabase):
+        """Test that a cached sermon is replayed without calling OpenAI"""
+        cache = MagicMock()
+        cache.generate_cache_key.return_value = "ai_sermon:abc"
+        cache.get = AsyncMock(return_value={"sermon_content": self.CONTENT, "metadata": {"model": "gpt-4"}})
+        mocker.patch('app.services.openai_service.get_cache_service', return_value=cache)
+        openai_service = OpenAIService()
+        openai_service.client = MagicMock()
+        openai_service.client.chat.completions.create = AsyncMock()
+        mocker.patch('app.routers.sermons.get_openai_service', return_value=openai_service)
+
+        events = self.post()
+
+        assert events[0] == {"event": "start", "model": "gpt-4", "from_cache": True}
+        assert {event["name"]: event["data"] for event in events[1:-1]} == self.CONTENT
+        assert events[-1]["event"] == "complete"
+        assert events[-1]["sermon"]["ai_model_used"] == "gpt-4"
+        openai_service.client.chat.completions.create.assert_not_awaited()
+        cache.acquire_lock.assert_not_called()
+
+
 class TestSermonUpdate:
     """Tests for sermon update endpoint"""
 
     def test_update_sermon_success(self, mocker):
         """Test successful sermon update"""
         mock_supabase = mocker.patch('app.routers.sermons.get_supabase_service')
-        mock_supabase.return_value.get_sermon.return_value = {
+        mock_supabase.return_value.update_sermon.return_value = {
             "id": "sermon-123",
             "user_id": "test-user-123",
-            "title": "Original Title",
+            "title": "Updated Title",
+            "content": {},
+            "source_verses": [],
+            "sermon_type": "expository",
+            "target_audience": "general",
+            "language": "telugu",
+            "created_at": "2026-02-01",
+            "updated_at": "2026-02-02"
         }
-        mock_supabase.return_value.update_sermon.return_value = True
         mocker.patch('app.routers.sermons.get_current_user', return_value='test-user-123')
 
         update_data = {
@@ -256,14 +481,16 @@ class TestSermonUpdate:
         )
 
         assert response.status_code == 200
+        assert response.json()["title"] == "Updated Title"
+        mock_supabase.return_value.update_sermon.assert_called_once_with(
+            "sermon-123", "test-user-123", {"title": "Updated Title"}
+        )
+        mock_supabase.return_value.get_sermon.assert_not_called()
 
     def test_update_sermon_unauthorized(self, mocker):
         """Test sermon update for sermon owned by different user"""
         mock_supabase = mocker.patch('app.routers.sermons.get_supabase_service')
-        mock_supabase.return_value.get_sermon.return_value = {
-            "id": "sermon-123",
-            "user_id": "other-user",
-        }
+        mock_supabase.return_value.update_sermon.return_value = None
         mocker.patch('app.routers.sermons.get_current_user', return_value='test-user-123')
 
         response = client.put(
@@ -281,10 +508,6 @@ class TestSermonDeletion:
     def test_delete_sermon_success(self, mocker):
         """Test successful sermon deletion"""
         mock_supabase = mocker.patch('app.routers.sermons.get_supabase_service')
-        mock_supabase.return_value.get_sermon.return_value = {
-            "id": "sermon-123",
-            "user_id": "test-user-123",
-        }
         mock_supabase.return_value.delete_sermon.return_value = True
         mocker.patch('app.routers.sermons.get_current_user', return_value='test-user-123')
 
@@ -295,11 +518,12 @@ class TestSermonDeletion:
 
         assert response.status_code == 200
         assert "deleted successfully" in response.json()["message"]
+        mock_supabase.return_value.delete_sermon.assert_called_once_with("sermon-123", "test-user-123")
 
     def test_delete_sermon_not_found(self, mocker):
         """Test sermon deletion with non-existent sermon"""
         mock_supabase = mocker.patch('app.routers.sermons.get_supabase_service')
-        mock_supabase.return_value.get_sermon.return_value = None
+        mock_supabase.return_value.delete_sermon.return_value = False
         mocker.patch('app.routers.sermons.get_current_user', return_value='test-user-123')
 
         response = client.delete(
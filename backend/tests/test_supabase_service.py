@@ -0,0 +1,200 @@
+"""
+Supabase Service Tests
+Tests for database operations against a mocked Supabase client
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.services.supabase_service import SupabaseService
+
+
+@pytest.fixture
+def supabase_service(mocker, monkeypatch):
+    """SupabaseService with a mocked Supabase client"""
+    monkeypatch.setenv("SUPABASE_URL", "https://example.supabase.co")
+    monkeypatch.setenv("SUPABASE_KEY", "service-role-key")
+    mocker.patch("app.services.supabase_service.acreate_client", AsyncMock(return_value=MagicMock()))
+    service = SupabaseService()
+    asyncio.run(service.connect())
+    return service
+
+
+def returns(query, rows):
+    """Make an awaited query.execute() return rows"""
+    query.execute = AsyncMock(return_value=MagicMock(data=rows))
+
+
+def rpc_returns(service, rows):
+    """Make the consume_ai_quota RPC return rows"""
+    returns(service.client.rpc.return_value, rows)
+
+
+class TestConnection:
+    """Tests for the async client lifecycle"""
+
+    def test_connect_is_idempotent(self, supabase_service):
+        """Test that connect() reuses the existing client"""
+        client = supabase_service.client
+        asyncio.run(supabase_service.connect())
+
+        assert supabase_service.client is client
+
+    def test_close_releases_http_session(self, supabase_service):
+        """Test that close() closes the PostgREST session"""
+        postgrest = supabase_service.client.postgrest
+        postgrest.aclose = AsyncMock()
+
+        asyncio.run(supabase_service.close())
+
+        postgrest.aclose.assert_awaited_once()
+        assert supabase_service.client is None
+
+
+class TestCheckAndDecrementQuota:
+    """Tests for the atomic quota RPC"""
+
+    def test_consumes_quota_in_one_call(self, supabase_service):
+        """Test that a successful call returns remaining quota and tier"""
+        rpc_returns(supabase_service, [{
+            "success": True,
+            "quota_remaining": 9,
+            "quota_reset_at": "2026-11-01T00:00:00+00:00",
+            "subscription_tier": "premium",
+            "unlimited": False,
+        }])
+
+        result = asyncio.run(supabase_service.check_and_decrement_quota("user-1"))
+
+        supabase_service.client.rpc.assert_called_once_with("consume_ai_quota", {"p_user_id": "user-1"})
+        supabase_service.client.table.assert_not_called()
+        assert result["success"] is True
+        assert result["quota_remaining"] == 9
+        assert result["subscription_tier"] == "premium"
+        assert "unlimited" not in result
+
+    def test_quota_exceeded(self, supabase_service):
+        """Test that an exhausted quota is reported with its reset time"""
+        rpc_returns(supabase_service, [{
+            "success": False,
+            "quota_remaining": 0,
+            "quota_reset_at": "2026-11-01T00:00:00+00:00",
+            "subscription_tier": "free",
+            "unlimited": False,
+        }])
+
+        result = asyncio.run(supabase_service.check_and_decrement_quota("user-1"))
+
+        assert result["success"] is False
+        assert result["error"] == "Quota exceeded"
+        assert result["quota_reset_at"] == "2026-11-01T00:00:00+00:00"
+
+    def test_unlimited_plan(self, supabase_service):
+        """Test that unlimited plans succeed without a remaining count"""
+        rpc_returns(supabase_service, [{
+            "success": True,
+            "quota_remaining": -1,
+            "quota_reset_at": "2026-11-01T00:00:00+00:00",
+            "subscription_tier": "ministry",
+            "unlimited": True,
+        }])
+
+        result = asyncio.run(supabase_service.check_and_decrement_quota("user-1"))
+
+        assert result["success"] is True
+        assert result["unlimited"] is True
+        assert result["quota_remaining"] == -1
+
+    def test_missing_profile(self, supabase_service):
+        """Test that an unknown user is rejected"""
+        rpc_returns(supabase_service, [])
+
+        result = asyncio.run(supabase_service.check_and_decrement_quota("missing"))
+
+        assert result == {"success": False, "error": "User not found", "quota_remaining": 0}
+
+
+class TestSermonWrites:
+    """Tests for single round-trip sermon writes"""
+
+    def test_create_sermon_returns_row(self, supabase_service):
+        """Test that the inserted row is returned without a follow-up read"""
+        row = {"id": "sermon-1", "title": "Title"}
+        table = supabase_service.client.table.return_value
+        returns(table.insert.return_value, [row])
+
+        assert asyncio.run(supabase_service.create_sermon({"title": "Title"})) == row
+        table.select.assert_not_called()
+
+    def test_update_sermon_filters_by_owner(self, supabase_service):
+        """Test that updates are scoped to the owner in one statement"""
+        row = {"id": "sermon-1", "title": "New"}
+        query = supabase_service.client.table.return_value.update.return_value
+        returns(query.eq.return_value.eq.return_value, [row])
+
+        result = asyncio.run(supabase_service.update_sermon("sermon-1", "user-1", {"title": "New"}))
+
+        assert result == row
+        query.eq.assert_called_once_with("id", "sermon-1")
+        query.eq.return_value.eq.assert_called_once_with("user_id", "user-1")
+
+    def test_delete_sermon_not_owned(self, supabase_service):
+        """Test that deleting another user's sermon matches no rows"""
+        query = supabase_service.client.table.return_value.delete.return_value
+        returns(query.eq.return_value.eq.return_value, [])
+
+        assert asyncio.run(supabase_service.delete_sermon("sermon-1", "user-2")) is False
+        query.eq.return_value.eq.assert_called_once_with("user_id", "user-2")
+
+    def test_summaries_use_keyset_filter(self, supabase_service):
+        """Test that summary pages project list columns and seek past the cursor"""
+        query = supabase_service.client.table.return_value.select.return_value.eq.return_value
+        ordered = query.or_.return_value.order.return_value.order.return_value.limit.return_value
+        returns(ordered, [{"id": "sermon-1"}])
+
+        result = asyncio.run(supabase_service.get_user_sermon_summaries(
+            "user-1", limit=21, after=("2026-02-01T10:00:00+00:00", "sermon-2")
+        ))
+
+        assert result == [{"id": "sermon-1"}]
+        supabase_service.client.table.return_value.select.assert_called_once_with(
+            "id,title,sermon_type,target_audience,created_at"
+        )
+        query.or_.assert_called_once_with(
+            'created_at.lt."2026-02-01T10:00:00+00:00",'
+            'and(created_at.eq."2026-02-01T10:00:00+00:00",id.lt.sermon-2)'
+        )
+
+
+class TestAICache:
+    """Tests for the ai_cache second-level cache operations"""
+
+    def test_get_entry_skips_expired(self, supabase_service):
+        """Test that entries are read by key and only while unexpired"""
+        row = {"cache_key": "ai_sermon:abc", "response_content": {}}
+        query = supabase_service.client.table.return_value.select.return_value.eq.return_value
+        returns(query.gt.return_value.limit.return_value, [row])
+
+        assert asyncio.run(supabase_service.get_ai_cache_entry("ai_sermon:abc")) == row
+        query.gt.assert_called_once()
+        assert query.gt.call_args.args[0] == "expires_at"
+
+    def test_upsert_entries_in_one_request(self, supabase_service):
+        """Test that a batch of rows is upserted on cache_key"""
+        table = supabase_service.client.table.return_value
+        returns(table.upsert.return_value, [])
+        rows = [{"cache_key": "ai_sermon:a"}, {"cache_key": "ai_sermon:b"}]
+
+        assert asyncio.run(supabase_service.upsert_ai_cache_entries(rows)) is True
+        table.upsert.assert_called_once_with(rows, on_conflict="cache_key")
+
+    def test_hit_counts_in_one_rpc(self, supabase_service):
+        """Test that hit counts are added through the bulk RPC"""
+        rpc_returns(supabase_service, 2)
+
+        assert asyncio.run(supabase_service.increment_ai_cache_hits({"ai_sermon:a": 3, "ai_sermon:b": 1}))
+        supabase_service.client.rpc.assert_called_once_with(
+            "increment_ai_cache_hits", {"p_hits": {"ai_sermon:a": 3, "ai_sermon:b": 1}}
+        )
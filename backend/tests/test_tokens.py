@@ -0,0 +1,74 @@
+"""
+Token Counting Tests
+Tests for cached encoders, the fallback estimate and truncation
+"""
+
+import pytest
+
+from app.utils import tokens
+
+
+class ByteEncoding:
+    """Stand-in tiktoken encoding: one token per UTF-8 byte"""
+
+    def encode(self, text):
+        return list(text.encode("utf-8"))
+
+    def decode_bytes(self, token_ids):
+        return bytes(token_ids)
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Reset the per-process encoder and static count caches"""
+    tokens.get_encoding.cache_clear()
+    tokens.count_static_tokens.cache_clear()
+    yield
+    tokens.get_encoding.cache_clear()
+    tokens.count_static_tokens.cache_clear()
+
+
+class TestTokens:
+    """Tests for app.utils.tokens"""
+
+    def test_encoder_loaded_once(self, mocker):
+        """Test that the encoder is loaded once per model, not per call"""
+        load = mocker.patch("app.utils.tokens.tiktoken.encoding_for_model", return_value=ByteEncoding())
+
+        assert tokens.count_tokens("abc", "gpt-4") == 3
+        assert tokens.count_tokens("abcd", "gpt-4") == 4
+        load.assert_called_once_with("gpt-4")
+
+    def test_unknown_model_uses_default_encoding(self, mocker):
+        """Test that model names tiktoken does not know get cl100k_base"""
+        mocker.patch("app.utils.tokens.tiktoken.encoding_for_model", side_effect=KeyError("x"))
+        default = mocker.patch("app.utils.tokens.tiktoken.get_encoding", return_value=ByteEncoding())
+
+        assert tokens.get_encoding("my-fine-tune") is default.return_value
+        default.assert_called_once_with("cl100k_base")
+
+    def test_estimate_when_encoder_unavailable(self, mocker):
+        """Test that Telugu is estimated by bytes, not characters // 4"""
+        mocker.patch("app.utils.tokens.tiktoken.encoding_for_model", side_effect=OSError("offline"))
+        telugu = "దేవుడు లోకమును ప్రేమించెను"
+
+        assert tokens.count_tokens("a" * 40, "gpt-4") == 10
+        assert tokens.count_tokens(telugu, "gpt-4") > len(telugu)
+
+    def test_truncate_on_token_boundary(self, mocker):
+        """Test truncation with an encoder drops partial characters"""
+        mocker.patch("app.utils.tokens.tiktoken.encoding_for_model", return_value=ByteEncoding())
+
+        # 4 bytes: one Telugu character (3 bytes) plus a partial one
+        assert tokens.truncate_to_tokens("దేవుడు", 4, "gpt-4") == "ద"
+        assert tokens.truncate_to_tokens("abc", 10, "gpt-4") == "abc"
+
+    def test_truncate_with_estimate(self, mocker):
+        """Test that estimated truncation stays within the budget"""
+        mocker.patch("app.utils.tokens.tiktoken.encoding_for_model", side_effect=OSError("offline"))
+        text = "దేవుడు లోకమును ప్రేమించెను"
+
+        cut = tokens.truncate_to_tokens(text, 10, "gpt-4")
+
+        assert text.startswith(cut)
+        assert 0 < tokens.count_tokens(cut, "gpt-4") <= 10
@@ -14,6 +14,7 @@ jest.mock('expo-sqlite', () => ({
     getAllAsync: jest.fn(),
     getFirstAsync: jest.fn(),
     runAsync: jest.fn(),
+    execAsync: jest.fn(),
   })),
 }));
 
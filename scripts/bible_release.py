@@ -0,0 +1,244 @@
+"""
+Publish bible.db releases as row-level deltas
+Clients holding an older bible.db download only the rows that changed
+
+Each release is identified by a hash of the database content. Publishing
+compares the new database with the previously released one and writes a
+gzipped JSON delta, named by its SHA-256, plus an entry in manifest.json:
+
+    data/releases/
+        manifest.json                 # release chain, oldest first
+        bible.db                      # latest released database
+        deltas/<sha256>.json.gz       # previous release -> release
+
+Rows are matched by natural key (verses by translation, book, chapter and
+verse), not by rowid, because rebuilds renumber rowids; page-level diffs
+would be just as noisy since VACUUM rewrites pages.
+
+Usage:
+    python scripts/bible_release.py                        # assets/bible.db
+    python scripts/create_bible_db.py --release            # build + publish
+"""
+
+import os
+import gzip
+import json
+import shutil
+import sqlite3
+import hashlib
+import argparse
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+DELTA_FORMAT = 1
+
+# Tables shipped in deltas: natural key columns, then the other columns
+DELTA_TABLES = {
+    "translations": (("id",), ("code", "name", "language")),
+    "books": (("id",), ("name_telugu", "name_english", "testament", "chapter_count", "verse_count")),
+    "book_names": (("translation_id", "book_id"), ("name",)),
+    "verses": (("translation_id", "book_id", "chapter", "verse"), ("text",)),
+}
+
+
+def database_version(conn: sqlite3.Connection, schema: str = "main") -> str:
+    """
+    Hash the content of the delta tables (rowids and search tables excluded).
+
+    Args:
+        conn: Database connection
+        schema: Schema name (for attached databases)
+
+    Returns:
+        16 hex characters identifying the content
+    """
+    digest = hashlib.sha256()
+
+    for table, (key, columns) in DELTA_TABLES.items():
+        digest.update(table.encode())
+        order = ", ".join(key + columns)
+        for row in conn.execute(f"SELECT {order} FROM {schema}.{table} ORDER BY {order}"):
+            digest.update(json.dumps(row, ensure_ascii=False).encode())
+
+    return digest.hexdigest()[:16]
+
+
+def compute_delta(old_path: str, new_path: str) -> Dict[str, Any]:
+    """
+    Compute the row changes that turn one database into another.
+
+    For every table, "delete" lists keys to remove and "upsert" lists rows
+    whose keys are replaced: a client deletes all rows with each listed
+    key, then inserts the upsert rows.
+
+    Args:
+        old_path: Previously released database
+        new_path: New database
+
+    Returns:
+        Delta dict (see module docstring)
+    """
+    conn = sqlite3.connect(new_path)
+    conn.execute("ATTACH DATABASE ? AS old", (old_path,))
+
+    delta: Dict[str, Any] = {
+        "format": DELTA_FORMAT,
+        "from": database_version(conn, "old"),
+        "to": database_version(conn, "main"),
+        "tables": {},
+    }
+
+    for table, (key, columns) in DELTA_TABLES.items():
+        keys = ", ".join(key)
+        row = ", ".join(key + columns)
+        match = " AND ".join(f"t.{k} = changed.{k}" for k in key)
+
+        # Keys whose rows differ in either direction
+        changed = f"""
+            SELECT {keys} FROM (
+                SELECT * FROM (SELECT {row} FROM main.{table} EXCEPT SELECT {row} FROM old.{table})
+                UNION ALL
+                SELECT * FROM (SELECT {row} FROM old.{table} EXCEPT SELECT {row} FROM main.{table})
+            ) GROUP BY {keys}
+        """
+
+        upsert = conn.execute(f"""
+            SELECT {", ".join(f"t.{c}" for c in key + columns)}
+            FROM main.{table} AS t JOIN ({changed}) AS changed ON {match}
+            ORDER BY {", ".join(f"t.{c}" for c in key)}, t.rowid
+        """).fetchall()
+
+        delete = conn.execute(f"""
+            SELECT {", ".join(f"changed.{k}" for k in key)} FROM ({changed}) AS changed
+            WHERE NOT EXISTS (SELECT 1 FROM main.{table} AS t WHERE {match})
+        """).fetchall()
+
+        if upsert or delete:
+            delta["tables"][table] = {
+                "key": list(key),
+                "columns": list(key + columns),
+                "upsert": [list(r) for r in upsert],
+                "delete": [list(r) for r in delete],
+            }
+
+    conn.close()
+    return delta
+
+
+def apply_delta(conn: sqlite3.Connection, delta: Dict[str, Any]):
+    """
+    Apply a delta in one transaction (search tables follow via triggers).
+
+    Args:
+        conn: Connection to a database at version delta["from"]
+        delta: Delta from compute_delta (or a squashed chain)
+    """
+    with conn:
+        for table, changes in delta["tables"].items():
+            key = changes["key"]
+            match = " AND ".join(f"{k} = ?" for k in key)
+
+            replaced = [row[:len(key)] for row in changes["upsert"]]
+            conn.executemany(
+                f"DELETE FROM {table} WHERE {match}",
+                list({tuple(k): None for k in replaced + changes["delete"]}),
+            )
+            conn.executemany(
+                f"INSERT INTO {table} ({', '.join(changes['columns'])})"
+                f" VALUES ({', '.join('?' * len(changes['columns']))})",
+                changes["upsert"],
+            )
+
+
+def load_manifest(releases_dir: str) -> Dict[str, Any]:
+    """Load manifest.json (empty chain if there is none yet)"""
+    path = os.path.join(releases_dir, "manifest.json")
+    if not os.path.exists(path):
+        return {"format": DELTA_FORMAT, "latest": None, "releases": []}
+
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def publish_release(db_path: str, releases_dir: str) -> Optional[Dict[str, Any]]:
+    """
+    Publish a database as the next release.
+
+    Args:
+        db_path: Newly built bible.db
+        releases_dir: Release directory (created if missing)
+
+    Returns:
+        The new manifest entry, or None if the content is unchanged
+    """
+    print("\nPublishing release...")
+
+    os.makedirs(os.path.join(releases_dir, "deltas"), exist_ok=True)
+    manifest = load_manifest(releases_dir)
+    released_db = os.path.join(releases_dir, "bible.db")
+
+    conn = sqlite3.connect(db_path)
+    version = database_version(conn)
+    conn.close()
+
+    if version == manifest["latest"]:
+        print(f"✅ Already released: {version}")
+        return None
+
+    entry: Dict[str, Any] = {
+        "version": version,
+        "previous": manifest["latest"],
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "delta": None,
+    }
+
+    if manifest["latest"] and os.path.exists(released_db):
+        delta = compute_delta(released_db, db_path)
+        payload = gzip.compress(
+            json.dumps(delta, ensure_ascii=False, separators=(",", ":")).encode(),
+            mtime=0,  # Same content -> same bytes -> same name
+        )
+        sha256 = hashlib.sha256(payload).hexdigest()
+
+        with open(os.path.join(releases_dir, "deltas", f"{sha256}.json.gz"), 'wb') as f:
+            f.write(payload)
+
+        entry["delta"] = {
+            "file": f"deltas/{sha256}.json.gz",
+            "sha256": sha256,
+            "size": len(payload),
+            "rows": sum(len(t["upsert"]) + len(t["delete"]) for t in delta["tables"].values()),
+        }
+        print(f"  ✅ Delta {manifest['latest']} -> {version}: {entry['delta']['rows']} rows, {len(payload) / 1024:.1f} KB")
+
+    shutil.copyfile(db_path, released_db)
+
+    manifest["releases"].append(entry)
+    manifest["latest"] = version
+
+    # Write then rename, so readers never see a partial manifest
+    manifest_path = os.path.join(releases_dir, "manifest.json")
+    with open(manifest_path + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(manifest_path + ".tmp", manifest_path)
+
+    print(f"✅ Released {version}")
+    return entry
+
+
+def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description="Publish bible.db as a delta release")
+    parser.add_argument("--db", default="assets/bible.db", help="Database to publish")
+    parser.add_argument("--releases", default="data/releases", help="Release directory")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"\n❌ Database not found: {args.db}")
+        return
+
+    publish_release(args.db, args.releases)
+
+
+if __name__ == "__main__":
+    main()
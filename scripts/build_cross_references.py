@@ -0,0 +1,306 @@
+"""
+Build the cross-reference table in bible.db
+Related verses come from the OpenBible.info dataset plus a text similarity pass
+
+Verses are keyed by book_id * 1_000_000 + chapter * 1000 + verse, so one
+verse's (or a range's) related verses are a single primary key range scan:
+
+    cross_references(verse_key, rank, related_key, related_end_key, source, score)
+
+For each verse, OpenBible references come first (most votes first), then
+verses with similar wording elsewhere in the Bible (highest similarity
+first). Download the dataset from https://www.openbible.info/labs/cross-references/
+and extract cross_references.txt to data/.
+
+Usage:
+    python scripts/build_cross_references.py                    # assets/bible.db
+    python scripts/create_bible_db.py --cross-references        # build + cross-references
+"""
+
+import os
+import re
+import math
+import time
+import heapq
+import sqlite3
+import argparse
+from collections import Counter, defaultdict
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# OpenBible (OSIS) book abbreviations in canonical order: book id = index + 1
+OSIS_BOOKS = [
+    "Gen", "Exod", "Lev", "Num", "Deut", "Josh", "Judg", "Ruth", "1Sam", "2Sam",
+    "1Kgs", "2Kgs", "1Chr", "2Chr", "Ezra", "Neh", "Esth", "Job", "Ps", "Prov",
+    "Eccl", "Song", "Isa", "Jer", "Lam", "Ezek", "Dan", "Hos", "Joel", "Amos",
+    "Obad", "Jonah", "Mic", "Nah", "Hab", "Zeph", "Hag", "Zech", "Mal",
+    "Matt", "Mark", "Luke", "John", "Acts", "Rom", "1Cor", "2Cor", "Gal", "Eph",
+    "Phil", "Col", "1Thess", "2Thess", "1Tim", "2Tim", "Titus", "Phlm", "Heb", "Jas",
+    "1Pet", "2Pet", "1John", "2John", "3John", "Jude", "Rev",
+]
+OSIS_BOOK_IDS = {name: i + 1 for i, name in enumerate(OSIS_BOOKS)}
+
+OSIS_REF_RE = re.compile(r'([1-3]?[A-Za-z]+)\.(\d+)\.(\d+)')
+
+# Words, keeping Indic combining marks and ZWNJ/ZWJ inside words
+WORD_RE = re.compile(r'[\w\u0900-\u0dff\u200c\u200d]+')
+
+DEFAULT_MAX_PER_VERSE = 10
+DEFAULT_SIMILAR = 5
+DEFAULT_MIN_SIMILARITY = 0.2
+
+# Source translation for the similarity pass
+DEFAULT_TRANSLATION_ID = 1
+
+
+def verse_key(book_id: int, chapter: int, verse: int) -> int:
+    """Key a verse as book_id * 1_000_000 + chapter * 1000 + verse"""
+    return book_id * 1_000_000 + chapter * 1000 + verse
+
+
+def parse_osis_ref(ref: str) -> Optional[Tuple[int, int]]:
+    """
+    Parse an OpenBible reference into (start key, end key).
+
+    "Rom.5.8" is a single verse; "Prov.8.22-Prov.8.30" is a range. Ranges
+    that leave their chapter are cut to the first verse, since references
+    cover one chapter.
+
+    Returns:
+        (start key, end key), or None for unknown books
+    """
+    parts = ref.split("-")
+    match = OSIS_REF_RE.fullmatch(parts[0])
+    if not match or match.group(1) not in OSIS_BOOK_IDS:
+        return None
+
+    book_id = OSIS_BOOK_IDS[match.group(1)]
+    start = verse_key(book_id, int(match.group(2)), int(match.group(3)))
+    end = start
+
+    if len(parts) == 2:
+        end_match = OSIS_REF_RE.fullmatch(parts[1])
+        if end_match and end_match.group(1) == match.group(1) and end_match.group(2) == match.group(2):
+            end = max(start, verse_key(book_id, int(end_match.group(2)), int(end_match.group(3))))
+
+    return start, end
+
+
+def load_openbible(
+    path: str,
+    min_votes: int = 1,
+) -> Dict[int, List[Tuple[float, int, int]]]:
+    """
+    Load OpenBible cross_references.txt (From Verse, To Verse, Votes; tab-separated).
+
+    Args:
+        path: Path to cross_references.txt
+        min_votes: Drop references with fewer votes (the dataset has
+            negative votes for disputed references)
+
+    Returns:
+        Verse key -> [(votes, related key, related end key)], most votes first
+    """
+    references: Dict[int, List[Tuple[float, int, int]]] = defaultdict(list)
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            fields = line.rstrip("\n").split("\t")
+            if len(fields) < 3 or not fields[2].lstrip("-").isdigit():
+                continue  # Header or malformed line
+
+            votes = int(fields[2])
+            source, target = parse_osis_ref(fields[0]), parse_osis_ref(fields[1])
+            if votes < min_votes or source is None or target is None:
+                continue
+
+            # A verse range source applies to each of its verses
+            for key in range(source[0], source[1] + 1):
+                references[key].append((float(votes), target[0], target[1]))
+
+    for refs in references.values():
+        refs.sort(key=lambda r: (-r[0], r[1]))
+
+    return references
+
+
+def _iter_verses(conn: sqlite3.Connection, translation_id: int) -> Iterator[Tuple[int, str]]:
+    """Yield (verse key, text) for one translation"""
+    columns = {name for _, name, *_ in conn.execute("PRAGMA table_info(verses)")}
+    where = " WHERE translation_id = ?" if "translation_id" in columns else ""
+    params = (translation_id,) if where else ()
+
+    for book_id, chapter, verse, text in conn.execute(
+        f"SELECT book_id, chapter, verse, text FROM verses{where} ORDER BY book_id, chapter, verse",
+        params,
+    ):
+        yield verse_key(book_id, chapter, verse), text
+
+
+def find_similar_verses(
+    verses: List[Tuple[int, str]],
+    limit: int = DEFAULT_SIMILAR,
+    min_similarity: float = DEFAULT_MIN_SIMILARITY,
+) -> Dict[int, List[Tuple[float, int]]]:
+    """
+    Find verses with similar wording (TF-IDF cosine similarity).
+
+    Words in a single verse cannot link two verses, and words in more than
+    0.2% of verses (names of God, particles) link too many, so both are
+    dropped; only the remaining postings are scored. Verses in the same
+    chapter are skipped, as the reader sees them anyway.
+
+    Args:
+        verses: (verse key, text) pairs
+        limit: Similar verses to keep per verse
+        min_similarity: Minimum cosine similarity (0-1)
+
+    Returns:
+        Verse key -> [(similarity, related key)], most similar first
+    """
+    documents = [Counter(w.lower() for w in WORD_RE.findall(text) if not w.isdigit()) for _, text in verses]
+    document_frequency = Counter(word for words in documents for word in words)
+    max_df = max(50, len(verses) // 500)
+
+    idf = {
+        word: math.log(len(verses) / df)
+        for word, df in document_frequency.items()
+        if 2 <= df <= max_df
+    }
+
+    # Unit-length weight vectors and postings over the kept words
+    vectors: List[List[Tuple[str, float]]] = []
+    postings: Dict[str, List[Tuple[int, float]]] = defaultdict(list)
+    for doc_id, words in enumerate(documents):
+        weights = [(word, (1 + math.log(count)) * idf[word]) for word, count in words.items() if word in idf]
+        norm = math.sqrt(sum(w * w for _, w in weights)) or 1.0
+        vector = [(word, w / norm) for word, w in weights]
+        vectors.append(vector)
+        for word, weight in vector:
+            postings[word].append((doc_id, weight))
+
+    keys = [key for key, _ in verses]
+    similar: Dict[int, List[Tuple[float, int]]] = {}
+
+    for doc_id, vector in enumerate(vectors):
+        chapter = keys[doc_id] // 1000
+        scores: Dict[int, float] = defaultdict(float)
+        for word, weight in vector:
+            for other, other_weight in postings[word]:
+                scores[other] += weight * other_weight
+
+        best = heapq.nlargest(
+            limit,
+            (
+                (score, keys[other])
+                for other, score in scores.items()
+                if score >= min_similarity and keys[other] // 1000 != chapter
+            ),
+        )
+        if best:
+            similar[keys[doc_id]] = [(round(score, 4), key) for score, key in best]
+
+    return similar
+
+
+def build_cross_references(
+    db_path: str,
+    openbible_file: Optional[str] = None,
+    similar: int = DEFAULT_SIMILAR,
+    max_per_verse: int = DEFAULT_MAX_PER_VERSE,
+    min_similarity: float = DEFAULT_MIN_SIMILARITY,
+) -> int:
+    """
+    (Re)build the cross_references table.
+
+    Args:
+        db_path: bible.db to update
+        openbible_file: OpenBible cross_references.txt (None: similarity only)
+        similar: Similar verses to add per verse (0 to skip the pass)
+        max_per_verse: Total related verses kept per verse
+        min_similarity: Minimum similarity for the similarity pass
+
+    Returns:
+        Number of rows written
+    """
+    print("\nBuilding cross-references...")
+    started = time.perf_counter()
+
+    conn = sqlite3.connect(db_path)
+    verses = list(_iter_verses(conn, DEFAULT_TRANSLATION_ID))
+    existing = {key for key, _ in verses}
+
+    openbible: Dict[int, List[Tuple[float, int, int]]] = {}
+    if openbible_file:
+        openbible = load_openbible(openbible_file)
+        print(f"  ✅ OpenBible: {sum(len(r) for r in openbible.values())} references")
+
+    similar_verses: Dict[int, List[Tuple[float, int]]] = {}
+    if similar > 0:
+        similar_verses = find_similar_verses(verses, limit=similar, min_similarity=min_similarity)
+        print(f"  ✅ Similarity: {sum(len(r) for r in similar_verses.values())} pairs")
+
+    rows = []
+    for key in sorted(existing):
+        related: List[Tuple[int, int, str, float]] = []
+        seen = set()
+
+        for votes, start, end in openbible.get(key, []):
+            if start in existing and start not in seen:
+                related.append((start, end, "openbible", votes))
+                seen.add(start)
+
+        for score, start in similar_verses.get(key, []):
+            if start not in seen:
+                related.append((start, start, "similar", score))
+                seen.add(start)
+
+        for rank, (start, end, source, score) in enumerate(related[:max_per_verse]):
+            rows.append((key, rank, start, end, source, score))
+
+    with conn:
+        conn.execute("DROP TABLE IF EXISTS cross_references")
+        conn.execute("""
+            CREATE TABLE cross_references (
+                verse_key INTEGER NOT NULL,
+                rank INTEGER NOT NULL,
+                related_key INTEGER NOT NULL,
+                related_end_key INTEGER NOT NULL,
+                source TEXT NOT NULL,
+                score REAL NOT NULL,
+                PRIMARY KEY (verse_key, rank)
+            ) WITHOUT ROWID
+        """)
+        conn.executemany("INSERT INTO cross_references VALUES (?, ?, ?, ?, ?, ?)", rows)
+    conn.close()
+
+    print(f"✅ Cross-references: {len(rows)} rows for {len({r[0] for r in rows})} verses "
+          f"({time.perf_counter() - started:.1f}s)")
+    return len(rows)
+
+
+def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description="Build the cross-reference table in bible.db")
+    parser.add_argument("--db", default="assets/bible.db", help="Database to update")
+    parser.add_argument(
+        "--openbible",
+        default="data/cross_references.txt",
+        help="OpenBible cross_references.txt (skipped if missing)",
+    )
+    parser.add_argument("--similar", type=int, default=DEFAULT_SIMILAR, help="Similar verses per verse (0: none)")
+    parser.add_argument("--max-per-verse", type=int, default=DEFAULT_MAX_PER_VERSE, help="Related verses kept per verse")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"\n❌ Database not found: {args.db}")
+        return
+
+    openbible_file = args.openbible if os.path.exists(args.openbible) else None
+    if openbible_file is None:
+        print(f"⚠️  {args.openbible} not found, using the similarity pass only")
+
+    build_cross_references(args.db, openbible_file, similar=args.similar, max_per_verse=args.max_per_verse)
+
+
+if __name__ == "__main__":
+    main()
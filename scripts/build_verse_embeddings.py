@@ -0,0 +1,270 @@
+"""
+Build verse embeddings for semantic search
+Writes a memory-mapped NumPy matrix next to bible.db, one row per verse
+
+By default verses are embedded as signed hashed TF-IDF vectors over words
+and character trigrams (no model, no network). With --model, a local
+sentence-transformers model is used instead; the backend then needs the
+same model installed to embed text queries.
+
+    assets/
+        bible.db
+        bible.vectors.json            # method, dims, dtype, IVF lists
+        bible.vectors.npy             # (verses, dims) int8 or float16
+        bible.vectors.keys.npy        # verse key per row
+        bible.vectors.idf.npy         # hashed TF-IDF weights
+        bible.vectors.centroids.npy   # IVF centroids (--ivf)
+
+Usage:
+    python scripts/build_verse_embeddings.py                   # hashed TF-IDF, exact search
+    python scripts/build_verse_embeddings.py --ivf             # + IVF partitioning
+    python scripts/build_verse_embeddings.py --model intfloat/multilingual-e5-small
+"""
+
+import os
+import re
+import json
+import math
+import time
+import zlib
+import sqlite3
+import argparse
+import unicodedata
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+VECTORS_FORMAT = 1
+
+# Words, keeping Indic combining marks and ZWNJ/ZWJ inside words
+# (must match backend/app/services/verse_vectors.py)
+WORD_RE = re.compile(r'[\w\u0900-\u0dff\u200c\u200d]+')
+
+DEFAULT_DIMS = 512
+DEFAULT_NGRAM = 3
+DEFAULT_TRANSLATION_ID = 1
+KMEANS_ITERATIONS = 10
+
+
+def verse_key(book_id: int, chapter: int, verse: int) -> int:
+    """Key a verse as book_id * 1_000_000 + chapter * 1000 + verse"""
+    return book_id * 1_000_000 + chapter * 1000 + verse
+
+
+def vector_paths(db_path: str) -> Dict[str, str]:
+    """Output files next to the database"""
+    stem = os.path.splitext(db_path)[0]
+    return {
+        "meta": f"{stem}.vectors.json",
+        "matrix": f"{stem}.vectors.npy",
+        "keys": f"{stem}.vectors.keys.npy",
+        "idf": f"{stem}.vectors.idf.npy",
+        "centroids": f"{stem}.vectors.centroids.npy",
+    }
+
+
+def hashed_features(text: str, ngram: int) -> Iterable[str]:
+    """Words plus character n-grams of each word (Telugu is heavily inflected)"""
+    for word in WORD_RE.findall(unicodedata.normalize("NFC", text).lower()):
+        if word.isdigit():
+            continue
+        yield "w:" + word
+        padded = f"<{word}>"
+        for i in range(len(padded) - ngram + 1):
+            yield "c:" + padded[i:i + ngram]
+
+
+def embed_hashed_tfidf(texts: List[str], dims: int, ngram: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Embed texts as signed hashed TF-IDF vectors of unit length.
+
+    Each feature's CRC32 picks a dimension (low bits) and a sign (top bit).
+    IDF is computed per dimension.
+
+    Returns:
+        Tuple of (matrix float32 (texts, dims), idf float32 (dims,))
+    """
+    documents: List[List[Tuple[int, float, float]]] = []
+    document_frequency = np.zeros(dims, dtype=np.int64)
+
+    for text in texts:
+        entries = []
+        for feature, count in Counter(hashed_features(text, ngram)).items():
+            h = zlib.crc32(feature.encode("utf-8"))
+            entries.append((h % dims, 1.0 if h >> 31 else -1.0, 1.0 + math.log(count)))
+        documents.append(entries)
+        document_frequency[list({bucket for bucket, _, _ in entries})] += 1
+
+    idf = (np.log((1 + len(texts)) / (1 + document_frequency)) + 1).astype(np.float32)
+
+    matrix = np.zeros((len(texts), dims), dtype=np.float32)
+    for row, entries in enumerate(documents):
+        for bucket, sign, tf in entries:
+            matrix[row, bucket] += sign * tf * idf[bucket]
+
+    return _normalize(matrix), idf
+
+
+def embed_with_model(texts: List[str], model_name: str) -> np.ndarray:
+    """Embed texts with a local sentence-transformers model (unit length)"""
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(model_name, device="cpu")
+    return np.asarray(
+        model.encode(texts, batch_size=64, normalize_embeddings=True, show_progress_bar=True),
+        dtype=np.float32,
+    )
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length (zero rows stay zero)"""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+def build_ivf(matrix: np.ndarray, lists: int, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Partition rows with spherical k-means.
+
+    Returns:
+        Tuple of (centroids float32 (lists, dims), list index per row)
+    """
+    rng = np.random.default_rng(seed)
+    centroids = matrix[rng.choice(len(matrix), size=lists, replace=False)].copy()
+
+    for _ in range(KMEANS_ITERATIONS):
+        assignment = np.argmax(matrix @ centroids.T, axis=1)
+        for i in range(lists):
+            members = matrix[assignment == i]
+            if len(members):
+                centroids[i] = members.sum(axis=0)
+            else:
+                centroids[i] = matrix[rng.integers(len(matrix))]  # Re-seed empty lists
+        centroids = _normalize(centroids)
+
+    return centroids.astype(np.float32), np.argmax(matrix @ centroids.T, axis=1)
+
+
+def build_verse_embeddings(
+    db_path: str,
+    dims: int = DEFAULT_DIMS,
+    dtype: str = "int8",
+    ivf: bool = False,
+    lists: Optional[int] = None,
+    model: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Embed every verse of the default translation and write the vector files.
+
+    Args:
+        db_path: bible.db to read
+        dims: Hashed TF-IDF dimensions
+        dtype: Stored row type, "int8" (rows scaled by 127) or "float16"
+        ivf: Partition rows into IVF lists
+        lists: IVF list count (default: sqrt(verses))
+        model: sentence-transformers model name (default: hashed TF-IDF)
+
+    Returns:
+        The written metadata
+    """
+    print("\nBuilding verse embeddings...")
+    started = time.perf_counter()
+
+    conn = sqlite3.connect(db_path)
+    columns = {name for _, name, *_ in conn.execute("PRAGMA table_info(verses)")}
+    where = " WHERE translation_id = ?" if "translation_id" in columns else ""
+    rows = conn.execute(
+        f"SELECT book_id, chapter, verse, text FROM verses{where} ORDER BY book_id, chapter, verse",
+        (DEFAULT_TRANSLATION_ID,) if where else (),
+    ).fetchall()
+    conn.close()
+
+    keys = np.array([verse_key(b, c, v) for b, c, v, _ in rows], dtype=np.int32)
+    texts = [text for *_, text in rows]
+
+    meta: Dict[str, Any] = {
+        "format": VECTORS_FORMAT,
+        "translation_id": DEFAULT_TRANSLATION_ID,
+        "count": len(rows),
+    }
+    idf = None
+    if model:
+        matrix = embed_with_model(texts, model)
+        meta.update(method="model", model=model)
+    else:
+        matrix, idf = embed_hashed_tfidf(texts, dims, DEFAULT_NGRAM)
+        meta.update(method="hashed-tfidf", ngram=DEFAULT_NGRAM)
+    meta["dims"] = int(matrix.shape[1])
+    print(f"  ✅ Embedded {len(rows)} verses ({meta['method']}, {meta['dims']} dims)")
+
+    centroids = None
+    meta["lists"] = None
+    if ivf:
+        lists = lists or max(1, round(math.sqrt(len(rows))))
+        centroids, assignment = build_ivf(matrix, lists)
+
+        # Group rows by list so each list is one contiguous slice
+        order = np.lexsort((keys, assignment))
+        matrix, keys = matrix[order], keys[order]
+        meta["lists"] = [0] + np.cumsum(np.bincount(assignment, minlength=lists)).tolist()
+        print(f"  ✅ IVF: {lists} lists")
+
+    meta["dtype"] = dtype
+    if dtype == "int8":
+        stored = np.round(matrix * 127).astype(np.int8)
+        meta["scale"] = 1 / 127
+    else:
+        stored = matrix.astype(np.float16)
+        meta["scale"] = 1.0
+
+    paths = vector_paths(db_path)
+    np.save(paths["matrix"], stored)
+    np.save(paths["keys"], keys)
+    for name, array in (("idf", idf), ("centroids", centroids)):
+        if array is not None:
+            np.save(paths[name], array)
+        elif os.path.exists(paths[name]):
+            os.remove(paths[name])
+
+    # Metadata last: the backend only loads vectors once it exists
+    with open(paths["meta"], 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+
+    print(f"✅ Verse embeddings: {paths['matrix']} ({stored.nbytes / 1024 / 1024:.1f} MB, "
+          f"{time.perf_counter() - started:.1f}s)")
+    return meta
+
+
+def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description="Build verse embeddings for semantic search")
+    parser.add_argument("--db", default="assets/bible.db", help="Database to embed")
+    parser.add_argument("--dims", type=int, default=DEFAULT_DIMS, help="Hashed TF-IDF dimensions")
+    parser.add_argument(
+        "--dtype",
+        choices=["int8", "float16"],
+        default="int8",
+        help="Stored row type (int8 scores faster: numpy widens float16 slowly)",
+    )
+    parser.add_argument("--ivf", action="store_true", help="Partition rows into IVF lists")
+    parser.add_argument("--lists", type=int, help="IVF list count (default: sqrt(verses))")
+    parser.add_argument("--model", help="Local sentence-transformers model instead of hashed TF-IDF")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"\n❌ Database not found: {args.db}")
+        return
+
+    if args.model:
+        try:
+            import sentence_transformers  # noqa: F401
+        except ImportError:
+            print("\n❌ --model needs sentence-transformers (pip install sentence-transformers)")
+            return
+
+    build_verse_embeddings(args.db, args.dims, args.dtype, args.ivf, args.lists, args.model)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,15 +2,97 @@
 Create SQLite database from parsed Telugu Bible JSON
 Includes FTS5 full-text search index
 
+Several translations can live side by side: verses are keyed by
+(translation_id, book_id, chapter, verse) and each translation has its own
+FTS5 tables. Put each translation's USFM files in data/usfm/<code>/ (a flat
+data/usfm/ directory is loaded as the Telugu translation).
+
 Usage:
-    python scripts/create_bible_db.py
+    python scripts/create_bible_db.py                    # from data/usfm (or JSON)
+    python scripts/create_bible_db.py --incremental      # rewrite changed books only
+    python scripts/create_bible_db.py --rebuild-search   # existing bible.db
+    python scripts/create_bible_db.py --release          # also publish a delta release
+    python scripts/create_bible_db.py --cross-references # also build related verses
 """
 
 import os
+import re
 import json
+import time
 import sqlite3
+import argparse
+import unicodedata
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Iterable, Iterator, List, Dict, Any, Optional, Tuple
+
+from bible_release import publish_release
+from build_cross_references import build_cross_references
+from parse_usfm import VerseRow, find_usfm_files, iter_translation_books
+
+
+# Word index tokenizer. The default unicode61 categories treat combining
+# marks (virama, vowel signs) as separators and split Telugu words into
+# fragments; adding M* keeps each word whole. ZWNJ/ZWJ stay inside words.
+# The same holds for the other Indic scripts.
+FTS_TOKENIZER = "unicode61 remove_diacritics 2 categories 'L* M* N* Co' tokenchars '\u200c\u200d'"
+
+# Loaded first, so it gets translation id 1 and the unsuffixed search
+# tables (verses_fts, verses_fts_trigram) the mobile app queries
+DEFAULT_TRANSLATION = "tel"
+DEFAULT_TRANSLATION_ID = 1
+
+# Display name and language tag per translation code
+TRANSLATIONS = {
+    "tel": {"name": "Telugu", "language": "te"},
+    "hin": {"name": "Hindi", "language": "hi"},
+    "tam": {"name": "Tamil", "language": "ta"},
+    "kan": {"name": "Kannada", "language": "kn"},
+    "mal": {"name": "Malayalam", "language": "ml"},
+    "mar": {"name": "Marathi", "language": "mr"},
+    "ben": {"name": "Bengali", "language": "bn"},
+    "guj": {"name": "Gujarati", "language": "gu"},
+    "eng": {"name": "English", "language": "en"},
+}
+
+TRANSLATION_CODE_RE = re.compile(r'[a-z0-9_]+')
+
+
+def normalize_text(text: str) -> str:
+    """NFC-normalize verse text so indexed and queried forms match"""
+    return unicodedata.normalize("NFC", text)
+
+
+def search_table_names(translation_id: int, code: str) -> Tuple[str, str]:
+    """Get the (word, trigram) FTS5 table names of a translation"""
+    if translation_id == DEFAULT_TRANSLATION_ID:
+        return "verses_fts", "verses_fts_trigram"
+    return f"verses_fts_{code}", f"verses_fts_trigram_{code}"
+
+
+def discover_translations(usfm_directory: str) -> Dict[str, str]:
+    """
+    Find translation directories, default translation first.
+
+    Args:
+        usfm_directory: data/usfm, holding USFM files (Telugu) or one
+            subdirectory of USFM files per translation code
+
+    Returns:
+        Translation code -> directory
+    """
+    if find_usfm_files(usfm_directory):
+        return {DEFAULT_TRANSLATION: usfm_directory}
+
+    directories = {
+        path.name: str(path)
+        for path in sorted(Path(usfm_directory).iterdir())
+        if path.is_dir() and TRANSLATION_CODE_RE.fullmatch(path.name) and find_usfm_files(path)
+    }
+
+    if DEFAULT_TRANSLATION in directories:
+        directories = {DEFAULT_TRANSLATION: directories.pop(DEFAULT_TRANSLATION), **directories}
+
+    return directories
 
 
 class BibleDatabaseCreator:
@@ -21,11 +103,13 @@ class BibleDatabaseCreator:
         self.db_path = db_path
         self.conn = None
         self.cursor = None
+        self.translation_ids: Dict[str, int] = {}
 
     def __enter__(self):
         """Context manager entry"""
         self.conn = sqlite3.connect(self.db_path)
         self.cursor = self.conn.cursor()
+        self.translation_ids = self._load_translation_ids()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -33,11 +117,20 @@ class BibleDatabaseCreator:
         if self.conn:
             self.conn.close()
 
+    def _load_translation_ids(self) -> Dict[str, int]:
+        """Read translation codes and ids from an existing database"""
+        exists = self.cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'translations'"
+        ).fetchone()
+        if not exists:
+            return {}
+        return dict(self.cursor.execute("SELECT code, id FROM translations ORDER BY id"))
+
     def create_schema(self):
         """Create database tables"""
         print("Creating database schema...")
 
-        # Books table
+        # Books table (names from BOOK_CODES; counts from the default translation)
         self.cursor.execute("""
             CREATE TABLE IF NOT EXISTS books (
                 id INTEGER PRIMARY KEY,
@@ -49,145 +142,369 @@ class BibleDatabaseCreator:
             )
         """)
 
-        # Verses table
+        # Translations table
         self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS translations (
+                id INTEGER PRIMARY KEY,
+                code TEXT NOT NULL UNIQUE,
+                name TEXT NOT NULL,
+                language TEXT NOT NULL
+            )
+        """)
+
+        # Book names as printed in each translation
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS book_names (
+                translation_id INTEGER NOT NULL,
+                book_id INTEGER NOT NULL,
+                name TEXT NOT NULL,
+                PRIMARY KEY (translation_id, book_id),
+                FOREIGN KEY (translation_id) REFERENCES translations(id),
+                FOREIGN KEY (book_id) REFERENCES books(id)
+            )
+        """)
+
+        # Verses table
+        self.cursor.execute(f"""
             CREATE TABLE IF NOT EXISTS verses (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
+                translation_id INTEGER NOT NULL DEFAULT {DEFAULT_TRANSLATION_ID},
                 book_id INTEGER NOT NULL,
                 chapter INTEGER NOT NULL,
                 verse INTEGER NOT NULL,
                 text TEXT NOT NULL,
+                FOREIGN KEY (translation_id) REFERENCES translations(id),
                 FOREIGN KEY (book_id) REFERENCES books(id)
             )
         """)
 
+        # Databases built before translations: move the verses to the
+        # default translation and drop the old search tables (recreated
+        # per translation)
+        columns = {row[1] for row in self.cursor.execute("PRAGMA table_info(verses)")}
+        if "translation_id" not in columns:
+            print("  Upgrading single-translation database...")
+            self.cursor.execute(
+                f"ALTER TABLE verses ADD COLUMN translation_id INTEGER NOT NULL DEFAULT {DEFAULT_TRANSLATION_ID}"
+            )
+            for name in ("verses_ai", "verses_ad", "verses_au"):
+                self.cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+            for table in ("verses_fts", "verses_fts_trigram"):
+                self.cursor.execute(f"DROP TABLE IF EXISTS {table}")
+            self.cursor.execute("DROP INDEX IF EXISTS idx_verses_book_chapter_verse")
+
         # Create indexes
         self.cursor.execute("""
             CREATE INDEX IF NOT EXISTS idx_verses_book_chapter
             ON verses(book_id, chapter)
         """)
 
+        # Verse key: lookups, parallel lookups and per-book diffs. Unique, so
+        # a rebuild or update fails instead of storing a verse twice.
+        # Databases built with the old non-unique index keep the newest
+        # copy of each verse.
+        key_index = self.cursor.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'index' AND name = ?",
+            ("idx_verses_translation_book_chapter_verse",),
+        ).fetchone()
+        if key_index and "UNIQUE" not in key_index[0].upper():
+            self.cursor.execute("DROP INDEX idx_verses_translation_book_chapter_verse")
+            removed = self.cursor.execute("""
+                DELETE FROM verses WHERE id NOT IN (
+                    SELECT MAX(id) FROM verses GROUP BY translation_id, book_id, chapter, verse
+                )
+            """).rowcount
+            if removed:
+                print(f"  Removed {removed} duplicate verses")
+
         self.cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_verses_book_chapter_verse
-            ON verses(book_id, chapter, verse)
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_verses_translation_book_chapter_verse
+            ON verses(translation_id, book_id, chapter, verse)
         """)
 
-        # FTS5 virtual table for full-text search
-        self.cursor.execute("""
-            CREATE VIRTUAL TABLE IF NOT EXISTS verses_fts USING fts5(
-                text,
-                content=verses,
-                content_rowid=id
+        self.conn.commit()
+        print("✅ Schema created")
+
+    def add_translation(self, code: str) -> int:
+        """
+        Register a translation (no-op if it exists).
+
+        Args:
+            code: Translation code, e.g. "tel" (names from TRANSLATIONS)
+
+        Returns:
+            Translation id
+        """
+        if code not in self.translation_ids:
+            info = TRANSLATIONS.get(code, {"name": code, "language": code})
+            self.cursor.execute(
+                "INSERT INTO translations (code, name, language) VALUES (?, ?, ?)",
+                (code, info["name"], info["language"]),
             )
+            self.translation_ids[code] = self.cursor.lastrowid
+            print(f"  ✅ Translation {code} ({info['name']}) -> id {self.cursor.lastrowid}")
+
+        return self.translation_ids[code]
+
+    def has_search_tables(self, code: str) -> bool:
+        """Check whether a translation's FTS5 tables exist"""
+        tables = search_table_names(self.translation_ids[code], code)
+        return self.cursor.execute(
+            f"SELECT COUNT(*) FROM sqlite_master WHERE name IN ({','.join('?' * len(tables))})",
+            tables,
+        ).fetchone()[0] == len(tables)
+
+    def create_search_tables(self, code: str):
+        """
+        Create a translation's FTS5 search tables, replacing existing ones.
+
+        - verses_fts: whole-word index (Telugu-aware tokenizer), bm25 ranked
+        - verses_fts_trigram: trigram index for partial-word matches
+
+        Both index the view verses_<code>, so each translation is ranked
+        against its own vocabulary. The sync triggers are created
+        separately (create_search_triggers), so bulk loads can skip
+        per-row indexing and rebuild once.
+        """
+        translation_id = self.translation_ids[code]
+        word_table, trigram_table = search_table_names(translation_id, code)
+
+        for suffix in ("ai", "ad", "au"):
+            self.cursor.execute(f"DROP TRIGGER IF EXISTS verses_{suffix}_{code}")
+
+        for table in (word_table, trigram_table):
+            self.cursor.execute(f"DROP TABLE IF EXISTS {table}")
+
+        self.cursor.execute(f"DROP VIEW IF EXISTS verses_{code}")
+        self.cursor.execute(f"""
+            CREATE VIEW verses_{code} AS
+            SELECT id, text FROM verses WHERE translation_id = {translation_id}
         """)
 
-        # Triggers to keep FTS5 in sync
-        self.cursor.execute("""
-            CREATE TRIGGER IF NOT EXISTS verses_ai AFTER INSERT ON verses BEGIN
-                INSERT INTO verses_fts(rowid, text) VALUES (new.id, new.text);
-            END
+        self.cursor.execute(f"""
+            CREATE VIRTUAL TABLE {word_table} USING fts5(
+                text,
+                content=verses_{code},
+                content_rowid=id,
+                tokenize="{FTS_TOKENIZER}"
+            )
         """)
 
-        self.cursor.execute("""
-            CREATE TRIGGER IF NOT EXISTS verses_ad AFTER DELETE ON verses BEGIN
-                DELETE FROM verses_fts WHERE rowid = old.id;
-            END
+        self.cursor.execute(f"""
+            CREATE VIRTUAL TABLE {trigram_table} USING fts5(
+                text,
+                content=verses_{code},
+                content_rowid=id,
+                tokenize='trigram'
+            )
         """)
 
-        self.cursor.execute("""
-            CREATE TRIGGER IF NOT EXISTS verses_au AFTER UPDATE ON verses BEGIN
-                UPDATE verses_fts SET text = new.text WHERE rowid = new.id;
-            END
-        """)
+    def create_search_triggers(self, code: str):
+        """Create triggers that keep a translation's FTS5 tables in sync"""
+        translation_id = self.translation_ids[code]
+        tables = search_table_names(translation_id, code)
+
+        for suffix in ("ai", "ad", "au"):
+            self.cursor.execute(f"DROP TRIGGER IF EXISTS verses_{suffix}_{code}")
+
+        # External content tables need the 'delete' command with the old text
+        inserts = "".join(
+            f"INSERT INTO {t}(rowid, text) SELECT new.id, new.text WHERE new.translation_id = {translation_id};"
+            for t in tables
+        )
+        deletes = "".join(
+            f"INSERT INTO {t}({t}, rowid, text) SELECT 'delete', old.id, old.text"
+            f" WHERE old.translation_id = {translation_id};"
+            for t in tables
+        )
+
+        self.cursor.execute(f"CREATE TRIGGER verses_ai_{code} AFTER INSERT ON verses BEGIN {inserts} END")
+        self.cursor.execute(f"CREATE TRIGGER verses_ad_{code} AFTER DELETE ON verses BEGIN {deletes} END")
+        self.cursor.execute(f"CREATE TRIGGER verses_au_{code} AFTER UPDATE ON verses BEGIN {deletes}{inserts} END")
+
+    def _run_search_command(self, code: str, command: str):
+        """Run an FTS5 command ('rebuild' or 'optimize') on a translation's tables"""
+        for table in search_table_names(self.translation_ids[code], code):
+            self.cursor.execute(f"INSERT INTO {table}({table}) VALUES('{command}')")
+
+    def rebuild_search_index(self, codes: Optional[Iterable[str]] = None):
+        """
+        Recreate search tables and index all existing verses.
+
+        Args:
+            codes: Translations to rebuild (default: all)
+        """
+        print("\nRebuilding search index...")
+
+        for code in list(codes or self.translation_ids):
+            self.create_search_tables(code)
+            self._run_search_command(code, "rebuild")
+            self.create_search_triggers(code)
+            print(f"  ✅ {code}")
 
         self.conn.commit()
-        print("✅ Schema created")
 
-    def insert_books(self, bible_data: List[Dict[str, Any]]):
-        """Insert book records"""
-        print("\nInserting books...")
+        print("✅ Search index rebuilt")
+
+    def begin_bulk_load(self):
+        """
+        Switch off journaling and fsync for a from-scratch build.
+
+        A crash mid-build can corrupt the file, which is fine because a
+        full build always starts from a deleted database.
+        """
+        self.cursor.execute("PRAGMA journal_mode = OFF")
+        self.cursor.execute("PRAGMA synchronous = OFF")
+        self.cursor.execute("PRAGMA temp_store = MEMORY")
+
+    def end_bulk_load(self):
+        """Restore the default journaling and fsync settings"""
+        self.cursor.execute("PRAGMA journal_mode = DELETE")
+        self.cursor.execute("PRAGMA synchronous = FULL")
+
+    def _write_book(self, translation_id: int, book: Dict[str, Any], verses: List[VerseRow]):
+        """Insert one translation's book (row, name and verses)"""
+        chapter_count = max((chapter for _, chapter, _, _ in verses), default=0)
+
+        # Other translations only add books the default translation lacks
+        conflict = "REPLACE" if translation_id == DEFAULT_TRANSLATION_ID else "IGNORE"
+        self.cursor.execute(f"""
+            INSERT OR {conflict} INTO books
+            (id, name_telugu, name_english, testament, chapter_count, verse_count)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (
+            book["id"],
+            book["name_telugu"],
+            book["name_english"],
+            book["testament"],
+            chapter_count,
+            len(verses)
+        ))
 
-        books_inserted = 0
+        self.cursor.execute("""
+            INSERT OR REPLACE INTO book_names (translation_id, book_id, name)
+            VALUES (?, ?, ?)
+        """, (translation_id, book["id"], book.get("name") or book["name_telugu"]))
+
+        self.cursor.executemany("""
+            INSERT INTO verses (translation_id, book_id, chapter, verse, text)
+            VALUES (?, ?, ?, ?, ?)
+        """, (
+            (translation_id, book_id, chapter, verse, normalize_text(text))
+            for book_id, chapter, verse, text in verses
+        ))
+
+    def insert_parsed_books(self, books: Iterable[Dict[str, Any]]):
+        """
+        Insert books and verses in a single pass over parsed books.
+
+        Accepts the generator from parse_usfm.iter_translation_books, so
+        each book is written as soon as it is parsed and the whole Bible is
+        never held in memory at once. Everything is written in one
+        transaction.
+
+        Args:
+            books: Dicts with "translation" code (registered with
+                add_translation), "book" info and "verses" rows
+                (book_id, chapter, verse, text)
+        """
+        print("\nParsing and inserting books...")
 
-        for book_data in bible_data:
-            book = book_data["book"]
-            verses = book_data["verses"]
-
-            # Calculate chapter count
-            chapters = set(v["chapter"] for v in verses)
-            chapter_count = max(chapters) if chapters else 0
-
-            # Insert book
-            self.cursor.execute("""
-                INSERT OR REPLACE INTO books
-                (id, name_telugu, name_english, testament, chapter_count, verse_count)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                book["id"],
-                book["name_telugu"],
-                book["name_english"],
-                book["testament"],
-                chapter_count,
-                len(verses)
-            ))
+        books_inserted = 0
+        verses_inserted = 0
 
+        for book_data in books:
+            translation_id = self.translation_ids[book_data["translation"]]
+            self._write_book(translation_id, book_data["book"], book_data["verses"])
             books_inserted += 1
-            print(f"  ✅ {book['name_english']} ({len(verses)} verses, {chapter_count} chapters)")
+            verses_inserted += len(book_data["verses"])
 
         self.conn.commit()
-        print(f"\n✅ Inserted {books_inserted} books")
+        print(f"\n✅ Inserted {books_inserted} books, {verses_inserted} verses")
+
+    def update_changed_books(self, books: Iterable[Dict[str, Any]]) -> List[str]:
+        """
+        Rewrite only the books whose verses differ from the database.
+
+        Each parsed book is compared row by row with the stored verses of
+        its translation; changed books are deleted and reinserted, and the
+        FTS triggers update the search index for just those rows. Books
+        missing from the source are left untouched.
+
+        Args:
+            books: Dicts with "translation" code (registered with
+                add_translation), "book" info and "verses" rows
+                (book_id, chapter, verse, text)
+
+        Returns:
+            Changed books as "<code>:<English name>"
+        """
+        print("\nComparing books with the existing database...")
+
+        # Translations without search tables (new, or upgraded from a
+        # single-translation database) are indexed once at the end
+        unindexed = [code for code in self.translation_ids if not self.has_search_tables(code)]
+        for code in self.translation_ids:
+            if code not in unindexed:
+                self.create_search_triggers(code)
+
+        changed = []
+
+        for book_data in books:
+            code = book_data["translation"]
+            translation_id = self.translation_ids[code]
+            book = book_data["book"]
+            verses = [
+                (book_id, chapter, verse, normalize_text(text))
+                for book_id, chapter, verse, text in book_data["verses"]
+            ]
+
+            stored = self.cursor.execute("""
+                SELECT book_id, chapter, verse, text FROM verses
+                WHERE translation_id = ? AND book_id = ?
+                ORDER BY chapter, verse, id
+            """, (translation_id, book["id"])).fetchall()
+
+            if stored == sorted(verses, key=lambda row: (row[1], row[2])):
+                continue
+
+            self.cursor.execute(
+                "DELETE FROM verses WHERE translation_id = ? AND book_id = ?",
+                (translation_id, book["id"]),
+            )
+            self._write_book(translation_id, book, verses)
+            changed.append(f"{code}:{book['name_english']}")
+            print(f"  ✏️  [{code}] {book['name_english']} ({len(verses)} verses)")
 
-    def insert_verses(self, bible_data: List[Dict[str, Any]]):
-        """Insert verse records"""
-        print("\nInserting verses...")
+        self.conn.commit()
+        if unindexed:
+            self.rebuild_search_index(unindexed)
 
-        verses_inserted = 0
-        batch_size = 1000
-        verse_batch = []
-
-        for book_data in bible_data:
-            for verse in book_data["verses"]:
-                verse_batch.append((
-                    verse["book_id"],
-                    verse["chapter"],
-                    verse["verse"],
-                    verse["text"]
-                ))
-
-                if len(verse_batch) >= batch_size:
-                    self.cursor.executemany("""
-                        INSERT INTO verses (book_id, chapter, verse, text)
-                        VALUES (?, ?, ?, ?)
-                    """, verse_batch)
-                    verses_inserted += len(verse_batch)
-                    verse_batch = []
-                    print(f"  Inserted {verses_inserted} verses...", end='\r')
-
-        # Insert remaining verses
-        if verse_batch:
-            self.cursor.executemany("""
-                INSERT INTO verses (book_id, chapter, verse, text)
-                VALUES (?, ?, ?, ?)
-            """, verse_batch)
-            verses_inserted += len(verse_batch)
+        print(f"\n✅ {len(changed)} books changed")
+        return changed
 
-        self.conn.commit()
-        print(f"\n✅ Inserted {verses_inserted} verses")
+    def optimize_database(self, rebuild_search: bool = True):
+        """
+        Optimize database for size and performance.
 
-    def optimize_database(self):
-        """Optimize database for size and performance"""
+        Args:
+            rebuild_search: Rebuild the FTS5 indexes from scratch (bulk
+                loads); otherwise only merge their segments
+        """
         print("\nOptimizing database...")
 
         # Analyze tables for query optimization
         self.cursor.execute("ANALYZE")
 
-        # Rebuild FTS5 index
-        self.cursor.execute("INSERT INTO verses_fts(verses_fts) VALUES('rebuild')")
+        # Rebuild (or merge) FTS5 indexes
+        for code in self.translation_ids:
+            self._run_search_command(code, "rebuild" if rebuild_search else "optimize")
+
+        # VACUUM cannot run inside the transaction opened above
+        self.conn.commit()
 
         # Vacuum to compact database
         self.cursor.execute("VACUUM")
-
-        self.conn.commit()
         print("✅ Database optimized")
 
     def get_statistics(self) -> Dict[str, Any]:
@@ -202,6 +519,15 @@ class BibleDatabaseCreator:
         self.cursor.execute("SELECT COUNT(*) FROM verses")
         stats["verses"] = self.cursor.fetchone()[0]
 
+        # Verses per translation
+        self.cursor.execute("""
+            SELECT t.code, COUNT(v.id)
+            FROM translations t LEFT JOIN verses v ON v.translation_id = t.id
+            GROUP BY t.id
+            ORDER BY t.id
+        """)
+        stats["translations"] = dict(self.cursor.fetchall())
+
         # OT/NT breakdown
         self.cursor.execute("""
             SELECT testament, COUNT(*) as count, SUM(verse_count) as verses
@@ -235,23 +561,108 @@ def load_bible_json(json_file: str) -> List[Dict[str, Any]]:
     return data
 
 
+def iter_json_books(bible_data: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Convert parsed Bible JSON (Telugu) to the row format of iter_translation_books"""
+    for book_data in bible_data:
+        yield {
+            "translation": DEFAULT_TRANSLATION,
+            "book": book_data["book"],
+            "verses": [
+                (v["book_id"], v["chapter"], v["verse"], v["text"])
+                for v in book_data["verses"]
+            ],
+        }
+
+
+def _existing(path: str) -> Optional[str]:
+    """Return path if the file exists, else None"""
+    return path if os.path.exists(path) else None
+
+
 def main():
     """Main execution function"""
+    parser = argparse.ArgumentParser(description="Create the Telugu Bible SQLite database")
+    parser.add_argument(
+        "--rebuild-search",
+        action="store_true",
+        help="Only rebuild the FTS5 search tables of an existing database",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Update an existing database, rewriting only books that changed",
+    )
+    parser.add_argument(
+        "--release",
+        action="store_true",
+        help="Publish the result to data/releases as a delta from the last release",
+    )
+    parser.add_argument(
+        "--cross-references",
+        action="store_true",
+        help="Build the related-verse table (OpenBible data/cross_references.txt + similarity)",
+    )
+    args = parser.parse_args()
+
     print("=" * 60)
     print("Telugu Bible SQLite Database Creator")
     print("=" * 60)
 
     # Configuration
+    usfm_directory = "data/usfm"
     json_file = "data/telugu_bible.json"
     db_file = "assets/bible.db"
+    releases_directory = "data/releases"
+    cross_references_file = "data/cross_references.txt"
+
+    if args.rebuild_search:
+        if not os.path.exists(db_file):
+            print(f"\n❌ Database not found: {db_file}")
+            return
+
+        with BibleDatabaseCreator(db_file) as db:
+            db.create_schema()
+            if not db.translation_ids:
+                db.add_translation(DEFAULT_TRANSLATION)
+            db.rebuild_search_index()
+        return
 
     # Create assets directory
     os.makedirs("assets", exist_ok=True)
 
-    # Check if JSON file exists
-    if not os.path.exists(json_file):
-        print(f"\n❌ Bible JSON file not found: {json_file}")
-        print("\nPlease run parse_usfm.py first to generate the JSON file.")
+    # Prefer parsing USFM directly; fall back to the JSON export
+    use_usfm = os.path.isdir(usfm_directory)
+    if not use_usfm and not os.path.exists(json_file):
+        print(f"\n❌ Neither {usfm_directory}/ nor {json_file} found")
+        print("\nDownload the USFM files first (see scripts/README.md).")
+        return
+
+    started = time.perf_counter()
+    if use_usfm:
+        directories = discover_translations(usfm_directory)
+        translations = list(directories)
+        books = iter_translation_books(directories)
+    else:
+        translations = [DEFAULT_TRANSLATION]
+        books = iter_json_books(load_bible_json(json_file))
+
+    if not translations:
+        print(f"\n❌ No USFM files found in {usfm_directory}/")
+        return
+    print(f"\nTranslations: {', '.join(translations)}")
+
+    if args.incremental and os.path.exists(db_file):
+        with BibleDatabaseCreator(db_file) as db:
+            db.create_schema()
+            for code in translations:
+                db.add_translation(code)
+            if db.update_changed_books(books):
+                db.optimize_database(rebuild_search=False)
+        if args.cross_references:
+            build_cross_references(db_file, _existing(cross_references_file))
+        if args.release:
+            publish_release(db_file, releases_directory)
+        print(f"\n✅ Database updated: {db_file} ({time.perf_counter() - started:.1f}s)")
         return
 
     # Delete existing database
@@ -259,20 +670,23 @@ def main():
         print(f"\n⚠️  Deleting existing database: {db_file}")
         os.remove(db_file)
 
-    # Load Bible data
-    bible_data = load_bible_json(json_file)
-
     # Create database
     with BibleDatabaseCreator(db_file) as db:
-        # Create schema
+        # Bulk load: no journal, no fsync, no per-row FTS triggers
+        db.begin_bulk_load()
         db.create_schema()
+        for code in translations:
+            db.add_translation(code)
+            db.create_search_tables(code)
 
-        # Insert data
-        db.insert_books(bible_data)
-        db.insert_verses(bible_data)
+        # Insert data (one transaction; translations parsed in parallel)
+        db.insert_parsed_books(books)
 
-        # Optimize
+        # Index everything once, then keep FTS in sync for later updates
+        for code in translations:
+            db.create_search_triggers(code)
         db.optimize_database()
+        db.end_bulk_load()
 
         # Print statistics
         stats = db.get_statistics()
@@ -281,6 +695,9 @@ def main():
         print("=" * 60)
         print(f"Books: {stats['books']}")
         print(f"Total Verses: {stats['verses']}")
+        print(f"\nTranslations:")
+        for code, count in stats["translations"].items():
+            print(f"  {code}: {count} verses")
         print(f"\nOld Testament:")
         print(f"  Books: {stats['testament']['OT']['books']}")
         print(f"  Verses: {stats['testament']['OT']['verses']}")
@@ -290,7 +707,13 @@ def main():
         print(f"\nDatabase Size: {stats['file_size_mb']:.2f} MB")
         print("=" * 60)
 
-    print(f"\n✅ Database created successfully: {db_file}")
+    if args.cross_references:
+        build_cross_references(db_file, _existing(cross_references_file))
+
+    if args.release:
+        publish_release(db_file, releases_directory)
+
+    print(f"\n✅ Database created successfully: {db_file} ({time.perf_counter() - started:.1f}s)")
     print("\nNext steps:")
     print("1. Copy bible.db to your Expo app's assets folder")
     print("2. Configure expo-asset to bundle the database with your app")
@@ -11,6 +11,7 @@ import type {
   VerseReference,
   GenerateSermonRequest,
   GenerateSermonResponse,
+  SermonListPage,
 } from '../types';
 
 interface FetchOptions {
@@ -130,6 +131,18 @@ class AIService {
     });
   }
 
+  /**
+   * List sermon summaries (no content), newest first.
+   * Pass the previous page's next_cursor to load the following page.
+   */
+  async listSermonSummaries(limit: number = 20, cursor?: string | null): Promise<SermonListPage> {
+    const params: Record<string, string | number> = { limit };
+    if (cursor) {
+      params.cursor = cursor;
+    }
+    return this.request<SermonListPage>('/api/v1/sermons/summaries', { params });
+  }
+
   /**
    * Update sermon
    */
@@ -13,6 +13,10 @@ import { Book, Verse } from '../types';
 // Import Bible data for web
 import bibleData from '../../assets/bible-data.json';
 
+// bible.db can hold several translations; the app reads the default one
+// (id 1, see scripts/create_bible_db.py)
+const DEFAULT_TRANSLATION_ID = 1;
+
 class BibleService {
   private db: SQLite.SQLiteDatabase | null = null;
   private isInitialized = false;
@@ -86,6 +90,15 @@ class BibleService {
 
     // Open the database
     this.db = await SQLite.openDatabaseAsync(dbName);
+
+    // Copies made before bible.db held translations: every verse belongs
+    // to the default translation
+    const columns = await this.db.getAllAsync<{ name: string }>('PRAGMA table_info(verses)');
+    if (!columns.some(column => column.name === 'translation_id')) {
+      await this.db.execAsync(
+        `ALTER TABLE verses ADD COLUMN translation_id INTEGER NOT NULL DEFAULT ${DEFAULT_TRANSLATION_ID}`
+      );
+    }
   }
 
   /**
@@ -159,8 +172,8 @@ class BibleService {
       ).sort((a, b) => a.verse - b.verse);
     } else {
       const result = await this.db.getAllAsync<Verse>(
-        'SELECT * FROM verses WHERE book_id = ? AND chapter = ? ORDER BY verse',
-        [bookId, chapter]
+        'SELECT * FROM verses WHERE translation_id = ? AND book_id = ? AND chapter = ? ORDER BY verse',
+        [DEFAULT_TRANSLATION_ID, bookId, chapter]
       );
       return result;
     }
@@ -182,8 +195,8 @@ class BibleService {
       ) || null;
     } else {
       const result = await this.db.getFirstAsync<Verse>(
-        'SELECT * FROM verses WHERE book_id = ? AND chapter = ? AND verse = ?',
-        [bookId, chapter, verse]
+        'SELECT * FROM verses WHERE translation_id = ? AND book_id = ? AND chapter = ? AND verse = ?',
+        [DEFAULT_TRANSLATION_ID, bookId, chapter, verse]
       );
       return result || null;
     }
@@ -209,8 +222,8 @@ class BibleService {
       ).sort((a, b) => a.verse - b.verse);
     } else {
       const result = await this.db.getAllAsync<Verse>(
-        'SELECT * FROM verses WHERE book_id = ? AND chapter = ? AND verse >= ? AND verse <= ? ORDER BY verse',
-        [bookId, chapter, verseStart, verseEnd]
+        'SELECT * FROM verses WHERE translation_id = ? AND book_id = ? AND chapter = ? AND verse >= ? AND verse <= ? ORDER BY verse',
+        [DEFAULT_TRANSLATION_ID, bookId, chapter, verseStart, verseEnd]
       );
       return result;
     }
@@ -236,9 +249,9 @@ class BibleService {
       const result = await this.db.getAllAsync<Verse>(
         `SELECT v.* FROM verses v
          JOIN verses_fts fts ON v.id = fts.rowid
-         WHERE verses_fts MATCH ?
+         WHERE verses_fts MATCH ? AND v.translation_id = ?
          LIMIT ? OFFSET ?`,
-        [query, limit, offset]
+        [query, DEFAULT_TRANSLATION_ID, limit, offset]
       );
       return result;
     }
@@ -284,7 +297,8 @@ class BibleService {
       );
 
       const totalVerses = await this.db.getFirstAsync<{ count: number }>(
-        'SELECT COUNT(*) as count FROM verses'
+        'SELECT COUNT(*) as count FROM verses WHERE translation_id = ?',
+        [DEFAULT_TRANSLATION_ID]
       );
 
       const otBooks = await this.db.getFirstAsync<{ count: number }>(
@@ -19,6 +19,7 @@ describe('BibleService', () => {
     mockDb = {
       getAllAsync: jest.fn(),
       getFirstAsync: jest.fn(),
+      execAsync: jest.fn(),
     };
 
     (SQLite.openDatabaseAsync as jest.Mock).mockResolvedValue(mockDb);
@@ -99,8 +100,8 @@ describe('BibleService', () => {
 
       expect(verses).toEqual(mockVerses);
       expect(mockDb.getAllAsync).toHaveBeenCalledWith(
-        'SELECT * FROM verses WHERE book_id = ? AND chapter = ? ORDER BY verse',
-        [43, 3]
+        'SELECT * FROM verses WHERE translation_id = ? AND book_id = ? AND chapter = ? ORDER BY verse',
+        [1, 43, 3]
       );
     });
 
@@ -126,7 +127,7 @@ describe('BibleService', () => {
       expect(results).toEqual(mockResults);
       expect(mockDb.getAllAsync).toHaveBeenCalledWith(
         expect.stringContaining('verses_fts MATCH'),
-        ['ప్రేమ', 50, 0]
+        ['ప్రేమ', 1, 50, 0]
       );
     });
 
@@ -147,7 +148,7 @@ describe('BibleService', () => {
 
       expect(mockDb.getAllAsync).toHaveBeenCalledWith(
         expect.any(String),
-        ['test', 50, 100]
+        ['test', 1, 50, 100]
       );
     });
   });
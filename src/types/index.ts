@@ -73,6 +73,7 @@ export interface SermonConfig {
   length_minutes: SermonLength;
   tone?: 'formal' | 'casual' | 'passionate' | 'gentle';
   include_illustrations?: boolean;
+  parallel_translation?: string; // e.g. 'hin': quote this translation alongside Telugu
 }
 
 export interface SermonPoint {
@@ -106,6 +107,16 @@ export interface Sermon {
   sync_status?: SyncStatus;
 }
 
+export type SermonSummary = Pick<
+  Sermon,
+  'id' | 'title' | 'sermon_type' | 'target_audience' | 'created_at'
+>;
+
+export interface SermonListPage {
+  items: SermonSummary[];
+  next_cursor: string | null;
+}
+
 // Subscription types
 export type SubscriptionTier = 'free' | 'basic' | 'premium' | 'ministry';
 export type SubscriptionStatus = 'active' | 'cancelled' | 'expired' | 'trial';